@@ -5,15 +5,30 @@ Supports:
 - Images: JPEG, PNG, TIFF, HEIC, WebP (EXIF, IPTC, XMP)
 - Documents: PDF, DOCX, XLSX, PPTX
 - Videos: MP4, MOV, AVI (basic metadata)
+
+The parse_* functions read JPEG/TIFF EXIF, JPEG XMP and IPTC, PNG text
+chunks, the PDF Info dictionary and OOXML/ODF document properties
+in-process from partial file contents (see partial.py); they raise NeedMoreData when the bytes
+they were given stop short. exiftool runs as one persistent -stay_open
+process per worker instead of a subprocess per file.
 """
 
+import atexit
 import io
 import logging
+import os
+import select
+import shutil
+import struct
 import subprocess
 import json
 import re
+import threading
+import time
+import zlib
+import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -186,31 +201,114 @@ def extract_exif(data: bytes, url: str) -> MetadataResult:
     return result
 
 
+class ExiftoolWorker:
+    """
+    A long-running `exiftool -stay_open True -@ -` process.
+
+    Each request writes its arguments plus -execute to stdin and reads
+    stdout up to the {ready} marker, so the Perl start-up cost is paid
+    once per process rather than once per file. Requests are serialized.
+    """
+
+    READY = b"{ready}"
+
+    def __init__(self, executable: str = "exiftool"):
+        self.executable = executable
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            [self.executable, "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def execute(self, *args: str, timeout: float = 30) -> bytes:
+        """Run one exiftool command and return its stdout."""
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            proc = self._proc
+            proc.stdin.write(("\n".join(args) + "\n-execute\n").encode("utf-8"))
+            proc.stdin.flush()
+
+            fd = proc.stdout.fileno()
+            output = b""
+            deadline = time.monotonic() + timeout
+            while not output.rstrip().endswith(self.READY):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    self._kill()
+                    raise TimeoutError(f"exiftool did not answer within {timeout}s")
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    self._kill()
+                    raise RuntimeError("exiftool exited")
+                output += chunk
+            return output.rstrip()[:-len(self.READY)]
+
+    def _kill(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def close(self):
+        """Ask exiftool to exit (killed if it does not)."""
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._proc = None
+                return
+            try:
+                self._proc.stdin.write(b"-stay_open\nFalse\n")
+                self._proc.stdin.flush()
+                self._proc.wait(timeout=5)
+                self._proc = None
+            except Exception:
+                self._kill()
+
+
+_exiftool: Optional[ExiftoolWorker] = None
+_exiftool_lock = threading.Lock()
+
+
+def get_exiftool() -> Optional[ExiftoolWorker]:
+    """This process's exiftool worker (None when exiftool is not installed)."""
+    global _exiftool
+    with _exiftool_lock:
+        if _exiftool is None:
+            executable = shutil.which("exiftool")
+            if not executable:
+                return None
+            _exiftool = ExiftoolWorker(executable)
+            atexit.register(_exiftool.close)
+        return _exiftool
+
+
 def _extract_with_exiftool(data: bytes) -> Optional[Dict]:
-    """Extract using exiftool command-line tool."""
+    """Extract using the persistent exiftool worker."""
+    worker = get_exiftool()
+    if worker is None:
+        logger.debug("exiftool not installed")
+        return None
+
     try:
-        # Write to temp file and run exiftool
+        # Write to temp file and hand the path to exiftool
         import tempfile
         with tempfile.NamedTemporaryFile(delete=False, suffix=".tmp") as f:
             f.write(data)
             temp_path = f.name
 
         try:
-            result = subprocess.run(
-                ["exiftool", "-json", "-a", "-g", temp_path],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0 and result.stdout:
-                parsed = json.loads(result.stdout)
+            output = worker.execute("-json", "-a", "-g", temp_path)
+            if output.strip():
+                parsed = json.loads(output)
                 if parsed and isinstance(parsed, list):
                     return parsed[0]
         finally:
             Path(temp_path).unlink(missing_ok=True)
-    except FileNotFoundError:
-        logger.debug("exiftool not installed")
     except Exception as e:
         logger.debug(f"exiftool error: {e}")
 
@@ -513,6 +611,663 @@ def extract_video_meta(data: bytes, url: str) -> MetadataResult:
     return result
 
 
+def metadata_result(url: str, file_type: str, meta: Dict) -> MetadataResult:
+    """Successful MetadataResult with the common fields populated."""
+    result = MetadataResult(url=url, file_type=file_type, success=True, metadata=meta)
+    _populate_common_fields(result, meta)
+    return result
+
+
+# =============================================================================
+# In-process parsers (stdlib only, work on partial file contents)
+# =============================================================================
+
+class NeedMoreData(Exception):
+    """The structure continues past the bytes supplied; `needed` is the length required."""
+
+    def __init__(self, needed: int):
+        super().__init__(f"need {needed} bytes")
+        self.needed = needed
+
+
+# TIFF tag id -> name (Pillow's names, so results match _extract_with_pillow)
+EXIF_TAGS = {
+    0x010E: "ImageDescription", 0x010F: "Make", 0x0110: "Model",
+    0x0131: "Software", 0x0132: "DateTime", 0x013B: "Artist",
+    0x8298: "Copyright", 0x8769: "ExifOffset", 0x8825: "GPSInfo",
+    0x9003: "DateTimeOriginal", 0x9004: "DateTimeDigitized",
+    0x9C9B: "XPTitle", 0x9C9C: "XPComment", 0x9C9D: "XPAuthor",
+    0x9C9E: "XPKeywords", 0x9C9F: "XPSubject",
+    0xA420: "ImageUniqueID", 0xA430: "CameraOwnerName",
+    0xA431: "BodySerialNumber", 0xA433: "LensMake", 0xA434: "LensModel",
+}
+
+GPS_TAGS = {
+    0: "GPSVersionID", 1: "GPSLatitudeRef", 2: "GPSLatitude",
+    3: "GPSLongitudeRef", 4: "GPSLongitude", 5: "GPSAltitudeRef",
+    6: "GPSAltitude", 7: "GPSTimeStamp", 29: "GPSDateStamp",
+}
+
+# TIFF field type -> (struct code, size)
+_TIFF_TYPES = {
+    1: ("B", 1), 2: ("s", 1), 3: ("H", 2), 4: ("I", 4), 5: ("II", 8),
+    6: ("b", 1), 7: ("s", 1), 8: ("h", 2), 9: ("i", 4), 10: ("ii", 8),
+}
+
+
+def _tiff_value(field_type: int, raw: bytes, count: int, endian: str, tag_name: str) -> Any:
+    code, size = _TIFF_TYPES[field_type]
+    if field_type == 2:
+        return raw.split(b"\x00", 1)[0].decode("utf-8", errors="replace").strip()
+    if field_type == 7 or (field_type == 1 and tag_name.startswith("XP")):
+        if tag_name.startswith("XP"):
+            return raw.decode("utf-16-le", errors="ignore").rstrip("\x00")
+        return raw
+    if field_type in (5, 10):
+        pairs = struct.unpack(f"{endian}{code * count}", raw)
+        values = [n / d if d else 0.0 for n, d in zip(pairs[0::2], pairs[1::2])]
+    else:
+        values = list(struct.unpack(f"{endian}{code * count}", raw))
+    return values[0] if count == 1 else tuple(values)
+
+
+def _read_ifd(data: bytes, base: int, offset: int, endian: str, names: Dict[int, str]) -> Dict[str, Any]:
+    """Named entries of one IFD; `base` is where the TIFF header starts."""
+    pos = base + offset
+    if pos + 2 > len(data):
+        raise NeedMoreData(pos + 2)
+    count = struct.unpack(f"{endian}H", data[pos:pos + 2])[0]
+    if pos + 2 + 12 * count > len(data):
+        raise NeedMoreData(pos + 2 + 12 * count)
+
+    meta: Dict[str, Any] = {}
+    for i in range(count):
+        entry = pos + 2 + 12 * i
+        tag, field_type, n = struct.unpack(f"{endian}HHI", data[entry:entry + 8])
+        if tag not in names or field_type not in _TIFF_TYPES:
+            continue
+        length = _TIFF_TYPES[field_type][1] * n
+        if length <= 4:
+            start = entry + 8
+        else:
+            start = base + struct.unpack(f"{endian}I", data[entry + 8:entry + 12])[0]
+            if start + length > len(data):
+                raise NeedMoreData(start + length)
+        try:
+            meta[names[tag]] = _tiff_value(field_type, data[start:start + length], n, endian, names[tag])
+        except struct.error:
+            continue
+    return meta
+
+
+def parse_tiff(data: bytes, base: int = 0) -> Dict[str, Any]:
+    """EXIF tags of a TIFF structure at `base` (TIFF-based files, JPEG APP1, PNG eXIf)."""
+    if len(data) < base + 8:
+        raise NeedMoreData(base + 8)
+    byte_order = data[base:base + 2]
+    if byte_order not in (b"II", b"MM"):
+        return {}
+    endian = "<" if byte_order == b"II" else ">"
+    magic, ifd0 = struct.unpack(f"{endian}HI", data[base + 2:base + 8])
+    if magic != 42:
+        return {}
+
+    meta = _read_ifd(data, base, ifd0, endian, EXIF_TAGS)
+    exif_offset = meta.pop("ExifOffset", None)
+    if isinstance(exif_offset, int):
+        meta.update(_read_ifd(data, base, exif_offset, endian, EXIF_TAGS))
+    gps_offset = meta.pop("GPSInfo", None)
+    if isinstance(gps_offset, int):
+        meta["GPSInfo"] = _read_ifd(data, base, gps_offset, endian, GPS_TAGS)
+    return meta
+
+
+_XMP_SIGNATURE = b"http://ns.adobe.com/xap/1.0/\x00"
+_PHOTOSHOP_SIGNATURE = b"Photoshop 3.0\x00"
+_RDF = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+
+# XMP property -> name (exiftool's names)
+XMP_PROPERTIES = {
+    "{http://purl.org/dc/elements/1.1/}creator": "Creator",
+    "{http://purl.org/dc/elements/1.1/}rights": "Rights",
+    "{http://purl.org/dc/elements/1.1/}title": "Title",
+    "{http://purl.org/dc/elements/1.1/}description": "Description",
+    "{http://ns.adobe.com/xap/1.0/}CreatorTool": "CreatorTool",
+    "{http://ns.adobe.com/xap/1.0/}CreateDate": "CreateDate",
+    "{http://ns.adobe.com/xap/1.0/}ModifyDate": "ModifyDate",
+    "{http://ns.adobe.com/photoshop/1.0/}Credit": "Credit",
+}
+
+# IPTC-IIM application record (2:xx) dataset -> name (exiftool's names)
+IPTC_DATASETS = {
+    25: "Keywords", 80: "By-line", 85: "By-lineTitle", 110: "Credit",
+    115: "Source", 116: "CopyrightNotice", 120: "Caption-Abstract",
+}
+
+
+def parse_jpeg(data: bytes) -> Dict[str, Any]:
+    """
+    EXIF (APP1), XMP (APP1) and IPTC (APP13) from the segments of a JPEG
+    before the image data. EXIF values win over XMP/IPTC ones of the same name.
+    """
+    if not data.startswith(b"\xff\xd8"):
+        return {}
+    exif: Dict[str, Any] = {}
+    extra: Dict[str, Any] = {}
+    pos = 2
+    while True:
+        if pos + 4 > len(data):
+            raise NeedMoreData(pos + 4)
+        if data[pos] != 0xFF:
+            break
+        marker = data[pos + 1]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker in (0xD9, 0xDA):  # EOI / start of scan: no metadata after this
+            break
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            pos += 2
+            continue
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        end = pos + 2 + length
+        if marker in (0xE1, 0xED):
+            if end > len(data):
+                raise NeedMoreData(end)
+            body = data[pos + 4:end]
+            if marker == 0xE1 and body.startswith(b"Exif\x00\x00") and not exif:
+                exif = parse_tiff(body[6:])
+            elif marker == 0xE1 and body.startswith(_XMP_SIGNATURE):
+                for key, value in parse_xmp(body[len(_XMP_SIGNATURE):]).items():
+                    extra.setdefault(key, value)
+            elif marker == 0xED and body.startswith(_PHOTOSHOP_SIGNATURE):
+                for key, value in parse_iptc(_photoshop_iptc(body[len(_PHOTOSHOP_SIGNATURE):])).items():
+                    extra.setdefault(key, value)
+        pos = end
+    return {**extra, **exif}
+
+
+def parse_xmp(packet: bytes) -> Dict[str, Any]:
+    """XMP_PROPERTIES of an XMP packet, from attributes or rdf:Seq/Bag/Alt items (joined with ', ')."""
+    try:
+        root = ET.fromstring(packet)
+    except ET.ParseError:
+        return {}
+    meta: Dict[str, Any] = {}
+    for element in root.iter():
+        if element.tag == f"{_RDF}Description":
+            for attribute, value in element.attrib.items():
+                if attribute in XMP_PROPERTIES and value.strip():
+                    meta.setdefault(XMP_PROPERTIES[attribute], value.strip())
+        elif element.tag in XMP_PROPERTIES:
+            items = [(li.text or "").strip() for li in element.iter(f"{_RDF}li")]
+            text = ", ".join(item for item in items if item) or (element.text or "").strip()
+            if text:
+                meta.setdefault(XMP_PROPERTIES[element.tag], text)
+    return meta
+
+
+def _photoshop_iptc(resources: bytes) -> bytes:
+    """IPTC-NAA block (resource 0x0404) of Photoshop image resources."""
+    pos = 0
+    while pos + 8 <= len(resources) and resources[pos:pos + 4] == b"8BIM":
+        resource_id, name_length = struct.unpack(">HB", resources[pos + 4:pos + 7])
+        pos += 6 + name_length + 1 + (name_length + 1) % 2  # Pascal name, padded to even
+        if pos + 4 > len(resources):
+            break
+        size = struct.unpack(">I", resources[pos:pos + 4])[0]
+        pos += 4
+        if resource_id == 0x0404:
+            return resources[pos:pos + size]
+        pos += size + size % 2
+    return b""
+
+
+def parse_iptc(data: bytes) -> Dict[str, Any]:
+    """IPTC_DATASETS of an IPTC-IIM block (Keywords as a list)."""
+    meta: Dict[str, Any] = {}
+    pos = 0
+    while pos + 5 <= len(data) and data[pos] == 0x1C:
+        record, dataset, length = struct.unpack(">BBH", data[pos + 1:pos + 5])
+        if length & 0x8000:  # Extended dataset: not a text field
+            break
+        raw = data[pos + 5:pos + 5 + length]
+        pos += 5 + length
+        key = IPTC_DATASETS.get(dataset) if record == 2 else None
+        if not key:
+            continue
+        try:
+            text = raw.decode("utf-8").strip()
+        except UnicodeDecodeError:
+            text = raw.decode("latin-1").strip()
+        if key == "Keywords":
+            meta.setdefault(key, []).append(text)
+        elif text:
+            meta.setdefault(key, text)
+    return meta
+
+
+def parse_png(data: bytes) -> Dict[str, Any]:
+    """tEXt/zTXt/iTXt text and eXIf chunks that precede the image data."""
+    if not data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return {}
+    meta: Dict[str, Any] = {}
+    pos = 8
+    while True:
+        if pos + 8 > len(data):
+            raise NeedMoreData(pos + 8)
+        length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+        if chunk_type in (b"IDAT", b"IEND"):
+            return meta
+        body_end = pos + 8 + length
+        if body_end > len(data):
+            raise NeedMoreData(body_end + 4)
+        body = data[pos + 8:body_end]
+        try:
+            if chunk_type == b"tEXt":
+                key, _, value = body.partition(b"\x00")
+                meta[key.decode("latin-1")] = value.decode("latin-1")
+            elif chunk_type == b"zTXt":
+                key, _, value = body.partition(b"\x00")
+                meta[key.decode("latin-1")] = zlib.decompress(value[1:]).decode("latin-1")
+            elif chunk_type == b"iTXt":
+                key, _, rest = body.partition(b"\x00")
+                compressed, rest = rest[0], rest[2:]
+                _, _, rest = rest.partition(b"\x00")  # Language tag
+                _, _, text = rest.partition(b"\x00")  # Translated keyword
+                if compressed:
+                    text = zlib.decompress(text)
+                meta[key.decode("latin-1")] = text.decode("utf-8", errors="replace")
+            elif chunk_type == b"eXIf":
+                meta.update(parse_tiff(body))
+        except (zlib.error, IndexError, NeedMoreData):
+            pass
+        pos = body_end + 4  # CRC
+
+
+# ─── PDF ───
+
+_PDF_INFO_REF = re.compile(rb"/Info\s+(\d+)\s+(\d+)\s+R")
+_PDF_ROOT_REF = re.compile(rb"/Root\s+(\d+)\s+(\d+)\s+R")
+_PDF_PAGES_REF = re.compile(rb"/Pages\s+(\d+)\s+(\d+)\s+R")
+_PDF_COUNT = re.compile(rb"/Count\s+(\d+)(?!\s+\d+\s+R)")
+_PDF_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_PDF_PREV = re.compile(rb"/Prev\s+(\d+)")
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+PdfRef = Tuple[int, int]
+
+
+def parse_pdf_trailer(tail: bytes) -> Tuple[Optional[int], Optional[PdfRef], Optional[PdfRef], bool]:
+    """(startxref offset, Info (num, gen), Root (num, gen), encrypted) from the end of a PDF."""
+    startxref = _PDF_STARTXREF.findall(tail)
+    info = _PDF_INFO_REF.findall(tail)
+    root = _PDF_ROOT_REF.findall(tail)
+    return (
+        int(startxref[-1]) if startxref else None,
+        (int(info[-1][0]), int(info[-1][1])) if info else None,
+        (int(root[-1][0]), int(root[-1][1])) if root else None,
+        b"/Encrypt" in tail,
+    )
+
+
+def pdf_pages_ref(catalog: bytes) -> Optional[PdfRef]:
+    """Page tree root (num, gen) named by a document catalog object."""
+    open_at, close_at = pdf_dict_span(catalog, 0)
+    match = _PDF_PAGES_REF.search(catalog, open_at, close_at)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def parse_pdf_page_count(pages: bytes) -> Optional[int]:
+    """/Count of a page tree root object (None if it is not a direct number)."""
+    open_at, close_at = pdf_dict_span(pages, 0)
+    match = _PDF_COUNT.search(pages, open_at, close_at)
+    return int(match.group(1)) if match else None
+
+
+def find_pdf_object(data: bytes, num: int, gen: int) -> Optional[int]:
+    """Offset of the last `num gen obj` header in `data`."""
+    found = None
+    for match in re.finditer(rb"(?<!\d)%d\s+%d\s+obj\b" % (num, gen), data):
+        found = match.start()
+    return found
+
+
+def pdf_dict_span(data: bytes, start: int) -> Tuple[int, int]:
+    """(start, end) of the << >> dictionary beginning at or after `start`."""
+    open_at = data.find(b"<<", start)
+    if open_at < 0:
+        raise NeedMoreData(len(data) + 4096)
+    depth, pos = 0, open_at
+    while pos < len(data) - 1:
+        pair = data[pos:pos + 2]
+        if pair == b"<<":
+            depth += 1
+            pos += 2
+        elif pair == b">>":
+            depth -= 1
+            pos += 2
+            if not depth:
+                return open_at, pos
+        elif data[pos:pos + 1] == b"(":
+            pos = _pdf_literal_end(data, pos)
+        elif data[pos:pos + 1] == b"<":  # Hex string
+            end = data.find(b">", pos)
+            if end < 0:
+                break
+            pos = end + 1
+        else:
+            pos += 1
+    raise NeedMoreData(len(data) + 4096)
+
+
+def _pdf_literal_end(data: bytes, pos: int) -> int:
+    depth = 0
+    while pos < len(data):
+        ch = data[pos:pos + 1]
+        if ch == b"\\":
+            pos += 2
+            continue
+        if ch == b"(":
+            depth += 1
+        elif ch == b")":
+            depth -= 1
+            if not depth:
+                return pos + 1
+        pos += 1
+    raise NeedMoreData(len(data) + 4096)
+
+
+def _pdf_text(raw: bytes) -> str:
+    """Decode a PDF text string (UTF-16 with BOM, UTF-8 with BOM, else PDFDocEncoding)."""
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", errors="replace")
+    if raw.startswith(b"\xef\xbb\xbf"):
+        return raw[3:].decode("utf-8", errors="replace")
+    return raw.decode("latin-1")
+
+
+def _pdf_literal(body: bytes) -> bytes:
+    out, pos = bytearray(), 0
+    while pos < len(body):
+        ch = body[pos:pos + 1]
+        if ch != b"\\":
+            out += ch
+            pos += 1
+            continue
+        nxt = body[pos + 1:pos + 2]
+        if nxt in _PDF_ESCAPES:
+            out += _PDF_ESCAPES[nxt]
+            pos += 2
+        elif nxt and nxt in b"01234567":
+            octal = re.match(rb"[0-7]{1,3}", body[pos + 1:pos + 4]).group()
+            out.append(int(octal, 8) & 0xFF)
+            pos += 1 + len(octal)
+        elif nxt in (b"\r", b"\n"):  # Line continuation
+            pos += 2
+            if nxt == b"\r" and body[pos:pos + 1] == b"\n":
+                pos += 1
+        else:
+            out += nxt
+            pos += 2
+    return bytes(out)
+
+
+def parse_pdf_info(data: bytes, start: int = 0) -> Dict[str, Any]:
+    """Text entries of the Info dictionary in the object starting at `start`."""
+    open_at, close_at = pdf_dict_span(data, start)
+    body = data[open_at + 2:close_at - 2]
+    meta: Dict[str, Any] = {}
+    pos = 0
+    for match in re.finditer(rb"/([A-Za-z0-9_.#-]+)\s*", body):
+        if match.start() < pos:
+            continue  # Inside the previous value
+        key = match.group(1).decode("latin-1")
+        value_at = match.end()
+        head = body[value_at:value_at + 1]
+        if head == b"(":
+            end = _pdf_literal_end(body, value_at)
+            meta[key] = _pdf_text(_pdf_literal(body[value_at + 1:end - 1]))
+            pos = end
+        elif body[value_at:value_at + 2] == b"<<":  # Nested dictionary: not a text entry
+            pos = pdf_dict_span(body, value_at)[1]
+        elif head == b"<":
+            end = body.find(b">", value_at)
+            hex_digits = re.sub(rb"\s", b"", body[value_at + 1:end])
+            if len(hex_digits) % 2:
+                hex_digits += b"0"
+            try:
+                meta[key] = _pdf_text(bytes.fromhex(hex_digits.decode("ascii")))
+            except ValueError:
+                pass
+            pos = end + 1
+    return meta
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    """Undo PNG row predictors (None/Sub/Up) used by xref streams."""
+    out, previous = bytearray(), bytearray(columns)
+    for row_start in range(0, len(data), columns + 1):
+        predictor = data[row_start]
+        row = bytearray(data[row_start + 1:row_start + 1 + columns])
+        if predictor == 1:
+            for i in range(1, len(row)):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif predictor == 2:
+            for i in range(len(row)):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif predictor != 0:
+            raise ValueError(f"Unsupported PNG predictor {predictor}")
+        out += row
+        previous = row
+    return bytes(out)
+
+
+def pdf_xref_lookup(data: bytes, num: int) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Look up object `num` in the xref section at the start of `data`.
+
+    Handles classic xref tables and (Flate, PNG-predicted) xref streams.
+    Returns (offset, None) when found, (None, prev) to continue at the
+    previous section, and (None, None) when the object is not a plain
+    top-level object (free, or inside an object stream).
+    """
+    stripped = data.lstrip()
+    skipped = len(data) - len(stripped)
+
+    if stripped.startswith(b"xref"):
+        pos = 4
+        while True:
+            header = re.compile(rb"\s*(\d+)\s+(\d+)[ \t]*\r?\n?").match(stripped, pos)
+            if header is None:
+                break
+            first, count = int(header.group(1)), int(header.group(2))
+            entries_at = header.end()
+            if first <= num < first + count:
+                entry_at = entries_at + 20 * (num - first)
+                if entry_at + 18 > len(stripped):
+                    raise NeedMoreData(skipped + entry_at + 20)
+                entry = re.match(rb"(\d{10}) (\d{5}) ([nf])", stripped[entry_at:entry_at + 18])
+                if entry is None or entry.group(3) != b"n":
+                    return None, None
+                return int(entry.group(1)), None
+            pos = entries_at + 20 * count
+            if pos > len(stripped):
+                raise NeedMoreData(skipped + pos + 64)
+        trailer_at = stripped.find(b"trailer", pos)
+        if trailer_at < 0:
+            raise NeedMoreData(len(data) + 4096)
+        open_at, close_at = pdf_dict_span(stripped, trailer_at)
+        prev = _PDF_PREV.search(stripped[open_at:close_at])
+        return None, int(prev.group(1)) if prev else None
+
+    # Cross-reference stream: "N G obj << /Type /XRef ... >> stream ... endstream"
+    if not re.match(rb"\d+\s+\d+\s+obj", stripped):
+        return None, None
+    open_at, close_at = pdf_dict_span(stripped, 0)
+    info = stripped[open_at:close_at]
+    length = re.search(rb"/Length\s+(\d+)(?!\s+\d+\s+R)", info)
+    widths = re.search(rb"/W\s*\[\s*(\d+)\s+(\d+)\s+(\d+)\s*\]", info)
+    if length is None or widths is None or (b"/Filter" in info and b"/FlateDecode" not in info):
+        return None, None
+    stream_at = re.compile(rb"\s*stream\r?\n").match(stripped, close_at)
+    if stream_at is None:
+        raise NeedMoreData(skipped + close_at + 64)
+    end = stream_at.end() + int(length.group(1))
+    if end > len(stripped):
+        raise NeedMoreData(skipped + end)
+    raw = stripped[stream_at.end():end]
+    if b"/FlateDecode" in info:
+        raw = zlib.decompress(raw)
+    predictor = re.search(rb"/Predictor\s+(\d+)", info)
+    if predictor and int(predictor.group(1)) >= 10:
+        columns = re.search(rb"/Columns\s+(\d+)", info)
+        raw = _png_unpredict(raw, int(columns.group(1)) if columns else 1)
+
+    w = [int(x) for x in widths.groups()]
+    row = sum(w)
+    size = re.search(rb"/Size\s+(\d+)", info)
+    index = re.search(rb"/Index\s*\[([\d\s]+)\]", info)
+    bounds = [int(x) for x in index.group(1).split()] if index else [0, int(size.group(1)) if size else 0]
+
+    row_number = 0
+    for first, count in zip(bounds[0::2], bounds[1::2]):
+        if first <= num < first + count:
+            at = (row_number + num - first) * row
+            fields = [int.from_bytes(raw[at + sum(w[:i]):at + sum(w[:i + 1])], "big") for i in range(3)]
+            entry_type = fields[0] if w[0] else 1
+            return (fields[1], None) if entry_type == 1 else (None, None)
+        row_number += count
+    prev = _PDF_PREV.search(info)
+    return None, int(prev.group(1)) if prev else None
+
+
+# ─── ZIP containers (OOXML, ODF) ───
+
+_ZIP_EOCD = b"PK\x05\x06"
+_ZIP_CENTRAL = b"PK\x01\x02"
+_ZIP_LOCAL = b"PK\x03\x04"
+
+
+def zip_central_directory(tail: bytes) -> Tuple[int, int]:
+    """(offset, size) of the central directory from the end-of-directory record."""
+    at = tail.rfind(_ZIP_EOCD)
+    if at < 0 or at + 22 > len(tail):
+        raise ValueError("No ZIP end of central directory record")
+    size, offset = struct.unpack("<II", tail[at + 12:at + 20])
+    if offset == 0xFFFFFFFF or size == 0xFFFFFFFF:
+        raise ValueError("ZIP64 archives are not read partially")
+    return offset, size
+
+
+def zip_entries(directory: bytes) -> Dict[str, Tuple[int, int, int]]:
+    """Member name -> (compression method, compressed size, local header offset)."""
+    entries = {}
+    pos = 0
+    while directory[pos:pos + 4] == _ZIP_CENTRAL and pos + 46 <= len(directory):
+        (method,) = struct.unpack("<H", directory[pos + 10:pos + 12])
+        compressed, = struct.unpack("<I", directory[pos + 20:pos + 24])
+        name_len, extra_len, comment_len = struct.unpack("<HHH", directory[pos + 28:pos + 34])
+        local_offset, = struct.unpack("<I", directory[pos + 42:pos + 46])
+        name = directory[pos + 46:pos + 46 + name_len].decode("utf-8", errors="replace")
+        entries[name] = (method, compressed, local_offset)
+        pos += 46 + name_len + extra_len + comment_len
+    return entries
+
+
+def zip_member(data: bytes, start: int, method: int, compressed: int) -> bytes:
+    """Contents of the member whose local header starts at `start`."""
+    if start + 30 > len(data):
+        raise NeedMoreData(start + 30)
+    if data[start:start + 4] != _ZIP_LOCAL:
+        raise ValueError("Bad ZIP local header")
+    name_len, extra_len = struct.unpack("<HH", data[start + 26:start + 30])
+    body_at = start + 30 + name_len + extra_len
+    if body_at + compressed > len(data):
+        raise NeedMoreData(body_at + compressed)
+    body = data[body_at:body_at + compressed]
+    if method == 8:
+        return zlib.decompressobj(-15).decompress(body)
+    if method == 0:
+        return body
+    raise ValueError(f"Unsupported ZIP compression method {method}")
+
+
+_OOXML_CORE = {
+    "{http://purl.org/dc/elements/1.1/}creator": ("Author", "Creator"),
+    "{http://purl.org/dc/elements/1.1/}title": ("Title",),
+    "{http://purl.org/dc/elements/1.1/}subject": ("Subject",),
+    "{http://purl.org/dc/elements/1.1/}description": ("Comments",),
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}keywords": ("Keywords",),
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}lastModifiedBy": ("LastModifiedBy",),
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}category": ("Category",),
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}revision": ("Revision",),
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}version": ("Version",),
+    "{http://purl.org/dc/terms/}created": ("Created",),
+    "{http://purl.org/dc/terms/}modified": ("Modified",),
+}
+
+_OOXML_APP = {
+    "Company": "Company", "Manager": "Manager", "Application": "Application",
+    "AppVersion": "AppVersion", "Template": "Template",
+    "Pages": "PageCount", "Slides": "SlideCount",
+}
+
+_ODF_META = {
+    "{urn:oasis:names:tc:opendocument:xmlns:meta:1.0}initial-creator": ("Author", "Creator"),
+    "{http://purl.org/dc/elements/1.1/}creator": ("LastModifiedBy",),
+    "{http://purl.org/dc/elements/1.1/}title": ("Title",),
+    "{http://purl.org/dc/elements/1.1/}subject": ("Subject",),
+    "{http://purl.org/dc/elements/1.1/}description": ("Comments",),
+    "{urn:oasis:names:tc:opendocument:xmlns:meta:1.0}keyword": ("Keywords",),
+    "{urn:oasis:names:tc:opendocument:xmlns:meta:1.0}creation-date": ("Created",),
+    "{http://purl.org/dc/elements/1.1/}date": ("Modified",),
+    "{urn:oasis:names:tc:opendocument:xmlns:meta:1.0}generator": ("Application",),
+}
+
+_DATE_KEYS = ("Created", "Modified")
+
+
+def _w3cdtf(value: str) -> str:
+    """Render W3CDTF dates like python-docx/openpyxl do (naive UTC datetime)."""
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return str(parsed)
+
+
+def _xml_properties(xml: bytes, names: Dict[str, Tuple[str, ...]]) -> Dict[str, Any]:
+    meta: Dict[str, Any] = {}
+    for element in ET.fromstring(xml).iter():
+        keys = names.get(element.tag)
+        text = (element.text or "").strip()
+        if keys and text:
+            for key in keys:
+                meta[key] = _w3cdtf(text) if key in _DATE_KEYS else text
+    return meta
+
+
+def parse_ooxml_props(core: Optional[bytes], app: Optional[bytes] = None) -> Dict[str, Any]:
+    """Metadata from docProps/core.xml and docProps/app.xml."""
+    meta = _xml_properties(core, _OOXML_CORE) if core else {}
+    if app:
+        for element in ET.fromstring(app):
+            key = _OOXML_APP.get(element.tag.rsplit("}", 1)[-1])
+            text = (element.text or "").strip()
+            if key and text:
+                meta[key] = int(text) if key.endswith("Count") and text.isdigit() else text
+    return meta
+
+
+def parse_odf_meta(xml: bytes) -> Dict[str, Any]:
+    """Metadata from an OpenDocument meta.xml."""
+    return _xml_properties(xml, _ODF_META)
+
+
 def _populate_common_fields(result: MetadataResult, meta: Dict):
     """Populate common investigation-relevant fields from metadata."""
 
@@ -0,0 +1,394 @@
+"""
+EXIF Partial Fetch - Range requests for only the bytes that hold metadata.
+
+- JPEG / TIFF-based raw / PNG: the leading bytes (EXIF/XMP APP1, IPTC APP13,
+  IFDs, text chunks)
+- PDF: the trailer and xref, then the Info object and, for the page
+  count, the catalog and page tree root
+- OOXML / ODF: the ZIP central directory, then only docProps/core.xml,
+  docProps/app.xml or meta.xml
+
+Fetching yields a Payload - just the bytes the metadata is parsed from -
+and extract_payload() parses it in-process (extractors.parse_*), so the
+two can run in different places. PartialUnavailable means the file has
+to be downloaded whole (server ignores Range, ZIP64, encrypted PDF, Info
+inside an object stream, ...); when the server sent the whole body
+anyway it is attached so it is not fetched twice. extract_payload() raises
+it too, for partial payloads whose metadata does not parse.
+
+Usage:
+    try:
+        payload = await fetch_partial(session, url, max_file_size)
+        result = extract_payload(payload) if payload else None
+    except PartialUnavailable as e:
+        ...  # e.body holds the file if the server ignored the Range header
+"""
+
+import hashlib
+import logging
+import struct
+import zlib
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .extractors import (
+    MetadataResult,
+    NeedMoreData,
+    extract_exif,
+    extract_metadata,
+    find_pdf_object,
+    metadata_result,
+    parse_jpeg,
+    parse_odf_meta,
+    parse_ooxml_props,
+    parse_pdf_info,
+    parse_pdf_page_count,
+    parse_pdf_trailer,
+    pdf_dict_span,
+    pdf_pages_ref,
+    parse_png,
+    parse_tiff,
+    pdf_xref_lookup,
+    zip_central_directory,
+    zip_entries,
+    zip_member,
+)
+
+logger = logging.getLogger(__name__)
+
+HEAD_BYTES = 64 * 1024  # EXIF APP1 segments are capped at 64KB
+TAIL_BYTES = 64 * 1024  # PDF trailer / ZIP end of central directory
+OBJECT_BYTES = 4 * 1024  # First read of a PDF xref section or Info object
+ZIP_HEADER_SLACK = 256  # Local header extra fields not listed in the central directory
+MAX_PARTIAL_BYTES = 2 * 1024 * 1024  # Past this, download the file instead
+MAX_XREF_SECTIONS = 8  # /Prev hops followed through incremental updates
+MIN_FILE_SIZE = 100
+
+PARTIAL_FORMATS = {
+    "jpg": "jpeg", "jpeg": "jpeg", "jpe": "jpeg",
+    "tif": "tiff", "tiff": "tiff", "dng": "tiff", "nef": "tiff", "cr2": "tiff", "arw": "tiff",
+    "png": "png",
+    "pdf": "pdf",
+    "docx": "ooxml", "docm": "ooxml", "dotx": "ooxml",
+    "xlsx": "ooxml", "xlsm": "ooxml",
+    "pptx": "ooxml", "pptm": "ooxml", "ppsx": "ooxml",
+    "odt": "odf", "ods": "odf", "odp": "odf",
+}
+
+IMAGE_PARSERS = {"jpeg": parse_jpeg, "tiff": parse_tiff, "png": parse_png}
+
+ZIP_MEMBERS = {
+    "ooxml": ("docProps/core.xml", "docProps/app.xml"),
+    "odf": ("meta.xml",),
+}
+
+
+@dataclass
+class Payload:
+    """
+    What a file's metadata is extracted from.
+
+    `kind` is a partial format ('jpeg', 'pdf', 'ooxml', ...) with the
+    metadata-bearing parts, or 'file' with the whole download.
+    """
+    url: str
+    kind: str
+    parts: Tuple[Optional[bytes], ...]
+    content_type: str = ""
+
+    def digest(self) -> str:
+        """
+        Content hash - identical for mirrored copies of the same file.
+
+        Covers everything extract_payload() reads except the URL itself
+        (the extension picks the extractor, e.g. docx vs xlsx).
+        """
+        extension = urlparse(self.url).path.lower().rsplit(".", 1)[-1]
+        h = hashlib.sha256(f"{self.kind}\0{extension}\0{self.content_type}".encode())
+        for part in self.parts:
+            h.update(b"-" if part is None else len(part).to_bytes(8, "big") + part)
+        return h.hexdigest()
+
+    @property
+    def size(self) -> int:
+        return sum(len(part) for part in self.parts if part)
+
+
+class PartialUnavailable(Exception):
+    """The file has to be downloaded whole; `body` is set if it already was."""
+
+    def __init__(self, reason: str, body: Optional[bytes] = None, content_type: str = ""):
+        super().__init__(reason)
+        self.body = body
+        self.content_type = content_type
+
+
+def partial_format(url: str) -> Optional[str]:
+    """Partial reader for a URL ('jpeg', 'tiff', 'png', 'pdf', 'ooxml', 'odf') or None."""
+    path = urlparse(url).path.lower()
+    return PARTIAL_FORMATS.get(path.rsplit(".", 1)[-1]) if "." in path else None
+
+
+async def read_body(resp: aiohttp.ClientResponse, limit: int) -> bytes:
+    """Response body up to `limit` bytes (StreamReader.read() stops at the buffered chunk)."""
+    body = bytearray()
+    while len(body) < limit:
+        chunk = await resp.content.read(limit - len(body))
+        if not chunk:
+            break
+        body += chunk
+    return bytes(body)
+
+
+class RangeReader:
+    """Byte ranges of one URL; learns the file size from Content-Range."""
+
+    def __init__(self, session: aiohttp.ClientSession, url: str, max_file_size: int):
+        self.session = session
+        self.url = url
+        self.max_file_size = max_file_size
+        self.size: Optional[int] = None
+        self.fetched = 0
+        self.requests = 0
+
+    async def read(self, start: int, end: int) -> bytes:
+        """Bytes [start, end), clamped to the file size."""
+        if self.size is not None:
+            end = min(end, self.size)
+        if end <= start:
+            return b""
+        return await self._get(f"bytes={start}-{end - 1}")
+
+    async def tail(self, length: int) -> Tuple[int, bytes]:
+        """(offset, data) of the last `length` bytes."""
+        data = await self._get(f"bytes=-{length}")
+        if self.size is None:
+            raise PartialUnavailable("File size unknown")
+        return self.size - len(data), data
+
+    async def _get(self, byte_range: str) -> bytes:
+        self.requests += 1
+        async with self.session.get(self.url, headers={"Range": byte_range}, allow_redirects=True) as resp:
+            if resp.status == 206:
+                total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+                if total.isdigit():
+                    self.size = int(total)
+                data = await resp.read()
+                self.fetched += len(data)
+                return data
+
+            if resp.status == 200:
+                # Range ignored: the whole file is on its way anyway
+                content_length = resp.headers.get("Content-Length")
+                if content_length and int(content_length) > self.max_file_size:
+                    raise PartialUnavailable("Range not supported")
+                body = await read_body(resp, self.max_file_size)
+                self.fetched += len(body)
+                raise PartialUnavailable("Range not supported", body, resp.headers.get("Content-Type", ""))
+
+            resp.raise_for_status()
+            raise PartialUnavailable(f"Unexpected HTTP {resp.status}")
+
+
+async def _parse_growing(reader: RangeReader, parse: Callable[[bytes], Any],
+                         data: bytes, start: int) -> Tuple[Any, bytes]:
+    """parse(data) for data read from `start`, reading further while it needs more."""
+    while True:
+        try:
+            return parse(data), data
+        except NeedMoreData as e:
+            have = start + len(data)
+            if reader.size is not None and have >= reader.size:
+                raise PartialUnavailable("Structure runs past the end of the file")
+            if e.needed > MAX_PARTIAL_BYTES:
+                raise PartialUnavailable(f"Metadata spans more than {MAX_PARTIAL_BYTES} bytes")
+            more = await reader.read(have, start + max(e.needed, 2 * len(data)))
+            if not more:
+                raise PartialUnavailable("Short read")
+            data += more
+
+
+async def _image_payload(reader: RangeReader, url: str, fmt: str) -> Optional[Payload]:
+    data = await reader.read(0, HEAD_BYTES)
+    if (reader.size or len(data)) < MIN_FILE_SIZE:
+        return None
+    _, data = await _parse_growing(reader, IMAGE_PARSERS[fmt], data, 0)
+    return Payload(url, fmt, (data,))
+
+
+async def _pdf_object_offset(reader: RangeReader, tail: bytes, tail_at: int,
+                             startxref: Optional[int], num: int) -> int:
+    """Follow xref sections from `startxref` to the offset of object `num`."""
+    section = startxref
+    for _ in range(MAX_XREF_SECTIONS):
+        if section is None:
+            break
+        if section >= tail_at:
+            data = tail[section - tail_at:]
+        else:
+            data = await reader.read(section, section + OBJECT_BYTES)
+        (offset, prev), _ = await _parse_growing(reader, lambda d: pdf_xref_lookup(d, num), data, section)
+        if offset is not None:
+            return offset
+        section = prev
+    raise PartialUnavailable(f"Object {num} not reachable through a plain xref entry")
+
+
+async def _pdf_object(reader: RangeReader, tail: bytes, tail_at: int,
+                      startxref: Optional[int], ref: Tuple[int, int]) -> bytes:
+    """Object `ref` up to the end of its dictionary, from the tail or via the xref."""
+    num, gen = ref
+    at = find_pdf_object(tail, num, gen)
+    if at is not None:
+        data, start = tail, tail_at
+    else:
+        offset = await _pdf_object_offset(reader, tail, tail_at, startxref, num)
+        data, start, at = await reader.read(offset, offset + OBJECT_BYTES), offset, 0
+        if find_pdf_object(data[:64], num, gen) is None:
+            raise PartialUnavailable(f"xref offset does not point at object {num}")
+    (_, end), data = await _parse_growing(reader, lambda d: pdf_dict_span(d, at), data, start)
+    return data[at:end]
+
+
+async def _pdf_payload(reader: RangeReader, url: str) -> Optional[Payload]:
+    tail_at, tail = await reader.tail(TAIL_BYTES)
+    if reader.size < MIN_FILE_SIZE:
+        return None
+
+    startxref, info_ref, root_ref, encrypted = parse_pdf_trailer(tail)
+    if encrypted:
+        raise PartialUnavailable("Encrypted PDF")
+    if info_ref is None:
+        raise PartialUnavailable("No Info dictionary in the trailer")
+    if root_ref is None:
+        raise PartialUnavailable("No document catalog in the trailer")
+
+    info = await _pdf_object(reader, tail, tail_at, startxref, info_ref)
+    # PageCount: catalog -> page tree root -> /Count
+    pages_ref = pdf_pages_ref(await _pdf_object(reader, tail, tail_at, startxref, root_ref))
+    if pages_ref is None:
+        raise PartialUnavailable("No page tree in the catalog")
+    pages = await _pdf_object(reader, tail, tail_at, startxref, pages_ref)
+    if parse_pdf_page_count(pages) is None:
+        raise PartialUnavailable("Page count is not a direct number")
+    return Payload(url, "pdf", (info, pages))
+
+
+async def _zip_payload(reader: RangeReader, url: str, fmt: str) -> Optional[Payload]:
+    tail_at, tail = await reader.tail(TAIL_BYTES)
+    if reader.size < MIN_FILE_SIZE:
+        return None
+
+    directory_at, directory_size = zip_central_directory(tail)
+    if directory_size > MAX_PARTIAL_BYTES:
+        raise PartialUnavailable("Central directory too large")
+    if directory_at >= tail_at:
+        directory = tail[directory_at - tail_at:directory_at - tail_at + directory_size]
+    else:
+        directory = await reader.read(directory_at, directory_at + directory_size)
+
+    entries = zip_entries(directory)
+    wanted = [(name, entries[name]) for name in ZIP_MEMBERS[fmt] if name in entries]
+    if not wanted:
+        raise PartialUnavailable("No document properties part")
+
+    # One range covering the wanted members (they sit next to each other in practice)
+    first = min(offset for _, (_, _, offset) in wanted)
+    last = max(offset + 30 + len(name.encode()) + size + ZIP_HEADER_SLACK
+               for name, (_, size, offset) in wanted)
+    if last - first > MAX_PARTIAL_BYTES:
+        raise PartialUnavailable("Document properties spread across the archive")
+    if first >= tail_at:
+        data = tail[first - tail_at:]
+    else:
+        data = await reader.read(first, last)
+
+    members = {}
+    for name, (method, size, offset) in wanted:
+        members[name], data = await _parse_growing(
+            reader, lambda d, o=offset - first, m=method, s=size: zip_member(d, o, m, s), data, first
+        )
+
+    return Payload(url, fmt, tuple(members.get(name) for name in ZIP_MEMBERS[fmt]))
+
+
+async def fetch_partial(
+    session: aiohttp.ClientSession,
+    url: str,
+    max_file_size: int,
+) -> Optional[Payload]:
+    """
+    Fetch the parts of a file that hold its metadata.
+
+    Returns None for files too small to bother with (like a full download
+    would). Raises PartialUnavailable when the file has to be fetched whole.
+    """
+    fmt = partial_format(url)
+    if fmt is None:
+        raise PartialUnavailable("No partial reader for this format")
+
+    reader = RangeReader(session, url, max_file_size)
+    try:
+        if fmt in IMAGE_PARSERS:
+            payload = await _image_payload(reader, url, fmt)
+        elif fmt == "pdf":
+            payload = await _pdf_payload(reader, url)
+        else:
+            payload = await _zip_payload(reader, url, fmt)
+    except (ValueError, struct.error, zlib.error) as e:
+        raise PartialUnavailable(f"Unreadable {fmt} structure: {e}")
+
+    logger.debug(f"{url}: {reader.fetched} bytes in {reader.requests} requests (file size {reader.size})")
+    return payload
+
+
+def extract_payload(payload: Payload) -> MetadataResult:
+    """
+    Parse a payload in-process (CPU-bound; safe to run in a worker process).
+
+    Raises PartialUnavailable when a partial payload cannot be parsed
+    (malformed XML, bad PDF strings, ...): the whole file may still be
+    readable by the full extractors.
+    """
+    url, kind = payload.url, payload.kind
+
+    if kind == "file":
+        return extract_metadata(payload.parts[0], url, payload.content_type)
+
+    try:
+        if kind in IMAGE_PARSERS:
+            data = payload.parts[0]
+            meta = IMAGE_PARSERS[kind](data)
+            if not meta:
+                # No EXIF, XMP or IPTC in the header: exiftool/Pillow on what we have
+                return extract_exif(data, url)
+            return metadata_result(url, "image", meta)
+
+        if kind == "pdf":
+            meta = parse_pdf_info(payload.parts[0])
+            meta["PageCount"] = parse_pdf_page_count(payload.parts[1])
+            return metadata_result(url, "pdf", meta)
+
+        if kind == "odf":
+            meta = parse_odf_meta(payload.parts[0])
+        else:
+            meta = parse_ooxml_props(*payload.parts)
+    except (ValueError, struct.error, zlib.error, ET.ParseError, NeedMoreData) as e:
+        raise PartialUnavailable(f"Unreadable {kind} metadata: {e}")
+
+    extension = urlparse(url).path.lower().rsplit(".", 1)[-1]
+    return metadata_result(url, extension if extension in ("docx", "xlsx", "pptx") else "office", meta)
+
+
+async def fetch_partial_metadata(
+    session: aiohttp.ClientSession,
+    url: str,
+    max_file_size: int,
+) -> Optional[MetadataResult]:
+    """fetch_partial() and extract_payload() in one step."""
+    payload = await fetch_partial(session, url, max_file_size)
+    return extract_payload(payload) if payload else None
@@ -1,19 +1,34 @@
 """
 EXIF Scanner - Domain-wide metadata extraction.
 
-Discovers all files on a domain and extracts metadata.
+Discovers all files on a domain and extracts metadata. Formats with a
+partial reader (JPEG/TIFF/PNG, PDF, OOXML/ODF) are read with Range
+requests for just their metadata; everything else is downloaded.
+
+A scan is a three-stage pipeline joined by bounded queues:
+discovery -> fetch (per-host caps, retries) -> extraction in a process
+pool. Results are yielded as they are extracted, and files whose fetched
+bytes hash the same (mirrors) are extracted once.
 """
 
 import asyncio
 import aiohttp
+import atexit
+import dataclasses
 import json
 import logging
-from dataclasses import dataclass, field
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any, AsyncIterator, Dict, List, Optional, Set
 from urllib.parse import urljoin, urlparse
 
-from .extractors import MetadataResult, extract_metadata, get_file_type, FILE_TYPE_MAP
+from .extractors import MetadataResult, get_exiftool, get_file_type, FILE_TYPE_MAP
+from .partial import Payload, PartialUnavailable, extract_payload, fetch_partial, partial_format, read_body
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +52,136 @@ except Exception:
         "mp4", "mov", "mp3", "wav"
     }
 
+DEFAULT_PER_HOST = 4  # Concurrent fetches per host
+FETCH_RETRIES = 2  # Extra attempts after a timeout, connection error or 429/5xx
+RETRY_BACKOFF = 1.0  # Seconds before the first retry, doubled each time
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+SEARCH_DISCOVERY_BELOW = 50  # Query search engines only if crawling found fewer files
+
+
+def _init_extraction_worker():
+    """Locate exiftool once per worker process."""
+    get_exiftool()
+
+
+@dataclass
+class PipelineStats:
+    """Counters for one scan pipeline run."""
+    discovered: int = 0
+    fetched: int = 0
+    skipped: int = 0
+    extracted: int = 0
+    duplicates: int = 0
+    retries: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _default_workers() -> int:
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class ExtractionPool:
+    """
+    Metadata extraction off the event loop.
+
+    `workers` spawned processes, each with its own persistent exiftool;
+    workers=0 extracts in one thread of this process instead. At most
+    `queue_size` payloads are queued or in flight. One pool serves every
+    scan in the process (get_extraction_pool), so workers start once.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        self.workers = _default_workers() if workers is None else workers
+        self.queue_size = queue_size or max(1, self.workers) * 2
+        self.restarts = 0
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_extraction_worker,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="exif-extract")
+            return self._executor
+
+    async def extract(self, payload: Payload) -> MetadataResult:
+        """
+        extract_payload() in a worker; a failed result if extraction fails.
+
+        PartialUnavailable propagates: the partial payload could not be
+        parsed and the file has to be downloaded whole.
+        """
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            # Semaphores belong to one event loop; the pool may outlive it
+            self._slots, self._slots_loop = asyncio.Semaphore(self.queue_size), loop
+
+        async with self._slots:
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, extract_payload, payload)
+            except PartialUnavailable:
+                raise
+            except BrokenProcessPool as e:
+                # A worker died - start a fresh pool for later files
+                logger.warning(f"Extraction worker died on {payload.url}: {e}")
+                self._discard(executor)
+                error = f"Extraction worker died: {e}"
+            except Exception as e:
+                error = f"Extraction failed: {e}"
+
+        return MetadataResult(url=payload.url, file_type=payload.kind, success=False, error=error)
+
+    def _discard(self, executor: Executor):
+        """Drop a broken pool; only the first caller failing on it replaces it."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_pools: Dict[int, ExtractionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_extraction_pool(workers: Optional[int] = None) -> ExtractionPool:
+    """This process's extraction pool for `workers` (default: cores - 1, at most 4)."""
+    workers = _default_workers() if workers is None else workers
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ExtractionPool(workers)
+        return _pools[workers]
+
+
+def close_extraction_pools():
+    """Shut down the shared extraction pools (they restart on next use)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_extraction_pools)
+
 
 @dataclass
 class ScanResult:
@@ -79,6 +224,9 @@ class MetadataScanner:
         scanner = MetadataScanner()
         result = await scanner.scan_domain("example.com")
         entities = await scanner.extract_entities(result)
+
+        async for meta in scanner.scan_pipeline("example.com"):
+            ...
     """
 
     def __init__(
@@ -87,11 +235,17 @@ class MetadataScanner:
         max_file_size_mb: int = 50,
         timeout: int = 30,
         concurrent: int = 10,
+        per_host: int = DEFAULT_PER_HOST,
+        retries: int = FETCH_RETRIES,
+        extract_workers: Optional[int] = None,
     ):
         self.max_files = max_files
         self.max_file_size = max_file_size_mb * 1024 * 1024
         self.timeout = timeout
         self.concurrent = concurrent
+        self.per_host = per_host
+        self.retries = retries
+        self.extract_workers = extract_workers
 
     async def scan_domain(
         self,
@@ -109,61 +263,178 @@ class MetadataScanner:
             ScanResult with all extracted metadata
         """
         result = ScanResult(domain=domain)
+        stats = PipelineStats()
 
-        # Discover files on domain
         logger.info(f"Discovering files on {domain}")
-        file_urls = await self._discover_files(domain, file_types)
-        result.files_discovered = len(file_urls)
-
-        if not file_urls:
+        async for meta_result in self.scan_pipeline(domain, file_types, stats):
+            result.files_scanned += 1
+
+            if meta_result.success:
+                result.files_with_metadata += 1
+                result.results.append(meta_result)
+
+                # Aggregate for entity extraction
+                if meta_result.author:
+                    result.all_authors.append(meta_result.author)
+                if meta_result.company:
+                    result.all_companies.append(meta_result.company)
+                if meta_result.software:
+                    result.all_software.append(meta_result.software)
+                if meta_result.gps_lat and meta_result.gps_lon:
+                    result.all_gps.append({
+                        "lat": meta_result.gps_lat,
+                        "lon": meta_result.gps_lon,
+                        "url": meta_result.url,
+                    })
+
+        result.files_discovered = stats.discovered
+        result.errors.extend(stats.errors)
+
+        if not stats.discovered:
             logger.warning(f"No files found on {domain}")
             return result
 
-        logger.info(f"Found {len(file_urls)} files, extracting metadata...")
+        logger.info(
+            f"Scan complete: {result.files_scanned} scanned, "
+            f"{result.files_with_metadata} with metadata "
+            f"({stats.discovered} discovered, {stats.duplicates} duplicates, {stats.retries} retries)"
+        )
 
-        # Extract metadata from files
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        ) as session:
-            semaphore = asyncio.Semaphore(self.concurrent)
+        return result
 
-            tasks = [
-                self._extract_file_metadata(session, url, semaphore)
-                for url in file_urls[:self.max_files]
-            ]
+    async def scan_pipeline(
+        self,
+        domain: str,
+        file_types: Optional[List[str]] = None,
+        stats: Optional[PipelineStats] = None,
+    ) -> AsyncIterator[MetadataResult]:
+        """
+        Discover, fetch and extract concurrently, yielding every result as it is ready.
+
+        Discovered URLs feed `concurrent` fetchers (at most `per_host` per
+        host, transient failures retried) through a bounded queue; fetched
+        payloads feed the extraction pool through another. Payloads with
+        the same content hash are extracted once and the copies get that
+        result under their own URL. Files that are missing, too small or
+        too large produce no result. A partial payload that turns out to be
+        unparseable is downloaded whole and extracted again.
+
+        Extraction runs in the process-wide pool (get_extraction_pool), so
+        its workers are reused by later scans.
+        """
+        stats = stats if stats is not None else PipelineStats()
+        pool = get_extraction_pool(self.extract_workers)
+        urls: asyncio.Queue = asyncio.Queue(maxsize=self.concurrent * 2)
+        payloads: asyncio.Queue = asyncio.Queue(maxsize=pool.queue_size)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.concurrent * 2)
+        hosts: Dict[str, asyncio.Semaphore] = {}
+        extracted: Dict[str, asyncio.Future] = {}  # content hash -> first result
+
+        async def discover():
+            try:
+                async for url in self._discover_stream(domain, file_types):
+                    stats.discovered += 1
+                    await urls.put(url)
+            except Exception as e:
+                logger.error(f"File discovery failed for {domain}: {e}")
+            for _ in fetchers:
+                await urls.put(None)
 
-            for coro in asyncio.as_completed(tasks):
+        async def fetch():
+            while (url := await urls.get()) is not None:
                 try:
-                    meta_result = await coro
-                    if meta_result:
-                        result.files_scanned += 1
-
-                        if meta_result.success:
-                            result.files_with_metadata += 1
-                            result.results.append(meta_result)
-
-                            # Aggregate for entity extraction
-                            if meta_result.author:
-                                result.all_authors.append(meta_result.author)
-                            if meta_result.company:
-                                result.all_companies.append(meta_result.company)
-                            if meta_result.software:
-                                result.all_software.append(meta_result.software)
-                            if meta_result.gps_lat and meta_result.gps_lon:
-                                result.all_gps.append({
-                                    "lat": meta_result.gps_lat,
-                                    "lon": meta_result.gps_lon,
-                                    "url": meta_result.url,
-                                })
+                    payload = await self._fetch_with_retries(session, url, hosts, stats)
                 except Exception as e:
-                    result.errors.append(str(e))
-
-        logger.info(
-            f"Scan complete: {result.files_scanned} scanned, "
-            f"{result.files_with_metadata} with metadata"
-        )
+                    logger.debug(f"Error fetching {url}: {e}")
+                    stats.errors.append(f"{url}: {e}")
+                    continue
+                if payload is None:
+                    stats.skipped += 1
+                    continue
+                stats.fetched += 1
+                await payloads.put(payload)
+
+        async def extract_one(payload: Payload) -> MetadataResult:
+            try:
+                return await pool.extract(payload)
+            except PartialUnavailable as e:
+                logger.debug(f"Partial metadata unreadable for {payload.url} ({e}); downloading it")
+                reason = str(e)
+            try:
+                whole = await self._fetch_with_retries(session, payload.url, hosts, stats, partial=False)
+            except Exception as e:
+                whole, reason = None, f"{reason}; download failed: {e}"
+            if whole is None:
+                return MetadataResult(url=payload.url, file_type=payload.kind, success=False,
+                                      error=f"Metadata parse failed: {reason}")
+            return await pool.extract(whole)
+
+        async def extract():
+            while (payload := await payloads.get()) is not None:
+                key = payload.digest()
+                first = extracted.get(key)
+                if first is None:
+                    first = extracted[key] = asyncio.get_running_loop().create_future()
+                    first.set_result(await extract_one(payload))
+                    stats.extracted += 1
+                    await results.put(first.result())
+                else:
+                    # Mirror of a file already extracted (or being extracted)
+                    stats.duplicates += 1
+                    original = await first
+                    await results.put(dataclasses.replace(original, url=payload.url, metadata=dict(original.metadata)))
+
+        async def close_stages():
+            try:
+                await asyncio.gather(discoverer, *fetchers)
+                for _ in extractors:
+                    await payloads.put(None)
+                await asyncio.gather(*extractors)
+            except Exception as e:
+                logger.error(f"Metadata pipeline for {domain} failed: {e}")
+            await results.put(None)
 
-        return result
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as session:
+            fetchers = [asyncio.create_task(fetch()) for _ in range(self.concurrent)]
+            extractors = [asyncio.create_task(extract()) for _ in range(pool.queue_size)]
+            discoverer = asyncio.create_task(discover())
+            closer = asyncio.create_task(close_stages())
+            tasks = [discoverer, *fetchers, *extractors, closer]
+            try:
+                while (meta_result := await results.get()) is not None:
+                    yield meta_result
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_with_retries(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        hosts: Dict[str, asyncio.Semaphore],
+        stats: PipelineStats,
+        partial: bool = True,
+    ) -> Optional[Payload]:
+        """_fetch_payload() under the URL's host cap, retrying transient failures."""
+        host = urlparse(url).netloc.lower()
+        error: Exception = RuntimeError("No attempts made")
+        for attempt in range(self.retries + 1):
+            try:
+                async with hosts.setdefault(host, asyncio.Semaphore(self.per_host)):
+                    return await self._fetch_payload(session, url, partial)
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES:
+                    return None  # 404 and friends: nothing to extract
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            if attempt < self.retries:
+                stats.retries += 1
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        raise error
 
     async def _discover_files(
         self,
@@ -171,48 +442,64 @@ class MetadataScanner:
         file_types: Optional[List[str]] = None
     ) -> List[str]:
         """Discover files on domain using multiple methods."""
-        file_urls: Set[str] = set()
-        target_extensions = file_types or SUPPORTED_EXTENSIONS
+        return [url async for url in self._discover_stream(domain, file_types)]
 
-        # Method 1: Try JESTER MAPPER
-        try:
-            from modules.JESTER.MAPPER.mapper import JesterMapper
-            mapper = JesterMapper()
-            urls = await mapper.discover(domain, mode="fast")
-            for url_obj in urls:
-                url = url_obj.url if hasattr(url_obj, "url") else str(url_obj)
-                if self._is_target_file(url, target_extensions):
-                    file_urls.add(url)
-        except Exception as e:
-            logger.debug(f"MAPPER discovery failed: {e}")
-
-        # Method 2: Try Firecrawl map
-        try:
-            from modules.alldom.sources.firecrawl_mapper import FirecrawlMapper
-            fm = FirecrawlMapper()
-            async for discovered in fm.map_domain(domain):
-                if self._is_target_file(discovered.url, target_extensions):
-                    file_urls.add(discovered.url)
-        except Exception as e:
-            logger.debug(f"Firecrawl discovery failed: {e}")
-
-        # Method 3: Try search engines with filetype operators
-        if len(file_urls) < 50:
+    async def _discover_stream(
+        self,
+        domain: str,
+        file_types: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Yield new file URLs as each discovery method finishes (at most max_files)."""
+        target_extensions = file_types or SUPPORTED_EXTENSIONS
+        found: Set[str] = set()
+
+        methods = [
+            ("MAPPER", self._mapper_discovery),
+            ("Firecrawl", self._firecrawl_discovery),
+            ("Search engine", self._search_engine_discovery),
+            ("Sitemap", self._sitemap_discovery),
+            ("Common path", self._common_path_discovery),
+        ]
+        for name, method in methods:
+            # Search engines only when crawling found little
+            if method == self._search_engine_discovery and len(found) >= SEARCH_DISCOVERY_BELOW:
+                continue
             try:
-                file_urls.update(await self._search_engine_discovery(domain, target_extensions))
+                urls = await method(domain, target_extensions)
             except Exception as e:
-                logger.debug(f"Search engine discovery failed: {e}")
+                logger.debug(f"{name} discovery failed: {e}")
+                continue
 
-        # Method 4: Try sitemap
-        try:
-            file_urls.update(await self._sitemap_discovery(domain, target_extensions))
-        except Exception as e:
-            logger.debug(f"Sitemap discovery failed: {e}")
+            for url in urls:
+                if url not in found:
+                    found.add(url)
+                    yield url
+                    if len(found) >= self.max_files:
+                        return
 
-        # Method 5: Common file paths
-        file_urls.update(await self._common_path_discovery(domain, target_extensions))
+    async def _mapper_discovery(self, domain: str, extensions: Set[str]) -> Set[str]:
+        """Discover files with JESTER MAPPER."""
+        from modules.JESTER.MAPPER.mapper import JesterMapper
 
-        return list(file_urls)[:self.max_files]
+        results = set()
+        mapper = JesterMapper()
+        urls = await mapper.discover(domain, mode="fast")
+        for url_obj in urls:
+            url = url_obj.url if hasattr(url_obj, "url") else str(url_obj)
+            if self._is_target_file(url, extensions):
+                results.add(url)
+        return results
+
+    async def _firecrawl_discovery(self, domain: str, extensions: Set[str]) -> Set[str]:
+        """Discover files with a Firecrawl map."""
+        from modules.alldom.sources.firecrawl_mapper import FirecrawlMapper
+
+        results = set()
+        fm = FirecrawlMapper()
+        async for discovered in fm.map_domain(domain):
+            if self._is_target_file(discovered.url, extensions):
+                results.add(discovered.url)
+        return results
 
     def _is_target_file(self, url: str, target_extensions: Set[str]) -> bool:
         """Check if URL points to a target file type."""
@@ -318,45 +605,54 @@ class MetadataScanner:
 
         return results
 
-    async def _extract_file_metadata(
+    async def _fetch_payload(
         self,
         session: aiohttp.ClientSession,
         url: str,
-        semaphore: asyncio.Semaphore
-    ) -> Optional[MetadataResult]:
-        """Download file and extract metadata."""
-        async with semaphore:
-            try:
-                # First do HEAD to check size
-                async with session.head(url, allow_redirects=True) as head_resp:
-                    content_length = head_resp.headers.get("Content-Length")
-                    if content_length and int(content_length) > self.max_file_size:
-                        logger.debug(f"Skipping {url}: too large ({content_length} bytes)")
-                        return None
-
-                # Download file
-                async with session.get(url, allow_redirects=True) as resp:
-                    if resp.status != 200:
-                        return None
-
-                    # Check content type
-                    content_type = resp.headers.get("Content-Type", "")
-
-                    # Read file (with size limit)
-                    data = await resp.content.read(self.max_file_size)
-
-                    if len(data) < 100:  # Too small
-                        return None
-
-                    # Extract metadata
-                    return extract_metadata(data, url, content_type)
-
-            except asyncio.TimeoutError:
-                logger.debug(f"Timeout downloading {url}")
-            except Exception as e:
-                logger.debug(f"Error downloading {url}: {e}")
+        partial: bool = True,
+    ) -> Optional[Payload]:
+        """
+        Fetch what a file's metadata is extracted from.
 
+        The metadata-bearing parts for formats with a partial reader (unless
+        `partial` is False), otherwise the whole file. None when the file is
+        missing, too small or too large; transient failures (timeouts,
+        429/5xx) raise.
+        """
+        if partial and partial_format(url):
+            try:
+                return await fetch_partial(session, url, self.max_file_size)
+            except PartialUnavailable as e:
+                if e.body is not None:
+                    # Server ignored the Range header and sent the file
+                    return self._whole_file(e.body, url, e.content_type)
+                logger.debug(f"Partial fetch unavailable for {url}: {e}")
+
+        # First do HEAD to check size
+        async with session.head(url, allow_redirects=True) as head_resp:
+            content_length = head_resp.headers.get("Content-Length")
+            if content_length and int(content_length) > self.max_file_size:
+                logger.debug(f"Skipping {url}: too large ({content_length} bytes)")
+                return None
+
+        # Download file
+        async with session.get(url, allow_redirects=True) as resp:
+            if resp.status in RETRY_STATUSES:
+                resp.raise_for_status()
+            if resp.status != 200:
+                return None
+
+            # Check content type
+            content_type = resp.headers.get("Content-Type", "")
+
+            # Read file (with size limit)
+            data = await read_body(resp, self.max_file_size)
+            return self._whole_file(data, url, content_type)
+
+    def _whole_file(self, data: bytes, url: str, content_type: str) -> Optional[Payload]:
+        if len(data) < 100:  # Too small
             return None
+        return Payload(url, "file", (data,), content_type)
 
     async def scan_stream(
         self,
@@ -368,17 +664,6 @@ class MetadataScanner:
 
         Yields MetadataResult objects as files are processed.
         """
-        file_urls = await self._discover_files(domain, file_types)
-
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        ) as session:
-            semaphore = asyncio.Semaphore(self.concurrent)
-
-            for url in file_urls[:self.max_files]:
-                try:
-                    result = await self._extract_file_metadata(session, url, semaphore)
-                    if result and result.success:
-                        yield result
-                except Exception:
-                    pass
+        async for result in self.scan_pipeline(domain, file_types):
+            if result.success:
+                yield result
@@ -0,0 +1,244 @@
+"""
+Tests for partial (Range request) metadata fetching
+Stub HTTP server with JPEG, PDF and DOCX fixtures; partial reads must
+match what is in the file and fall back to a full download when needed
+"""
+
+import io
+import os
+import re
+import struct
+import sys
+import zipfile
+from pathlib import Path
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from EXIF.partial import PartialUnavailable, Payload, extract_payload, fetch_partial
+from EXIF.scanner import MetadataScanner
+
+PADDING = 512 * 1024  # Image data / attachments the partial reader must not fetch
+
+
+# ─── Fixtures ───
+
+def _jpeg(entries=((0x010F, b"StubCam\x00"), (0x013B, b"Jane Roe\x00")), segments: bytes = b"") -> bytes:
+    """JPEG whose APP1 holds IFD0 `entries` (Make/Artist), then `segments`, then a large scan."""
+    data_at = 8 + 2 + 12 * len(entries) + 4
+    ifd, values = struct.pack("<H", len(entries)), b""
+    for tag, value in entries:
+        ifd += struct.pack("<HHII", tag, 2, len(value), data_at + len(values))
+        values += value
+    tiff = b"II" + struct.pack("<HI", 42, 8) + ifd + b"\x00\x00\x00\x00" + values
+    app1 = b"Exif\x00\x00" + tiff
+    return (b"\xff\xd8" + _segment(0xE1, app1) + segments
+            + b"\xff\xda\x00\x02" + os.urandom(PADDING) + b"\xff\xd9")
+
+
+def _segment(marker: int, body: bytes) -> bytes:
+    return bytes([0xFF, marker]) + struct.pack(">H", len(body) + 2) + body
+
+
+XMP = """<?xpacket begin="\ufeff" id="W5M0MpCehiHzreSzNTczkc9d"?>
+<x:xmpmeta xmlns:x="adobe:ns:meta/">
+ <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+  <rdf:Description xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:xmp="http://ns.adobe.com/xap/1.0/"
+                   xmp:CreatorTool="StubEditor 2.1" xmp:CreateDate="2021-04-01T10:00:00">
+   <dc:creator><rdf:Seq><rdf:li>John Doe</rdf:li></rdf:Seq></dc:creator>
+  </rdf:Description>
+ </rdf:RDF>
+</x:xmpmeta>
+<?xpacket end="w"?>"""
+
+
+def _app13(datasets) -> bytes:
+    """Photoshop APP13 whose IPTC-NAA resource holds record 2 `datasets`."""
+    iptc = b"".join(b"\x1c\x02" + bytes([number]) + struct.pack(">H", len(value)) + value
+                    for number, value in datasets)
+    resource = b"8BIM" + struct.pack(">H", 0x0404) + b"\x00\x00" + struct.pack(">I", len(iptc)) + iptc
+    return b"Photoshop 3.0\x00" + resource + b"\x00" * (len(iptc) % 2)
+
+
+def _pdf() -> bytes:
+    """Classic-xref PDF with the catalog, page tree and Info far from the tail."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [] /Count 3 >>",
+        b"<< /Author (Jane Roe) /Producer (StubWriter) /Title <FEFF00480069> >>",
+        b"<< /Length %d >>\nstream\n" % PADDING + b"x" * PADDING + b"\nendstream",
+    ]
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info 3 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    return bytes(out)
+
+
+CORE_XML = (
+    '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+    'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    "<dc:creator>Jane Roe</dc:creator><dc:title>Stub report</dc:title></cp:coreProperties>"
+)
+
+
+def _docx(core: str = CORE_XML) -> bytes:
+    """DOCX with its document properties ahead of a large stored attachment."""
+    app = (
+        '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+        "<Company>Stub Ltd</Company><Pages>7</Pages></Properties>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("docProps/core.xml", core, zipfile.ZIP_DEFLATED)
+        archive.writestr("docProps/app.xml", app, zipfile.ZIP_DEFLATED)
+        archive.writestr("word/media/image1.bin", os.urandom(PADDING), zipfile.ZIP_STORED)
+    return buffer.getvalue()
+
+
+# ─── Stub server ───
+
+async def _serve(files: dict, ranges: bool = True):
+    """Serve `files` by path, honouring Range headers unless `ranges` is False."""
+    served = []
+
+    async def handle(request):
+        body = files.get(request.match_info["name"])
+        if body is None:
+            return web.Response(status=404)
+        header = request.headers.get("Range", "")
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", header)
+        if not ranges or match is None:
+            served.append(len(body) if request.method == "GET" else 0)
+            return web.Response(body=body if request.method == "GET" else None,
+                                headers={"Content-Length": str(len(body))})
+        first, last = match.groups()
+        if first:
+            start, end = int(first), min(int(last) + 1 if last else len(body), len(body))
+        else:
+            start, end = max(0, len(body) - int(last)), len(body)
+        served.append(end - start)
+        return web.Response(status=206, body=body[start:end],
+                            headers={"Content-Range": f"bytes {start}-{end - 1}/{len(body)}"})
+
+    app = web.Application()
+    app.router.add_route("*", "/{name}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", served
+
+
+async def _partial(name: str, body: bytes):
+    runner, base, served = await _serve({name: body})
+    try:
+        async with aiohttp.ClientSession() as session:
+            payload = await fetch_partial(session, f"{base}/{name}", 50 * 1024 * 1024)
+    finally:
+        await runner.cleanup()
+    return payload, sum(served)
+
+
+@pytest.mark.asyncio
+async def test_jpeg_reads_only_the_exif_segment():
+    payload, fetched = await _partial("photo.jpg", _jpeg())
+
+    assert fetched < PADDING
+    result = extract_payload(payload)
+    assert result.success
+    assert result.camera_make == "StubCam"
+    assert result.author == "Jane Roe"
+
+
+@pytest.mark.asyncio
+async def test_jpeg_authors_in_xmp_and_iptc_are_read_alongside_exif():
+    segments = (_segment(0xE1, b"http://ns.adobe.com/xap/1.0/\x00" + XMP.encode())
+                + _segment(0xED, _app13([(80, b"Ann Smith"), (25, b"harbour"), (25, b"night")])))
+    payload, fetched = await _partial("photo.jpg", _jpeg(entries=[(0x010F, b"StubCam\x00")], segments=segments))
+
+    assert fetched < PADDING
+    result = extract_payload(payload)
+    assert result.camera_make == "StubCam"
+    assert result.author == "John Doe"
+    assert result.software == "StubEditor 2.1"
+    assert result.create_date == "2021-04-01T10:00:00"
+    assert result.metadata["By-line"] == "Ann Smith"
+    assert result.metadata["Keywords"] == ["harbour", "night"]
+
+
+def test_jpeg_exif_author_wins_over_iptc():
+    body = _jpeg(entries=[(0x013B, b"Jane Roe\x00")], segments=_segment(0xED, _app13([(80, b"Ann Smith")])))
+    assert extract_payload(Payload("https://example.com/a.jpg", "jpeg", (body,))).author == "Jane Roe"
+
+    body = _jpeg(entries=[(0x010F, b"StubCam\x00")], segments=_segment(0xED, _app13([(80, b"Ann Smith")])))
+    assert extract_payload(Payload("https://example.com/a.jpg", "jpeg", (body,))).author == "Ann Smith"
+
+
+@pytest.mark.asyncio
+async def test_pdf_reads_info_and_page_count_through_the_xref():
+    payload, fetched = await _partial("report.pdf", _pdf())
+
+    assert fetched < PADDING
+    result = extract_payload(payload)
+    assert result.success
+    assert result.metadata == {"Author": "Jane Roe", "Producer": "StubWriter", "Title": "Hi", "PageCount": 3}
+    assert result.software == "StubWriter"
+
+
+@pytest.mark.asyncio
+async def test_pdf_without_a_direct_page_count_needs_the_whole_file():
+    body = _pdf().replace(b"/Count 3 ", b"/Count 5 0 R")
+    with pytest.raises(PartialUnavailable):
+        await _partial("report.pdf", body)
+
+
+@pytest.mark.asyncio
+async def test_docx_reads_only_the_document_properties():
+    payload, fetched = await _partial("report.docx", _docx())
+
+    assert fetched < PADDING
+    result = extract_payload(payload)
+    assert result.success
+    assert result.file_type == "docx"
+    assert result.author == "Jane Roe"
+    assert result.company == "Stub Ltd"
+    assert result.metadata["PageCount"] == 7
+
+
+@pytest.mark.asyncio
+async def test_server_ignoring_range_is_downloaded_once():
+    body = _jpeg()
+    runner, base, served = await _serve({"photo.jpg": body}, ranges=False)
+    try:
+        async with aiohttp.ClientSession() as session:
+            payload = await MetadataScanner()._fetch_payload(session, f"{base}/photo.jpg")
+    finally:
+        await runner.cleanup()
+
+    assert payload.kind == "file"
+    assert payload.parts == (body,)
+    assert served == [len(body)]
+
+
+@pytest.mark.asyncio
+async def test_unreadable_partial_structure_falls_back_to_full_download():
+    body = _pdf().replace(b"/Root 1 0 R ", b"/Encrypt 9 0 R ")
+    runner, base, served = await _serve({"report.pdf": body})
+    try:
+        async with aiohttp.ClientSession() as session:
+            payload = await MetadataScanner()._fetch_payload(session, f"{base}/report.pdf")
+    finally:
+        await runner.cleanup()
+
+    assert payload.kind == "file"
+    assert payload.parts == (body,)
@@ -0,0 +1,127 @@
+"""
+Tests for the metadata scan pipeline
+Files come from the stub Range server in test_partial; discovery is
+replaced by a fixed URL list
+"""
+
+import asyncio
+import sys
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from EXIF.partial import Payload
+from EXIF.scanner import ExtractionPool, MetadataScanner, PipelineStats, close_extraction_pools, get_extraction_pool
+from EXIF.tests.test_partial import _docx, _jpeg, _pdf, _serve
+
+BROKEN_CORE = "<cp:coreProperties><dc:creator>Jane Roe</cp:coreProperties>"
+
+
+@pytest.fixture(autouse=True)
+def shared_pools():
+    yield
+    close_extraction_pools()
+
+
+async def _scan(scanner: MetadataScanner, base: str, names):
+    async def discover(domain, file_types=None):
+        for name in names:
+            yield f"{base}/{name}"
+
+    scanner._discover_stream = discover
+    stats = PipelineStats()
+    results = {r.url.rsplit("/", 1)[-1]: r async for r in scanner.scan_pipeline("stub.example", stats=stats)}
+    return results, stats
+
+
+@pytest.mark.asyncio
+async def test_pipeline_extracts_partial_payloads_and_dedupes_mirrors():
+    jpeg = _jpeg()
+    files = {"photo.jpg": jpeg, "mirror.jpg": jpeg, "report.pdf": _pdf(), "report.docx": _docx()}
+    runner, base, served = await _serve(files)
+    try:
+        results, stats = await _scan(MetadataScanner(concurrent=2, extract_workers=0), base, files)
+    finally:
+        await runner.cleanup()
+
+    assert set(results) == set(files)
+    assert all(r.success for r in results.values())
+    assert results["mirror.jpg"].camera_make == "StubCam"
+    assert results["report.pdf"].metadata["PageCount"] == 3
+    assert results["report.docx"].company == "Stub Ltd"
+    assert (stats.extracted, stats.duplicates) == (3, 1)
+    assert sum(served) < sum(len(body) for body in files.values()) // 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [0, 1])
+async def test_unparseable_partial_payload_is_downloaded_whole(workers):
+    broken = _docx(core=BROKEN_CORE)
+    runner, base, served = await _serve({"broken.docx": broken})
+    try:
+        results, stats = await _scan(MetadataScanner(extract_workers=workers), base, ["broken.docx"])
+    finally:
+        await runner.cleanup()
+
+    assert list(results) == ["broken.docx"]
+    assert len(broken) in served  # Full GET after the partial read
+    assert stats.extracted == 1
+
+
+@pytest.mark.asyncio
+async def test_scans_share_one_extraction_pool():
+    files = {"photo.jpg": _jpeg()}
+    runner, base, _ = await _serve(files)
+    try:
+        await _scan(MetadataScanner(extract_workers=0), base, files)
+        executor = get_extraction_pool(0)._executor
+        await _scan(MetadataScanner(extract_workers=0), base, files)
+    finally:
+        await runner.cleanup()
+
+    assert executor is not None
+    assert get_extraction_pool(0)._executor is executor
+    assert not executor._shutdown
+
+
+class _PendingExecutor:
+    """Executor whose submitted calls stay pending until failed by the test."""
+
+    def __init__(self):
+        self.futures = []
+        self.shutdowns = 0
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdowns += 1
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_is_shut_down_and_replaced_once():
+    pool = ExtractionPool(workers=2)
+    broken = pool._executor = _PendingExecutor()
+    first = asyncio.create_task(pool.extract(Payload("https://a.example/a.jpg", "jpeg", (b"",))))
+    second = asyncio.create_task(pool.extract(Payload("https://b.example/b.jpg", "jpeg", (b"",))))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(broken.futures) == 2
+
+    broken.futures[0].set_exception(BrokenProcessPool("worker died"))
+    assert not (await first).success
+    assert pool._executor is None
+    replacement = pool._executor = _PendingExecutor()
+
+    # The second caller fails on the old pool; the replacement must survive
+    broken.futures[1].set_exception(BrokenProcessPool("worker died"))
+    assert not (await second).success
+    assert pool._executor is replacement
+    assert broken.shutdowns == 2
+    assert pool.restarts == 1
@@ -7,13 +7,17 @@ Script with two main functions:
    This identifies potential competitors or related sites receiving links from the same sources.
 """
 import requests
-from collections import defaultdict
-from typing import List, Dict, Set, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Dict, Set, Tuple, Optional
 import time
 import json
+import sqlite3
 import sys
 import os
 import argparse
+import functools
+import threading
 from urllib.parse import urlparse
 import logging
 from datetime import datetime
@@ -43,7 +47,13 @@ HEADERS = {
 }
 
 # Rate-limit control
-DELAY = 2.0  # seconds between requests
+DELAY = 2.0  # seconds between requests, across all threads
+
+# Neighbour-set fetching
+FETCH_WORKERS = 4       # Concurrent neighbour lookups (requests still go out DELAY apart)
+FETCH_BUDGET = None     # Max uncached neighbour lookups per search (None = unlimited)
+CACHE_PATH = Path(os.getenv("COMMON_LINKS_CACHE", str(Path.home() / ".cache" / "corporella" / "link_neighbours.db")))
+CACHE_TTL = float(os.getenv("COMMON_LINKS_CACHE_TTL", 7 * 24 * 3600))  # seconds; 0 disables the cache
 
 def get_domain_from_url(url: str) -> str:
     """Extract the domain from a URL."""
@@ -56,6 +66,20 @@ def get_domain_from_url(url: str) -> str:
     except Exception as e:
         return url.lower().replace('www.', '')
 
+_request_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+def _api_get(params: dict) -> requests.Response:
+    """GET the Ahrefs API, spacing requests from all threads DELAY seconds apart."""
+    global _next_request_at
+    with _request_lock:
+        wait = _next_request_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _next_request_at = time.monotonic() + DELAY
+    return requests.get(API_ENDPOINT, params=params, headers=HEADERS)
+
 def get_linked_domains(referring_domain: str, max_links: int = 100) -> Set[str]:
     """
     Get domains that are linked from a given referring domain.
@@ -76,7 +100,7 @@ def get_linked_domains(referring_domain: str, max_links: int = 100) -> Set[str]:
     
     try:
         logger.info(f"Checking if domain exists in Ahrefs database: {referring_domain}")
-        response = requests.get(API_ENDPOINT, params=check_params, headers=HEADERS)
+        response = _api_get(check_params)
         
         if response.status_code != 200:
             logger.error(f"Error: API returned status code {response.status_code}")
@@ -102,7 +126,7 @@ def get_linked_domains(referring_domain: str, max_links: int = 100) -> Set[str]:
         }
         
         logger.info(f"Fetching outgoing links for: {referring_domain} (limited to {max_links})")
-        response = requests.get(API_ENDPOINT, params=params, headers=HEADERS)
+        response = _api_get(params)
         
         if response.status_code != 200:
             logger.error(f"Error: API returned status code {response.status_code}")
@@ -117,7 +141,7 @@ def get_linked_domains(referring_domain: str, max_links: int = 100) -> Set[str]:
             logger.info("Trying alternative endpoint...")
             params["from"] = "linked_domains"
             params["limit"] = max_links  # Ensure limit is also set here
-            response = requests.get(API_ENDPOINT, params=params, headers=HEADERS)
+            response = _api_get(params)
             
             if response.status_code != 200:
                 logger.error(f"Error with alternative endpoint: {response.status_code}")
@@ -157,7 +181,6 @@ def get_linked_domains(referring_domain: str, max_links: int = 100) -> Set[str]:
         logger.error(f"Error fetching data for {referring_domain}: {e}")
     
     logger.info(f"Found {len(target_domains)} unique target domains")
-    time.sleep(DELAY)
     return target_domains
 
 def get_backlink_domains(domain: str, limit: int = 1000) -> Set[str]:
@@ -179,7 +202,7 @@ def get_backlink_domains(domain: str, limit: int = 1000) -> Set[str]:
     
     try:
         logger.info(f"Checking if domain exists in Ahrefs database: {domain}")
-        response = requests.get(API_ENDPOINT, params=check_params, headers=HEADERS)
+        response = _api_get(check_params)
         
         if response.status_code != 200:
             logger.error(f"Error: API returned status code {response.status_code}")
@@ -206,7 +229,7 @@ def get_backlink_domains(domain: str, limit: int = 1000) -> Set[str]:
         }
         
         logger.info(f"Fetching domains linking to: {domain}")
-        response = requests.get(API_ENDPOINT, params=params, headers=HEADERS)
+        response = _api_get(params)
         
         if response.status_code != 200:
             logger.error(f"Error: API returned status code {response.status_code}")
@@ -236,33 +259,248 @@ def get_backlink_domains(domain: str, limit: int = 1000) -> Set[str]:
     except Exception as e:
         logger.error(f"Error fetching referring domains for {domain}: {e}")
     
-    time.sleep(DELAY)
     return referring_domains
 
-def find_common_link_targets(ref_domains: List[str]) -> Dict[str, dict]:
+# ============================================================================
+# Neighbour sets: persistent cache, concurrent fetching, intersection
+# ============================================================================
+
+class NeighbourCache:
+    """
+    SQLite store of per-domain neighbour sets (outlinks or backlinks) with a TTL.
+
+    A set fetched with one limit also answers smaller limits when it was
+    complete (fewer results than its limit). One connection is shared by all
+    threads, serialised by a lock.
+    """
+
+    def __init__(self, db_path: Path = CACHE_PATH, ttl: float = CACHE_TTL):
+        self.ttl = ttl
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS neighbours (
+                kind TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                link_limit INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                neighbours TEXT NOT NULL,
+                PRIMARY KEY (kind, domain)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, kind: str, domain: str, limit: int) -> Optional[Set[str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT link_limit, fetched_at, neighbours FROM neighbours WHERE kind = ? AND domain = ?",
+                (kind, domain)
+            ).fetchone()
+        if not row or time.time() - row[1] > self.ttl:
+            return None
+        stored_limit, neighbours = row[0], json.loads(row[2])
+        if stored_limit == limit or (len(neighbours) < stored_limit and len(neighbours) <= limit):
+            return set(neighbours)
+        return None
+
+    def put(self, kind: str, domain: str, limit: int, neighbours: Set[str]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO neighbours (kind, domain, link_limit, fetched_at, neighbours) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, domain, limit, time.time(), json.dumps(sorted(neighbours)))
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[NeighbourCache] = None
+_cache_lock = threading.Lock()
+_lookups = 0
+_lookups_lock = threading.Lock()
+
+
+def get_neighbour_cache() -> Optional[NeighbourCache]:
+    """Shared cache, or None when disabled (CACHE_TTL <= 0) or unavailable."""
+    global _cache
+    if _cache is None and CACHE_TTL > 0:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = NeighbourCache(CACHE_PATH, CACHE_TTL)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Neighbour cache unavailable ({CACHE_PATH}): {e}")
+                    return None
+    return _cache
+
+
+def _budgeted(search: Callable) -> Callable:
+    """Give each call of a search a fresh FETCH_BUDGET of lookups."""
+    @functools.wraps(search)
+    def wrapper(*args, **kwargs):
+        global _lookups
+        with _lookups_lock:
+            _lookups = 0
+        return search(*args, **kwargs)
+    return wrapper
+
+
+def _within_budget() -> bool:
+    """Count one API lookup against FETCH_BUDGET; False once it is spent."""
+    global _lookups
+    with _lookups_lock:
+        if FETCH_BUDGET is not None and _lookups >= FETCH_BUDGET:
+            return False
+        _lookups += 1
+        return True
+
+
+_FETCHERS: Dict[str, Callable[[str, int], Set[str]]] = {
+    "out": lambda domain, limit: get_linked_domains(domain, max_links=limit),
+    "in": lambda domain, limit: get_backlink_domains(domain, limit=limit),
+}
+
+
+def fetch_neighbour_sets(domains: Iterable[str], kind: str = "out", limit: int = 100) -> Dict[str, Set[str]]:
+    """
+    Neighbour sets ("out" = linked domains, "in" = backlink domains) for many
+    domains, in input order.
+
+    Cached sets are used while fresh; the rest are fetched FETCH_WORKERS at a
+    time until FETCH_BUDGET is spent (domains beyond it get an empty set).
+    Empty results are not cached, since the API reports errors that way too.
+    """
+    domains = list(dict.fromkeys(domains))
+    cache = get_neighbour_cache()
+    found: Dict[str, Set[str]] = {}
+    misses = []
+    for domain in domains:
+        cached = cache.get(kind, domain, limit) if cache else None
+        if cached is not None:
+            found[domain] = cached
+        else:
+            misses.append(domain)
+    if len(misses) < len(domains):
+        logger.info(f"Neighbour cache: {len(domains) - len(misses)}/{len(domains)} {kind}-link sets cached")
+
+    fetch = _FETCHERS[kind]
+
+    def lookup(domain: str) -> Optional[Set[str]]:
+        if not _within_budget():
+            return None
+        return fetch(domain, limit)
+
+    if misses:
+        with ThreadPoolExecutor(max_workers=max(1, FETCH_WORKERS)) as pool:
+            for domain, neighbours in zip(misses, pool.map(lookup, misses)):
+                if neighbours is None:
+                    logger.warning(f"Lookup budget ({FETCH_BUDGET}) spent - skipping {domain}")
+                    neighbours = set()
+                elif neighbours and cache:
+                    cache.put(kind, domain, limit, neighbours)
+                found[domain] = neighbours
+
+    return {domain: found[domain] for domain in domains}
+
+
+def _source_bitmaps(neighbour_sets: Dict[str, Set[str]], sources: List[str], exclude: Set[str],
+                    bitmaps: Dict[str, int], offset: int = 0):
+    """OR each source's bit (its position in `sources`) into the bitmaps of its neighbours."""
+    for position, source in enumerate(sources, offset):
+        bit = 1 << position
+        for neighbour in neighbour_sets.get(source, ()):
+            if neighbour not in exclude:
+                bitmaps[neighbour] = bitmaps.get(neighbour, 0) | bit
+
+
+def _bitmap_members(bitmap: int, sources: List[str]) -> List[str]:
+    return [source for position, source in enumerate(sources) if bitmap >> position & 1]
+
+
+def _top_k_settled(bitmaps: Dict[str, int], top_k: int, remaining: int, min_count: int = 1) -> bool:
+    """
+    True when `remaining` more sources cannot change the top k result: its
+    members are certain and each already meets `min_count`.
+    """
+    counts = sorted((bin(b).count("1") for b in bitmaps.values()), reverse=True)
+    if len(counts) < top_k or counts[top_k - 1] < min_count:
+        return False
+    runner_up = counts[top_k] if len(counts) > top_k else 0
+    return counts[top_k - 1] > runner_up + remaining and counts[top_k - 1] > remaining
+
+
+def common_link_targets(
+    sources: List[str],
+    kind: str = "out",
+    limit: int = 100,
+    min_count: int = 1,
+    top_k: Optional[int] = None,
+    exclude: Iterable[str] = (),
+    key: str = "referrers",
+) -> Dict[str, dict]:
+    """
+    Neighbours shared by `sources`:
+    {target: {"count": n, key: [sources], "partial": bool}}, most shared
+    first (ties in first-seen order).
+
+    Sources are fetched in batches of FETCH_WORKERS and intersected as
+    bitmaps over source positions. With top_k, fetching stops as soon as the
+    remaining sources can no longer change which targets make the top k and
+    all of them already meet min_count. Results are then marked partial:
+    counts and source lists cover only the sources fetched so far (lower
+    bounds).
+    """
+    sources = list(dict.fromkeys(sources))
+    exclude = set(exclude)
+    bitmaps: Dict[str, int] = {}
+    batch_size = max(1, FETCH_WORKERS)
+
+    fetched = 0
+    for start in range(0, len(sources), batch_size):
+        batch = sources[start:start + batch_size]
+        for position, source in enumerate(batch, start + 1):
+            logger.info(f"\nAnalyzing {kind}-links of {position}/{len(sources)}: {source}")
+        _source_bitmaps(fetch_neighbour_sets(batch, kind, limit), batch, exclude, bitmaps, start)
+        fetched = start + len(batch)
+        remaining = len(sources) - fetched
+        if top_k and remaining and _top_k_settled(bitmaps, top_k, remaining, min_count):
+            logger.info(f"Top {top_k} common links settled after {fetched}/{len(sources)} sources")
+            break
+
+    results = []
+    for target, bitmap in bitmaps.items():
+        members = _bitmap_members(bitmap, sources[:fetched])
+        if len(members) >= min_count:
+            results.append((target, members))
+    results.sort(key=lambda item: len(item[1]), reverse=True)
+    if top_k:
+        results = results[:top_k]
+    partial = fetched < len(sources)
+    return {target: {"count": len(members), key: members, "partial": partial} for target, members in results}
+
+
+def _ranking_title(title: str, results: Dict[str, dict]) -> str:
+    """Display title, noting when counts stopped early at a settled top k."""
+    if any(data.get("partial") for data in results.values()):
+        return f"{title} (partial counts: lookups stopped once the top K were certain)"
+    return title
+
+
+@_budgeted
+def find_common_link_targets(ref_domains: List[str], max_links: int = 100, min_count: int = 1,
+                             top_k: Optional[int] = None) -> Dict[str, dict]:
     """
     Takes a list of referring domains, returns a dict of targets with details.
     """
-    all_targets = defaultdict(lambda: {"count": 0, "referrers": []})
-    
-    for domain in ref_domains:
-        logger.info(f"\nAnalyzing outgoing links from: {domain}")
-        target_domains = get_linked_domains(domain)
-        
-        for target in target_domains:
-            all_targets[target]["count"] += 1
-            all_targets[target]["referrers"].append(domain)
-    
-    # Convert to regular dict and sort by count
-    result = {k: v for k, v in sorted(
-        all_targets.items(), 
-        key=lambda item: item[1]["count"], 
-        reverse=True
-    )}
-    
-    return result
+    return common_link_targets(ref_domains, "out", max_links, min_count=min_count, top_k=top_k)
 
-def find_similar_backlink_profiles(target_domain: str, min_shared: int = 3, max_links: int = 100, max_backlinks: int = 10) -> Dict[str, dict]:
+@_budgeted
+def find_similar_backlink_profiles(target_domain: str, min_shared: int = 3, max_links: int = 100, max_backlinks: int = 10,
+                                   top_k: Optional[int] = None) -> Dict[str, dict]:
     """
     Finds domains with similar backlink profiles to the target domain.
     Returns a dict of domains that share backlinks with the target.
@@ -272,6 +510,7 @@ def find_similar_backlink_profiles(target_domain: str, min_shared: int = 3, max_
     - min_shared: Minimum number of shared referring domains required
     - max_links: Maximum number of outgoing links to analyze per referring domain
     - max_backlinks: Maximum number of backlink sources to analyze
+    - top_k: Only the top k similar domains (stops fetching once they are certain)
     """
     # Step 1: Get all domains linking to the target
     logger.info(f"Finding sites that link to {target_domain}")
@@ -282,51 +521,23 @@ def find_similar_backlink_profiles(target_domain: str, min_shared: int = 3, max_
         
     logger.info(f"Found {len(referring_domains)} sites linking to {target_domain}")
     
-    # Step 2: For each referring domain, find what other domains they link to
-    similar_domains = defaultdict(lambda: {"count": 0, "shared_referrers": []})
-    
-    # Use a counter to sample only a portion of referring domains if there are too many
+    # Step 2: Find what other domains the referring domains link to
     # Limit to max_backlinks for faster results
     sample_limit = min(max_backlinks, len(referring_domains))
-    sample_count = 0
-    
+
     # Get the top X domains by authority (they're already sorted by domain_rating)
     sampled_domains = list(referring_domains)[:sample_limit]
     logger.info(f"For efficiency, analyzing only top {sample_limit} referring domains by authority")
-    
-    for ref_domain in sampled_domains:
-        sample_count += 1
-        logger.info(f"\nAnalyzing outgoing links from referring domain {sample_count}/{sample_limit}: {ref_domain}")
-        
-        # Get domains that this referring domain links to, with max_links limit
-        other_targets = get_linked_domains(ref_domain, max_links=max_links)
-        
-        # Ignore the original target domain in results
-        if target_domain in other_targets:
-            other_targets.remove(target_domain)
-        
-        # Add each target to our similar domains dict
-        for other_domain in other_targets:
-            similar_domains[other_domain]["count"] += 1
-            similar_domains[other_domain]["shared_referrers"].append(ref_domain)
-    
-    # Filter out domains with too few shared referrers
-    filtered_results = {
-        domain: data 
-        for domain, data in similar_domains.items() 
-        if data["count"] >= min_shared
-    }
-    
-    # Sort by count of shared referring domains
-    result = {k: v for k, v in sorted(
-        filtered_results.items(), 
-        key=lambda item: item[1]["count"], 
-        reverse=True
-    )}
-    
-    return result
 
-def find_colinked_domains(target_domain: str, max_links: int = 100, max_ref_domains: int = 10) -> Dict[str, dict]:
+    # Ignore the original target domain in results; keep domains with enough shared referrers
+    return common_link_targets(
+        sampled_domains, "out", max_links,
+        min_count=min_shared, top_k=top_k, exclude={target_domain}, key="shared_referrers",
+    )
+
+@_budgeted
+def find_colinked_domains(target_domain: str, max_links: int = 100, max_ref_domains: int = 10,
+                          top_k: Optional[int] = None) -> Dict[str, dict]:
     """
     For a target domain, find other domains that its referring domains also link to.
     This reveals domains frequently linked alongside the target domain.
@@ -335,6 +546,7 @@ def find_colinked_domains(target_domain: str, max_links: int = 100, max_ref_doma
     - target_domain: The domain to analyze
     - max_links: Maximum number of outgoing links to fetch per referring domain
     - max_ref_domains: Maximum number of referring domains to analyze
+    - top_k: Only the top k co-linked domains (stops fetching once they are certain)
     """
     # Step 1: Get domains linking to the target
     logger.info(f"Finding domains that link to {target_domain}")
@@ -345,40 +557,16 @@ def find_colinked_domains(target_domain: str, max_links: int = 100, max_ref_doma
         
     logger.info(f"Found {len(ref_domains)} domains linking to {target_domain}")
     
-    # Step 2: For each referring domain, get its outgoing links
-    colinked_domains = defaultdict(lambda: {"count": 0, "referrers": []})
-    
+    # Step 2: Get the outgoing links of the referring domains
     # Limit the number of referring domains to analyze
     sample_limit = min(max_ref_domains, len(ref_domains))
     sampled_domains = list(ref_domains)[:sample_limit]
     logger.info(f"For efficiency, analyzing only top {sample_limit} referring domains by authority")
-    
-    for i, ref_domain in enumerate(sampled_domains, 1):
-        logger.info(f"\nAnalyzing outgoing links from referring domain {i}/{sample_limit}: {ref_domain}")
-        
-        # Get domains that this referring domain links to
-        outgoing_links = get_linked_domains(ref_domain, max_links=max_links)
-        
-        # Remove the original target from results
-        if target_domain in outgoing_links:
-            outgoing_links.remove(target_domain)
-            
-        logger.info(f"Found {len(outgoing_links)} other domains linked to by {ref_domain}")
-        
-        # Add each linked domain to our results
-        for linked_domain in outgoing_links:
-            colinked_domains[linked_domain]["count"] += 1
-            colinked_domains[linked_domain]["referrers"].append(ref_domain)
-    
-    # Sort by count (number of referring domains linking to this domain)
-    result = {k: v for k, v in sorted(
-        colinked_domains.items(),
-        key=lambda item: item[1]["count"],
-        reverse=True
-    )}
-    
-    return result
 
+    # Remove the original target from results
+    return common_link_targets(sampled_domains, "out", max_links, top_k=top_k, exclude={target_domain})
+
+@_budgeted
 def find_backlinks_twice_removed(target_domain: str, max_links: int = 100, max_ref_domains: int = 10, max_second_level: int = 5) -> Dict[str, dict]:
     """
     Find domains that link to your backlinks ("backlinks twice removed").
@@ -400,39 +588,19 @@ def find_backlinks_twice_removed(target_domain: str, max_links: int = 100, max_r
     logger.info(f"Found {len(first_level_domains)} domains linking directly to {target_domain}")
     
     # Step 2: Get second level backlinks (domains linking to your backlinks)
-    second_level_domains = defaultdict(lambda: {"count": 0, "paths": []})
-    
     # Limit number of first-level domains to analyze
     sample_limit = min(max_ref_domains, len(first_level_domains))
     sampled_domains = list(first_level_domains)[:sample_limit]
     logger.info(f"For efficiency, analyzing backlinks for top {sample_limit} referring domains")
-    
-    for i, first_level in enumerate(sampled_domains, 1):
-        logger.info(f"\nAnalyzing backlinks for referring domain {i}/{sample_limit}: {first_level}")
-        
-        # Get domains linking to this first level domain
-        second_domains = get_backlink_domains(first_level, limit=max_second_level)
-        logger.info(f"Found {len(second_domains)} domains linking to {first_level}")
-        
-        # Add each second level domain to our results
-        for second_domain in second_domains:
-            # Skip if it's the target domain or a first level domain to avoid loops
-            if second_domain == target_domain or second_domain in first_level_domains:
-                continue
-                
-            # Record the path: second_domain -> first_level -> target_domain
-            second_level_domains[second_domain]["count"] += 1
-            second_level_domains[second_domain]["paths"].append(first_level)
-    
-    # Sort by count (number of different paths to target)
-    result = {k: v for k, v in sorted(
-        second_level_domains.items(),
-        key=lambda item: item[1]["count"],
-        reverse=True
-    )}
-    
-    return result
 
+    # Skip the target and first level domains to avoid loops; paths are
+    # second_domain -> first_level -> target_domain
+    return common_link_targets(
+        sampled_domains, "in", max_second_level,
+        exclude={target_domain} | first_level_domains, key="paths",
+    )
+
+@_budgeted
 def compare_domains(domains: List[str], max_links: int = 100, filter_seo_spam: bool = True) -> Dict[str, Dict]:
     """
     Compare multiple domains to find both common backlinks and common outbound links.
@@ -450,11 +618,7 @@ def compare_domains(domains: List[str], max_links: int = 100, filter_seo_spam: b
         logger.error("Need at least 2 domains to compare")
         return {"common_backlinks": {}, "common_outlinks": {}}
     
-    # Initialize results
-    results = {
-        "common_backlinks": defaultdict(lambda: {"count": 0, "targets": []}),
-        "common_outlinks": defaultdict(lambda: {"count": 0, "sources": []})
-    }
+    results = {}
     
     # Explicit backlist of domains to ignore
     backlist_domains = {
@@ -475,62 +639,32 @@ def compare_domains(domains: List[str], max_links: int = 100, filter_seo_spam: b
             return False  # Skip filtering if disabled
         return domain.lower() in backlist_domains
     
-    # Step 1: Get backlinks for each domain
-    all_backlinks = {}
-    for domain in domains:
-        logger.info(f"Getting backlinks for: {domain}")
-        backlinks = get_backlink_domains(domain, limit=max_links)
-        
-        # Filter out domains from our input list to avoid circular references
-        # Also filter out explicitly backlisted domains
-        filtered_backlinks = {
-            backlink for backlink in backlinks 
-            if backlink not in domains and not is_backlisted(backlink)
-        }
-        
-        all_backlinks[domain] = filtered_backlinks
-        logger.info(f"Found {len(filtered_backlinks)} legitimate backlinks for {domain} (filtered out backlisted domains)")
-        
-        # Check for common backlinks with previously processed domains
-        for backlink in filtered_backlinks:
-            for prev_domain in domains:
-                if prev_domain == domain:
-                    continue  # Skip self
-                if prev_domain in all_backlinks and backlink in all_backlinks[prev_domain]:
-                    results["common_backlinks"][backlink]["count"] += 1
-                    if domain not in results["common_backlinks"][backlink]["targets"]:
-                        results["common_backlinks"][backlink]["targets"].append(domain)
-                    if prev_domain not in results["common_backlinks"][backlink]["targets"]:
-                        results["common_backlinks"][backlink]["targets"].append(prev_domain)
-    
-    # Step 2: Get outbound links for each domain
-    all_outlinks = {}
-    for domain in domains:
-        logger.info(f"Getting outbound links for: {domain}")
-        outlinks = get_linked_domains(domain, max_links=max_links)
-        
-        # Filter out domains from our input list to avoid circular references
-        # Also filter out explicitly backlisted domains
-        filtered_outlinks = {
-            outlink for outlink in outlinks 
-            if outlink not in domains and not is_backlisted(outlink)
-        }
-        
-        all_outlinks[domain] = filtered_outlinks
-        logger.info(f"Found {len(filtered_outlinks)} legitimate outbound links for {domain} (filtered out backlisted domains)")
-        
-        # Check for common outbound links with previously processed domains
-        for outlink in filtered_outlinks:
-            for prev_domain in domains:
-                if prev_domain == domain:
-                    continue  # Skip self
-                if prev_domain in all_outlinks and outlink in all_outlinks[prev_domain]:
-                    results["common_outlinks"][outlink]["count"] += 1
-                    if domain not in results["common_outlinks"][outlink]["sources"]:
-                        results["common_outlinks"][outlink]["sources"].append(domain)
-                    if prev_domain not in results["common_outlinks"][outlink]["sources"]:
-                        results["common_outlinks"][outlink]["sources"].append(prev_domain)
-    
+    def common(kind: str, key: str) -> Dict[str, dict]:
+        neighbour_sets = fetch_neighbour_sets(domains, kind, max_links)
+        positions = list(neighbour_sets)
+        bitmaps: Dict[str, int] = {}
+        for domain, links in neighbour_sets.items():
+            # Filter out domains from our input list to avoid circular references
+            # Also filter out explicitly backlisted domains
+            neighbour_sets[domain] = {link for link in links if link not in domains and not is_backlisted(link)}
+            logger.info(f"Found {len(neighbour_sets[domain])} legitimate {kind}-links for {domain} (filtered out backlisted domains)")
+        _source_bitmaps(neighbour_sets, positions, set(), bitmaps)
+
+        shared = {}
+        for link, bitmap in bitmaps.items():
+            members = _bitmap_members(bitmap, positions)
+            if len(members) > 1:
+                # One count per pair of input domains sharing the link
+                shared[link] = {
+                    "count": len(members) * (len(members) - 1) // 2,
+                    key: [members[1], members[0]] + members[2:],
+                }
+        return shared
+
+    # Step 1: Common backlinks; Step 2: common outbound links
+    results["common_backlinks"] = common("in", "targets")
+    results["common_outlinks"] = common("out", "sources")
+
     # Sort results by count (most common first)
     sorted_backlinks = {k: v for k, v in sorted(
         results["common_backlinks"].items(),
@@ -562,7 +696,7 @@ def get_domain_outlink_count(domain: str) -> int:
             "output": "json"
         }
         
-        response = requests.get(API_ENDPOINT, params=check_params, headers=HEADERS)
+        response = _api_get(check_params)
         if response.status_code != 200:
             logger.error(f"Error getting domain rating: {response.status_code}")
             return 999999  # High number indicates error/low priority
@@ -576,7 +710,7 @@ def get_domain_outlink_count(domain: str) -> int:
             "output": "json"
         }
         
-        response = requests.get(API_ENDPOINT, params=stats_params, headers=HEADERS)
+        response = _api_get(stats_params)
         if response.status_code != 200:
             logger.error(f"Error getting outlink count: {response.status_code}")
             return 999999  # High number indicates error/low priority
@@ -751,7 +885,7 @@ def get_backlinks_with_anchors(domain: str, limit: int = 100) -> Dict[str, List[
     
     try:
         logger.info(f"Checking if domain exists in Ahrefs database: {domain}")
-        response = requests.get(API_ENDPOINT, params=check_params, headers=HEADERS)
+        response = _api_get(check_params)
         
         if response.status_code != 200:
             logger.error(f"Error: API returned status code {response.status_code}")
@@ -773,7 +907,7 @@ def get_backlinks_with_anchors(domain: str, limit: int = 100) -> Dict[str, List[
         }
         
         logger.info(f"Fetching backlinks with anchor text for: {domain}")
-        response = requests.get(API_ENDPOINT, params=params, headers=HEADERS)
+        response = _api_get(params)
         
         if response.status_code != 200:
             logger.error(f"Error: API returned status code {response.status_code}")
@@ -818,7 +952,6 @@ def get_backlinks_with_anchors(domain: str, limit: int = 100) -> Dict[str, List[
     except Exception as e:
         logger.error(f"Error fetching backlinks with anchors: {e}")
     
-    time.sleep(DELAY)
     return backlinks_with_anchors
 
 def analyze_anchors(domain: str, anchor_text: str = "", limit: int = 30) -> Dict:
@@ -845,7 +978,7 @@ def analyze_anchors(domain: str, anchor_text: str = "", limit: int = 30) -> Dict
     
     try:
         logger.info(f"Checking if domain exists in Ahrefs database: {domain}")
-        response = requests.get(API_ENDPOINT, params=check_params, headers=HEADERS)
+        response = _api_get(check_params)
         
         if response.status_code != 200:
             logger.error(f"Error: API returned status code {response.status_code}")
@@ -869,7 +1002,7 @@ def analyze_anchors(domain: str, anchor_text: str = "", limit: int = 30) -> Dict
             "output": "json"
         }
         
-        response = requests.get(API_ENDPOINT, params=params, headers=HEADERS)
+        response = _api_get(params)
         
         if response.status_code != 200:
             logger.error(f"Error with anchors endpoint: {response.status_code}")
@@ -909,7 +1042,7 @@ def analyze_anchors(domain: str, anchor_text: str = "", limit: int = 30) -> Dict
             "output": "json"
         }
         
-        response = requests.get(API_ENDPOINT, params=params, headers=HEADERS)
+        response = _api_get(params)
         
         if response.status_code != 200:
             logger.error(f"Error with backlinks endpoint: {response.status_code}")
@@ -974,9 +1107,6 @@ def analyze_anchors(domain: str, anchor_text: str = "", limit: int = 30) -> Dict
         import traceback
         logger.error(traceback.format_exc())
         return {'error': str(e)}
-    
-    finally:
-        time.sleep(DELAY)
 
 def search_anchor_texts(domains: List[str], search_term: str = None, max_links: int = 100) -> Dict[str, Dict]:
     """
@@ -1133,6 +1263,7 @@ def display_anchor_results(results: Dict[str, Dict], search_term: str = None):
         print("-" * 80)
 
 def main():
+    global FETCH_WORKERS, FETCH_BUDGET, CACHE_TTL
     parser = argparse.ArgumentParser(description='Analyze domain link patterns using Ahrefs API')
     parser.add_argument('domains', nargs='+', help='One or more domains to analyze (REQUIRED)')
     parser.add_argument('--similar', action='store_true', help='Find domains with similar backlink profiles')
@@ -1149,7 +1280,13 @@ def main():
     parser.add_argument('--max-results', type=int, default=50, help='Maximum number of results to show (default: 50)')
     parser.add_argument('--simple', action='store_true', help='Skip detailed outlink analysis for faster results')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    parser.add_argument('--workers', type=int, default=FETCH_WORKERS, help=f'Concurrent link lookups (default: {FETCH_WORKERS})')
+    parser.add_argument('--budget', type=int, help='Maximum uncached link lookups for this run (default: unlimited)')
+    parser.add_argument('--top-k', type=int, help='Only find the top K common links, stopping lookups once they are certain')
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL, help='Seconds cached link sets stay fresh (0 disables the cache)')
     args = parser.parse_args()
+
+    FETCH_WORKERS, FETCH_BUDGET, CACHE_TTL = args.workers, args.budget, args.cache_ttl
     
     # Set logging level based on debug flag
     if args.debug:
@@ -1264,7 +1401,7 @@ def main():
         print(f"Max links per domain: {args.max_links}, Max backlink sources: {args.max_backlinks}")
         print("=" * 50)
         
-        colinked_results = find_colinked_domains(target, args.max_links, args.max_backlinks)
+        colinked_results = find_colinked_domains(target, args.max_links, args.max_backlinks, top_k=args.top_k)
         
         # Convert to format compatible with display_domain_rankings
         formatted_results = {}
@@ -1276,7 +1413,7 @@ def main():
         
         display_domain_rankings(
             formatted_results,
-            f"Domains co-linked with {target}",
+            _ranking_title(f"Domains co-linked with {target}", colinked_results),
             "outlinks",
             args.max_results,
             not args.simple
@@ -1329,7 +1466,8 @@ def main():
         print(f"Max links per domain: {args.max_links}, Max backlink sources: {args.max_backlinks}")
         print("=" * 50)
         
-        similar_domains = find_similar_backlink_profiles(target, args.min_shared, args.max_links, args.max_backlinks)
+        similar_domains = find_similar_backlink_profiles(target, args.min_shared, args.max_links, args.max_backlinks,
+                                                         top_k=args.top_k)
         
         # Convert to format compatible with display_domain_rankings
         formatted_results = {}
@@ -1341,7 +1479,7 @@ def main():
         
         display_domain_rankings(
             formatted_results,
-            f"Domains with similar backlink profiles to {target}",
+            _ranking_title(f"Domains with similar backlink profiles to {target}", similar_domains),
             "outlinks",
             args.max_results,
             not args.simple
@@ -1357,29 +1495,20 @@ def main():
         # Find common domains, passing the max_links parameter
         print("\n===== FINDING COMMON LINKED DOMAINS =====")
         
-        # Create a dictionary to store results
-        all_targets = defaultdict(lambda: {"count": 0, "referrers": []})
-        
-        for domain in domains:
-            logger.info(f"\nAnalyzing outgoing links from: {domain}")
-            target_domains = get_linked_domains(domain, max_links=args.max_links)
-            
-            for target in target_domains:
-                all_targets[target]["count"] += 1
-                all_targets[target]["referrers"].append(domain)
-        
+        # Only include domains linked by multiple sources
+        all_targets = find_common_link_targets(domains, args.max_links, min_count=2, top_k=args.top_k)
+
         # Convert to format compatible with display_domain_rankings
         formatted_results = {}
         for domain, data in all_targets.items():
-            if len(data["referrers"]) > 1:  # Only include domains linked by multiple sources
-                formatted_results[domain] = {
-                    "sources": data["referrers"],
-                    "count": data["count"]
-                }
+            formatted_results[domain] = {
+                "sources": data["referrers"],
+                "count": data["count"]
+            }
         
         display_domain_rankings(
             formatted_results,
-            "Common target domains",
+            _ranking_title("Common target domains", all_targets),
             "outlinks",
             args.max_results,
             not args.simple
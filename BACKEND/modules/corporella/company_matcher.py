@@ -2,9 +2,10 @@
 Company matching algorithms for identifying the same company across different data sources
 """
 import re
-from typing import Dict, Tuple, List, Optional, Any
-from difflib import SequenceMatcher
+from collections import defaultdict
+from typing import Dict, Tuple, List, Optional, Any, Set
 from models.unified_company import UnifiedCompanyProfile, ConfidenceLevel
+from name_blocking import NameBlockIndex, normalize_for_matching, similarity, transliterate
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,8 +27,15 @@ class CompanyMatcher:
     # Common words to ignore in matching
     IGNORE_WORDS = ['THE', 'AND', '&', 'OF', 'FOR', 'IN']
     
+    # Fuzzy threshold for officer names in match_people
+    PEOPLE_MATCH_THRESHOLD = 0.9
+
+    # Minimum confidence returned by find_best_match
+    MIN_MATCH_SCORE = 0.6
+
     def __init__(self):
         self.suffix_pattern = self._build_suffix_pattern()
+        self._normalized_cache: Dict[str, str] = {}
     
     def _build_suffix_pattern(self) -> re.Pattern:
         """Build regex pattern for company suffixes"""
@@ -45,23 +53,13 @@ class CompanyMatcher:
         if not name:
             return ""
         
-        # Convert to uppercase
-        normalized = name.upper().strip()
-        
-        # Remove company type suffixes
-        normalized = self.suffix_pattern.sub('', normalized).strip()
-        
-        # Remove special characters but keep spaces
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        
-        # Remove extra whitespace
-        normalized = ' '.join(normalized.split())
-        
-        # Remove common words
-        words = normalized.split()
-        filtered_words = [w for w in words if w not in self.IGNORE_WORDS]
-        
-        return ' '.join(filtered_words)
+        cached = self._normalized_cache.get(name)
+        if cached is None:
+            # Transliterate + uppercase, strip suffix, punctuation and common words
+            cached = normalize_for_matching(name, self.suffix_pattern, self.IGNORE_WORDS)
+            if len(self._normalized_cache) < 100000:
+                self._normalized_cache[name] = cached
+        return cached
     
     def extract_company_number(self, number: str) -> str:
         """Extract and normalize company registration number"""
@@ -73,10 +71,7 @@ class CompanyMatcher:
     
     def fuzzy_match_score(self, str1: str, str2: str) -> float:
         """Calculate fuzzy match score between two strings"""
-        if not str1 or not str2:
-            return 0.0
-        
-        return SequenceMatcher(None, str1, str2).ratio()
+        return similarity(str1, str2)
     
     def match_addresses(self, addr1: Any, addr2: Any) -> float:
         """Calculate address similarity score"""
@@ -121,12 +116,17 @@ class CompanyMatcher:
         exact_matches = names1.intersection(names2)
         matches = len(exact_matches)
         
-        # Check for fuzzy matches
-        for name1 in names1 - exact_matches:
-            for name2 in names2 - exact_matches:
-                if self.fuzzy_match_score(name1, name2) > 0.9:
-                    matches += 1
-                    break
+        # Check for fuzzy matches - only against blocked candidates
+        remaining2 = names2 - exact_matches
+        if remaining2:
+            index = NameBlockIndex()
+            for name2 in remaining2:
+                index.add(name2, name2)
+            for name1 in names1 - exact_matches:
+                for name2 in index.candidates(name1):
+                    if similarity(name1, name2, self.PEOPLE_MATCH_THRESHOLD) > self.PEOPLE_MATCH_THRESHOLD:
+                        matches += 1
+                        break
         
         # Calculate score based on overlap
         total_unique = len(names1.union(names2))
@@ -232,16 +232,94 @@ class CompanyMatcher:
         
         return overall_score, match_details
     
-    def find_best_match(self, company: Dict[str, Any], candidates: List[Dict[str, Any]]) -> Optional[Tuple[Dict[str, Any], float, Dict[str, Any]]]:
+    def _people_names(self, company: Dict[str, Any]) -> List[str]:
+        people = company.get('officers', []) + company.get('directors', [])
+        return [p.name for p in people if hasattr(p, 'name') and p.name]
+
+    def _address_tokens(self, company: Dict[str, Any]) -> Set[str]:
+        addr = company.get('registered_address') or company.get('headquarters_address')
+        if not addr:
+            return set()
+        text = f"{getattr(addr, 'city', '') or ''} {getattr(addr, 'raw_address', '') or ''}"
+        return set(re.sub(r'[^\w\s]', ' ', transliterate(text)).split())
+
+    def build_candidate_index(self, candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build blocking indexes over candidates (reusable across queries):
+        normalized name tokens/trigrams, registration numbers, officer name
+        tokens and address tokens.
+        """
+        names = NameBlockIndex()
+        numbers: Dict[str, Set[int]] = defaultdict(set)
+        people: Dict[str, Set[int]] = defaultdict(set)
+        addresses: Dict[str, Set[int]] = defaultdict(set)
+
+        for i, candidate in enumerate(candidates):
+            names.add(i, self.normalize_company_name(candidate.get('name', '')))
+            for number in (candidate.get('company_numbers') or {}).values():
+                normalized_number = self.extract_company_number(number)
+                if normalized_number:
+                    numbers[normalized_number].add(i)
+            for person in self._people_names(candidate):
+                for token in transliterate(person).split():
+                    people[token].add(i)
+            for token in self._address_tokens(candidate):
+                addresses[token].add(i)
+
+        return {
+            'candidates': candidates,
+            'names': names,
+            'numbers': numbers,
+            'people': people,
+            'addresses': addresses,
+        }
+
+    def _blocked_candidates(self, company: Dict[str, Any], index: Dict[str, Any]) -> List[int]:
+        """
+        Candidate positions that share at least one blocking key with company:
+        the exact normalized name, a name token or enough trigrams, a company
+        number, or an uncommon officer / address token.
+        """
+        found: Set[int] = set(index['names'].candidates(self.normalize_company_name(company.get('name', ''))))
+
+        for number in (company.get('company_numbers') or {}).values():
+            found.update(index['numbers'].get(self.extract_company_number(number), ()))
+
+        # Tokens present on most candidates ("JOHN", "STREET") don't narrow anything
+        cap = max(NameBlockIndex.SMALL_INDEX, len(index["candidates"]) // 20)
+        for person in self._people_names(company):
+            for token in transliterate(person).split():
+                posting = index['people'].get(token, ())
+                if len(posting) <= cap:
+                    found.update(posting)
+        for token in self._address_tokens(company):
+            posting = index['addresses'].get(token, ())
+            if len(posting) <= cap:
+                found.update(posting)
+
+        return sorted(found)
+
+    def find_best_match(self, company: Dict[str, Any], candidates: List[Dict[str, Any]],
+                        candidate_index: Optional[Dict[str, Any]] = None) -> Optional[Tuple[Dict[str, Any], float, Dict[str, Any]]]:
         """
         Find the best matching company from a list of candidates
         Returns (best_match, confidence_score, match_details) or None
+
+        Only candidates sharing a blocking key (name token/trigram, company
+        number, officer or address token) are scored. Pass a prebuilt
+        candidate_index when matching many companies against one list.
         """
+        if not candidates:
+            return None
+        if candidate_index is None or candidate_index['candidates'] is not candidates:
+            candidate_index = self.build_candidate_index(candidates)
+
         best_match = None
         best_score = 0.0
         best_details = {}
         
-        for candidate in candidates:
+        for i in self._blocked_candidates(company, candidate_index):
+            candidate = candidates[i]
             score, details = self.match_companies(company, candidate)
             if score > best_score:
                 best_score = score
@@ -249,7 +327,13 @@ class CompanyMatcher:
                 best_details = details
         
         # Only return matches above a minimum threshold
-        if best_score >= 0.6:
+        if best_score >= self.MIN_MATCH_SCORE:
             return best_match, best_score, best_details
         
-        return None
\ No newline at end of file
+        return None
+
+    def find_best_matches(self, companies: List[Dict[str, Any]],
+                          candidates: List[Dict[str, Any]]) -> List[Optional[Tuple[Dict[str, Any], float, Dict[str, Any]]]]:
+        """find_best_match for many companies, building the candidate index once"""
+        candidate_index = self.build_candidate_index(candidates)
+        return [self.find_best_match(company, candidates, candidate_index) for company in companies]
@@ -0,0 +1,180 @@
+"""
+Blocking index and fast scoring for company / officer name matching
+
+CompanyMatcher used to compare every query against every candidate with
+difflib.SequenceMatcher, and match_people nested that across both officer
+lists. This module provides the pieces to avoid the quadratic scan:
+
+- normalize_for_matching(): transliteration + legal-designator stripping,
+  done once per name
+- NameBlockIndex: exact-name, token and padded-trigram postings, so only
+  candidates sharing a token / enough trigrams with the query are scored
+- similarity(): difflib's SequenceMatcher ratio with an early cutoff - cheap
+  upper bounds (length, rapidfuzz Indel when installed, quick_ratio) reject
+  pairs that cannot reach the cutoff before the exact ratio is computed
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+try:
+    from rapidfuzz.distance import Indel
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Characters NFKD does not decompose to ASCII
+_TRANSLITERATION = str.maketrans({
+    'ß': 'SS', 'ẞ': 'SS', 'Æ': 'AE', 'æ': 'AE', 'Œ': 'OE', 'œ': 'OE',
+    'Ø': 'O', 'ø': 'O', 'Ł': 'L', 'ł': 'L', 'Đ': 'D', 'đ': 'D',
+    'Þ': 'TH', 'þ': 'TH', 'Ð': 'D', 'ð': 'D', 'ı': 'I',
+})
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+def transliterate(text: str) -> str:
+    """Fold accents and special Latin letters to plain ASCII-ish uppercase"""
+    text = text.translate(_TRANSLITERATION)
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).upper()
+
+
+def normalize_for_matching(name: str,
+                           suffix_pattern: Optional["re.Pattern"] = None,
+                           ignore_words: Iterable[str] = ()) -> str:
+    """
+    Normalize a name once for blocking and scoring:
+    transliterate, strip a trailing legal designator, drop punctuation and
+    ignorable words, collapse whitespace.
+    """
+    if not name:
+        return ""
+    normalized = transliterate(name.strip())
+    if suffix_pattern is not None:
+        normalized = suffix_pattern.sub('', normalized).strip()
+    normalized = _NON_WORD.sub(' ', normalized)
+    ignore = set(ignore_words)
+    return ' '.join(w for w in normalized.split() if w not in ignore)
+
+
+def similarity(a: str, b: str, cutoff: float = 0.0) -> float:
+    """
+    SequenceMatcher(None, a, b).ratio(), or 0.0 as soon as the score provably
+    cannot reach ``cutoff``.
+
+    The Indel similarity (2*LCS / total length) is an upper bound on the
+    ratio, since SequenceMatcher's matching blocks form a common subsequence.
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    # Length bound: ratio <= 2*min(len) / (len(a) + len(b))
+    la, lb = len(a), len(b)
+    if cutoff and 2.0 * min(la, lb) / (la + lb) < cutoff:
+        return 0.0
+
+    if cutoff and RAPIDFUZZ_AVAILABLE and not Indel.normalized_similarity(a, b, score_cutoff=cutoff):
+        return 0.0
+
+    matcher = SequenceMatcher(None, a, b)
+    if cutoff and (matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff):
+        return 0.0
+    score = matcher.ratio()
+    return score if score >= cutoff else 0.0
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of a normalized string"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameBlockIndex:
+    """
+    Inverted index from normalized names, name tokens and trigrams to
+    candidate keys.
+
+    ``candidates()`` returns keys with exactly the query's normalized name,
+    plus keys that share a whole token with the query or at least
+    ``min_trigram_overlap`` of its trigrams. Postings held by a large share
+    of the index are skipped, so a fuzzy match reachable only through such
+    common keys can be missed; when that leaves no candidates at all the
+    postings are re-read without the cap.
+    """
+
+    # Below this many names, no posting is considered too common to use
+    SMALL_INDEX = 64
+
+    def __init__(self, min_trigram_overlap: float = 0.3, max_posting_fraction: float = 0.05):
+        self.min_trigram_overlap = min_trigram_overlap
+        self.max_posting_fraction = max_posting_fraction
+        self.names: Dict[Hashable, str] = {}
+        self._exact: Dict[str, List[Hashable]] = defaultdict(list)
+        self._tokens: Dict[str, List[Hashable]] = defaultdict(list)
+        self._grams: Dict[str, List[Hashable]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, key: Hashable, normalized_name: str):
+        if key in self.names:
+            return
+        # Empty names (only designators / ignored words) are reachable by exact lookup
+        self.names[key] = normalized_name
+        self._exact[normalized_name].append(key)
+        for token in set(normalized_name.split()):
+            self._tokens[token].append(key)
+        for gram in trigrams(normalized_name):
+            self._grams[gram].append(key)
+
+    def candidates(self, normalized_query: str) -> Set[Hashable]:
+        if not self.names:
+            return set()
+
+        found: Set[Hashable] = set(self._exact.get(normalized_query, ()))
+        if not normalized_query:
+            return found
+
+        # Keys shared by a large share of the index ("HOLDINGS", " HO") block
+        # nothing; small indexes are cheap enough to keep every posting.
+        if len(self.names) < self.SMALL_INDEX:
+            posting_cap = len(self.names)
+        else:
+            posting_cap = max(1, int(len(self.names) * self.max_posting_fraction))
+
+        blocked = self._posting_candidates(normalized_query, posting_cap)
+        if not blocked and not found and posting_cap < len(self.names):
+            blocked = self._posting_candidates(normalized_query, len(self.names))
+        return found | blocked
+
+    def _posting_candidates(self, normalized_query: str, posting_cap: int) -> Set[Hashable]:
+        found: Set[Hashable] = set()
+        for token in set(normalized_query.split()):
+            posting = self._tokens.get(token)
+            if posting and len(posting) <= posting_cap:
+                found.update(posting)
+
+        query_grams = trigrams(normalized_query)
+        shared: Counter = Counter()
+        for gram in query_grams:
+            posting = self._grams.get(gram)
+            if posting and len(posting) <= posting_cap:
+                shared.update(posting)
+        needed = max(1, int(len(query_grams) * self.min_trigram_overlap))
+        found.update(key for key, count in shared.items() if count >= needed)
+        return found
+
+    def best_matches(self, normalized_query: str, cutoff: float) -> List[Tuple[Hashable, float]]:
+        """Score only blocked candidates; return (key, score) above cutoff, best first"""
+        scored = []
+        for key in self.candidates(normalized_query):
+            score = similarity(normalized_query, self.names[key], cutoff)
+            if score and score >= cutoff:
+                scored.append((key, score))
+        scored.sort(key=lambda item: -item[1])
+        return scored
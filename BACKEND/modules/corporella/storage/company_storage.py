@@ -9,21 +9,97 @@ import hashlib
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
+import asyncio
 import logging
+import re
+from .connection_pool import SQLiteConnectionPool
 from .entity_graph import EntityGraph
 
 logger = logging.getLogger(__name__)
 
+# Full-text index over company names, aliases and officer names.
+# Rows share the rowid of company_entities and are maintained by triggers.
+FTS_TABLE = "company_search_fts"
+
+FTS_SCHEMA = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name,
+        aliases,
+        officers,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3 4'
+    )
+"""
+
+# Columns fed into the index for one company_entities row (alias: ce)
+_FTS_ROW_VALUES = """
+    ce.name || ' ' || ce.normalized_name,
+    CASE WHEN json_valid(ce.metadata) THEN
+        COALESCE(json_extract(ce.metadata, '$.alias'), '') || ' ' ||
+        COALESCE(json_extract(ce.metadata, '$.variations'), '')
+    ELSE '' END,
+    COALESCE((SELECT group_concat(o.name, ' ') FROM company_officers o WHERE o.company_id = ce.id), '')
+"""
+
+# Keyed by trigger name so _init_fts can replace definitions left by older versions
+FTS_TRIGGERS = {
+    "company_entities_fts_ai": f"""
+    CREATE TRIGGER IF NOT EXISTS company_entities_fts_ai AFTER INSERT ON company_entities BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, aliases, officers)
+        SELECT ce.rowid, {_FTS_ROW_VALUES} FROM company_entities ce WHERE ce.rowid = new.rowid;
+    END
+    """,
+    "company_entities_fts_au": f"""
+    CREATE TRIGGER IF NOT EXISTS company_entities_fts_au AFTER UPDATE ON company_entities BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+        INSERT INTO {FTS_TABLE}(rowid, name, aliases, officers)
+        SELECT ce.rowid, {_FTS_ROW_VALUES} FROM company_entities ce WHERE ce.rowid = new.rowid;
+    END
+    """,
+    "company_entities_fts_ad": f"""
+    CREATE TRIGGER IF NOT EXISTS company_entities_fts_ad AFTER DELETE ON company_entities BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+    END
+    """,
+    "company_officers_fts_ai": f"""
+    CREATE TRIGGER IF NOT EXISTS company_officers_fts_ai AFTER INSERT ON company_officers BEGIN
+        UPDATE {FTS_TABLE}
+        SET officers = (SELECT group_concat(o.name, ' ') FROM company_officers o WHERE o.company_id = new.company_id)
+        WHERE rowid = (SELECT rowid FROM company_entities WHERE id = new.company_id);
+    END
+    """,
+    "company_officers_fts_ad": f"""
+    CREATE TRIGGER IF NOT EXISTS company_officers_fts_ad AFTER DELETE ON company_officers BEGIN
+        UPDATE {FTS_TABLE}
+        SET officers = COALESCE((SELECT group_concat(o.name, ' ') FROM company_officers o WHERE o.company_id = old.company_id), '')
+        WHERE rowid = (SELECT rowid FROM company_entities WHERE id = old.company_id);
+    END
+    """,
+    "company_officers_fts_au": f"""
+    CREATE TRIGGER IF NOT EXISTS company_officers_fts_au AFTER UPDATE OF name, company_id ON company_officers BEGIN
+        UPDATE {FTS_TABLE}
+        SET officers = COALESCE((SELECT group_concat(o.name, ' ') FROM company_officers o WHERE o.company_id = old.company_id), '')
+        WHERE rowid = (SELECT rowid FROM company_entities WHERE id = old.company_id);
+        UPDATE {FTS_TABLE}
+        SET officers = (SELECT group_concat(o.name, ' ') FROM company_officers o WHERE o.company_id = new.company_id)
+        WHERE rowid = (SELECT rowid FROM company_entities WHERE id = new.company_id);
+    END
+    """,
+}
+
+_FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+
 class CorporellaStorage:
     """Manages company data persistence in Search Engineer's SQL database"""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, pool_size: int = 4):
         """
         Initialize storage with database path
 
         Args:
             db_path: Path to SQLite database. If None, tries Search Engineer DB first,
                     then falls back to local database
+            pool_size: Number of long-lived connections kept open (WAL mode)
         """
         if db_path:
             self.db_path = db_path
@@ -38,6 +114,8 @@ class CorporellaStorage:
                 self.db_path = str(Path(__file__).parent.parent / "corporella_data.db")
                 logger.info(f"Using local database: {self.db_path}")
 
+        self._pool = SQLiteConnectionPool(self.db_path, size=pool_size)
+        self._fts_enabled = False
         self._init_database()
 
         # Initialize entity graph using the same database
@@ -45,7 +123,7 @@ class CorporellaStorage:
 
     def _init_database(self):
         """Initialize database tables if they don't exist"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Create company_entities table (compatible with Search Engineer schema)
@@ -139,8 +217,44 @@ class CorporellaStorage:
                 )
             """)
 
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_company_officers_company ON company_officers(company_id)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_company_entities_normalized ON company_entities(normalized_name)"
+            )
+
+            self._init_fts(cursor)
+
             conn.commit()
 
+    def _init_fts(self, cursor):
+        """Create the FTS5 index + sync triggers, backfilling existing rows once"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,))
+        existed = cursor.fetchone() is not None
+        try:
+            cursor.execute(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, company search falls back to LIKE scans: {e}")
+            return
+
+        for name, trigger in FTS_TRIGGERS.items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(trigger)
+
+        if not existed:
+            cursor.execute(f"""
+                INSERT INTO {FTS_TABLE}(rowid, name, aliases, officers)
+                SELECT ce.rowid, {_FTS_ROW_VALUES} FROM company_entities ce
+            """)
+            logger.info(f"Built {FTS_TABLE} for {cursor.rowcount} companies")
+
+        self._fts_enabled = True
+
+    def close(self):
+        """Close pooled connections"""
+        self._pool.close()
+
     def _generate_id(self, name: str, jurisdiction: Optional[str] = None) -> str:
         """Generate unique ID for company"""
         id_string = f"{name.lower()}_{jurisdiction or 'unknown'}"
@@ -212,7 +326,7 @@ class CorporellaStorage:
         metadata_json = json.dumps(metadata)
 
         # Save to database
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Check if company exists
@@ -394,7 +508,7 @@ class CorporellaStorage:
         """
         normalized_name = self._normalize_name(company_name)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Search by normalized name and optionally jurisdiction
@@ -554,7 +668,7 @@ class CorporellaStorage:
             company_id = company_name_or_id
             updates = jurisdiction_or_updates if isinstance(jurisdiction_or_updates, dict) else {}
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Build update query dynamically
@@ -604,9 +718,18 @@ class CorporellaStorage:
 
         return False
 
+    @staticmethod
+    def _fts_query(search_term: str) -> str:
+        """Turn free text into an FTS5 query: every token must match, as a prefix"""
+        tokens = _FTS_TOKEN.findall(search_term)
+        return " ".join(f'"{token}"*' for token in tokens)
+
     def search_companies(self, search_term: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Search for companies by name
+        Search for companies by name, alias or officer name
+
+        Uses the FTS5 index (token + prefix matching, ranked by bm25) when
+        available, otherwise a LIKE scan over the name columns.
 
         Args:
             search_term: Search term
@@ -615,18 +738,32 @@ class CorporellaStorage:
         Returns:
             List of company summaries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        fts_query = self._fts_query(search_term) if self._fts_enabled else ""
+
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
-            # Search in both name and normalized_name
-            cursor.execute("""
-                SELECT id, name, company_number, jurisdiction,
-                       founded_year, updated_at
-                FROM company_entities
-                WHERE name LIKE ? OR normalized_name LIKE ?
-                ORDER BY updated_at DESC
-                LIMIT ?
-            """, (f'%{search_term}%', f'%{search_term.upper()}%', limit))
+            if fts_query:
+                # Name hits weigh more than alias hits, alias more than officers
+                cursor.execute(f"""
+                    SELECT ce.id, ce.name, ce.company_number, ce.jurisdiction,
+                           ce.founded_year, ce.updated_at
+                    FROM {FTS_TABLE} f
+                    JOIN company_entities ce ON ce.rowid = f.rowid
+                    WHERE {FTS_TABLE} MATCH ?
+                    ORDER BY bm25({FTS_TABLE}, 10.0, 5.0, 1.0), ce.updated_at DESC
+                    LIMIT ?
+                """, (fts_query, limit))
+            else:
+                # Search in both name and normalized_name
+                cursor.execute("""
+                    SELECT id, name, company_number, jurisdiction,
+                           founded_year, updated_at
+                    FROM company_entities
+                    WHERE name LIKE ? OR normalized_name LIKE ?
+                    ORDER BY updated_at DESC
+                    LIMIT ?
+                """, (f'%{search_term}%', f'%{search_term.upper()}%', limit))
 
             results = []
             for row in cursor.fetchall():
@@ -641,9 +778,48 @@ class CorporellaStorage:
 
             return results
 
+    def rebuild_search_index(self) -> int:
+        """Rebuild the full-text index from the base tables. Returns rows indexed."""
+        if not self._fts_enabled:
+            return 0
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(f"""
+                INSERT INTO {FTS_TABLE}(rowid, name, aliases, officers)
+                SELECT ce.rowid, {_FTS_ROW_VALUES} FROM company_entities ce
+            """)
+            indexed = cursor.rowcount
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+            return indexed
+
+    # ------------------------------------------------------------------
+    # Async wrappers - run the blocking calls on a worker thread so callers
+    # on the event loop (websocket server) never block on disk I/O.
+    # save_company's graph write is safe there: EntityGraph opens one
+    # connection per thread.
+    # ------------------------------------------------------------------
+
+    async def asave_company(self, entity_dict: Dict[str, Any]) -> str:
+        return await asyncio.to_thread(self.save_company, entity_dict)
+
+    async def aload_company(self, company_name: str, jurisdiction: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.load_company, company_name, jurisdiction)
+
+    async def asearch_companies(self, search_term: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.search_companies, search_term, limit)
+
+    async def aupdate_company(self, company_name_or_id: str,
+                              jurisdiction_or_updates: Optional[Union[str, Dict[str, Any]]] = None,
+                              entity_dict: Optional[Dict[str, Any]] = None) -> bool:
+        return await asyncio.to_thread(self.update_company, company_name_or_id, jurisdiction_or_updates, entity_dict)
+
+    async def aget_entity_relationships(self, company_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.get_entity_relationships, company_id)
+
     def get_stats(self) -> Dict[str, int]:
         """Get database statistics"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             stats = {}
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+SQLite connection pool for Corporella storage
+
+Keeps a small set of long-lived connections (WAL mode) instead of opening a
+new sqlite3 connection on every call. Connections are created with
+check_same_thread=False and are only ever used by one caller at a time, so the
+pool is safe to use from worker threads (e.g. asyncio.to_thread) as well as
+synchronous code.
+
+ThreadLocalConnections is the alternative for objects that keep a
+connection for their whole lifetime: every thread gets its own.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+def open_connection(db_path: str, timeout: float = 30.0) -> sqlite3.Connection:
+    """Long-lived WAL connection with the settings every Corporella store uses"""
+    conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+    conn.execute("PRAGMA foreign_keys=OFF")
+    return conn
+
+
+class SQLiteConnectionPool:
+    """Bounded pool of long-lived SQLite connections"""
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        return open_connection(self.db_path, self.timeout)
+
+    def _acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._open()
+                self._all.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No SQLite connection available for {self.db_path} after {self.timeout}s")
+
+    def _release(self, conn: sqlite3.Connection):
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection for one unit of work.
+
+        Commits on success, rolls back on error (same semantics as
+        ``with sqlite3.connect(...) as conn``), then returns it to the pool.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Close every connection (idle ones now, busy ones when released)"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class ThreadLocalConnections:
+    """One long-lived SQLite connection per calling thread"""
+
+    def __init__(self, db_path: str, timeout: float = 30.0, row_factory: Optional[type] = None):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.row_factory = row_factory
+        self._local = threading.local()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def get(self) -> sqlite3.Connection:
+        """This thread's connection (opened on first use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._closed:
+                raise RuntimeError("Connections are closed")
+            conn = open_connection(self.db_path, self.timeout)
+            if self.row_factory is not None:
+                conn.row_factory = self.row_factory
+            self._local.conn = conn
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def close(self):
+        """Close every thread's connection"""
+        self._closed = True
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            conn.close()
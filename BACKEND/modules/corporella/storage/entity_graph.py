@@ -2,15 +2,51 @@
 """
 Entity Graph System for Corporella Claude
 Creates nodes for all entities and bidirectional edges between them
+
+Writes are buffered per thread and flushed as one transaction when the
+outermost batch() exits, so a whole company record costs one SELECT and
+two executemany calls. Names are indexed with an FTS5 trigram table, and
+neighbourhoods / ownership chains are walked with recursive queries
+inside SQLite. Each thread gets its own connection.
+
+Usage:
+    graph = EntityGraph()
+    with graph.batch():
+        a = graph.create_node('company', 'Acme Holdings Ltd')
+        b = graph.create_node('company', 'Acme Trading Ltd')
+        graph.create_bidirectional_edge(b, a, field_context='subsidiary')
+    graph.find_nodes_by_name('acme')
+    graph.get_neighbourhood(a, depth=2)
+    graph.find_ownership_paths(b, direction='up')
 """
 
 import sqlite3
 import json
 import hashlib
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
 from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from .connection_pool import ThreadLocalConnections
+except ImportError:
+    from connection_pool import ThreadLocalConnections
+
+# Relationship types followed when walking ownership chains
+OWNERSHIP_UP = ('OWNED_BY', 'SUBSIDIARY_OF')
+OWNERSHIP_DOWN = ('OWNS', 'PARENT_OF')
+
+MIN_TRIGRAM_QUERY = 3  # Shorter names cannot use the trigram index
+
+# Allowed entity_nodes.entity_type values (the table's CHECK constraint)
+ENTITY_TYPES = frozenset((
+    'company', 'person', 'address', 'email', 'phone',
+    'url', 'litigation', 'regulator', 'document', 'other'
+))
+
 
 class EntityRelationshipMap:
     """
@@ -154,8 +190,9 @@ class EntityGraph:
             # Try to use Corporella's existing database
             self.db_path = str(Path(__file__).parent.parent / "corporella_data.db")
 
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        self._connections = ThreadLocalConnections(self.db_path, row_factory=sqlite3.Row)
+        self._local = threading.local()
+        self._fts_enabled = False
 
         # Create/update schema
         self._init_schema()
@@ -163,6 +200,11 @@ class EntityGraph:
         # Initialize relationship mapper
         self.relationship_map = EntityRelationshipMap()
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's connection"""
+        return self._connections.get()
+
     def _init_schema(self):
         """Initialize or update the graph schema"""
 
@@ -235,6 +277,56 @@ class EntityGraph:
         """)
 
         self.conn.commit()
+        self._init_name_index()
+
+    def _init_name_index(self):
+        """Trigram index over normalized names (falls back to LIKE scans without FTS5)"""
+
+        cursor = self.conn.cursor()
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entity_names'"
+        ).fetchone()
+
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS entity_names USING fts5(
+                    normalized_name,
+                    content='entity_nodes', content_rowid='rowid',
+                    tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or the trigram tokenizer (< 3.34)
+            self.conn.rollback()
+            return
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS entity_names_ai AFTER INSERT ON entity_nodes BEGIN
+                INSERT INTO entity_names(rowid, normalized_name)
+                VALUES (new.rowid, new.normalized_name);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS entity_names_ad AFTER DELETE ON entity_nodes BEGIN
+                INSERT INTO entity_names(entity_names, rowid, normalized_name)
+                VALUES ('delete', old.rowid, old.normalized_name);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS entity_names_au AFTER UPDATE OF normalized_name ON entity_nodes BEGIN
+                INSERT INTO entity_names(entity_names, rowid, normalized_name)
+                VALUES ('delete', old.rowid, old.normalized_name);
+                INSERT INTO entity_names(rowid, normalized_name)
+                VALUES (new.rowid, new.normalized_name);
+            END
+        """)
+
+        if not exists:
+            # Index nodes written before the index existed
+            cursor.execute("INSERT INTO entity_names(entity_names) VALUES ('rebuild')")
+
+        self.conn.commit()
+        self._fts_enabled = True
 
     def _generate_node_id(self, entity_type: str, name: str) -> str:
         """Generate unique ID for a node"""
@@ -249,86 +341,158 @@ class EntityGraph:
         # Remove extra spaces, convert to lowercase, strip
         return " ".join(name.lower().strip().split())
 
+    # ─────────────────────────────────────────────────────────────
+    # Batched writes
+    # ─────────────────────────────────────────────────────────────
+
+    def _pending(self):
+        """This thread's write buffer"""
+        state = getattr(self._local, 'batch', None)
+        if state is None:
+            state = self._local.batch = SimpleNamespace(depth=0, nodes={}, edges={})
+        return state
+
+    @contextmanager
+    def batch(self):
+        """
+        Buffer node/edge writes and flush them in one transaction
+
+        Nested batches join the outermost one. Reads do not see buffered
+        writes until it exits; on an exception the buffer is discarded.
+        create_node and create_edge check the table constraints before
+        buffering, so one bad record is refused on its own (IntegrityError /
+        False) instead of failing the whole flush.
+        """
+        state = self._pending()
+        state.depth += 1
+        try:
+            yield self
+        except BaseException:
+            state.depth -= 1
+            if not state.depth:
+                state.nodes, state.edges = {}, {}
+            raise
+        state.depth -= 1
+        if not state.depth:
+            self._flush(state)
+
+    def _flush(self, state):
+        """Write buffered nodes and edges in a single transaction"""
+
+        nodes, edges = state.nodes, state.edges
+        state.nodes, state.edges = {}, {}
+        if not nodes and not edges:
+            return
+
+        conn = self.conn
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            if nodes:
+                existing = {
+                    row['id']: row for row in conn.execute("""
+                        SELECT id, properties, sources
+                        FROM entity_nodes
+                        WHERE id IN (SELECT value FROM json_each(?))
+                    """, (json.dumps(list(nodes)),))
+                }
+
+                rows = []
+                for node_id, node in nodes.items():
+                    properties, sources = node['properties'], node['sources']
+                    if node_id in existing:
+                        # Merge properties and sources
+                        merged_props = json.loads(existing[node_id]['properties'] or '{}')
+                        merged_sources = json.loads(existing[node_id]['sources'] or '[]')
+                        merged_props.update(properties)
+                        merged_sources.extend([s for s in sources if s not in merged_sources])
+                        properties, sources = merged_props, merged_sources
+                    rows.append((
+                        node_id, node['entity_type'], node['name'], node['normalized_name'],
+                        json.dumps(properties), json.dumps(sources)
+                    ))
+
+                conn.executemany("""
+                    INSERT INTO entity_nodes
+                    (id, entity_type, name, normalized_name, properties, sources)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        properties = excluded.properties,
+                        sources = excluded.sources,
+                        last_updated = CURRENT_TIMESTAMP
+                """, rows)
+
+            if edges:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO entity_edges
+                    (source_id, target_id, relationship_type, relationship_label,
+                     properties, field_context, confidence, source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, list(edges.values()))
+
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
     def create_node(self, entity_type: str, name: str,
                    properties: Dict = None, sources: List[str] = None) -> str:
         """
         Create or update an entity node
-        Returns the node ID
+        Returns the node ID (written when the enclosing batch exits)
+        Raises sqlite3.IntegrityError for an unknown entity_type or no name
         """
 
-        node_id = self._generate_node_id(entity_type, name)
-        normalized_name = self._normalize_name(name)
-
-        cursor = self.conn.cursor()
-
-        # Check if node exists
-        cursor.execute("""
-            SELECT id, properties, sources
-            FROM entity_nodes
-            WHERE id = ?
-        """, (node_id,))
-
-        existing = cursor.fetchone()
-
-        if existing:
-            # Merge properties and sources
-            existing_props = json.loads(existing['properties'] or '{}')
-            existing_sources = json.loads(existing['sources'] or '[]')
+        if entity_type not in ENTITY_TYPES:
+            raise sqlite3.IntegrityError(f"CHECK constraint failed: entity_type {entity_type!r}")
+        if name is None:
+            raise sqlite3.IntegrityError("NOT NULL constraint failed: entity_nodes.name")
 
-            if properties:
-                existing_props.update(properties)
-            if sources:
-                existing_sources.extend([s for s in sources if s not in existing_sources])
-
-            # Update existing node
-            cursor.execute("""
-                UPDATE entity_nodes
-                SET properties = ?, sources = ?, last_updated = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (json.dumps(existing_props), json.dumps(existing_sources), node_id))
+        node_id = self._generate_node_id(entity_type, name)
 
-        else:
-            # Create new node
-            cursor.execute("""
-                INSERT INTO entity_nodes
-                (id, entity_type, name, normalized_name, properties, sources)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                node_id,
-                entity_type,
-                name,
-                normalized_name,
-                json.dumps(properties or {}),
-                json.dumps(sources or [])
-            ))
+        with self.batch() as graph:
+            pending = graph._pending().nodes
+            node = pending.get(node_id)
+            if node is None:
+                pending[node_id] = {
+                    'entity_type': entity_type,
+                    'name': name,
+                    'normalized_name': self._normalize_name(name),
+                    'properties': dict(properties or {}),
+                    'sources': list(sources or []),
+                }
+            else:
+                if properties:
+                    node['properties'].update(properties)
+                if sources:
+                    node['sources'].extend([s for s in sources if s not in node['sources']])
 
-        self.conn.commit()
         return node_id
 
     def create_edge(self, source_id: str, target_id: str,
                    relationship_type: str, relationship_label: str = None,
                    field_context: str = None, properties: Dict = None,
                    source: str = None, confidence: float = 1.0) -> bool:
-        """Create an edge between two nodes"""
-
-        cursor = self.conn.cursor()
+        """
+        Create an edge between two nodes
+        Returns False (nothing buffered) if an endpoint or the type is missing
+        """
 
-        try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO entity_edges
-                (source_id, target_id, relationship_type, relationship_label,
-                 properties, field_context, confidence, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                source_id, target_id, relationship_type, relationship_label,
-                json.dumps(properties or {}), field_context, confidence, source
-            ))
-            self.conn.commit()
-            return True
-
-        except sqlite3.IntegrityError:
-            # Edge already exists or nodes don't exist
+        key = (source_id, target_id, relationship_type)
+        if None in key:
+            # NOT NULL columns - the insert would fail
             return False
+        row = (
+            source_id, target_id, relationship_type, relationship_label,
+            json.dumps(properties or {}), field_context, confidence, source
+        )
+
+        with self.batch() as graph:
+            pending = graph._pending().edges
+            # Re-adding moves the edge to the end, like INSERT OR REPLACE
+            pending.pop(key, None)
+            pending[key] = row
+        return True
 
     def create_bidirectional_edge(self, entity1_id: str, entity2_id: str,
                                  field_context: str, is_forward: bool = True,
@@ -433,50 +597,192 @@ class EntityGraph:
         """, (node_id,))
 
         row = cursor.fetchone()
-        if row:
-            node = dict(row)
-            if node.get('properties'):
-                node['properties'] = json.loads(node['properties'])
-            if node.get('sources'):
-                node['sources'] = json.loads(node['sources'])
-            return node
-        return None
+        return self._row_to_node(row) if row else None
+
+    def _row_to_node(self, row: sqlite3.Row) -> Dict:
+        node = dict(row)
+        if node.get('properties'):
+            node['properties'] = json.loads(node['properties'])
+        if node.get('sources'):
+            node['sources'] = json.loads(node['sources'])
+        return node
 
     def find_nodes_by_name(self, name: str, entity_type: str = None) -> List[Dict]:
         """Find nodes by name (partial match)"""
 
         cursor = self.conn.cursor()
         normalized = self._normalize_name(name)
-
-        if entity_type:
-            cursor.execute("""
-                SELECT * FROM entity_nodes
-                WHERE normalized_name LIKE ? AND entity_type = ?
-            """, (f"%{normalized}%", entity_type))
+        type_filter = " AND n.entity_type = ?" if entity_type else ""
+        type_params = (entity_type,) if entity_type else ()
+
+        if (self._fts_enabled and len(normalized) >= MIN_TRIGRAM_QUERY
+                and '%' not in normalized and '_' not in normalized):
+            # Trigram candidates, confirmed with the same LIKE as the scan
+            phrase = '"' + normalized.replace('"', '""') + '"'
+            cursor.execute(f"""
+                SELECT n.* FROM entity_names f
+                JOIN entity_nodes n ON n.rowid = f.rowid
+                WHERE entity_names MATCH ? AND n.normalized_name LIKE ?{type_filter}
+                ORDER BY n.rowid
+            """, (phrase, f"%{normalized}%") + type_params)
         else:
-            cursor.execute("""
-                SELECT * FROM entity_nodes
-                WHERE normalized_name LIKE ?
-            """, (f"%{normalized}%",))
+            cursor.execute(f"""
+                SELECT n.* FROM entity_nodes n
+                WHERE n.normalized_name LIKE ?{type_filter}
+            """, (f"%{normalized}%",) + type_params)
+
+        return [self._row_to_node(row) for row in cursor.fetchall()]
+
+    # ─────────────────────────────────────────────────────────────
+    # Multi-hop queries
+    # ─────────────────────────────────────────────────────────────
+
+    def get_neighbourhood(self, node_id: str, depth: int = 2, max_fanout: int = 50,
+                          relationship_types: List[str] = None, limit: int = 1000) -> Dict[str, List[Dict]]:
+        """
+        Nodes within `depth` hops of a node and the edges between them
 
-        nodes = []
+        Walks outgoing edges (every relationship is stored with its inverse),
+        following at most `max_fanout` edges per node, highest confidence
+        first. Each node carries the hop count it was first reached at.
+        """
+
+        type_filter = ""
+        type_params: Tuple = ()
+        if relationship_types:
+            type_filter = f" AND relationship_type IN ({', '.join('?' * len(relationship_types))})"
+            type_params = tuple(relationship_types)
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            WITH RECURSIVE walk(id, depth) AS (
+                SELECT ?, 0
+                UNION
+                SELECT e.target_id, w.depth + 1
+                FROM walk w
+                JOIN entity_edges e ON e.id IN (
+                    SELECT id FROM entity_edges
+                    WHERE source_id = w.id{type_filter}
+                    ORDER BY confidence DESC, id
+                    LIMIT ?
+                )
+                WHERE w.depth < ?
+            ),
+            hood AS (
+                SELECT id, MIN(depth) AS depth FROM walk
+                GROUP BY id
+                ORDER BY depth, id
+                LIMIT ?
+            )
+            SELECT n.*, hood.depth AS depth
+            FROM hood JOIN entity_nodes n ON n.id = hood.id
+            ORDER BY hood.depth, n.rowid
+        """, (node_id,) + type_params + (max_fanout, depth, limit))
+        nodes = [self._row_to_node(row) for row in cursor.fetchall()]
+
+        ids = json.dumps([node['id'] for node in nodes])
+        cursor.execute(f"""
+            SELECT * FROM entity_edges
+            WHERE source_id IN (SELECT value FROM json_each(?))
+              AND target_id IN (SELECT value FROM json_each(?)){type_filter}
+            ORDER BY id
+        """, (ids, ids) + type_params)
+
+        edges = []
         for row in cursor.fetchall():
-            node = dict(row)
-            if node.get('properties'):
-                node['properties'] = json.loads(node['properties'])
-            if node.get('sources'):
-                node['sources'] = json.loads(node['sources'])
-            nodes.append(node)
+            edge = dict(row)
+            if edge.get('properties'):
+                edge['properties'] = json.loads(edge['properties'])
+            edges.append(edge)
+
+        return {'nodes': nodes, 'edges': edges}
+
+    def find_ownership_paths(self, node_id: str, direction: str = 'up', max_depth: int = 6,
+                             max_fanout: int = 50, max_paths: int = 500) -> List[Dict]:
+        """
+        Ownership chains starting at a node, shortest first
 
-        return nodes
+        direction='up' follows owners and parents (OWNED_BY, SUBSIDIARY_OF),
+        'down' follows holdings and subsidiaries (OWNS, PARENT_OF). Every
+        chain prefix is returned; `ultimate` marks chains whose last node
+        has no further owner (or holding). Cycles are cut.
+        """
+
+        if direction not in ('up', 'down'):
+            raise ValueError(f"direction must be 'up' or 'down', not {direction!r}")
+        relationship_types = OWNERSHIP_UP if direction == 'up' else OWNERSHIP_DOWN
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            WITH RECURSIVE chain(id, depth, path, steps) AS (
+                SELECT ?, 0, json_array(?), json_array()
+                UNION ALL
+                SELECT e.target_id, c.depth + 1,
+                       json_insert(c.path, '$[#]', e.target_id),
+                       json_insert(c.steps, '$[#]', json_array(
+                           e.relationship_type,
+                           json_extract(e.properties, '$.percentage')
+                       ))
+                FROM chain c
+                JOIN entity_edges e ON e.id IN (
+                    SELECT id FROM entity_edges
+                    WHERE source_id = c.id AND relationship_type IN (?, ?)
+                    ORDER BY confidence DESC, id
+                    LIMIT ?
+                )
+                WHERE c.depth < ?
+                  AND e.target_id NOT IN (SELECT value FROM json_each(c.path))
+                LIMIT ?
+            )
+            SELECT path, steps, depth,
+                   NOT EXISTS (
+                       SELECT 1 FROM entity_edges x
+                       WHERE x.source_id = chain.id AND x.relationship_type IN (?, ?)
+                   ) AS ultimate
+            FROM chain
+            WHERE depth > 0
+            ORDER BY depth
+        """, (node_id, node_id) + relationship_types + (max_fanout, max_depth, max_paths + 1)
+             + relationship_types)
+        rows = cursor.fetchall()
+
+        # Names for every node on any chain, in one query
+        ids = {node for row in rows for node in json.loads(row['path'])}
+        cursor.execute("""
+            SELECT id, name, entity_type FROM entity_nodes
+            WHERE id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(sorted(ids)),))
+        names = {row['id']: dict(row) for row in cursor.fetchall()}
+
+        paths = []
+        for row in rows:
+            path = json.loads(row['path'])
+            steps = json.loads(row['steps'])
+            paths.append({
+                'path': path,
+                'nodes': [names.get(node, {'id': node, 'name': None, 'entity_type': None}) for node in path],
+                'relationships': [step[0] for step in steps],
+                'percentages': [step[1] for step in steps],
+                'depth': row['depth'],
+                'ultimate': bool(row['ultimate']),
+            })
+
+        return paths
 
     def extract_and_create_entities(self, company_data: Dict,
                                    company_id: str, source: str = None) -> Dict[str, List[str]]:
         """
         Extract all entities from company data and create nodes/edges
+        in a single transaction
         Returns dict of entity_type -> list of node_ids
         """
 
+        with self.batch():
+            return self._extract_entities(company_data, company_id, source)
+
+    def _extract_entities(self, company_data: Dict,
+                          company_id: str, source: str = None) -> Dict[str, List[str]]:
+
         created_entities = {
             'companies': [],
             'people': [],
@@ -596,8 +902,8 @@ class EntityGraph:
         return created_entities
 
     def close(self):
-        """Close database connection"""
-        self.conn.close()
+        """Close every thread's database connection"""
+        self._connections.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for common_link_targets early stopping
+A top-k cut-off may only end lookups once the top k are certain and already
+meet min_count; counts gathered that way are marked partial
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import common_links_finder as clf
+
+
+@pytest.fixture
+def links(monkeypatch):
+    """Serve out-links from a dict, recording lookups, with no cache or budget."""
+    graph = {}
+    calls = []
+
+    def fetch(domain, limit):
+        calls.append(domain)
+        return set(graph.get(domain, ()))
+
+    monkeypatch.setitem(clf._FETCHERS, "out", fetch)
+    monkeypatch.setattr(clf, "get_neighbour_cache", lambda: None)
+    monkeypatch.setattr(clf, "FETCH_BUDGET", None)
+    monkeypatch.setattr(clf, "FETCH_WORKERS", 2)
+    return graph, calls
+
+
+def test_top_k_waits_for_min_count(links):
+    graph, calls = links
+    sources = [f"s{i}.com" for i in range(5)]
+    for source in sources:
+        graph[source] = {"a.com"}
+
+    result = clf.common_link_targets(sources, "out", 100, min_count=5, top_k=1)
+
+    assert result == {"a.com": {"count": 5, "referrers": sources, "partial": False}}
+    assert sorted(calls) == sources
+
+
+def test_similar_profiles_top_k_respects_min_shared(links):
+    graph, _ = links
+    sources = [f"s{i}.com" for i in range(5)]
+    for source in sources:
+        graph[source] = {"a.com"}
+
+    # a.com reaches min_shared after four sources, so the fifth is skipped
+    result = clf.common_link_targets(sources, "out", 100, min_count=4, top_k=1, key="shared_referrers")
+    assert result == {"a.com": {"count": 4, "shared_referrers": sources[:4], "partial": True}}
+
+    result = clf.common_link_targets(sources, "out", 100, min_count=5, top_k=1, key="shared_referrers")
+    assert result == {"a.com": {"count": 5, "shared_referrers": sources, "partial": False}}
+
+
+def test_settled_top_k_is_marked_partial(links):
+    graph, calls = links
+    sources = [f"s{i}.com" for i in range(6)]
+    for source in sources:
+        graph[source] = {"a.com"}
+    graph["s0.com"] = {"a.com", "b.com"}
+
+    result = clf.common_link_targets(sources, "out", 100, min_count=1, top_k=1)
+
+    # After four sources a.com has 4 and b.com 1: two more cannot change the top 1
+    assert len(calls) == 4
+    assert result == {"a.com": {"count": 4, "referrers": sources[:4], "partial": True}}
+
+
+def test_without_top_k_every_source_is_fetched(links):
+    graph, calls = links
+    sources = [f"s{i}.com" for i in range(5)]
+    for source in sources:
+        graph[source] = {"a.com"}
+
+    result = clf.common_link_targets(sources, "out", 100)
+
+    assert len(calls) == 5
+    assert result["a.com"]["partial"] is False
+
+
+def test_ranking_title_notes_partial_counts():
+    assert clf._ranking_title("Common target domains", {"a.com": {"partial": False}}) == "Common target domains"
+    assert "partial counts" in clf._ranking_title("Common target domains", {"a.com": {"partial": True}})
+
+
+def test_lookup_budget_is_reset_per_search(links, monkeypatch):
+    graph, calls = links
+    monkeypatch.setattr(clf, "FETCH_BUDGET", 2)
+    sources = ["s0.com", "s1.com"]
+    for source in sources:
+        graph[source] = {"a.com"}
+
+    for _ in range(2):
+        result = clf.find_common_link_targets(sources)
+        assert result["a.com"]["count"] == 2
+    assert len(calls) == 4
+
+
+def test_api_requests_are_spaced_across_threads(monkeypatch):
+    sent = []
+    monkeypatch.setattr(clf, "DELAY", 0.05)
+    monkeypatch.setattr(clf, "_next_request_at", 0.0)
+    monkeypatch.setattr(clf.requests, "get", lambda *args, **kwargs: sent.append(time.monotonic()), raising=False)
+
+    threads = [threading.Thread(target=clf._api_get, args=({},)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    sent.sort()
+    assert len(sent) == 4
+    assert all(b - a >= 0.045 for a, b in zip(sent, sent[1:]))
+
+
+def test_neighbour_cache_is_usable_from_worker_threads(tmp_path):
+    cache = clf.NeighbourCache(tmp_path / "neighbours.db", ttl=60)
+    cache.put("out", "s0.com", 100, {"a.com"})
+    found, errors = [], []
+
+    def worker():
+        try:
+            found.append(cache.get("out", "s0.com", 100))
+            cache.put("out", "s1.com", 100, {"b.com"})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert not errors
+        assert found == [{"a.com"}] * 4
+        assert cache.get("out", "s1.com", 100) == {"b.com"}
+    finally:
+        cache.close()
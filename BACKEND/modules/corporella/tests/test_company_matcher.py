@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for CompanyMatcher scoring and candidate blocking
+Blocked matching must agree with scoring every candidate
+"""
+
+import random
+import sys
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from company_matcher import CompanyMatcher
+from name_blocking import NameBlockIndex, similarity
+
+
+def _company(name, country="GB"):
+    return {"name": name, "countries": [country]}
+
+
+def _brute_force(matcher, company, candidates):
+    scored = [(matcher.match_companies(company, c)[0], i) for i, c in enumerate(candidates)]
+    score, i = max(scored, key=lambda item: (item[0], -item[1]))
+    return (candidates[i], score) if score >= matcher.MIN_MATCH_SCORE else None
+
+
+def test_fuzzy_score_is_sequence_matcher_ratio():
+    matcher = CompanyMatcher()
+    assert matcher.fuzzy_match_score("ABCDEF", "FBDCEA") == SequenceMatcher(None, "ABCDEF", "FBDCEA").ratio()
+    assert matcher.fuzzy_match_score("", "ACME") == 0.0
+
+
+def test_similarity_cutoff_only_zeroes_scores_below_it():
+    rng = random.Random(7)
+    for _ in range(2000):
+        a = "".join(rng.choice("ABCDE ") for _ in range(rng.randint(1, 12)))
+        b = "".join(rng.choice("ABCDE ") for _ in range(rng.randint(1, 12)))
+        cutoff = rng.choice([0.0, 0.5, 0.8, 0.9])
+        ratio = 1.0 if a == b else SequenceMatcher(None, a, b).ratio()
+        assert similarity(a, b, cutoff) == (ratio if ratio >= cutoff else 0.0)
+
+
+def test_common_tokens_do_not_hide_the_exact_name():
+    matcher = CompanyMatcher()
+    candidates = [_company(f"Global Trading {i} Ltd") for i in range(100)]
+    candidates.append(_company("Global Trading Ltd"))
+    query = _company("Global Trading Limited")
+
+    best = matcher.find_best_match(query, candidates)
+    assert best is not None
+    assert best[0]["name"] == "Global Trading Ltd"
+    assert best[1] == _brute_force(matcher, query, candidates)[1]
+
+
+def test_names_normalizing_to_empty_are_indexed():
+    matcher = CompanyMatcher()
+    candidates = [_company(f"Acme {i} Holdings") for i in range(10)] + [_company("The Limited")]
+    query = _company("The Ltd")
+
+    best = matcher.find_best_match(query, candidates)
+    assert best is not None and best[0]["name"] == "The Limited"
+    assert best[1] == _brute_force(matcher, query, candidates)[1]
+
+
+def test_capped_postings_fall_back_to_full_scan():
+    index = NameBlockIndex()
+    for i in range(100):
+        index.add(i, f"HOLDINGS GROUP {i}")
+
+    assert index.candidates("HOLDINGS GROUP")
+    assert index.best_matches("HOLDINGS GROUP", 0.8)
+
+
+def test_blocked_matching_agrees_with_brute_force():
+    rng = random.Random(11)
+    words = ["NORTH", "SOUTH", "ALPHA", "BETA", "TRADING", "HOLDINGS", "GROUP", "MARINE", "ENERGY"]
+    candidates = [
+        _company(" ".join(rng.sample(words, 3)) + rng.choice([" Ltd", " Limited", " PLC", ""]), rng.choice(["GB", "DE"]))
+        for _ in range(300)
+    ]
+    matcher = CompanyMatcher()
+    index = matcher.build_candidate_index(candidates)
+
+    for _ in range(50):
+        query = _company(" ".join(rng.sample(words, 3)), rng.choice(["GB", "DE"]))
+        blocked = matcher.find_best_match(query, candidates, index)
+        expected = _brute_force(matcher, query, candidates)
+        assert (blocked and blocked[1]) == (expected and expected[1])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for CorporellaStorage full-text company search
+Covers FTS token/prefix matching and trigger-maintained index sync
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from storage.company_storage import FTS_TABLE, FTS_TRIGGERS, CorporellaStorage
+
+
+def _entity(name, jurisdiction, officers=(), alias=""):
+    return {
+        "name": {"value": name, "alias": alias},
+        "about": {"jurisdiction": jurisdiction},
+        "officers": [{"name": officer, "position": "director"} for officer in officers],
+    }
+
+
+def _names(results):
+    return [r["name"] for r in results]
+
+
+def test_prefix_and_token_matching(tmp_path):
+    storage = CorporellaStorage(str(tmp_path / "corporella.db"))
+    storage.save_company(_entity("Apple Inc", "us_ca", officers=["Tim Cook"], alias="Apple Computer"))
+    storage.save_company(_entity("Applied Materials Ltd", "gb"))
+
+    assert set(_names(storage.search_companies("app"))) == {"Apple Inc", "Applied Materials Ltd"}
+    assert _names(storage.search_companies("applied mat")) == ["Applied Materials Ltd"]
+    assert _names(storage.search_companies("computer")) == ["Apple Inc"]
+    assert _names(storage.search_companies("tim cook")) == ["Apple Inc"]
+    assert storage.search_companies("zzz") == []
+
+
+def test_index_follows_updates(tmp_path):
+    storage = CorporellaStorage(str(tmp_path / "corporella.db"))
+    storage.save_company(_entity("Apple Inc", "us_ca", officers=["Tim Cook"]))
+    storage.save_company(_entity("Apple Inc", "us_ca", officers=["Jony Ive"]))
+
+    assert storage.search_companies("cook") == []
+    assert _names(storage.search_companies("jony")) == ["Apple Inc"]
+    assert len(storage.search_companies("apple")) == 1
+
+
+def test_existing_rows_are_backfilled(tmp_path):
+    db_path = str(tmp_path / "corporella.db")
+    storage = CorporellaStorage(db_path)
+    storage.save_company(_entity("Siemens AG", "de", officers=["Roland Busch"]))
+    storage.rebuild_search_index()
+    storage.close()
+
+    reopened = CorporellaStorage(db_path)
+    assert _names(reopened.search_companies("busch")) == ["Siemens AG"]
+
+
+def test_database_without_the_index_is_backfilled_on_open(tmp_path):
+    db_path = str(tmp_path / "corporella.db")
+    storage = CorporellaStorage(db_path)
+    storage.save_company(_entity("Siemens AG", "de", officers=["Roland Busch"], alias="Siemens"))
+    storage.save_company(_entity("Bosch GmbH", "de"))
+    with storage._pool.connection() as conn:
+        for name in FTS_TRIGGERS:
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.execute(f"DROP TABLE {FTS_TABLE}")
+        conn.commit()
+    storage.close()
+
+    reopened = CorporellaStorage(db_path)
+    assert reopened._fts_enabled
+    with reopened._pool.connection() as conn:
+        assert conn.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}").fetchone()[0] == 2
+    assert _names(reopened.search_companies("busch")) == ["Siemens AG"]
+    assert _names(reopened.search_companies("bosch")) == ["Bosch GmbH"]
+
+
+def test_invalid_metadata_json_does_not_break_indexing(tmp_path):
+    db_path = str(tmp_path / "corporella.db")
+    storage = CorporellaStorage(db_path)
+    company_id = storage.save_company(_entity("Siemens AG", "de"))
+    with storage._pool.connection() as conn:
+        conn.execute("UPDATE company_entities SET metadata = 'not json' WHERE id = ?", (company_id,))
+        conn.commit()
+
+    assert storage.rebuild_search_index() == 1
+    assert _names(storage.search_companies("siemens")) == ["Siemens AG"]
+
+
+def test_async_save_writes_graph_from_worker_thread(tmp_path):
+    import asyncio
+
+    storage = CorporellaStorage(str(tmp_path / "corporella.db"))
+    company_id = asyncio.run(storage.asave_company(_entity("Apple Inc", "us_ca", officers=["Tim Cook"])))
+
+    assert [n["name"] for n in storage.entity_graph.find_nodes_by_name("Tim Cook")] == ["Tim Cook"]
+    assert storage.entity_graph.get_node_relationships(company_id)
+
+
+def test_async_update_and_relationships_run_off_the_loop(tmp_path):
+    import asyncio
+
+    storage = CorporellaStorage(str(tmp_path / "corporella.db"))
+    company_id = storage.save_company(_entity("Apple Inc", "us_ca", officers=["Tim Cook"]))
+
+    async def run():
+        updated = await storage.aupdate_company(
+            "Apple Inc", "us_ca", _entity("Apple Inc", "us_ca", officers=["Tim Cook", "Jeff Williams"])
+        )
+        relationships = await storage.aget_entity_relationships(company_id)
+        return updated, relationships
+
+    updated, relationships = asyncio.run(run())
+    assert updated
+    assert _names(storage.search_companies("williams")) == ["Apple Inc"]
+    assert relationships["total"] == len(relationships["outgoing"]) + len(relationships["incoming"]) > 0
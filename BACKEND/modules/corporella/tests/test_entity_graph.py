@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched entity graph
+Buffered writes, the trigram name index, multi-hop queries and per-thread
+connections, on a temporary database
+"""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from storage.connection_pool import ThreadLocalConnections
+from storage.entity_graph import EntityGraph
+
+
+@pytest.fixture
+def graph(tmp_path):
+    graph = EntityGraph(str(tmp_path / "graph.db"))
+    yield graph
+    graph.close()
+
+
+def _count(graph, table):
+    return graph.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+# ─── batch() ───
+
+def test_batch_writes_nothing_until_the_outermost_batch_exits(graph):
+    with graph.batch():
+        with graph.batch():
+            a = graph.create_node('company', 'Acme Holdings Ltd')
+            b = graph.create_node('company', 'Acme Trading Ltd')
+            graph.create_bidirectional_edge(b, a, field_context='subsidiary')
+        assert _count(graph, 'entity_nodes') == 0
+    assert _count(graph, 'entity_nodes') == 2
+    assert _count(graph, 'entity_edges') == 2
+
+
+def test_batch_merges_properties_and_sources_with_stored_nodes(graph):
+    node_id = graph.create_node('company', 'Acme Ltd', {'number': '1'}, ['oc'])
+    with graph.batch():
+        graph.create_node('company', ' ACME  ltd ', {'status': 'active'}, ['oc', 'ch'])
+    node = graph.get_node(node_id)
+    assert node['properties'] == {'number': '1', 'status': 'active'}
+    assert node['sources'] == ['oc', 'ch']
+
+
+def test_batch_is_discarded_on_exception(graph):
+    with pytest.raises(RuntimeError):
+        with graph.batch():
+            graph.create_node('company', 'Acme Ltd')
+            raise RuntimeError("abort")
+    assert _count(graph, 'entity_nodes') == 0
+
+
+def test_bad_edge_is_refused_without_losing_the_batch(graph):
+    with graph.batch():
+        a = graph.create_node('company', 'Acme Holdings Ltd')
+        b = graph.create_node('person', 'Jane Roe')
+        assert graph.create_edge(b, a, 'DIRECTOR_OF') is True
+        assert graph.create_edge(None, a, 'DIRECTOR_OF') is False
+        assert graph.create_edge(b, a, None) is False
+    assert _count(graph, 'entity_nodes') == 2
+    assert _count(graph, 'entity_edges') == 1
+
+
+def test_bad_node_is_refused_without_losing_the_batch(graph):
+    with graph.batch():
+        graph.create_node('company', 'Acme Ltd')
+        with pytest.raises(sqlite3.IntegrityError):
+            graph.create_node('spaceship', 'Enterprise')
+        with pytest.raises(sqlite3.IntegrityError):
+            graph.create_node('person', None)
+    assert [n['name'] for n in graph.find_nodes_by_name('acme')] == ['Acme Ltd']
+
+
+# ─── Name index ───
+
+def test_trigram_index_matches_the_like_scan(graph):
+    names = ['Acme Holdings Ltd', 'Acme Trading Ltd', 'Holdings of Acme', 'Zeta Ltd']
+    with graph.batch():
+        for name in names:
+            graph.create_node('company', name)
+    assert graph._fts_enabled
+
+    indexed = [n['name'] for n in graph.find_nodes_by_name('holdings')]
+    graph._fts_enabled = False
+    scanned = [n['name'] for n in graph.find_nodes_by_name('holdings')]
+    assert indexed == scanned == ['Acme Holdings Ltd', 'Holdings of Acme']
+    assert [n['name'] for n in graph.find_nodes_by_name('ac')] == names[:3]
+
+
+def test_trigram_index_covers_nodes_written_before_it(tmp_path):
+    db = str(tmp_path / "graph.db")
+    graph = EntityGraph(db)
+    graph.create_node('company', 'Acme Holdings Ltd')
+    graph.conn.execute("DROP TABLE entity_names")
+    graph.conn.commit()
+    graph.close()
+
+    reopened = EntityGraph(db)
+    try:
+        assert [n['name'] for n in reopened.find_nodes_by_name('holdings')] == ['Acme Holdings Ltd']
+    finally:
+        reopened.close()
+
+
+# ─── Multi-hop queries ───
+
+def _ownership_chain(graph):
+    """sub -> mid -> top (subsidiary edges) plus an officer of sub."""
+    with graph.batch():
+        sub = graph.create_node('company', 'Sub Ltd')
+        mid = graph.create_node('company', 'Mid Ltd')
+        top = graph.create_node('company', 'Top Ltd')
+        person = graph.create_node('person', 'Jane Roe')
+        graph.create_bidirectional_edge(sub, mid, field_context='subsidiary', properties={'percentage': 100})
+        graph.create_bidirectional_edge(mid, top, field_context='subsidiary', properties={'percentage': 51})
+        graph.create_bidirectional_edge(person, sub, field_context='director')
+    return sub, mid, top, person
+
+
+def test_neighbourhood_reports_hops_and_internal_edges(graph):
+    sub, mid, top, person = _ownership_chain(graph)
+
+    hood = graph.get_neighbourhood(sub, depth=1)
+    assert {n['id']: n['depth'] for n in hood['nodes']} == {sub: 0, mid: 1, person: 1}
+    assert {(e['source_id'], e['target_id']) for e in hood['edges']} == {
+        (sub, mid), (mid, sub), (sub, person), (person, sub)
+    }
+
+    hood = graph.get_neighbourhood(sub, depth=2, relationship_types=['SUBSIDIARY_OF'])
+    assert [n['id'] for n in hood['nodes']] == [sub, mid, top]
+
+
+def test_ownership_paths_walk_up_and_down(graph):
+    sub, mid, top, _ = _ownership_chain(graph)
+
+    up = graph.find_ownership_paths(sub, direction='up')
+    assert [p['path'] for p in up] == [[sub, mid], [sub, mid, top]]
+    assert [p['ultimate'] for p in up] == [False, True]
+    assert up[1]['percentages'] == [100, 51]
+    assert [n['name'] for n in up[1]['nodes']] == ['Sub Ltd', 'Mid Ltd', 'Top Ltd']
+
+    down = graph.find_ownership_paths(top, direction='down')
+    assert [p['path'] for p in down] == [[top, mid], [top, mid, sub]]
+
+    with pytest.raises(ValueError):
+        graph.find_ownership_paths(sub, direction='sideways')
+
+
+def test_ownership_cycles_are_cut(graph):
+    with graph.batch():
+        a = graph.create_node('company', 'A Ltd')
+        b = graph.create_node('company', 'B Ltd')
+        graph.create_edge(a, b, 'OWNED_BY')
+        graph.create_edge(b, a, 'OWNED_BY')
+    assert [p['path'] for p in graph.find_ownership_paths(a)] == [[a, b]]
+
+
+# ─── Connections ───
+
+def test_thread_local_connections_are_per_thread(tmp_path):
+    connections = ThreadLocalConnections(str(tmp_path / "graph.db"), row_factory=sqlite3.Row)
+    main = connections.get()
+    assert connections.get() is main
+    assert main.row_factory is sqlite3.Row
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(connections.get()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main
+
+    # close() closes every thread's connection; new threads get none
+    connections.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        main.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError):
+        other[0].execute("SELECT 1")
+    errors = []
+
+    def late():
+        try:
+            connections.get()
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=late)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+
+
+def test_batches_in_different_threads_do_not_mix(graph):
+    barrier = threading.Barrier(2)
+    errors = []
+
+    def write(prefix):
+        try:
+            with graph.batch():
+                for i in range(20):
+                    graph.create_node('company', f'{prefix} {i} Ltd')
+                barrier.wait()
+            assert len(graph.find_nodes_by_name(prefix)) == 20
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(p,)) for p in ('North', 'South')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert _count(graph, 'entity_nodes') == 40
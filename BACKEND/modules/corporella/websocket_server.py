@@ -104,7 +104,7 @@ class CorporateWebSocketServer:
         populator = CorporateEntityPopulator()
 
         # Check database for existing company profile
-        cached_entity = self.storage.load_company(query, country_code)
+        cached_entity = await self.storage.aload_company(query, country_code)
         if cached_entity:
             print(f"📚 Found cached profile for {query} ({country_code})")
 
@@ -112,7 +112,7 @@ class CorporateWebSocketServer:
             entity_relationships = None
             company_id = cached_entity.get("_db_id")
             if company_id:
-                entity_relationships = self.storage.get_entity_relationships(company_id)
+                entity_relationships = await self.storage.aget_entity_relationships(company_id)
                 if entity_relationships and "error" not in entity_relationships:
                     print(f"🔗 Entity graph: {entity_relationships.get('total', 0)} relationships found")
 
@@ -248,11 +248,11 @@ class CorporateWebSocketServer:
             entity_relationships = None
             if merged_entity:
                 try:
-                    company_id = self.storage.save_company(merged_entity)
+                    company_id = await self.storage.asave_company(merged_entity)
                     print(f"💾 Auto-saved company profile to database: {company_id}")
 
                     # Get entity relationships after save
-                    entity_relationships = self.storage.get_entity_relationships(company_id)
+                    entity_relationships = await self.storage.aget_entity_relationships(company_id)
                     if entity_relationships and "error" not in entity_relationships:
                         print(f"🔗 Entity graph: {entity_relationships.get('total', 0)} relationships created")
 
@@ -370,7 +370,7 @@ class CorporateWebSocketServer:
                 raise ValueError("Company name required for update")
 
             # Update in storage
-            updated = self.storage.update_company(company_name, jurisdiction, entity)
+            updated = await self.storage.aupdate_company(company_name, jurisdiction, entity)
 
             if updated:
                 print(f"✏️ Updated {field or 'entity'} for {company_name}")
@@ -381,7 +381,7 @@ class CorporateWebSocketServer:
                 })
             else:
                 # Company doesn't exist, save as new
-                company_id = self.storage.save_company(entity)
+                company_id = await self.storage.asave_company(entity)
                 print(f"💾 Created new profile for {company_name}: {company_id}")
                 await self.send_to_client(websocket, {
                     "type": "update_success",
@@ -496,7 +496,7 @@ class CorporateWebSocketServer:
         try:
             # If we have company name instead of ID, look it up
             if not entity_id and company_name:
-                cached_entity = self.storage.load_company(company_name, jurisdiction)
+                cached_entity = await self.storage.aload_company(company_name, jurisdiction)
                 if cached_entity:
                     entity_id = cached_entity.get("_db_id")
 
@@ -508,7 +508,7 @@ class CorporateWebSocketServer:
                 return
 
             # Get relationships
-            relationships = self.storage.get_entity_relationships(entity_id)
+            relationships = await self.storage.aget_entity_relationships(entity_id)
 
             await self.send_to_client(websocket, {
                 "type": "relationships_result",
@@ -676,10 +676,7 @@ class CorporateWebSocketServer:
 
                 # Save to database if we got good data
                 if updated_entity.get("name", {}).get("value"):
-                    company_id = self.storage.save_company(
-                        updated_entity,
-                        country_code=country
-                    )
+                    company_id = await self.storage.asave_company(updated_entity)
                     if company_id:
                         print(f"💾 Saved bang-enriched entity to database (ID: {company_id})")
 
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+EYE-D Search Cache Store
+
+Keyed, incrementally persisted replacement for the old ``search_cache.pkl``
+blob. Every cached search is one row in a SQLite database (WAL mode), so
+persisting a new result is a single upsert and a restart only opens the file;
+entries are read back on demand.
+
+- TTL eviction: expired rows are treated as misses and purged on write
+- Size eviction: least-recently-accessed rows are dropped once the store
+  exceeds ``max_entries`` or ``max_bytes``
+- Concurrency: one connection per thread, WAL + busy_timeout so several
+  server workers/processes can share the same file
+- Streaming: ``iter_items`` walks the table with a cursor instead of
+  materialising the whole cache
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = int(os.getenv('EYED_CACHE_TTL', str(30 * 24 * 3600)))
+DEFAULT_MAX_ENTRIES = int(os.getenv('EYED_CACHE_MAX_ENTRIES', '50000'))
+DEFAULT_MAX_BYTES = int(os.getenv('EYED_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+
+# Run the (cheap) eviction sweep once every N writes rather than on every put
+EVICT_EVERY = 200
+
+
+class SearchCacheStore:
+    """SQLite-backed key/value store for EYE-D search results."""
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: Optional[int] = DEFAULT_TTL_SECONDS,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    ):
+        self.db_path = str(db_path)
+        self.ttl_seconds = ttl_seconds or None
+        self.max_entries = max_entries or None
+        self.max_bytes = max_bytes or None
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self.init_database()
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            self._local.conn = conn
+        return conn
+
+    def init_database(self):
+        """Create the cache table and indexes if they don't exist"""
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                expires_at REAL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache(accessed_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_search_cache_expires ON search_cache(expires_at)')
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None if missing/expired."""
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT value, expires_at FROM search_cache WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            conn.execute('DELETE FROM search_cache WHERE key = ?', (key,))
+            return None
+        conn.execute('UPDATE search_cache SET accessed_at = ? WHERE key = ?', (now, key))
+        return json.loads(value)
+
+    def iter_items(self, batch_size: int = 500) -> Iterator[Tuple[str, Any]]:
+        """Stream live (key, value) pairs without loading the whole table."""
+        conn = self._connect()
+        now = time.time()
+        last_key = ''
+        while True:
+            rows = conn.execute(
+                '''SELECT key, value FROM search_cache
+                   WHERE key > ? AND (expires_at IS NULL OR expires_at > ?)
+                   ORDER BY key LIMIT ?''',
+                (last_key, now, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for key, value in rows:
+                yield key, json.loads(value)
+            last_key = rows[-1][0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialise the live cache (legacy /api/cache/load response)."""
+        return dict(self.iter_items())
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM search_cache').fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        entries, total_bytes = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache'
+        ).fetchone()
+        return {
+            'entries': entries,
+            'bytes': total_bytes,
+            'ttl_seconds': self.ttl_seconds,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+        }
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+        """Persist a single entry (one upsert, independent of cache size)."""
+        self.put_many([(key, value)], ttl_seconds=ttl_seconds)
+
+    def put_many(self, items: Iterable[Tuple[str, Any]], ttl_seconds: Optional[int] = None) -> int:
+        """Upsert several entries in one transaction. Returns rows written."""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        rows = []
+        for key, value in items:
+            payload = json.dumps(value, default=str)
+            rows.append((str(key), payload, len(payload), now, now, expires_at))
+        if not rows:
+            return 0
+
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('''
+                INSERT INTO search_cache (key, value, size, created_at, accessed_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    size = excluded.size,
+                    accessed_at = excluded.accessed_at,
+                    expires_at = excluded.expires_at
+            ''', rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        with self._writes_lock:
+            self._writes += len(rows)
+            due = self._writes >= EVICT_EVERY
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+        return len(rows)
+
+    def delete(self, key: str) -> bool:
+        cur = self._connect().execute('DELETE FROM search_cache WHERE key = ?', (key,))
+        return cur.rowcount > 0
+
+    def clear(self):
+        self._connect().execute('DELETE FROM search_cache')
+
+    def evict(self) -> int:
+        """Drop expired rows, then least-recently-accessed rows over the limits."""
+        conn = self._connect()
+        removed = 0
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            removed += conn.execute(
+                'DELETE FROM search_cache WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                (time.time(),)
+            ).rowcount
+
+            if self.max_entries:
+                removed += conn.execute('''
+                    DELETE FROM search_cache WHERE key IN (
+                        SELECT key FROM search_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (self.max_entries,)).rowcount
+
+            if self.max_bytes:
+                total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM search_cache').fetchone()[0]
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    doomed = []
+                    for key, size in conn.execute(
+                        'SELECT key, size FROM search_cache ORDER BY accessed_at ASC'
+                    ):
+                        doomed.append((key,))
+                        excess -= size
+                        if excess <= 0:
+                            break
+                    conn.executemany('DELETE FROM search_cache WHERE key = ?', doomed)
+                    removed += len(doomed)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return removed
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def import_legacy_pickle(self, pickle_path: Path) -> int:
+        """One-time import of the old search_cache.pkl blob.
+
+        The pickle is renamed to ``*.migrated`` afterwards so it is never
+        loaded again.
+        """
+        pickle_path = Path(pickle_path)
+        if not pickle_path.exists():
+            return 0
+        try:
+            with open(pickle_path, 'rb') as f:
+                legacy = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read legacy search cache {pickle_path}: {e}")
+            return 0
+
+        imported = 0
+        if isinstance(legacy, dict):
+            imported = self.put_many(legacy.items())
+        pickle_path.rename(pickle_path.with_suffix(pickle_path.suffix + '.migrated'))
+        logger.info(f"Migrated {imported} entries from {pickle_path.name}")
+        return imported
@@ -128,20 +128,13 @@ function setInfoPanelCollapsed(collapsed, options = {}) {
     }
 }
 
-// Load cache from disk on startup
+// Load cache from disk on startup (search entries are fetched lazily per key)
 async function loadCacheFromStorage() {
     try {
-        const response = await fetch('/api/cache/load');
+        const response = await fetch('/api/cache/load?search_cache=0');
         const result = await response.json();
         
         if (result.data) {
-            // Load search cache
-            if (result.data.search_cache) {
-                // Convert object back to Map
-                searchCache = new Map(Object.entries(result.data.search_cache));
-                console.log(`Loaded ${searchCache.size} cached searches from disk`);
-            }
-            
             // Return graph state for loading
             return result.data.graph_state;
         }
@@ -151,33 +144,39 @@ async function loadCacheFromStorage() {
     return null;
 }
 
-// Save cache to disk
-async function saveCacheToStorage() {
+// Look up a single search cache entry, in memory first and then on disk
+async function loadCacheEntryFromStorage(cacheKey) {
+    if (searchCache.has(cacheKey)) {
+        return searchCache.get(cacheKey);
+    }
     try {
-        // Convert Map to object for serialization
-        const cacheObj = {};
-        searchCache.forEach((value, key) => {
-            cacheObj[key] = value;
-        });
-        
-        const data = {
-            search_cache: cacheObj
-        };
-        
-        const response = await fetch('/api/cache/save', {
-            method: 'POST',
+        const response = await fetch(`/api/cache/entry/${encodeURIComponent(cacheKey)}`);
+        if (!response.ok) {
+            return null;
+        }
+        const result = await response.json();
+        if (result.data) {
+            searchCache.set(cacheKey, result.data);
+            return result.data;
+        }
+    } catch (e) {
+        console.error('Error loading cache entry from disk:', e);
+    }
+    return null;
+}
+
+// Persist a single search cache entry (one upsert on the server)
+async function saveCacheEntryToStorage(cacheKey, value) {
+    try {
+        await fetch(`/api/cache/entry/${encodeURIComponent(cacheKey)}`, {
+            method: 'PUT',
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify(data)
+            body: JSON.stringify({ data: value })
         });
-        
-        const result = await response.json();
-        if (result.success) {
-            console.log(`Saved ${searchCache.size} searches to disk`);
-        }
     } catch (e) {
-        console.error('Error saving cache to disk:', e);
+        console.error('Error saving cache entry to disk:', e);
     }
 }
 
@@ -4603,8 +4602,8 @@ async function performSearch(query, type = null, parentNodeId = null) {
     
     // Check cache first
     const cacheKey = `${query}_${type || 'auto'}`;
-    if (searchCache.has(cacheKey)) {
-        const cachedData = searchCache.get(cacheKey);
+    const cachedData = await loadCacheEntryFromStorage(cacheKey);
+    if (cachedData) {
         updateStatus(`Using cached results for ${query}`);
         
         // If no parent node, don't create a search node - just process results without parent
@@ -4679,7 +4678,7 @@ async function performSearch(query, type = null, parentNodeId = null) {
         
         // Cache the results and save to storage
         searchCache.set(cacheKey, data);
-        saveCacheToStorage();
+        saveCacheEntryToStorage(cacheKey, data);
         
         // If no parent node, don't create a search node - just process results without parent
         // This means initial searches won't have a parent node
@@ -11540,7 +11539,7 @@ function initializeSidebarResize() {
 // Force load graph data
 function forceLoadGraph() {
     console.log('FORCE LOAD CLICKED!');
-    fetch('/api/cache/load')
+    fetch('/api/cache/load?search_cache=0')
         .then(r => {
             console.log('Got response:', r);
             return r.json();
@@ -13160,7 +13159,7 @@ window.forceLoadGraph = function() {
         return;
     }
     
-    fetch('/api/cache/load')
+    fetch('/api/cache/load?search_cache=0')
         .then(r => r.json())
         .then(data => {
             if (data.data && data.data.graph_state && data.data.graph_state.nodes) {
@@ -15123,7 +15122,7 @@ window.recoverLegacyData = async function() {
     if (!confirm('This will load the graph_state.json file from cache. Continue?')) return;
     
     try {
-        const response = await fetch('/api/cache/load');
+        const response = await fetch('/api/cache/load?search_cache=0');
         const result = await response.json();
         
         if (result.data && result.data.graph_state) {
@@ -4,7 +4,7 @@ Web server for DeHashed visualization
 Acts as a proxy to handle DeHashed API requests
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import requests
 import json
@@ -12,8 +12,8 @@ import re
 import os
 import time
 import hashlib
+import threading
 import anthropic
-import pickle
 from pathlib import Path
 from datetime import datetime
 from bs4 import BeautifulSoup
@@ -90,6 +90,7 @@ except ImportError:
 
 # Import project management module
 from projects import ProjectManager
+from cache_store import SearchCacheStore
 
 # Import SE's EntityGraphStorageV2 for bidirectional sync
 try:
@@ -279,9 +280,33 @@ AHREFS_ENDPOINT = "https://apiv2.ahrefs.com"
 # Cache file paths
 CACHE_DIR = Path(__file__).parent / 'cache'
 CACHE_DIR.mkdir(exist_ok=True)
-SEARCH_CACHE_FILE = CACHE_DIR / 'search_cache.pkl'
+SEARCH_CACHE_FILE = CACHE_DIR / 'search_cache.pkl'  # legacy blob, migrated into SEARCH_CACHE_DB
+SEARCH_CACHE_DB = CACHE_DIR / 'search_cache.db'
 GRAPH_STATE_FILE = CACHE_DIR / 'graph_state.json'
 
+# Keyed search cache (SQLite/WAL). Opened lazily so startup never reads it.
+_search_cache_store = None
+_search_cache_store_lock = threading.Lock()
+
+
+def get_search_cache_store() -> SearchCacheStore:
+    global _search_cache_store
+    if _search_cache_store is None:
+        with _search_cache_store_lock:
+            if _search_cache_store is None:
+                store = SearchCacheStore(str(SEARCH_CACHE_DB))
+                store.import_legacy_pickle(SEARCH_CACHE_FILE)
+                _search_cache_store = store
+    return _search_cache_store
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    """Write JSON via a temp file + rename so a crash never truncates the original"""
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
 # Initialize project manager
 project_manager = ProjectManager(db_path=str(CACHE_DIR / 'projects.db'))
 
@@ -714,7 +739,11 @@ def ai_chat():
 
 @app.route('/api/cache/load', methods=['GET'])
 def load_cache():
-    """Load cache from disk"""
+    """Load cache from disk
+
+    Pass ?search_cache=0 to skip the search entries and fetch them lazily
+    through /api/cache/entry/<key>.
+    """
     try:
         cache_data = {
             'search_cache': {},
@@ -722,9 +751,8 @@ def load_cache():
         }
         
         # Load search cache
-        if SEARCH_CACHE_FILE.exists():
-            with open(SEARCH_CACHE_FILE, 'rb') as f:
-                cache_data['search_cache'] = pickle.load(f)
+        if request.args.get('search_cache', '1') != '0':
+            cache_data['search_cache'] = get_search_cache_store().to_dict()
                 
         # Load graph state
         if GRAPH_STATE_FILE.exists():
@@ -741,29 +769,70 @@ def load_cache():
 
 @app.route('/api/cache/save', methods=['POST'])
 def save_cache():
-    """Save cache to disk"""
+    """Save cache to disk (search entries are upserted, not rewritten)"""
     try:
         data = request.json
         
         # Save search cache
         if 'search_cache' in data:
-            with open(SEARCH_CACHE_FILE, 'wb') as f:
-                pickle.dump(data['search_cache'], f)
+            get_search_cache_store().put_many((data['search_cache'] or {}).items())
                 
         # Save graph state
         if 'graph_state' in data:
-            with open(GRAPH_STATE_FILE, 'w') as f:
-                json.dump(data['graph_state'], f)
+            _write_json_atomic(GRAPH_STATE_FILE, data['graph_state'])
                 
         return jsonify({'success': True})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache/entry/<path:key>', methods=['GET', 'PUT', 'DELETE'])
+def cache_entry(key):
+    """Read, write or delete a single search cache entry"""
+    try:
+        store = get_search_cache_store()
+        if request.method == 'GET':
+            value = store.get(key)
+            if value is None:
+                return jsonify({'error': 'Not found'}), 404
+            return jsonify({'success': True, 'key': key, 'data': value})
+        if request.method == 'PUT':
+            data = request.json or {}
+            store.put(key, data.get('data'), ttl_seconds=data.get('ttl_seconds'))
+            return jsonify({'success': True})
+        return jsonify({'success': store.delete(key)})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/cache/export', methods=['GET'])
+def export_cache():
+    """Stream the search cache as NDJSON, one {"key", "data"} record per line"""
+    store = get_search_cache_store()
+
+    def generate():
+        for key, value in store.iter_items():
+            yield json.dumps({'key': key, 'data': value}, default=str) + '\n'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename=search_cache.ndjson'}
+    )
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Entry count, stored bytes and eviction limits of the search cache"""
+    try:
+        return jsonify({'success': True, 'stats': get_search_cache_store().stats()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/cache/clear', methods=['POST'])
 def clear_cache():
     """Clear cache files"""
     try:
+        get_search_cache_store().clear()
         if SEARCH_CACHE_FILE.exists():
             SEARCH_CACHE_FILE.unlink()
         if GRAPH_STATE_FILE.exists():
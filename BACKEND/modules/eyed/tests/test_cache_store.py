@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Unit tests for the SQLite-backed EYE-D search cache store"""
+
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_store import SearchCacheStore
+
+
+def test_put_get_roundtrip(tmp_path):
+    store = SearchCacheStore(str(tmp_path / 'cache.db'))
+    store.put('john@example.com_email', {'results': [{'id': 1}]})
+    assert store.get('john@example.com_email') == {'results': [{'id': 1}]}
+    assert store.get('missing') is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    store = SearchCacheStore(str(tmp_path / 'cache.db'))
+    store.put('old', {'results': []}, ttl_seconds=-1)
+    assert store.get('old') is None
+    assert store.count() == 0
+
+
+def test_size_eviction_keeps_most_recent(tmp_path):
+    store = SearchCacheStore(str(tmp_path / 'cache.db'), max_entries=2, max_bytes=None)
+    for i in range(4):
+        store.put(f'k{i}', {'i': i})
+    store.evict()
+    assert [key for key, _ in store.iter_items()] == ['k2', 'k3']
+
+
+def test_iter_items_streams_in_batches(tmp_path):
+    store = SearchCacheStore(str(tmp_path / 'cache.db'))
+    store.put_many((f'k{i:03d}', i) for i in range(25))
+    assert dict(store.iter_items(batch_size=4)) == {f'k{i:03d}': i for i in range(25)}
+
+
+def test_legacy_pickle_is_migrated_once(tmp_path):
+    legacy = tmp_path / 'search_cache.pkl'
+    with open(legacy, 'wb') as f:
+        pickle.dump({'a_email': {'results': []}}, f)
+
+    store = SearchCacheStore(str(tmp_path / 'cache.db'))
+    assert store.import_legacy_pickle(legacy) == 1
+    assert not legacy.exists()
+    assert store.import_legacy_pickle(legacy) == 0
+    assert store.get('a_email') == {'results': []}
@@ -14,17 +14,58 @@ Output:
   - Clusters of similar entities
   - Bridges (entities connecting different clusters)
   - Surprising connections (unexpected similarities)
+
+Each entity's features (node, type, related nodes) are fetched once. Small
+selections compare every pair; above EXACT_HANDSHAKE_LIMIT entities only
+pairs sharing a blocking key are compared:
+  - a name token or its phonetic code
+  - a related node
+  - a tag, jurisdiction or source
+  - an identifier (IDENTIFIER_FIELDS, e.g. company number, email)
+Pruned pairs count as similarity 0. A pair sharing none of these is
+therefore never compared, even if the similarity engine would have scored
+it on something else. Keys held by more than MAX_BLOCK_SIZE entities are
+skipped too. Raise EXACT_HANDSHAKE_LIMIT when every pair must be compared.
+
+Comparisons through a similarity engine run concurrently; without one,
+scores come straight from the shared-connection sets.
 """
 
 import asyncio
+import heapq
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple, Set
 from itertools import combinations
 
+from ..similarity.index import normalize_name, soundex
 from .selection import BulkSelection, BatchOperation
 
 
+# Up to this many entities, every pair is compared
+EXACT_HANDSHAKE_LIMIT = 60
+
+# Blocking keys shared by more entities than this separate nothing
+MAX_BLOCK_SIZE = 100
+
+# Entity fields (top level or under "properties") used as identifier keys
+IDENTIFIER_FIELDS = (
+    "company_number", "registration_number", "email", "phone",
+    "domain", "dob", "address",
+)
+# Multi-valued fields: key prefix -> field names
+GROUP_FIELDS = {
+    "tag": ("tags",),
+    "j": ("jurisdiction", "jurisdictions"),
+    "s": ("source", "sources", "url"),
+}
+
+# Similarity engine comparisons in flight / scheduled per gather
+HANDSHAKE_CONCURRENCY = 16
+COMPARE_BATCH = 1024
+
+
 @dataclass
 class PairwiseComparison:
     """Result of comparing two entities."""
@@ -71,9 +112,10 @@ class HandshakeResult:
     # Raw comparisons
     comparisons: List[PairwiseComparison] = field(default_factory=list)
     total_pairs: int = 0
+    pruned_pairs: int = 0                      # Shared no blocking key (similarity 0, never compared)
 
     # Aggregated results
-    similarity_matrix: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    similarity_matrix: Dict[str, Dict[str, float]] = field(default_factory=dict)  # Compared pairs only
     clusters: List[SimilarityCluster] = field(default_factory=list)
     bridges: List[ClusterBridge] = field(default_factory=list)
 
@@ -87,17 +129,106 @@ class HandshakeResult:
 # PAIRWISE COMPARISON
 # =============================================================================
 
-async def compare_pair(
-    entity_a: Dict[str, Any],
-    entity_b: Dict[str, Any],
-    similarity_engine: Any = None,
+@dataclass
+class EntityFeatures:
+    """Per-entity data fetched once for a handshake."""
+    entity_type: Optional[str] = None
+    related: Optional[Set[str]] = None         # None when the lookup failed
+    blocking_keys: Set[str] = field(default_factory=set)
+
+
+def _related_ids(entity: Dict[str, Any], graph_provider: Any) -> Optional[Set[str]]:
+    """IDs of nodes related to an entity (None if the graph lookup fails)."""
+    try:
+        return {
+            n["id"] if isinstance(n, dict) else n
+            for n in graph_provider.get_related_nodes(entity["id"])
+        }
+    except Exception:
+        return None
+
+
+def _field_values(entity: Dict[str, Any], name: str) -> List[str]:
+    """Non-empty values of a field, from the entity or its properties, lowercased."""
+    properties = entity.get("properties")
+    value = entity.get(name)
+    if value is None and isinstance(properties, dict):
+        value = properties.get(name)
+    if value is None:
+        return []
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    return [str(v).strip().lower() for v in values if v is not None and str(v).strip()]
+
+
+def _entity_features(
+    entities: List[Dict[str, Any]],
     graph_provider: Any = None,
-) -> PairwiseComparison:
+) -> List[EntityFeatures]:
+    """Fetch type, related nodes and blocking keys for every entity once."""
+    features = []
+    for entity in entities:
+        feature = EntityFeatures()
+        if graph_provider:
+            feature.entity_type = entity.get("class") or entity.get("type")
+            feature.related = _related_ids(entity, graph_provider)
+
+        label = normalize_name(str(entity.get("label", entity.get("id", ""))))
+        for token in label.split():
+            feature.blocking_keys.add(f"t:{token}")
+            code = soundex(token)
+            if code:
+                feature.blocking_keys.add(f"p:{code}")
+        feature.blocking_keys.update(f"c:{node_id}" for node_id in feature.related or ())
+        for prefix, names in GROUP_FIELDS.items():
+            for name in names:
+                feature.blocking_keys.update(f"{prefix}:{v}" for v in _field_values(entity, name))
+        for name in IDENTIFIER_FIELDS:
+            feature.blocking_keys.update(f"id:{name}={v}" for v in _field_values(entity, name))
+        features.append(feature)
+    return features
+
+
+def _candidate_pairs(features: List[EntityFeatures], use_names: bool) -> List[Tuple[int, int]]:
     """
-    Compare two entities and return similarity analysis.
+    Pairs of entity positions worth a full comparison, in combinations() order.
 
-    Uses the existing =? compare operator logic internally.
+    Without a similarity engine only shared related nodes can score, so the
+    other keys are ignored. Keys held by more than MAX_BLOCK_SIZE entities
+    are skipped.
     """
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for position, feature in enumerate(features):
+        for key in feature.blocking_keys:
+            if use_names or key.startswith("c:"):
+                postings[key].append(position)
+
+    pairs: Set[Tuple[int, int]] = set()
+    for posting in postings.values():
+        if 2 <= len(posting) <= MAX_BLOCK_SIZE:
+            pairs.update(combinations(posting, 2))
+    return sorted(pairs)
+
+
+async def _engine_compare(
+    similarity_engine: Any,
+    entity_a: Dict[str, Any],
+    entity_b: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Run the similarity engine on one pair (None if it fails)."""
+    try:
+        return await similarity_engine.compare(entity_a.get("id"), entity_b.get("id"))
+    except Exception:
+        return None
+
+
+def _build_comparison(
+    entity_a: Dict[str, Any],
+    entity_b: Dict[str, Any],
+    engine_result: Optional[Dict[str, Any]] = None,
+    related_a: Optional[Set[str]] = None,
+    related_b: Optional[Set[str]] = None,
+) -> PairwiseComparison:
+    """Combine an engine result and shared connections into a PairwiseComparison."""
     comparison = PairwiseComparison(
         entity_a_id=entity_a.get("id", ""),
         entity_a_label=entity_a.get("label", entity_a.get("id", "")),
@@ -106,38 +237,24 @@ async def compare_pair(
         similarity_score=0.0,
     )
 
-    # Use similarity engine if available
-    if similarity_engine:
+    if engine_result is not None:
         try:
-            result = await similarity_engine.compare(
-                entity_a.get("id"),
-                entity_b.get("id")
-            )
-            comparison.similarity_score = result.get("score", 0.0)
-            comparison.shared_attributes = result.get("shared_attributes", [])
-            comparison.verdict = result.get("verdict", "UNKNOWN")
-            comparison.reasoning = result.get("reasoning", "")
+            comparison.similarity_score = engine_result.get("score", 0.0)
+            comparison.shared_attributes = engine_result.get("shared_attributes", [])
+            comparison.verdict = engine_result.get("verdict", "UNKNOWN")
+            comparison.reasoning = engine_result.get("reasoning", "")
         except Exception:
             pass
 
-    # Find shared connections via graph
-    if graph_provider:
-        try:
-            # Get related nodes for each entity
-            related_a = set(n["id"] for n in graph_provider.get_related_nodes(entity_a["id"]))
-            related_b = set(n["id"] for n in graph_provider.get_related_nodes(entity_b["id"]))
-
-            # Shared connections
-            shared = related_a & related_b
-            comparison.shared_connections = list(shared)
+    # Shared connections
+    if related_a is not None and related_b is not None:
+        shared = related_a & related_b
+        comparison.shared_connections = list(shared)
 
-            # Boost similarity if they share connections
-            if shared and comparison.similarity_score < 0.5:
-                connection_boost = min(len(shared) * 0.1, 0.3)
-                comparison.similarity_score += connection_boost
-
-        except Exception:
-            pass
+        # Boost similarity if they share connections
+        if shared and comparison.similarity_score < 0.5:
+            connection_boost = min(len(shared) * 0.1, 0.3)
+            comparison.similarity_score += connection_boost
 
     # Determine verdict if not set
     if not comparison.verdict:
@@ -153,10 +270,62 @@ async def compare_pair(
     return comparison
 
 
+async def compare_pair(
+    entity_a: Dict[str, Any],
+    entity_b: Dict[str, Any],
+    similarity_engine: Any = None,
+    graph_provider: Any = None,
+) -> PairwiseComparison:
+    """
+    Compare two entities and return similarity analysis.
+
+    Uses the existing =? compare operator logic internally.
+    """
+    engine_result = None
+    if similarity_engine:
+        engine_result = await _engine_compare(similarity_engine, entity_a, entity_b)
+
+    related_a = related_b = None
+    if graph_provider:
+        related_a = _related_ids(entity_a, graph_provider)
+        related_b = _related_ids(entity_b, graph_provider)
+
+    return _build_comparison(entity_a, entity_b, engine_result, related_a, related_b)
+
+
+async def _compare_pairs(
+    entities: List[Dict[str, Any]],
+    features: List[EntityFeatures],
+    pairs: List[Tuple[int, int]],
+    similarity_engine: Any = None,
+    concurrency: int = HANDSHAKE_CONCURRENCY,
+) -> List[PairwiseComparison]:
+    """Compare the given position pairs, concurrently when an engine is involved."""
+    if not similarity_engine:
+        return [
+            _build_comparison(entities[i], entities[j], None, features[i].related, features[j].related)
+            for i, j in pairs
+        ]
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(i: int, j: int) -> PairwiseComparison:
+        async with semaphore:
+            engine_result = await _engine_compare(similarity_engine, entities[i], entities[j])
+        return _build_comparison(entities[i], entities[j], engine_result, features[i].related, features[j].related)
+
+    comparisons: List[PairwiseComparison] = []
+    for start in range(0, len(pairs), COMPARE_BATCH):
+        chunk = pairs[start:start + COMPARE_BATCH]
+        comparisons.extend(await asyncio.gather(*(run(i, j) for i, j in chunk)))
+    return comparisons
+
+
 async def execute_handshake(
     batch: BatchOperation,
     similarity_engine: Any = None,
     graph_provider: Any = None,
+    concurrency: int = HANDSHAKE_CONCURRENCY,
 ) -> HandshakeResult:
     """
     Execute N×N pairwise comparison on all selected entities.
@@ -165,6 +334,7 @@ async def execute_handshake(
         batch: The batch operation with selection
         similarity_engine: Engine for computing similarity scores
         graph_provider: Provider for graph operations
+        concurrency: Max similarity engine comparisons in flight
 
     Returns:
         HandshakeResult with all comparisons and analysis
@@ -193,51 +363,46 @@ async def execute_handshake(
     n = len(entities)
     result.total_pairs = n * (n - 1) // 2
 
-    # Compare all pairs
-    for entity_a, entity_b in combinations(entities, 2):
-        comparison = await compare_pair(
-            entity_a,
-            entity_b,
-            similarity_engine,
-            graph_provider,
-        )
-        result.comparisons.append(comparison)
-
-        # Build similarity matrix
-        a_id = entity_a.get("id", "")
-        b_id = entity_b.get("id", "")
+    # Features once per entity, then only the pairs blocking keeps
+    features = _entity_features(entities, graph_provider)
+    if n <= EXACT_HANDSHAKE_LIMIT:
+        pairs = list(combinations(range(n), 2))
+    else:
+        pairs = _candidate_pairs(features, use_names=bool(similarity_engine))
+    result.pruned_pairs = result.total_pairs - len(pairs)
 
-        if a_id not in result.similarity_matrix:
-            result.similarity_matrix[a_id] = {}
-        if b_id not in result.similarity_matrix:
-            result.similarity_matrix[b_id] = {}
+    result.comparisons = await _compare_pairs(entities, features, pairs, similarity_engine, concurrency)
 
-        result.similarity_matrix[a_id][b_id] = comparison.similarity_score
-        result.similarity_matrix[b_id][a_id] = comparison.similarity_score  # Symmetric
+    # Sparse similarity matrix (pruned pairs are absent, i.e. 0)
+    for comparison in result.comparisons:
+        a_id = comparison.entity_a_id
+        b_id = comparison.entity_b_id
+        result.similarity_matrix.setdefault(a_id, {})[b_id] = comparison.similarity_score
+        result.similarity_matrix.setdefault(b_id, {})[a_id] = comparison.similarity_score  # Symmetric
 
     # Find strongest connections (top 5)
-    sorted_comparisons = sorted(
-        result.comparisons,
-        key=lambda c: c.similarity_score,
-        reverse=True
+    result.strongest_connections = heapq.nlargest(
+        5, result.comparisons, key=lambda c: c.similarity_score
     )
-    result.strongest_connections = sorted_comparisons[:5]
 
     # Find surprising connections (high similarity but different types)
+    types = {
+        entity.get("id", ""): feature.entity_type
+        for entity, feature in zip(entities, features)
+    }
     for comp in result.comparisons:
         if comp.similarity_score >= 0.6:
-            # Check if entities are different types
-            a_type = _get_entity_type(comp.entity_a_id, graph_provider)
-            b_type = _get_entity_type(comp.entity_b_id, graph_provider)
+            a_type = types.get(comp.entity_a_id)
+            b_type = types.get(comp.entity_b_id)
             if a_type and b_type and a_type != b_type:
                 result.surprising_connections.append(comp)
 
     # Find isolated entities (low similarity with everyone)
-    for entity in entities:
-        entity_id = entity.get("id", "")
-        similarities = result.similarity_matrix.get(entity_id, {})
-        if similarities:
-            avg_sim = sum(similarities.values()) / len(similarities)
+    if n > 1:
+        for entity in entities:
+            entity_id = entity.get("id", "")
+            similarities = result.similarity_matrix.get(entity_id, {})
+            avg_sim = sum(similarities.values()) / max(len(similarities), n - 1)
             if avg_sim < 0.2:
                 result.isolated_entities.append(entity_id)
 
@@ -250,17 +415,6 @@ async def execute_handshake(
     return result
 
 
-def _get_entity_type(entity_id: str, graph_provider: Any) -> Optional[str]:
-    """Get entity type from graph."""
-    if not graph_provider:
-        return None
-    try:
-        node = graph_provider.get_node(entity_id)
-        return node.get("class") or node.get("type")
-    except Exception:
-        return None
-
-
 def _build_clusters(
     comparisons: List[PairwiseComparison],
     entities: List[Dict[str, Any]],
@@ -296,6 +450,13 @@ def _build_clusters(
                 entity_to_cluster[entity_id] = a_cluster
             del clusters[b_cluster]
 
+    # Comparisons inside each cluster, gathered in one pass
+    within: Dict[int, List[PairwiseComparison]] = defaultdict(list)
+    for comp in comparisons:
+        a_cluster = entity_to_cluster.get(comp.entity_a_id)
+        if a_cluster is not None and a_cluster == entity_to_cluster.get(comp.entity_b_id):
+            within[a_cluster].append(comp)
+
     # Convert to SimilarityCluster objects
     result = []
     entity_labels = {e.get("id", ""): e.get("label", "") for e in entities}
@@ -306,14 +467,14 @@ def _build_clusters(
             labels = [entity_labels.get(eid, eid) for eid in entity_list]
 
             # Find centroid (most connected within cluster)
-            centroid = _find_centroid(entity_list, comparisons)
+            centroid = _find_centroid(entity_list, within[cluster_id])
 
             result.append(SimilarityCluster(
                 cluster_id=f"cluster_{cluster_id}",
                 entity_ids=entity_list,
                 entity_labels=labels,
                 centroid_id=centroid,
-                avg_similarity=_calculate_avg_similarity(entity_list, comparisons),
+                avg_similarity=_calculate_avg_similarity(entity_list, within[cluster_id]),
                 cluster_reason=f"Entities with similarity >= {threshold}",
             ))
 
@@ -357,34 +518,45 @@ def _find_bridges(
     clusters: List[SimilarityCluster],
     similarity_matrix: Dict[str, Dict[str, float]],
 ) -> List[ClusterBridge]:
-    """Find entities that bridge different clusters."""
+    """
+    Find entities that bridge different clusters.
+
+    Walks each member's (sparse) similarity row instead of every member pair
+    of every cluster pair; bridges come out in the same order as that scan.
+    """
     bridges = []
 
     if len(clusters) < 2:
         return bridges
 
+    # entity -> (cluster index, position in cluster)
+    placement: Dict[str, Tuple[int, int]] = {}
+    for i, cluster in enumerate(clusters):
+        for position, entity_id in enumerate(cluster.entity_ids):
+            placement.setdefault(entity_id, (i, position))
+
     for i, cluster_a in enumerate(clusters):
-        for cluster_b in clusters[i+1:]:
-            # Find entities in cluster_a connected to cluster_b
-            for entity_id in cluster_a.entity_ids:
-                connections_to_b = []
-                for other_id in cluster_b.entity_ids:
-                    sim = similarity_matrix.get(entity_id, {}).get(other_id, 0)
-                    if sim > 0.3:  # Threshold for "connected"
-                        connections_to_b.append(sim)
-
-                if connections_to_b:
-                    # Get label
-                    label_idx = cluster_a.entity_ids.index(entity_id)
-                    label = cluster_a.entity_labels[label_idx] if label_idx < len(cluster_a.entity_labels) else entity_id
-
-                    bridges.append(ClusterBridge(
-                        bridge_entity_id=entity_id,
-                        bridge_entity_label=label,
-                        cluster_a_id=cluster_a.cluster_id,
-                        cluster_b_id=cluster_b.cluster_id,
-                        connection_strength=sum(connections_to_b) / len(connections_to_b),
-                    ))
+        # (cluster_b index, position in cluster_a) -> [(position in cluster_b, sim)]
+        links: Dict[Tuple[int, int], List[Tuple[int, float]]] = defaultdict(list)
+        for position, entity_id in enumerate(cluster_a.entity_ids):
+            for other_id, sim in similarity_matrix.get(entity_id, {}).items():
+                if sim > 0.3 and other_id in placement:  # Threshold for "connected"
+                    j, other_position = placement[other_id]
+                    if j > i:
+                        links[(j, position)].append((other_position, sim))
+
+        for (j, position), connections in sorted(links.items()):
+            connections_to_b = [sim for _, sim in sorted(connections)]
+            entity_id = cluster_a.entity_ids[position]
+            label = cluster_a.entity_labels[position] if position < len(cluster_a.entity_labels) else entity_id
+
+            bridges.append(ClusterBridge(
+                bridge_entity_id=entity_id,
+                bridge_entity_label=label,
+                cluster_a_id=cluster_a.cluster_id,
+                cluster_b_id=clusters[j].cluster_id,
+                connection_strength=sum(connections_to_b) / len(connections_to_b),
+            ))
 
     # Sort by connection strength
     bridges.sort(key=lambda b: b.connection_strength, reverse=True)
@@ -408,6 +580,7 @@ def handshake_to_graph_node(result: HandshakeResult) -> Dict[str, Any]:
             "timestamp": result.timestamp.isoformat(),
             "total_pairs": result.total_pairs,
             "total_comparisons": len(result.comparisons),
+            "pruned_pairs": result.pruned_pairs,
             "cluster_count": len(result.clusters),
             "bridge_count": len(result.bridges),
             "isolated_count": len(result.isolated_entities),
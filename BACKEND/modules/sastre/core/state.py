@@ -15,7 +15,7 @@ RELATIONSHIP HIERARCHY:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
 from enum import Enum
 from datetime import datetime
 from collections import defaultdict
@@ -546,6 +546,9 @@ class InvestigationState:
     updated: datetime = field(default_factory=datetime.utcnow)
     iteration: int = 0
 
+    # Change listeners, called as listener(kind, obj_id) (e.g. grid.GridIndex)
+    change_listeners: List[Callable[[str, str], None]] = field(default_factory=list, repr=False, compare=False)
+
     @classmethod
     def create(cls, project_id: str, tasking: str) -> 'InvestigationState':
         inv_id = hashlib.sha256(f"{project_id}:{tasking}:{uuid.uuid4()}".encode()).hexdigest()[:16]
@@ -564,6 +567,7 @@ class InvestigationState:
         """Add a narrative item."""
         self.narrative_items[item.id] = item
         self.updated = datetime.utcnow()
+        self._notify("narrative", item.id)
 
     def add_goal(self, goal: NarrativeGoal):
         """Add a narrative goal."""
@@ -623,6 +627,7 @@ class InvestigationState:
             if narrative_id in self.narrative_items:
                 self.narrative_items[narrative_id].query_ids.append(query.id)
         self.updated = datetime.utcnow()
+        self._notify("query", query.id)
 
     def add_source(self, source: SourceResult, query_id: str = None):
         """Add a source and link to query."""
@@ -634,6 +639,9 @@ class InvestigationState:
             if query_id in self.queries:
                 self.queries[query_id].source_ids.append(source.id)
         self.updated = datetime.utcnow()
+        self._notify("source", source.id)
+        if query_id:
+            self._notify("query", query_id)
 
     def add_entity(self, entity: Entity, source_id: str = None):
         """Add an entity and link to source."""
@@ -645,11 +653,15 @@ class InvestigationState:
             if source_id in self.sources:
                 self.sources[source_id].entity_ids.append(entity.id)
         self.updated = datetime.utcnow()
+        self._notify("entity", entity.id)
+        if source_id:
+            self._notify("source", source_id)
 
     def add_edge(self, edge: Edge):
         """Add an edge to the graph."""
         self.graph.add_edge(edge)
         self.updated = datetime.utcnow()
+        self._notify("edge", edge.id)
 
     def add_collision(self, collision: EntityCollision):
         """Add a collision to pending."""
@@ -662,6 +674,8 @@ class InvestigationState:
             self.entities[collision.entity_b_id].collision_with.append(collision.entity_a_id)
             self.entities[collision.entity_b_id].disambiguation_state = DisambiguationState.PENDING
         self.updated = datetime.utcnow()
+        self._notify("entity", collision.entity_a_id)
+        self._notify("entity", collision.entity_b_id)
 
     def resolve_collision(self, collision: EntityCollision, resolution: str):
         """
@@ -727,12 +741,40 @@ class InvestigationState:
                 entity_b.disambiguation_state = DisambiguationState.PENDING
 
         self.updated = datetime.utcnow()
+        self._notify("entity", collision.entity_a_id)
+        self._notify("entity", collision.entity_b_id)
 
     def add_surprising_and(self, surprising: SurprisingAnd):
         """Add a surprising AND."""
         self.surprising_ands.append(surprising)
         self.updated = datetime.utcnow()
 
+    # ─────────────────────────────────────────────────────────────
+    # CHANGE NOTIFICATION
+    # ─────────────────────────────────────────────────────────────
+
+    def subscribe(self, listener: Callable[[str, str], None]):
+        """
+        Call listener(kind, obj_id) on every change made through this state.
+
+        kind is "narrative", "query", "source", "entity" or "edge".
+        """
+        if listener not in self.change_listeners:
+            self.change_listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, str], None]):
+        if listener in self.change_listeners:
+            self.change_listeners.remove(listener)
+
+    def mark_changed(self, kind: str, obj_id: str):
+        """Report an in-place edit (e.g. source.state, entity.shell) to listeners."""
+        self.updated = datetime.utcnow()
+        self._notify(kind, obj_id)
+
+    def _notify(self, kind: str, obj_id: str):
+        for listener in self.change_listeners:
+            listener(kind, obj_id)
+
     # ─────────────────────────────────────────────────────────────
     # QUERY METHODS (traverse relationships)
     # ─────────────────────────────────────────────────────────────
@@ -820,6 +862,7 @@ class InvestigationState:
 
         coverage = self.get_narrative_coverage(narrative_id)
         item = self.narrative_items[narrative_id]
+        previous = item.state
 
         if coverage.total_queries == 0:
             item.state = NarrativeState.UNANSWERED
@@ -834,6 +877,9 @@ class InvestigationState:
         else:
             item.state = NarrativeState.PARTIAL
 
+        if item.state != previous:
+            self._notify("narrative", narrative_id)
+
     def update_all_narrative_states(self):
         """Update all narrative states."""
         for narrative_id in self.narrative_items:
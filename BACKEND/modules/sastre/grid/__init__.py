@@ -39,6 +39,7 @@ from .assessor import (
     EnhancedGridAssessor,
     GridAssessment,
     EnhancedGridAssessment,
+    GridIndex,
     # Query generator
     GapQueryGenerator,
     GeneratedQuery,
@@ -122,6 +123,7 @@ __all__ = [
     'EnhancedGridAssessor',
     'GridAssessment',
     'EnhancedGridAssessment',
+    'GridIndex',
     # Query generator
     'GapQueryGenerator',
     'GeneratedQuery',
@@ -12,17 +12,19 @@ import asyncio
 import aiohttp
 import re
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 from enum import Enum
 from collections import defaultdict
+from itertools import islice
 
 from ..core.state import (
     InvestigationState, NarrativeState, QueryState, SourceState,
-    Priority, NarrativeItem, Entity, Edge, KUQuadrant
+    Priority, NarrativeItem, Entity, Edge, KUQuadrant, SourceResult
 )
 from .cross_level import (
     QueryNarrativeTracker, SourceQueryOverlapDetector,
-    NarrativeProgress, HotSpot, RedundantQueryPair, SourcePriority, OverlapType
+    NarrativeProgress, HotSpot, RedundantQueryPair, SourcePriority, OverlapType,
+    REDUNDANCY_THRESHOLD,
 )
 
 
@@ -411,6 +413,487 @@ class EnhancedGridAssessment(GridAssessment):
     unproductive_queries: List[Any]
 
 
+# =============================================================================
+# INCREMENTAL GRID INDEX
+# =============================================================================
+
+class GridIndex:
+    """
+    Grid assessment state kept up to date as an InvestigationState changes.
+
+    Subscribes to the state's change notifications and maintains:
+        - jurisdiction -> sources, with per-SourceState counts (location mode)
+        - shell jurisdiction -> entity ids (subject -> location hints)
+        - query -> sources and source -> queries postings (redundant queries)
+        - per-narrative / per-entity / per-source / per-edge results
+
+    A notification only marks the object dirty. refresh() re-derives the
+    dirty objects and what depends on them: a source's jurisdiction, a
+    query's narrative, the entities pointing at a changed jurisdiction and
+    the query pairs sharing a source with a changed query. The assessment
+    modes then assemble their output from the cached results.
+
+    Edits made in place (outside InvestigationState's add/resolve methods,
+    e.g. source.state = SourceState.CHECKED) need not be reported: refresh()
+    also compares a small signature of every object - the fields the
+    assessment reads - with the one it last derived from, and marks those
+    that differ dirty. That is one pass of tuple comparisons; the expensive
+    derivations still only run for what changed. state.mark_changed(kind,
+    obj_id) reports an edit the signatures do not cover (e.g. an attribute
+    value other than the shell jurisdiction).
+
+    Usage:
+        index = GridIndex.attach(state)     # one index per state, reused
+        index.refresh()
+        index.unchecked_sources("CY")
+    """
+
+    KINDS = ("narrative", "query", "source", "entity", "edge")
+
+    def __init__(self, state: InvestigationState):
+        self.state = state
+        # Insertion-ordered, so ids first seen get sequence numbers in state order
+        self._dirty: Dict[str, Dict[str, None]] = {kind: {} for kind in self.KINDS}
+        self._dirty_jurisdictions: Dict[str, None] = {}
+
+        # Location: where each source sits, and per-jurisdiction buckets
+        self._source_seq: Dict[str, int] = {}
+        self._source_place: Dict[str, Tuple[str, SourceState]] = {}
+        self._jurisdiction_sources: Dict[str, Set[str]] = defaultdict(set)
+        self._jurisdiction_counts: Dict[str, Dict[SourceState, int]] = defaultdict(lambda: defaultdict(int))
+        self._jurisdiction_unchecked: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._jurisdiction_first: Dict[str, int] = {}
+        self._unsorted: Set[str] = set()
+        # jurisdiction -> (first source seq, gap)
+        self._location: Dict[str, Tuple[int, Optional[Gap]]] = {}
+
+        # Subject -> location: entities by the jurisdiction in their shell
+        self._entity_jurisdiction: Dict[str, Any] = {}
+        self._jurisdiction_entities: Dict[Any, Set[str]] = defaultdict(set)
+
+        # Query <-> source postings; redundant pairs as symmetric adjacency
+        self._query_seq: Dict[str, int] = {}
+        self._query_narrative: Dict[str, str] = {}
+        self._query_sources: Dict[str, Set[str]] = {}
+        self._source_queries: Dict[str, Set[str]] = defaultdict(set)
+        self._redundant: Dict[str, Dict[str, float]] = defaultdict(dict)
+
+        # Cached per-object results
+        self._narratives: Dict[str, Tuple[NarrativeState, Optional[Gap]]] = {}
+        self._entities: Dict[str, Tuple[bool, bool, bool, List[Gap]]] = {}
+        self._entity_actions: Dict[str, Optional[CrossPollinatedAction]] = {}
+        self._source_actions: Dict[str, Optional[CrossPollinatedAction]] = {}
+        self._edges: List[Tuple[Edge, bool, Optional[Gap]]] = []
+
+        # kind -> id -> signature the cached results were derived from
+        self._signatures: Dict[str, Dict[str, Tuple]] = {kind: {} for kind in self.KINDS}
+
+        # States that cannot notify are re-derived in full on every refresh
+        self._live = hasattr(state, "subscribe")
+        if self._live:
+            state.subscribe(self)
+        self._mark_all()
+
+    @classmethod
+    def attach(cls, state: InvestigationState) -> 'GridIndex':
+        """The state's existing GridIndex, or a new one subscribed to it."""
+        for listener in getattr(state, "change_listeners", ()):
+            if isinstance(listener, cls):
+                return listener
+        return cls(state)
+
+    def __call__(self, kind: str, obj_id: str):
+        """State change listener: mark the object dirty."""
+        dirty = self._dirty.get(kind)
+        if dirty is not None:
+            dirty[obj_id] = None
+
+    def _mark_all(self):
+        self._dirty["narrative"].update(dict.fromkeys(self.state.narrative_items))
+        self._dirty["query"].update(dict.fromkeys(self.state.queries))
+        self._dirty["source"].update(dict.fromkeys(self.state.sources))
+        self._dirty["entity"].update(dict.fromkeys(self.state.entities))
+
+    def _signature(self, kind: str, obj: Any) -> Tuple:
+        """The fields of an object its cached results depend on."""
+        if kind == "narrative":
+            return obj.state, obj.question, obj.priority
+        if kind == "query":
+            return obj.state, obj.narrative_id, tuple(self.state.query_to_sources.get(obj.id, ()))
+        if kind == "source":
+            return (obj.state, obj.jurisdiction, obj.raw_results, obj.source_name,
+                    len(self.state.source_to_entities.get(obj.id, ())))
+        jurisdiction = obj.shell.get("jurisdiction")
+        return (obj.name, obj.entity_type, tuple(obj.core), tuple(obj.shell),
+                jurisdiction.value if jurisdiction is not None else None,
+                obj.disambiguation_state, len(obj.collision_with))
+
+    def _mark_edited(self):
+        """Mark objects added, removed or edited in place since their last signature."""
+        tables = (("narrative", self.state.narrative_items), ("query", self.state.queries),
+                  ("source", self.state.sources), ("entity", self.state.entities))
+        for kind, table in tables:
+            signatures, dirty = self._signatures[kind], self._dirty[kind]
+            for obj_id, obj in table.items():
+                signature = self._signature(kind, obj)
+                if signatures.get(obj_id) != signature:
+                    signatures[obj_id] = signature
+                    dirty[obj_id] = None
+            if len(signatures) > len(table):
+                for obj_id in [i for i in signatures if i not in table]:
+                    del signatures[obj_id]
+                    dirty[obj_id] = None
+
+    # ─────────────────────────────────────────────────────────────
+    # REFRESH
+    # ─────────────────────────────────────────────────────────────
+
+    def refresh(self):
+        """Re-derive everything affected by changes since the last refresh."""
+        if not self._live:
+            self._mark_all()
+        self._mark_edited()
+        dirty, self._dirty = self._dirty, {kind: {} for kind in self.KINDS}
+
+        self._sequence(self._query_seq, self.state.queries, dirty["query"])
+        self._sequence(self._source_seq, self.state.sources, dirty["source"])
+
+        narratives = dirty["narrative"]
+        for query_id in dirty["query"]:
+            narratives.update(dict.fromkeys(self._refresh_query(query_id)))
+        for source_id in dirty["source"]:
+            self._refresh_source(source_id)
+
+        entities = dirty["entity"]
+        for entity_id in entities:
+            self._refresh_entity(entity_id)
+        entities = dict(entities)
+        jurisdictions, self._dirty_jurisdictions = self._dirty_jurisdictions, {}
+        for jurisdiction in jurisdictions:
+            self._refresh_jurisdiction(jurisdiction)
+            entities.update(dict.fromkeys(self._jurisdiction_entities.get(jurisdiction, ())))
+        for entity_id in entities:
+            self._refresh_entity_action(entity_id)
+
+        for narrative_id in narratives:
+            self._refresh_narrative(narrative_id)
+        for query_id in dirty["query"]:
+            self._refresh_redundant(query_id)
+
+    def _sequence(self, seq: Dict[str, int], table: Dict[str, Any], ids: Iterable[str]):
+        """Number ids seen for the first time in the state's insertion order."""
+        new = {i for i in ids if i not in seq and i in table}
+        if not new:
+            return
+        # New ids are normally the newest entries of the state dict
+        tail = list(islice(reversed(table), len(new)))
+        if set(tail) == new:
+            for i in reversed(tail):
+                seq[i] = len(seq)
+            return
+        # Inserted without notification - renumber everything
+        seq.clear()
+        seq.update((i, n) for n, i in enumerate(table))
+        if seq is self._source_seq:
+            self._unsorted.update(self._jurisdiction_unchecked)
+            self._jurisdiction_first.clear()
+            self._dirty_jurisdictions.update(dict.fromkeys(self._jurisdiction_sources))
+
+    def _refresh_query(self, query_id: str) -> List[str]:
+        """Re-index a query's sources; returns the narratives it affects."""
+        affected = []
+        previous = self._query_narrative.pop(query_id, None)
+        if previous:
+            affected.append(previous)
+        for source_id in self._query_sources.pop(query_id, ()):
+            self._source_queries[source_id].discard(query_id)
+
+        query = self.state.queries.get(query_id)
+        if query is None:
+            return affected
+        if query.narrative_id:
+            self._query_narrative[query_id] = query.narrative_id
+            affected.append(query.narrative_id)
+        sources = set(self.state.query_to_sources.get(query_id, []))
+        self._query_sources[query_id] = sources
+        for source_id in sources:
+            self._source_queries[source_id].add(query_id)
+        return affected
+
+    def _refresh_source(self, source_id: str):
+        previous = self._source_place.pop(source_id, None)
+        if previous is not None:
+            jurisdiction, state = previous
+            self._jurisdiction_sources[jurisdiction].discard(source_id)
+            if self._jurisdiction_first.get(jurisdiction) == self._source_seq.get(source_id):
+                del self._jurisdiction_first[jurisdiction]
+            self._jurisdiction_counts[jurisdiction][state] -= 1
+            self._jurisdiction_unchecked[jurisdiction].pop(source_id, None)
+            self._dirty_jurisdictions[jurisdiction] = None
+
+        source = self.state.sources.get(source_id)
+        if source is None:
+            self._source_actions.pop(source_id, None)
+            return
+        seq = self._source_seq[source_id]
+        jurisdiction = source.jurisdiction
+        self._source_place[source_id] = (jurisdiction, source.state)
+        self._jurisdiction_sources[jurisdiction].add(source_id)
+        first = self._jurisdiction_first.get(jurisdiction)
+        if first is not None and seq < first:
+            self._jurisdiction_first[jurisdiction] = seq
+        self._jurisdiction_counts[jurisdiction][source.state] += 1
+        if source.state == SourceState.UNCHECKED:
+            unchecked = self._jurisdiction_unchecked[jurisdiction]
+            if unchecked and self._source_seq[next(reversed(unchecked))] > seq:
+                self._unsorted.add(jurisdiction)
+            unchecked[source_id] = None
+        self._dirty_jurisdictions[jurisdiction] = None
+
+        # Location -> Subject: source checked but entities not extracted
+        action = None
+        if source.state == SourceState.CHECKED:
+            entity_count = len(self.state.source_to_entities.get(source.id, []))
+            if source.raw_results > 0 and entity_count == 0:
+                action = CrossPollinatedAction(
+                    from_mode="LOCATION",
+                    to_mode="SUBJECT",
+                    insight=f"Source {source.source_name} has results but no extracted entities",
+                    action=f"Run entity extraction on {source.source_name}",
+                    priority=Priority.MEDIUM
+                )
+        self._source_actions[source_id] = action
+
+    def _refresh_jurisdiction(self, jurisdiction: str):
+        members = self._jurisdiction_sources.get(jurisdiction)
+        if not members:
+            for table in (self._location, self._jurisdiction_sources, self._jurisdiction_first,
+                          self._jurisdiction_counts, self._jurisdiction_unchecked):
+                table.pop(jurisdiction, None)
+            return
+
+        unchecked = self._jurisdiction_unchecked[jurisdiction]
+        if jurisdiction in self._unsorted:
+            self._unsorted.discard(jurisdiction)
+            ordered = sorted(unchecked, key=self._source_seq.__getitem__)
+            unchecked.clear()
+            unchecked.update(dict.fromkeys(ordered))
+
+        gap = None
+        if unchecked:
+            checked = self._jurisdiction_counts[jurisdiction][SourceState.CHECKED]
+            gap = Gap(
+                type="LOCATION_UNCHECKED",
+                target=jurisdiction,
+                description=f"{jurisdiction}: {checked}/{len(members)} sources checked",
+                priority=Priority.MEDIUM,
+                suggested_action=f"Check {len(unchecked)} remaining sources in {jurisdiction}"
+            )
+        if jurisdiction not in self._jurisdiction_first:
+            self._jurisdiction_first[jurisdiction] = min(self._source_seq[sid] for sid in members)
+        self._location[jurisdiction] = (self._jurisdiction_first[jurisdiction], gap)
+
+    def _refresh_entity(self, entity_id: str):
+        previous = self._entity_jurisdiction.pop(entity_id, None)
+        if previous is not None:
+            self._jurisdiction_entities[previous].discard(entity_id)
+
+        entity = self.state.entities.get(entity_id)
+        if entity is None:
+            self._entities.pop(entity_id, None)
+            return
+
+        gaps = []
+        core_incomplete = not entity.core_complete
+        shell_incomplete = not core_incomplete and not entity.shell_complete
+        collision = bool(entity.collision_flags)
+        if core_incomplete:
+            gaps.append(Gap(
+                type="ENTITY_CORE_INCOMPLETE",
+                target=entity.id,
+                description=f"Entity {entity.name} missing core attributes",
+                priority=Priority.HIGH,
+                suggested_action=f"Enrich core for {entity.name}"
+            ))
+        elif shell_incomplete:
+            gaps.append(Gap(
+                type="ENTITY_SHELL_INCOMPLETE",
+                target=entity.id,
+                description=f"Entity {entity.name} has Core but no Shell",
+                priority=Priority.MEDIUM,
+                suggested_action=f"Enrich shell for {entity.name}"
+            ))
+        if collision:
+            gaps.append(Gap(
+                type="ENTITY_COLLISION",
+                target=entity.id,
+                description=f"Entity {entity.name} may be confused with others",
+                priority=Priority.HIGH,
+                suggested_action="Run wedge queries for disambiguation"
+            ))
+        self._entities[entity_id] = (core_incomplete, shell_incomplete, collision, gaps)
+
+        if "jurisdiction" in entity.shell:
+            jurisdiction = entity.shell["jurisdiction"].value
+            try:
+                self._jurisdiction_entities[jurisdiction].add(entity_id)
+                self._entity_jurisdiction[entity_id] = jurisdiction
+            except TypeError:
+                pass  # Unhashable value - cannot equal a source jurisdiction
+
+    def _refresh_entity_action(self, entity_id: str):
+        """Subject -> Location: entity implies a jurisdiction with unchecked sources."""
+        entity = self.state.entities.get(entity_id)
+        jurisdiction = self._entity_jurisdiction.get(entity_id)
+        action = None
+        if entity is not None and jurisdiction is not None:
+            unchecked = len(self._jurisdiction_unchecked.get(jurisdiction, ()))
+            if unchecked:
+                action = CrossPollinatedAction(
+                    from_mode="SUBJECT",
+                    to_mode="LOCATION",
+                    insight=f"Entity {entity.name} implies jurisdiction {jurisdiction}",
+                    action=f"Check {unchecked} unchecked sources in {jurisdiction}",
+                    priority=Priority.HIGH
+                )
+        if entity is None:
+            self._entity_actions.pop(entity_id, None)
+        else:
+            self._entity_actions[entity_id] = action
+
+    def _refresh_narrative(self, narrative_id: str):
+        item = self.state.narrative_items.get(narrative_id)
+        if item is None:
+            self._narratives.pop(narrative_id, None)
+            return
+
+        gap = None
+        if item.state == NarrativeState.UNANSWERED:
+            gap = Gap(
+                type="NARRATIVE_UNANSWERED",
+                target=item.id,
+                description=f"Question not yet investigated: {item.question}",
+                priority=item.priority,
+                suggested_action=f"Run initial queries for: {item.question}"
+            )
+        elif item.state == NarrativeState.PARTIAL:
+            queries = self.state.get_queries_for_narrative(item.id)
+            run_queries = len([q for q in queries if q.state != QueryState.PENDING])
+            total_queries = len(queries)
+            gap = Gap(
+                type="NARRATIVE_PARTIAL",
+                target=item.id,
+                description=f"Question partially answered: {run_queries}/{total_queries} queries run",
+                priority=Priority.MEDIUM,
+                suggested_action=f"Run remaining {total_queries - run_queries} queries"
+            )
+        self._narratives[narrative_id] = (item.state, gap)
+
+    def _refresh_redundant(self, query_id: str):
+        """Recompute the redundant pairs of one query via shared-source postings."""
+        for other in self._redundant.pop(query_id, {}):
+            self._redundant[other].pop(query_id, None)
+        sources = self._query_sources.get(query_id)
+        if not sources:
+            return
+
+        partners = set()
+        for source_id in sources:
+            partners.update(self._source_queries.get(source_id, ()))
+        partners.discard(query_id)
+        for other in partners:
+            other_sources = self._query_sources[other]
+            similarity = len(sources & other_sources) / len(sources | other_sources)
+            if similarity > REDUNDANCY_THRESHOLD:
+                self._redundant[query_id][other] = similarity
+                self._redundant[other][query_id] = similarity
+
+    # ─────────────────────────────────────────────────────────────
+    # CACHED RESULTS (call refresh() first)
+    # ─────────────────────────────────────────────────────────────
+
+    def narrative(self, item: NarrativeItem) -> Tuple[NarrativeState, Optional[Gap]]:
+        entry = self._narratives.get(item.id)
+        if entry is None or entry[0] != item.state:
+            self._refresh_narrative(item.id)
+            entry = self._narratives[item.id]
+        return entry
+
+    def entity(self, entity: Entity) -> Tuple[bool, bool, bool, List[Gap]]:
+        if entity.id not in self._entities:
+            self._refresh_entity(entity.id)
+        return self._entities[entity.id]
+
+    def entity_action(self, entity: Entity) -> Optional[CrossPollinatedAction]:
+        if entity.id not in self._entity_actions:
+            self._refresh_entity_action(entity.id)
+        return self._entity_actions[entity.id]
+
+    def source_action(self, source: SourceResult) -> Optional[CrossPollinatedAction]:
+        if source.id not in self._source_actions:
+            self("source", source.id)
+            self.refresh()
+        return self._source_actions.get(source.id)
+
+    def edges(self) -> List[Tuple[Edge, bool, Optional[Gap]]]:
+        """(edge, confirmed, gap) for every graph edge; only new or changed edges are rebuilt."""
+        edges = self.state.graph.edges
+        del self._edges[len(edges):]
+        for position, edge in enumerate(edges):
+            if position < len(self._edges):
+                cached, confirmed, _ = self._edges[position]
+                if cached is edge and confirmed == edge.confirmed:
+                    continue
+            gap = None
+            if not edge.confirmed:
+                gap = Gap(
+                    type="NEXUS_UNCONFIRMED",
+                    target=(edge.source_entity_id, edge.target_entity_id),
+                    description=f"Connection {edge.source_entity_id} -> {edge.target_entity_id} unconfirmed",
+                    priority=Priority.MEDIUM,
+                    suggested_action=f"Verify connection"
+                )
+            entry = (edge, edge.confirmed, gap)
+            if position < len(self._edges):
+                self._edges[position] = entry
+            else:
+                self._edges.append(entry)
+        return self._edges
+
+    def locations(self) -> Iterator[Tuple[str, Optional[Gap]]]:
+        """(jurisdiction, gap) in order of each jurisdiction's first source."""
+        for jurisdiction, (_, gap) in sorted(self._location.items(), key=lambda kv: kv[1][0]):
+            yield jurisdiction, gap
+
+    def unchecked_sources(self, jurisdiction: str) -> List[SourceResult]:
+        """Unchecked sources of a jurisdiction, in state order."""
+        if jurisdiction in self._unsorted:
+            self._refresh_jurisdiction(jurisdiction)
+        return [self.state.sources[sid] for sid in self._jurisdiction_unchecked.get(jurisdiction, ())]
+
+    def redundant_queries(self) -> List[RedundantQueryPair]:
+        """Query pairs with source overlap above REDUNDANCY_THRESHOLD, in query order."""
+        pairs = []
+        for query_id, partners in self._redundant.items():
+            seq = self._query_seq[query_id]
+            for other, similarity in partners.items():
+                if self._query_seq[other] > seq:
+                    pairs.append((seq, self._query_seq[other], query_id, other, similarity))
+        pairs.sort()
+
+        redundant = []
+        for _, _, q1_id, q2_id, similarity in pairs:
+            q1_sources = set(self.state.query_to_sources.get(q1_id, []))
+            q2_sources = set(self.state.query_to_sources.get(q2_id, []))
+            redundant.append(RedundantQueryPair(
+                query_a=self.state.queries[q1_id],
+                query_b=self.state.queries[q2_id],
+                overlap_sources=list(q1_sources & q2_sources),
+                similarity=similarity
+            ))
+        return redundant
+
+
 # =============================================================================
 # MAIN ASSESSOR LOGIC
 # =============================================================================
@@ -418,13 +901,18 @@ class EnhancedGridAssessment(GridAssessment):
 class GridAssessor:
     """
     Assesses investigation completeness from four perspectives.
+
+    Results come from the state's GridIndex, so each call only recomputes
+    what changed since the previous assessment of the same state.
     """
     
     def __init__(self, state: InvestigationState):
         self.state = state
+        self.index = GridIndex.attach(state)
     
     def full_assessment(self) -> GridAssessment:
         """Run all four assessment modes plus cross-pollination."""
+        self.index.refresh()
         return GridAssessment(
             narrative=self.narrative_mode(),
             subject=self.subject_mode(),
@@ -439,31 +927,18 @@ class GridAssessor:
     
     def narrative_mode(self) -> NarrativeAssessment:
         assessment = NarrativeAssessment()
+        self.index.refresh()
         
         for item in self.state.narrative_items.values():
-            if item.state == NarrativeState.UNANSWERED:
+            state, gap = self.index.narrative(item)
+            if state == NarrativeState.UNANSWERED:
                 assessment.unanswered.append(item)
-                assessment.gaps.append(Gap(
-                    type="NARRATIVE_UNANSWERED",
-                    target=item.id,
-                    description=f"Question not yet investigated: {item.question}",
-                    priority=item.priority,
-                    suggested_action=f"Run initial queries for: {item.question}"
-                ))
-            elif item.state == NarrativeState.PARTIAL:
+            elif state == NarrativeState.PARTIAL:
                 assessment.partial.append(item)
-                queries = self.state.get_queries_for_narrative(item.id)
-                run_queries = len([q for q in queries if q.state != QueryState.PENDING])
-                total_queries = len(queries)
-                assessment.gaps.append(Gap(
-                    type="NARRATIVE_PARTIAL",
-                    target=item.id,
-                    description=f"Question partially answered: {run_queries}/{total_queries} queries run",
-                    priority=Priority.MEDIUM,
-                    suggested_action=f"Run remaining {total_queries - run_queries} queries"
-                ))
             else:
                 assessment.answered.append(item)
+            if gap is not None:
+                assessment.gaps.append(gap)
         
         return assessment
     
@@ -473,40 +948,19 @@ class GridAssessor:
     
     def subject_mode(self) -> SubjectAssessment:
         assessment = SubjectAssessment()
+        self.index.refresh()
         
         for entity in self.state.entities.values():
-            # Check Core completeness
-            if not entity.core_complete:
+            core_incomplete, shell_incomplete, collision, gaps = self.index.entity(entity)
+            # Check Core completeness, then Shell
+            if core_incomplete:
                 assessment.incomplete_core.append(entity)
-                assessment.gaps.append(Gap(
-                    type="ENTITY_CORE_INCOMPLETE",
-                    target=entity.id,
-                    description=f"Entity {entity.name} missing core attributes",
-                    priority=Priority.HIGH,
-                    suggested_action=f"Enrich core for {entity.name}"
-                ))
-            
-            # Check Shell completeness
-            elif not entity.shell_complete:
+            elif shell_incomplete:
                 assessment.incomplete_shell.append(entity)
-                assessment.gaps.append(Gap(
-                    type="ENTITY_SHELL_INCOMPLETE",
-                    target=entity.id,
-                    description=f"Entity {entity.name} has Core but no Shell",
-                    priority=Priority.MEDIUM,
-                    suggested_action=f"Enrich shell for {entity.name}"
-                ))
-            
             # Check for disambiguation needs
-            if entity.collision_flags:
+            if collision:
                 assessment.needs_disambiguation.append(entity)
-                assessment.gaps.append(Gap(
-                    type="ENTITY_COLLISION",
-                    target=entity.id,
-                    description=f"Entity {entity.name} may be confused with others",
-                    priority=Priority.HIGH,
-                    suggested_action="Run wedge queries for disambiguation"
-                ))
+            assessment.gaps.extend(gaps)
         
         return assessment
     
@@ -516,25 +970,13 @@ class GridAssessor:
     
     def location_mode(self) -> LocationAssessment:
         assessment = LocationAssessment()
+        self.index.refresh()
         
-        # Group sources by jurisdiction
-        by_jurisdiction = defaultdict(list)
-        for source in self.state.sources.values():
-            by_jurisdiction[source.jurisdiction].append(source)
-        
-        for jurisdiction, sources in by_jurisdiction.items():
-            checked = [s for s in sources if s.state == SourceState.CHECKED]
-            unchecked = [s for s in sources if s.state == SourceState.UNCHECKED]
-            
-            if unchecked:
-                assessment.unchecked_sources.extend(unchecked)
-                assessment.gaps.append(Gap(
-                    type="LOCATION_UNCHECKED",
-                    target=jurisdiction,
-                    description=f"{jurisdiction}: {len(checked)}/{len(sources)} sources checked",
-                    priority=Priority.MEDIUM,
-                    suggested_action=f"Check {len(unchecked)} remaining sources in {jurisdiction}"
-                ))
+        # Jurisdictions in order of their first source
+        for jurisdiction, gap in self.index.locations():
+            if gap is not None:
+                assessment.unchecked_sources.extend(self.index.unchecked_sources(jurisdiction))
+                assessment.gaps.append(gap)
         
         return assessment
     
@@ -545,18 +987,12 @@ class GridAssessor:
     def nexus_mode(self) -> NexusAssessment:
         assessment = NexusAssessment()
         
-        for edge in self.state.graph.edges:
-            if edge.confirmed:
+        for edge, confirmed, gap in self.index.edges():
+            if confirmed:
                 assessment.confirmed_connections.append(edge)
             else:
                 assessment.unconfirmed_connections.append(edge)
-                assessment.gaps.append(Gap(
-                    type="NEXUS_UNCONFIRMED",
-                    target=(edge.source_entity_id, edge.target_entity_id),
-                    description=f"Connection {edge.source_entity_id} -> {edge.target_entity_id} unconfirmed",
-                    priority=Priority.MEDIUM,
-                    suggested_action=f"Verify connection"
-                ))
+                assessment.gaps.append(gap)
         
         return assessment
 
@@ -566,41 +1002,25 @@ class GridAssessor:
     
     def cross_pollinate(self) -> List[CrossPollinatedAction]:
         actions = []
+        self.index.refresh()
         
         # Subject → Location: Entity implies jurisdiction to check
         for entity in self.state.entities.values():
-            if "jurisdiction" in entity.shell:
-                jurisdiction = entity.shell["jurisdiction"].value
-                unchecked = self._get_unchecked_sources_for_jurisdiction(jurisdiction)
-                if unchecked:
-                    actions.append(CrossPollinatedAction(
-                        from_mode="SUBJECT",
-                        to_mode="LOCATION",
-                        insight=f"Entity {entity.name} implies jurisdiction {jurisdiction}",
-                        action=f"Check {len(unchecked)} unchecked sources in {jurisdiction}",
-                        priority=Priority.HIGH
-                    ))
+            action = self.index.entity_action(entity)
+            if action is not None:
+                actions.append(action)
         
         # Location → Subject: Source checked but entities not extracted
         for source in self.state.sources.values():
-            if source.state == SourceState.CHECKED:
-                entity_count = len(self.state.source_to_entities.get(source.id, []))
-                if source.raw_results > 0 and entity_count == 0:
-                    actions.append(CrossPollinatedAction(
-                        from_mode="LOCATION",
-                        to_mode="SUBJECT",
-                        insight=f"Source {source.source_name} has results but no extracted entities",
-                        action=f"Run entity extraction on {source.source_name}",
-                        priority=Priority.MEDIUM
-                    ))
+            action = self.index.source_action(source)
+            if action is not None:
+                actions.append(action)
         
         return actions
 
     def _get_unchecked_sources_for_jurisdiction(self, jurisdiction: str) -> List[Any]:
-        return [
-            s for s in self.state.sources.values() 
-            if s.jurisdiction == jurisdiction and s.state == SourceState.UNCHECKED
-        ]
+        self.index.refresh()
+        return self.index.unchecked_sources(jurisdiction)
 
 
 # =============================================================================
@@ -632,7 +1052,7 @@ class EnhancedGridAssessor(GridAssessor):
             # NEW: Cross-level insights
             narrative_progress=self.assess_all_narrative_progress(),
             hot_spots=self.overlap_detector.find_hot_spots(),
-            redundant_queries=self.overlap_detector.find_redundant_queries(),
+            redundant_queries=self.index.redundant_queries(),
             source_priorities=self.overlap_detector.suggest_source_priorities(),
             unproductive_queries=self.query_narrative_tracker.find_unproductive_queries()
         )
@@ -8,6 +8,10 @@ from ..core.state import (
     QueryState, SourceState, Entity, KUQuadrant
 )
 
+# Source-set Jaccard above which two queries count as redundant
+REDUNDANCY_THRESHOLD = 0.7
+
+
 class ContributionStatus(Enum):
     NOT_RUN = "not_run"
     FAILED = "failed"
@@ -292,25 +296,37 @@ class SourceQueryOverlapDetector:
     def find_redundant_queries(self) -> List[RedundantQueryPair]:
         """
         Find query pairs that are essentially doing the same thing.
+
+        Only queries sharing a source can overlap, so each query is compared
+        with the later queries in its sources' postings, not with all queries.
         """
         redundant = []
         
         query_ids = list(self.state.queries.keys())
+        position = {qid: i for i, qid in enumerate(query_ids)}
+        source_sets = {qid: set(self.state.query_to_sources.get(qid, [])) for qid in query_ids}
+        postings: Dict[str, List[str]] = defaultdict(list)
+        for qid in query_ids:
+            for source_id in source_sets[qid]:
+                postings[source_id].append(qid)
         
         for i, q1_id in enumerate(query_ids):
-            for q2_id in query_ids[i+1:]:
-                q1_sources = set(self.state.query_to_sources.get(q1_id, []))
-                q2_sources = set(self.state.query_to_sources.get(q2_id, []))
-                
-                if not q1_sources or not q2_sources:
-                    continue
+            q1_sources = source_sets[q1_id]
+            if not q1_sources:
+                continue
+            partners = {
+                q2_id for source_id in q1_sources for q2_id in postings[source_id]
+                if position[q2_id] > i
+            }
+            for q2_id in sorted(partners, key=position.__getitem__):
+                q2_sources = source_sets[q2_id]
                 
                 # Calculate Jaccard similarity
                 intersection = len(q1_sources & q2_sources)
                 union = len(q1_sources | q2_sources)
                 similarity = intersection / union if union > 0 else 0
                 
-                if similarity > 0.7:  # 70% overlap = likely redundant
+                if similarity > REDUNDANCY_THRESHOLD:  # 70% overlap = likely redundant
                     redundant.append(RedundantQueryPair(
                         query_a=self.state.queries[q1_id],
                         query_b=self.state.queries[q2_id],
@@ -23,6 +23,12 @@ from .engine import (
     DimensionWeight,
 )
 
+# Blocking index
+from .index import (
+    SimilarityIndex,
+    blocking_keys,
+)
+
 # Compare operator
 from .compare import (
     CompareOperator,
@@ -59,6 +65,9 @@ __all__ = [
     # Engine
     "SimilarityEngine",
     "DimensionWeight",
+    # Blocking index
+    "SimilarityIndex",
+    "blocking_keys",
     # Compare operator
     "CompareOperator",
     "CompareResult",
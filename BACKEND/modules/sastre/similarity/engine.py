@@ -3,13 +3,22 @@ SASTRE Similarity Engine
 
 Computes multi-dimensional similarity between nodes.
 Used by the =? operator for identity comparison and similarity search.
+
+Large candidate sets go through a SimilarityIndex (blocking keys).
+find_similar / find_bridges fully score co-blocked candidates first, then
+only those others whose similarity_bound() could still reach the top
+results, so they return what an exact scan would. Clustering runs average
+linkage over the sparse graph of co-blocked pairs (approximate).
 """
 
+import heapq
 from dataclasses import dataclass
-from typing import Dict, List, Set, Optional, Tuple, Any
+from itertools import combinations
+from typing import Callable, Dict, List, Set, Optional, Tuple, Any
 from difflib import SequenceMatcher
 import numpy as np
 
+from .index import SimilarityIndex, normalize_name
 from .vectors import (
     SimilarityVector,
     SimilarityScore,
@@ -52,6 +61,11 @@ class SimilarityEngine:
     HIGH_SIMILARITY_THRESHOLD = 0.7
     LOW_SIMILARITY_THRESHOLD = 0.3
 
+    # Above these sizes the blocking index is used: searches score co-blocked
+    # entities first (others only if their bound qualifies), clustering only co-blocked pairs
+    EXACT_SCAN_LIMIT = 5000      # find_similar / find_bridges candidates
+    EXACT_CLUSTER_LIMIT = 300    # cluster() vectors (all pairs below this)
+
     def __init__(self, weights: Optional[Dict[str, float]] = None):
         """
         Initialize engine with optional custom weights.
@@ -62,6 +76,10 @@ class SimilarityEngine:
         self.weights = self.DEFAULT_WEIGHTS.copy()
         if weights:
             self.weights.update(weights)
+        # Index over the last candidate list searched, reused while callers
+        # pass the same vectors (the list is kept so their ids stay unique)
+        self._indexed: Optional[List[SimilarityVector]] = None
+        self._index: Optional[SimilarityIndex] = None
 
     def compute_similarity(
         self,
@@ -73,13 +91,47 @@ class SimilarityEngine:
 
         Returns score 0.0 - 1.0 plus breakdown by dimension.
         """
+        scores = self._dimension_scores(
+            a, b, self._name_similarity(a.name, b.name, a.name_embedding, b.name_embedding)
+        )
+        total = self._weighted_total(scores)
+
+        # Identify high/low dimensions
+        high_dims = [dim for dim, score in scores.items() if score > self.HIGH_SIMILARITY_THRESHOLD]
+        low_dims = [dim for dim, score in scores.items() if score < self.LOW_SIMILARITY_THRESHOLD]
+
+        return SimilarityScore(
+            total=total,
+            breakdown=scores,
+            explanation=self._explain_similarity(scores, high_dims),
+            high_dimensions=high_dims,
+            low_dimensions=low_dims,
+        )
+
+    def similarity_bound(self, a: SimilarityVector, b: SimilarityVector) -> float:
+        """
+        Upper bound of compute_similarity(a, b).total.
+
+        Every dimension is computed as usual except the name, which uses
+        SequenceMatcher.quick_ratio() (an upper bound of ratio()) - the
+        expensive part of a comparison.
+        """
+        if a.name_embedding is not None and b.name_embedding is not None:
+            name = self._cosine_similarity(a.name_embedding, b.name_embedding)
+        else:
+            a_norm, b_norm = self._normalize_name(a.name), self._normalize_name(b.name)
+            name = SequenceMatcher(None, a_norm, b_norm).quick_ratio() if a_norm and b_norm else 0.0
+        return self._weighted_total(self._dimension_scores(a, b, name))
+
+    def _dimension_scores(self, a: SimilarityVector, b: SimilarityVector, name: float) -> Dict[str, float]:
+        """Per-dimension scores, given the name similarity."""
         scores: Dict[str, float] = {}
 
         # Entity type match (binary)
         scores["entity_type"] = 1.0 if a.entity_type == b.entity_type else 0.0
 
         # Name similarity
-        scores["name"] = self._name_similarity(a.name, b.name, a.name_embedding, b.name_embedding)
+        scores["name"] = name
 
         # Attribute overlap (Jaccard on filled slots)
         scores["attributes"] = self._jaccard(a.attribute_keys(), b.attribute_keys())
@@ -99,6 +151,10 @@ class SimilarityEngine:
         # Shared connections (structural similarity)
         scores["shared_connections"] = self._connection_similarity(a, b)
 
+        return scores
+
+    def _weighted_total(self, scores: Dict[str, float]) -> float:
+        """Weighted mean of dimension scores."""
         # Compute weighted total
         total = sum(
             scores[dim] * self.weights.get(dim, 0.0)
@@ -108,21 +164,8 @@ class SimilarityEngine:
         # Normalize by total weight
         total_weight = sum(self.weights.get(dim, 0.0) for dim in scores)
         if total_weight > 0:
-            total = total / total_weight
-        else:
-            total = 0.0
-
-        # Identify high/low dimensions
-        high_dims = [dim for dim, score in scores.items() if score > self.HIGH_SIMILARITY_THRESHOLD]
-        low_dims = [dim for dim, score in scores.items() if score < self.LOW_SIMILARITY_THRESHOLD]
-
-        return SimilarityScore(
-            total=total,
-            breakdown=scores,
-            explanation=self._explain_similarity(scores, high_dims),
-            high_dimensions=high_dims,
-            low_dimensions=low_dims,
-        )
+            return total / total_weight
+        return 0.0
 
     def _name_similarity(
         self,
@@ -151,24 +194,7 @@ class SimilarityEngine:
 
     def _normalize_name(self, name: str) -> str:
         """Normalize a name for comparison."""
-        if not name:
-            return ""
-
-        # Lowercase
-        name = name.lower().strip()
-
-        # Remove common suffixes
-        for suffix in [" ltd", " ltd.", " limited", " inc", " inc.", " corp", " corp.", " llc", " llp", " plc", " gmbh", " ag", " sa", " bv", " nv"]:
-            if name.endswith(suffix):
-                name = name[:-len(suffix)].strip()
-
-        # Remove punctuation except hyphens
-        name = "".join(c if c.isalnum() or c in " -" else "" for c in name)
-
-        # Normalize whitespace
-        name = " ".join(name.split())
-
-        return name
+        return normalize_name(name)
 
     def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
         """Compute cosine similarity between vectors."""
@@ -265,7 +291,8 @@ class SimilarityEngine:
         limit: int = 10,
         min_score: float = 0.1,
         exclude_linked: bool = False,
-        linked_ids: Optional[Set[str]] = None
+        linked_ids: Optional[Set[str]] = None,
+        index: Optional[SimilarityIndex] = None
     ) -> List[Tuple[SimilarityVector, SimilarityScore]]:
         """
         Find nodes most similar to target.
@@ -277,31 +304,86 @@ class SimilarityEngine:
             min_score: Minimum similarity score to include
             exclude_linked: If True, exclude already-linked nodes
             linked_ids: Set of node IDs that are linked to target
+            index: SimilarityIndex over the candidates (built automatically,
+                and reused across calls with the same candidates, when there
+                are more than EXACT_SCAN_LIMIT candidates)
 
         Returns:
             List of (vector, score) tuples sorted by score descending
         """
         linked_ids = linked_ids or set()
-        results = []
 
-        for candidate in candidates:
-            # Skip self
-            if candidate.node_id == target.node_id:
-                continue
-
-            # Skip linked if requested
-            if exclude_linked and candidate.node_id in linked_ids:
-                continue
+        def score(positions: List[int]) -> List[Tuple[int, SimilarityVector, SimilarityScore]]:
+            scored = []
+            for position in positions:
+                candidate = candidates[position]
+                # Skip self, and linked nodes if requested
+                if candidate.node_id == target.node_id:
+                    continue
+                if exclude_linked and candidate.node_id in linked_ids:
+                    continue
+                similarity = self.compute_similarity(target, candidate)
+                if similarity.total >= min_score:
+                    scored.append((position, candidate, similarity))
+            return scored
+
+        if index is not None or len(candidates) > self.EXACT_SCAN_LIMIT:
+            blocked = self._co_blocked(target, candidates, index)
+            results = score(blocked)
+            # Candidates sharing no usable key are scored only if their bound
+            # could still place them in the top `limit`
+            floor = self._top_floor([r[2].total for r in results], limit, min_score)
+            results += score(self._unblocked(
+                candidates, blocked, lambda c: self.similarity_bound(target, c) >= floor
+            ))
+        else:
+            results = score(list(range(len(candidates))))
 
-            score = self.compute_similarity(target, candidate)
+        # Sort by score descending (ties in candidate order)
+        results.sort(key=lambda x: (-x[2].total, x[0]))
 
-            if score.total >= min_score:
-                results.append((candidate, score))
+        return [(candidate, similarity) for _, candidate, similarity in results[:limit]]
 
-        # Sort by score descending
-        results.sort(key=lambda x: x[1].total, reverse=True)
+    def _candidate_index(self, candidates: List[SimilarityVector]) -> SimilarityIndex:
+        """SimilarityIndex over candidates, reused while the same vectors are passed."""
+        indexed = self._indexed
+        if (indexed is None or len(indexed) != len(candidates)
+                or any(a is not b for a, b in zip(indexed, candidates))):
+            self._indexed = list(candidates)
+            self._index = SimilarityIndex(self._indexed)
+        return self._index
 
-        return results[:limit]
+    def _co_blocked(
+        self,
+        target: SimilarityVector,
+        candidates: List[SimilarityVector],
+        index: Optional[SimilarityIndex] = None
+    ) -> List[int]:
+        """Positions of candidates sharing a blocking key with target, ascending."""
+        if index is None:
+            index = self._candidate_index(candidates)
+        blocked = {index.vectors[p].node_id for p in index.candidate_positions(target)}
+        return [i for i, c in enumerate(candidates) if c.node_id in blocked]
+
+    def _top_floor(self, totals: List[float], limit: int, minimum: float) -> float:
+        """Lowest score that can still make the top `limit` given `totals` found so far."""
+        if limit > 0 and len(totals) >= limit:
+            return max(minimum, sorted(totals, reverse=True)[limit - 1])
+        return minimum
+
+    def _unblocked(
+        self,
+        candidates: List[SimilarityVector],
+        blocked: List[int],
+        may_qualify: Callable[[SimilarityVector], bool]
+    ) -> List[int]:
+        """Positions not in `blocked` that may_qualify, ascending (all of them under negative weights)."""
+        skip = set(blocked)
+        bounded = all(weight >= 0 for weight in self.weights.values())
+        return [
+            i for i, c in enumerate(candidates)
+            if i not in skip and (not bounded or may_qualify(c))
+        ]
 
     def cluster(
         self,
@@ -311,6 +393,11 @@ class SimilarityEngine:
         """
         Cluster vectors by similarity using agglomerative clustering.
 
+        Average linkage: the two clusters with the highest mean pairwise
+        similarity are merged until that mean drops below threshold. Up to
+        EXACT_CLUSTER_LIMIT vectors every pair is scored; above it only
+        co-blocked pairs are, and unscored pairs count as similarity 0.
+
         Args:
             vectors: List of vectors to cluster
             threshold: Similarity threshold for merging clusters
@@ -324,48 +411,85 @@ class SimilarityEngine:
         n = len(vectors)
         if n == 1:
             return [vectors]
+        if threshold <= 0:
+            # Every mean similarity qualifies - everything merges
+            return [list(vectors)]
 
-        # Build similarity matrix
-        similarity_matrix = np.zeros((n, n))
-        for i in range(n):
-            for j in range(i + 1, n):
-                score = self.compute_similarity(vectors[i], vectors[j])
-                similarity_matrix[i][j] = score.total
-                similarity_matrix[j][i] = score.total
-
-        # Simple agglomerative clustering
-        # Start with each vector in its own cluster
-        clusters = [[i] for i in range(n)]
-
-        while len(clusters) > 1:
-            # Find most similar pair of clusters
-            best_sim = -1
-            best_pair = (0, 1)
-
-            for i in range(len(clusters)):
-                for j in range(i + 1, len(clusters)):
-                    # Average linkage
-                    sim = np.mean([
-                        similarity_matrix[a][b]
-                        for a in clusters[i]
-                        for b in clusters[j]
-                    ])
-                    if sim > best_sim:
-                        best_sim = sim
-                        best_pair = (i, j)
-
-            # Stop if best similarity is below threshold
-            if best_sim < threshold:
-                break
-
-            # Merge clusters
-            i, j = best_pair
-            clusters[i].extend(clusters[j])
-            clusters.pop(j)
+        if n <= self.EXACT_CLUSTER_LIMIT:
+            pairs = combinations(range(n), 2)
+        else:
+            index = SimilarityIndex(vectors)
+            # Index positions skip duplicate node_ids; map back to list positions
+            position_of = {id(v): i for i, v in enumerate(vectors)}
+            pairs = (
+                (position_of[id(index.vectors[i])], position_of[id(index.vectors[j])])
+                for i, j in index.candidate_pairs()
+            )
+
+        edges: Dict[Tuple[int, int], float] = {}
+        for i, j in pairs:
+            score = self.compute_similarity(vectors[i], vectors[j]).total
+            if score > 0:
+                edges[(i, j)] = score
+
+        clusters = self._average_linkage(n, edges, threshold)
 
         # Convert indices back to vectors
         return [[vectors[idx] for idx in cluster] for cluster in clusters]
 
+    def _average_linkage(
+        self,
+        n: int,
+        edges: Dict[Tuple[int, int], float],
+        threshold: float
+    ) -> List[List[int]]:
+        """
+        Average-linkage agglomeration over a sparse similarity graph.
+
+        Clusters are keyed by their smallest member ("anchor"). For each pair
+        of adjacent clusters the summed member similarity is kept, so a merge
+        only touches the neighbours of the two merged clusters. A heap holds
+        candidate merges; entries made stale by a later merge are skipped.
+        Ties go to the lowest anchors, as in a left-to-right scan.
+        """
+        members: Dict[int, List[int]] = {i: [i] for i in range(n)}
+        sums: Dict[int, Dict[int, float]] = {i: {} for i in range(n)}
+        version = [0] * n
+        heap = []
+        for (i, j), score in edges.items():
+            sums[i][j] = sums[i].get(j, 0.0) + score
+            sums[j][i] = sums[j].get(i, 0.0) + score
+        for i, neighbours in sums.items():
+            for j, total in neighbours.items():
+                if i < j and total >= threshold:
+                    heap.append((-total, i, j, 0, 0))
+        heapq.heapify(heap)
+
+        while heap:
+            neg_avg, a, b, va, vb = heapq.heappop(heap)
+            if a not in members or b not in members or version[a] != va or version[b] != vb:
+                continue
+
+            # Merge b into a (a < b, so a stays the anchor)
+            members[a].extend(members.pop(b))
+            version[a] += 1
+            merged = sums[a]
+            merged.pop(b, None)
+            for c, total in sums.pop(b).items():
+                if c == a:
+                    continue
+                merged[c] = merged.get(c, 0.0) + total
+                sums[c].pop(b, None)
+            size_a = len(members[a])
+            for c, total in merged.items():
+                sums[c][a] = total
+                avg = total / (size_a * len(members[c]))
+                if avg >= threshold:
+                    lo, hi = (a, c) if a < c else (c, a)
+                    heapq.heappush(heap, (-avg, lo, hi, version[lo], version[hi]))
+
+        return [members[anchor] for anchor in sorted(members)]
+
     def find_bridges(
         self,
         targets: List[SimilarityVector],
@@ -386,30 +510,48 @@ class SimilarityEngine:
             List of (bridge_vector, {target_id: score}) tuples
         """
         target_ids = {t.node_id for t in targets}
-        bridges = []
-
-        for candidate in candidates:
-            # Skip targets themselves
-            if candidate.node_id in target_ids:
-                continue
 
-            # Compute similarity to each target
-            target_scores = {}
-            min_score = 1.0
-
-            for target in targets:
-                score = self.compute_similarity(candidate, target)
-                target_scores[target.node_id] = score
-                min_score = min(min_score, score.total)
-
-            # Must be at least somewhat similar to ALL targets
-            if min_score >= min_similarity:
-                bridges.append((candidate, target_scores))
+        def score(positions: List[int]) -> List[Tuple[int, SimilarityVector, Dict[str, SimilarityScore]]]:
+            scored = []
+            for position in positions:
+                candidate = candidates[position]
+                # Skip targets themselves
+                if candidate.node_id in target_ids:
+                    continue
+
+                # Compute similarity to each target
+                target_scores = {}
+                min_score = 1.0
+
+                for target in targets:
+                    similarity = self.compute_similarity(candidate, target)
+                    target_scores[target.node_id] = similarity
+                    min_score = min(min_score, similarity.total)
+
+                # Must be at least somewhat similar to ALL targets
+                if min_score >= min_similarity:
+                    scored.append((position, candidate, target_scores))
+            return scored
+
+        if targets and len(candidates) > self.EXACT_SCAN_LIMIT:
+            # A bridge must be co-blocked with every target
+            index = self._candidate_index(candidates)
+            shared = set.intersection(*(index.candidate_positions(t) for t in targets))
+            shared_ids = {index.vectors[p].node_id for p in shared}
+            blocked = [i for i, c in enumerate(candidates) if c.node_id in shared_ids]
+            bridges = score(blocked)
+            # The rest only if their bound to every target could still make the top `limit`
+            floor = self._top_floor(
+                [min(s.total for s in b[2].values()) for b in bridges], limit, min_similarity
+            )
+            bridges += score(self._unblocked(
+                candidates, blocked,
+                lambda c: c.node_id not in target_ids and all(self.similarity_bound(c, t) >= floor for t in targets)
+            ))
+        else:
+            bridges = score(list(range(len(candidates))))
 
         # Sort by minimum similarity (best bridges are similar to all targets)
-        bridges.sort(
-            key=lambda x: min(s.total for s in x[1].values()),
-            reverse=True
-        )
+        bridges.sort(key=lambda x: (-min(s.total for s in x[2].values()), x[0]))
 
-        return bridges[:limit]
+        return [(candidate, target_scores) for _, candidate, target_scores in bridges[:limit]]
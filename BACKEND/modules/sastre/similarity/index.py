@@ -0,0 +1,263 @@
+"""
+SASTRE Similarity Index
+
+Blocking keys for similarity search and clustering, so the engine scores
+only entities that share something instead of every entity.
+
+Every vector is indexed under:
+- name tokens (normalized name)            t:<token>
+- phonetic codes of name tokens (Soundex)  p:<code>
+- core identifiers (company number, DOB)   id:<key>=<value>
+- MinHash LSH bands of name trigrams       m:<band>:<hash>
+- relationships, addresses, agents         c:<node_id>  a:<address>  f:<agent>
+- attribute slots, topics                  k:<slot>  tp:<topic>
+- jurisdictions, sources                   j:<code>  s:<source>
+- decades of the activity period           y:<decade>
+
+Every dimension the engine scores has keys, so entities that overlap only
+on topics, jurisdictions, sources, attribute slots or time are candidates
+too, not just name and connection look-alikes.
+
+Keys shared by more than MAX_POSTING vectors (common words, hub
+connections, a popular jurisdiction) are ignored when looking up
+candidates, so the number of scored pairs grows with the number of
+genuine look-alikes, not with the square of the index. Blocked lookups
+are therefore approximate; SimilarityEngine falls back to an exact scan
+when they come up short.
+
+Usage:
+    index = SimilarityIndex()
+    index.add_all(vectors)
+    for vec in index.candidates(target):
+        ...
+    for i, j in index.candidate_pairs():
+        ...
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from datetime import date
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .vectors import SimilarityVector, TimeRange
+
+# Legal suffixes stripped before comparing names
+NAME_SUFFIXES = [" ltd", " ltd.", " limited", " inc", " inc.", " corp", " corp.", " llc", " llp", " plc", " gmbh", " ag", " sa", " bv", " nv"]
+
+MAX_POSTING = 100  # Keys shared by more vectors than this separate nothing
+MIN_YEAR = 1800  # Open-ended activity periods are blocked from this year on
+
+MINHASH_PERMUTATIONS = 16
+MINHASH_BANDS = 8  # 2 rows per band: pairs with trigram Jaccard ~0.35+ usually collide
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = np.random.RandomState(20240613)
+_MINHASH_A = _rng.randint(1, 1 << 31, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+_MINHASH_B = _rng.randint(0, 1 << 31, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+
+_SOUNDEX_CODES = {c: str(d) for d, letters in enumerate(
+    ["aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"]) for c in letters}
+_NON_ALPHA = re.compile(r"[^a-z]")
+_PUNCTUATION = re.compile(r"[^\w -]|_")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for comparison (lowercase, legal suffix, punctuation, spaces)."""
+    if not name:
+        return ""
+
+    # Lowercase
+    name = name.lower().strip()
+
+    # Remove common suffixes
+    for suffix in NAME_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)].strip()
+
+    # Remove punctuation except hyphens (\w is alphanumerics plus "_")
+    name = _PUNCTUATION.sub("", name)
+
+    # Normalize whitespace
+    return " ".join(name.split())
+
+
+def soundex(token: str) -> str:
+    """American Soundex code of a token ('' when it has no letters)."""
+    letters = _NON_ALPHA.sub("", token.lower())
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    last = _SOUNDEX_CODES.get(letters[0], "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit != last and digit != "0":
+            code += digit
+        if ch not in "hw":
+            last = digit
+        if len(code) == 4:
+            break
+    return code.ljust(4, "0")
+
+
+def name_trigrams(normalized: str) -> Set[str]:
+    """Padded character trigrams of a normalized name."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def minhash_bands(trigram_sets: List[Set[str]], chunk: int = 20000) -> List[List[str]]:
+    """
+    LSH band keys for many trigram sets at once.
+
+    Trigram hashes go through all permutations in one numpy pass per chunk;
+    each set's signature is the per-permutation minimum (reduceat over the
+    set's columns), and each band of rows is folded into one key.
+    """
+    bands: List[List[str]] = []
+    rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+    for offset in range(0, len(trigram_sets), chunk):
+        sets = trigram_sets[offset:offset + chunk]
+        lengths = np.fromiter((len(t) for t in sets), dtype=np.int64, count=len(sets))
+        nonempty = np.flatnonzero(lengths)
+        chunk_bands: List[List[str]] = [[] for _ in sets]
+        if len(nonempty):
+            hashes = np.fromiter(
+                (zlib.crc32(t.encode("utf-8")) for s in sets for t in s),
+                dtype=np.uint64, count=int(lengths.sum()),
+            )
+            permuted = (np.outer(_MINHASH_A, hashes) + _MINHASH_B[:, None]) % np.uint64(_MERSENNE_PRIME)
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+            signatures = np.minimum.reduceat(permuted, starts, axis=1).T  # (sets, permutations)
+            folded = signatures[:, 0::rows].copy()
+            for r in range(1, rows):
+                folded = folded * np.uint64(1000003) ^ signatures[:, r::rows]
+            for position, values in zip(nonempty.tolist(), folded.tolist()):
+                chunk_bands[position] = [f"m:{b}:{v}" for b, v in enumerate(values)]
+        bands.extend(chunk_bands)
+    return bands
+
+
+def blocking_keys(
+    vec: SimilarityVector,
+    bands: Optional[List[str]] = None,
+    normalized: Optional[str] = None,
+) -> Set[str]:
+    """All blocking keys for one vector (MinHash bands computed if not given)."""
+    keys: Set[str] = set()
+    if normalized is None:
+        normalized = normalize_name(vec.name)
+    for token in normalized.split():
+        keys.add(f"t:{token}")
+        code = soundex(token)
+        if code:
+            keys.add(f"p:{code}")
+    if bands is None and normalized:
+        bands = minhash_bands([name_trigrams(normalized)])[0]
+    keys.update(bands or ())
+
+    for key, value in vec.core_attributes.items():
+        if isinstance(value, (str, int)) and str(value).strip():
+            keys.add(f"id:{key}={str(value).strip().lower()}")
+    keys.update(f"c:{node_id}" for node_id in vec.all_relationships())
+    keys.update(f"a:{addr.lower()}" for addr in vec.shared_addresses)
+    if vec.formation_agent:
+        keys.add(f"f:{vec.formation_agent.lower()}")
+
+    keys.update(f"k:{key}" for key in vec.attribute_keys())
+    keys.update(f"tp:{topic}" for topic in vec.topics)
+    keys.update(f"j:{code}" for code in vec.jurisdictions)
+    keys.update(f"s:{source}" for source in vec.sources)
+    keys.update(f"y:{decade}" for decade in _decades(vec.time_range))
+    return keys
+
+
+def _decades(time_range: TimeRange) -> range:
+    """Decades an activity period touches (open ends clamped to MIN_YEAR / this year)."""
+    if not time_range.is_set:
+        return range(0)
+    start = time_range.start.year if time_range.start else MIN_YEAR
+    end = time_range.end.year if time_range.end else date.today().year
+    start, end = max(start, MIN_YEAR), min(end, date.today().year)
+    return range(start // 10 * 10, end + 1, 10) if start <= end else range(0)
+
+
+class SimilarityIndex:
+    """
+    Inverted index from blocking keys to vectors.
+
+    Args:
+        vectors: Vectors to index up front
+        max_posting: Keys held by more vectors than this are not used for
+            candidate lookup - they would make the candidate set grow with
+            the index instead of with the number of genuine look-alikes
+    """
+
+    def __init__(self, vectors: Optional[Iterable[SimilarityVector]] = None, max_posting: int = MAX_POSTING):
+        self.max_posting = max_posting
+        self.vectors: List[SimilarityVector] = []
+        self._positions: Dict[str, int] = {}
+        self._keys: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        if vectors is not None:
+            self.add_all(vectors)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._positions
+
+    def add_all(self, vectors: Iterable[SimilarityVector]):
+        """Index many vectors (MinHash computed in one batch)."""
+        new, seen = [], set()
+        for vec in vectors:
+            if vec.node_id not in self._positions and vec.node_id not in seen:
+                seen.add(vec.node_id)
+                new.append(vec)
+        normalized = [normalize_name(v.name) for v in new]
+        trigram_sets = [name_trigrams(name) if name else set() for name in normalized]
+        for vec, name, bands in zip(new, normalized, minhash_bands(trigram_sets)):
+            self._add(vec, blocking_keys(vec, bands, name))
+
+    def add(self, vec: SimilarityVector):
+        if vec.node_id not in self._positions:
+            self._add(vec, blocking_keys(vec))
+
+    def _add(self, vec: SimilarityVector, keys: Set[str]):
+        position = len(self.vectors)
+        self.vectors.append(vec)
+        self._positions[vec.node_id] = position
+        self._keys.append(keys)
+        for key in keys:
+            self._postings[key].append(position)
+
+    def candidate_positions(self, vec: SimilarityVector) -> Set[int]:
+        """Positions of indexed vectors sharing a usable key with `vec` (itself excluded)."""
+        keys = self._keys[self._positions[vec.node_id]] if vec.node_id in self._positions else blocking_keys(vec)
+        cap = self.max_posting
+        found: Set[int] = set()
+        for key in keys:
+            posting = self._postings.get(key)
+            if posting and len(posting) <= cap:
+                found.update(posting)
+        found.discard(self._positions.get(vec.node_id, -1))
+        return found
+
+    def candidates(self, vec: SimilarityVector) -> List[SimilarityVector]:
+        """Co-blocked vectors, in index order."""
+        return [self.vectors[p] for p in sorted(self.candidate_positions(vec))]
+
+    def candidate_pairs(self) -> Iterator[Tuple[int, int]]:
+        """Each co-blocked (i, j) position pair once, i < j."""
+        cap = self.max_posting
+        seen: Set[Tuple[int, int]] = set()
+        for posting in self._postings.values():
+            if len(posting) < 2 or len(posting) > cap:
+                continue
+            for pair in combinations(posting, 2):
+                if pair not in seen:
+                    seen.add(pair)
+                    yield pair
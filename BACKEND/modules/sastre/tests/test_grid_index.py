@@ -0,0 +1,111 @@
+"""
+Tests for the incremental GridIndex behind GridAssessor.
+
+Tests cover:
+- A reused index giving the same assessment as a freshly built one over
+  randomized add/resolve sequences
+- In-place edits (source state, entity shell, query links) picked up
+  without state.mark_changed()
+"""
+
+import random
+
+from BACKEND.modules.SASTRE.core.state import (
+    Attribute,
+    Edge,
+    Entity,
+    EntityType,
+    InvestigationState,
+    NarrativeItem,
+    Query,
+    QueryState,
+    SourceResult,
+    SourceState,
+)
+from BACKEND.modules.SASTRE.grid.assessor import GridAssessor, GridIndex
+
+JURISDICTIONS = ["CY", "PA", "VG", "GB"]
+
+
+def _fresh_assessment(state):
+    """Assessment from a new index, detached again so it does not linger."""
+    assessor = GridAssessor.__new__(GridAssessor)
+    assessor.state = state
+    assessor.index = GridIndex(state)
+    try:
+        return assessor.full_assessment()
+    finally:
+        state.unsubscribe(assessor.index)
+
+
+def _step(state, rng):
+    """One random change, through the state's methods or in place."""
+    roll = rng.random()
+    narratives, queries = list(state.narrative_items), list(state.queries)
+    sources, entities = list(state.sources.values()), list(state.entities.values())
+    if roll < 0.1 or not narratives:
+        state.add_narrative_item(NarrativeItem.create(f"question {len(narratives)}"))
+    elif roll < 0.25 or not queries:
+        state.add_query(Query.create(f"q{len(queries)}"), narrative_id=rng.choice(narratives))
+    elif roll < 0.45 or not sources:
+        source = SourceResult.create(f"https://s{len(sources)}.example", source_name=f"s{len(sources)}")
+        source.jurisdiction = rng.choice(JURISDICTIONS)
+        source.raw_results = rng.randint(0, 3)
+        state.add_source(source, query_id=rng.choice(queries))
+    elif roll < 0.6 or len(entities) < 2:
+        entity = Entity.create(f"e{len(entities)}", rng.choice([EntityType.COMPANY, EntityType.PERSON]))
+        state.add_entity(entity, source_id=rng.choice(sources).id)
+    elif roll < 0.7:
+        a, b = rng.sample(entities, 2)
+        state.add_edge(Edge.create(a.id, b.id, "officer_of"))
+    # In-place edits, never reported with mark_changed
+    elif roll < 0.8:
+        rng.choice(sources).state = rng.choice([SourceState.CHECKED, SourceState.UNCHECKED])
+    elif roll < 0.88:
+        entity = rng.choice(entities)
+        entity.shell["jurisdiction"] = Attribute("jurisdiction", rng.choice(JURISDICTIONS))
+    elif roll < 0.94:
+        entity = rng.choice(entities)
+        for name in ("name", "registration_number", "jurisdiction", "dob", "nationality"):
+            entity.core[name] = Attribute(name, "x")
+    elif roll < 0.97:
+        query_id = rng.choice(queries)
+        state.queries[query_id].state = QueryState.COMPLETE
+        state.update_narrative_state(state.queries[query_id].narrative_id)
+    else:
+        query_id = rng.choice(queries)
+        state.query_to_sources.setdefault(query_id, []).append(rng.choice(sources).id)
+
+
+def test_reused_index_matches_a_fresh_one():
+    rng = random.Random(42)
+    state = InvestigationState.create("project", "tasking")
+    assessor = GridAssessor(state)
+    for step in range(400):
+        _step(state, rng)
+        if step % 7 == 0:
+            assert assessor.full_assessment() == _fresh_assessment(state), step
+    assert GridIndex.attach(state) is assessor.index
+
+
+def test_in_place_edits_are_seen_without_mark_changed():
+    state = InvestigationState.create("project", "tasking")
+    state.add_narrative_item(NarrativeItem.create("who owns it?"))
+    query = Query.create("company: Acme")
+    state.add_query(query, narrative_id=next(iter(state.narrative_items)))
+    source = SourceResult.create("https://registry.example/acme")
+    source.jurisdiction = "CY"
+    state.add_source(source, query_id=query.id)
+    entity = Entity.create("Acme Ltd", EntityType.COMPANY)
+    state.add_entity(entity, source_id=source.id)
+
+    assessor = GridAssessor(state)
+    assert assessor.location_mode().unchecked_sources == [source]
+    assert assessor.cross_pollinate() == []
+
+    entity.shell["jurisdiction"] = Attribute("jurisdiction", "CY")
+    assert [a.to_mode for a in assessor.cross_pollinate()] == ["LOCATION"]
+
+    source.state = SourceState.CHECKED
+    assert assessor.location_mode().unchecked_sources == []
+    assert assessor.cross_pollinate() == []
@@ -0,0 +1,137 @@
+"""
+Tests for the SASTRE handshake operator.
+
+Tests cover:
+- Blocked comparison above EXACT_HANDSHAKE_LIMIT agreeing with the exact
+  N x N run on every pair the engine scores (names, identifiers, places)
+- Concurrent similarity engine comparisons (bounded, results in pair order)
+"""
+
+import asyncio
+import random
+from itertools import combinations
+
+import pytest
+
+from BACKEND.modules.SASTRE.bulk import handshake
+from BACKEND.modules.SASTRE.bulk.handshake import execute_handshake
+from BACKEND.modules.SASTRE.bulk.selection import BatchOperation, BulkSelection
+
+WORDS = ["acme", "zenith", "orion", "delta", "nova", "vertex", "kappa", "lumen", "sigma", "atlas",
+         "borealis", "cobalt", "ember", "fjord", "granite", "helix"]
+
+
+class Graph:
+    """Graph provider over fixed nodes and relations."""
+
+    def __init__(self, nodes, related=None):
+        self.nodes = {node["id"]: node for node in nodes}
+        self.related = related or {}
+
+    def get_node(self, node_id):
+        return self.nodes.get(node_id)
+
+    def get_related_nodes(self, node_id):
+        return self.related.get(node_id, [])
+
+
+class Engine:
+    """Scores pairs on shared name words, identifiers and jurisdiction; counts concurrency."""
+
+    def __init__(self, graph, delay=0.0):
+        self.graph = graph
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def compare(self, a_id, b_id):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        a, b = self.graph.nodes[a_id], self.graph.nodes[b_id]
+        score = 0.2 * len(set(a["label"].lower().split()) & set(b["label"].lower().split()))
+        if a.get("properties", {}).get("company_number") and \
+                a["properties"]["company_number"] == b.get("properties", {}).get("company_number"):
+            score += 0.6
+        if a.get("jurisdiction") and a.get("jurisdiction") == b.get("jurisdiction"):
+            score += 0.1
+        return {"score": min(score, 1.0)}
+
+
+def _nodes(n=90, seed=3):
+    """Random two-word companies; some share a company number but no name word."""
+    rng = random.Random(seed)
+    nodes = []
+    for i in range(n):
+        node = {"id": f"n{i}", "label": f"{rng.choice(WORDS)}{i % 7} {rng.choice(WORDS)}{i}", "class": "company"}
+        if rng.random() < 0.3:
+            node["jurisdiction"] = rng.choice(["CY", "PA", "VG", "MT", "GB", "US", "SC", "BZ"])
+        if rng.random() < 0.2:
+            node["properties"] = {"company_number": f"C{rng.randint(1, 8)}"}
+        nodes.append(node)
+    return nodes
+
+
+def _batch(nodes):
+    selection = BulkSelection(id="sel", raw_syntax="", node_ids=[n["id"] for n in nodes],
+                              node_labels=[n["label"] for n in nodes])
+    return BatchOperation(id="batch", selection=selection, operation="handshake")
+
+
+def _scores(result):
+    return {(c.entity_a_id, c.entity_b_id): round(c.similarity_score, 9)
+            for c in result.comparisons if c.similarity_score > 0}
+
+
+def test_blocked_handshake_keeps_every_scored_pair(monkeypatch):
+    nodes = _nodes()
+    graph = Graph(nodes)
+    assert len(nodes) > handshake.EXACT_HANDSHAKE_LIMIT
+
+    blocked = asyncio.run(execute_handshake(_batch(nodes), Engine(graph), graph))
+    monkeypatch.setattr(handshake, "EXACT_HANDSHAKE_LIMIT", 10 ** 6)
+    exact = asyncio.run(execute_handshake(_batch(nodes), Engine(graph), graph))
+
+    assert blocked.pruned_pairs > 0 and exact.pruned_pairs == 0
+    assert _scores(blocked) == _scores(exact)
+    assert [c.entity_a_id for c in blocked.strongest_connections] == \
+        [c.entity_a_id for c in exact.strongest_connections]
+
+
+def test_pair_sharing_only_an_identifier_is_compared():
+    nodes = [{"id": f"n{i}", "label": f"{WORDS[i % len(WORDS)]}{i}", "class": "company"}
+             for i in range(handshake.EXACT_HANDSHAKE_LIMIT + 10)]
+    nodes[0]["properties"] = {"company_number": "HE 12345"}
+    nodes[-1]["properties"] = {"company_number": "HE 12345"}
+    graph = Graph(nodes)
+
+    result = asyncio.run(execute_handshake(_batch(nodes), Engine(graph), graph))
+    assert result.similarity_matrix["n0"][nodes[-1]["id"]] == pytest.approx(0.6)
+
+
+def test_without_an_engine_only_related_nodes_block():
+    nodes = [{"id": f"n{i}", "label": f"acme {i}", "jurisdiction": "CY"}
+             for i in range(handshake.EXACT_HANDSHAKE_LIMIT + 5)]
+    graph = Graph(nodes, related={"n1": ["x"], "n2": ["x"]})
+
+    result = asyncio.run(execute_handshake(_batch(nodes), None, graph))
+    assert [(c.entity_a_id, c.entity_b_id) for c in result.comparisons] == [("n1", "n2")]
+    assert result.comparisons[0].similarity_score == pytest.approx(0.1)
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_engine_comparisons_run_concurrently_in_pair_order(concurrency):
+    nodes = _nodes(n=20)
+    graph = Graph(nodes)
+    engine = Engine(graph, delay=0.001)
+
+    result = asyncio.run(execute_handshake(_batch(nodes), engine, graph, concurrency=concurrency))
+    assert engine.max_in_flight == concurrency
+    assert engine.calls == len(result.comparisons) == 190
+    assert [(c.entity_a_id, c.entity_b_id) for c in result.comparisons] == \
+        [(a["id"], b["id"]) for a, b in combinations(nodes, 2)]
@@ -0,0 +1,142 @@
+"""
+Tests for blocked similarity search in the SASTRE similarity engine.
+
+Tests cover:
+- Blocked and exact find_similar / find_bridges returning the same results
+- Candidates overlapping only on non-name dimensions (topics, jurisdictions, time)
+- Reuse of the candidate index across calls, and bound-based pruning
+"""
+
+import random
+from datetime import date
+
+import pytest
+
+from BACKEND.modules.SASTRE.similarity import engine as engine_module
+from BACKEND.modules.SASTRE.similarity.engine import SimilarityEngine
+from BACKEND.modules.SASTRE.similarity.vectors import EntityType, SimilarityVector, TimeRange
+
+SYLLABLES = ["ka", "ro", "mi", "ten", "sol", "var", "dex", "lu", "bri", "zan", "qo", "fyr"]
+
+
+def _name(rng):
+    return " ".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(2)
+    )
+
+
+def _corpus(seed=7, n=1500):
+    """Random companies plus look-alikes of a target (name, officers, topics, places)."""
+    rng = random.Random(seed)
+    target = SimilarityVector(
+        node_id="target", entity_type=EntityType.COMPANY, name="Meridian Holdings Ltd",
+        topics={"#FRAUD"}, jurisdictions={"CY"}, sources={"src-1"},
+        shared_officers={"officer-1", "officer-2"}, time_range=TimeRange(date(2010, 1, 1), date(2015, 1, 1)),
+    )
+    vectors = []
+    for i in range(n):
+        vec = SimilarityVector(
+            node_id=f"n{i}", entity_type=rng.choice([EntityType.COMPANY, EntityType.PERSON]), name=_name(rng),
+            topics={rng.choice(["#FRAUD", "#SANCTIONS", "#PEP", "#TAX"])} if rng.random() < 0.3 else set(),
+            jurisdictions={rng.choice(["CY", "PA", "VG", "GB", "US", "MT"])} if rng.random() < 0.5 else set(),
+            sources={f"src-{rng.randint(1, 40)}"},
+        )
+        roll = rng.random()
+        if roll < 0.01:
+            vec.name = rng.choice(["Meridian Holdings", "Meridian Holding Limited", "Meridan Holdings"])
+        elif roll < 0.02:
+            vec.shared_officers = {rng.choice(["officer-1", "officer-2"])}
+        elif roll < 0.03:
+            vec.time_range = TimeRange(date(rng.randint(2005, 2014), 1, 1), None)
+        vectors.append(vec)
+    return target, vectors
+
+
+def _ids(results):
+    return [(vec.node_id, round(score.total, 9)) for vec, score in results]
+
+
+@pytest.fixture
+def blocked():
+    """Engine forced onto the blocked path, and one on the exact path."""
+    blocked_engine, exact_engine = SimilarityEngine(), SimilarityEngine()
+    blocked_engine.EXACT_SCAN_LIMIT = 0
+    exact_engine.EXACT_SCAN_LIMIT = 10 ** 9
+    return blocked_engine, exact_engine
+
+
+def test_non_name_dimensions_are_found_by_the_blocked_path(blocked):
+    blocked_engine, exact_engine = blocked
+    target = SimilarityVector(
+        node_id="t", entity_type=EntityType.COMPANY, name="Alpha Trading",
+        topics={"#FRAUD"}, jurisdictions={"CY"}, time_range=TimeRange(date(2012, 1, 1), date(2014, 1, 1)),
+    )
+    candidates = [
+        SimilarityVector(node_id="c1", entity_type=EntityType.COMPANY, name="Zeta Shipping",
+                         topics={"#FRAUD"}, jurisdictions={"CY"}),
+        SimilarityVector(node_id="c2", entity_type=EntityType.COMPANY, name="Omega Foods",
+                         time_range=TimeRange(date(2013, 1, 1), date(2016, 1, 1))),
+    ]
+
+    exact = exact_engine.find_similar(target, candidates)
+    assert [vec.node_id for vec, _ in exact] == ["c1", "c2"]
+    assert _ids(blocked_engine.find_similar(target, candidates)) == _ids(exact)
+
+
+@pytest.mark.parametrize("limit, min_score", [(10, 0.1), (5, 0.3), (50, 0.2)])
+def test_blocked_find_similar_matches_exact(blocked, limit, min_score):
+    blocked_engine, exact_engine = blocked
+    target, candidates = _corpus()
+
+    exact = exact_engine.find_similar(target, candidates, limit=limit, min_score=min_score)
+    assert exact
+    assert _ids(blocked_engine.find_similar(target, candidates, limit=limit, min_score=min_score)) == _ids(exact)
+
+
+@pytest.mark.parametrize("min_similarity", [0.2, 0.3])
+def test_blocked_find_bridges_matches_exact(blocked, min_similarity):
+    blocked_engine, exact_engine = blocked
+    target, candidates = _corpus(seed=11)
+    other = SimilarityVector(
+        node_id="other", entity_type=EntityType.COMPANY, name="Meridian Capital",
+        shared_officers={"officer-1"}, jurisdictions={"CY"},
+    )
+
+    exact = exact_engine.find_bridges([target, other], candidates, min_similarity=min_similarity)
+    blocked_result = blocked_engine.find_bridges([target, other], candidates, min_similarity=min_similarity)
+    assert [(vec.node_id, {k: round(s.total, 9) for k, s in scores.items()}) for vec, scores in blocked_result] == \
+        [(vec.node_id, {k: round(s.total, 9) for k, s in scores.items()}) for vec, scores in exact]
+
+
+def test_candidate_index_is_built_once_per_candidate_list(blocked, monkeypatch):
+    blocked_engine, _ = blocked
+    target, candidates = _corpus(n=300)
+    builds = []
+    real_index = engine_module.SimilarityIndex
+
+    def counting_index(vectors):
+        builds.append(len(vectors))
+        return real_index(vectors)
+
+    monkeypatch.setattr(engine_module, "SimilarityIndex", counting_index)
+    for _ in range(3):
+        blocked_engine.find_similar(target, candidates)
+    assert builds == [300]
+
+    blocked_engine.find_similar(target, candidates[:-1])
+    assert builds == [300, 299]
+
+
+def test_blocked_path_skips_full_scoring_of_unlikely_candidates(blocked, monkeypatch):
+    blocked_engine, _ = blocked
+    target, candidates = _corpus()
+    scored = []
+    real_compute = SimilarityEngine.compute_similarity
+
+    def counting_compute(self, a, b):
+        scored.append(b.node_id)
+        return real_compute(self, a, b)
+
+    monkeypatch.setattr(SimilarityEngine, "compute_similarity", counting_compute)
+    assert blocked_engine.find_similar(target, candidates, limit=5, min_score=0.3)
+    assert len(scored) < len(candidates) // 4
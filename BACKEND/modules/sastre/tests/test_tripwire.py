@@ -0,0 +1,219 @@
+"""
+Tests for the SASTRE Tripwire local matcher and ES consistency checks.
+
+Tests cover:
+- Tokenization parity with the ES standard analyzer
+- TripwireMatcher condition semantics
+- ES percolation request shape and mismatch handling (fake client)
+- Match-count flushing by count and by time, and closing the shared engine
+"""
+
+import pytest
+
+from BACKEND.modules.SASTRE import tripwire
+from BACKEND.modules.SASTRE.tripwire import (
+    TripwireEngine,
+    TripwireMatcher,
+    build_percolate_document,
+    tokenize,
+)
+
+
+# =============================================================================
+# TOKENIZATION
+# =============================================================================
+
+@pytest.mark.parametrize("text, tokens", [
+    ("Revenue fell 1.5 million", {"revenue", "fell", "1.5", "million"}),
+    ("U.S. sanctions", {"u.s", "sanctions"}),
+    ("1,000 O'Neil dogs'", {"1,000", "o'neil", "dogs"}),
+    ("a.1 end.", {"a", "1", "end"}),
+])
+def test_tokenize_matches_standard_analyzer(text, tokens):
+    assert tokenize(text) == tokens
+
+
+# =============================================================================
+# MATCHER
+# =============================================================================
+
+def _tripwire(tripwire_id, enabled=True, **conditions):
+    return {"id": tripwire_id, "name": tripwire_id, "enabled": enabled, "conditions": conditions}
+
+
+class TestTripwireMatcher:
+
+    def test_conditions_are_anded_and_values_ored(self):
+        matcher = TripwireMatcher([
+            _tripwire("ru-mining", themes=["mining_metals"], jurisdictions=["RU", "KZ"]),
+            _tripwire("bankruptcy", phenomena=["corp_bankruptcy"]),
+        ])
+        doc = build_percolate_document(
+            "", extracted_themes=["mining_metals"], primary_jurisdiction="KZ"
+        )
+        assert [tid for tid, _ in matcher.match_ids(doc)] == ["ru-mining"]
+
+    def test_keywords_use_analyzer_tokens(self):
+        matcher = TripwireMatcher([_tripwire("us", keywords=["U.S."]), _tripwire("ratio", keywords=["1.5"])])
+        assert {tid for tid, _ in matcher.match_ids(build_percolate_document("New U.S. rules"))} == {"us"}
+        assert matcher.match_ids(build_percolate_document("US 1 5")) == []
+
+    def test_years_compare_as_integers(self):
+        matcher = TripwireMatcher([_tripwire("y", years=["2019"])])
+        assert matcher.match_ids(build_percolate_document("", content_years=[2019]))
+
+    def test_disabled_and_unconditional_tripwires(self):
+        matcher = TripwireMatcher([_tripwire("off", enabled=False, keywords=["x"]), _tripwire("all")])
+        assert len(matcher) == 1
+        assert matcher.match_ids(build_percolate_document("x")) == [("all", 1.0)]
+
+
+# =============================================================================
+# ES PERCOLATION
+# =============================================================================
+
+class FakeIndices:
+    def exists(self, index):
+        return True
+
+
+class FakeES:
+    """
+    Serves a fixed tripwire set; percolation answers come from `hits`, a
+    hand-written map of document text -> matching ids for the enabled-only
+    query, so local results are checked against fixed expectations.
+    """
+
+    def __init__(self, tripwires, hits):
+        self.indices = FakeIndices()
+        self.tripwires = tripwires
+        self.hits = hits
+        self.percolate_bodies = []
+        self.fingerprint_checks = 0
+        self.bulk_bodies = []
+
+    def search(self, index, body):
+        if "aggs" in body:
+            self.fingerprint_checks += 1
+            return {"hits": {"total": {"value": len(self.tripwires)}},
+                    "aggregations": {"updated": {"value": 1.0}}}
+        self.percolate_bodies.append(body)
+        assert body["query"]["bool"]["filter"] == {"term": {"enabled": True}}
+        document = body["query"]["bool"]["must"]["percolate"]["document"]
+        return {"hits": {"hits": [
+            {"_id": tid, "_source": {"name": tid}, "_score": 0.2876}
+            for tid in self.hits.get(document["text"], [])
+        ]}}
+
+    def bulk(self, body):
+        self.bulk_bodies.append(body)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    es = FakeES(
+        [
+            _tripwire("active", keywords=["sanctions"]),
+            _tripwire("retired", enabled=False, keywords=["sanctions"]),
+            _tripwire("ru-mining", themes=["mining_metals"], jurisdictions=["RU", "KZ"]),
+        ],
+        hits={
+            "new sanctions": ["active"],
+            "U.S. sanctions": ["active"],
+            "sanctions": ["active"],
+            "Mining output in Kazakhstan": ["ru-mining"],
+        },
+    )
+
+    def fake_scan(client, index, query):
+        for t in client.tripwires:
+            yield {"_id": t["id"], "_source": {k: v for k, v in t.items() if k != "id"}}
+
+    monkeypatch.setattr(tripwire, "scan", fake_scan)
+    return TripwireEngine(es=es, verify_every=1, reload_interval=3600)
+
+
+def test_es_percolation_filters_enabled_and_sets_size(engine):
+    matches = engine._percolate_es(build_percolate_document("new sanctions"))
+    assert [m.tripwire_id for m in matches] == ["active"]
+    body = engine.es.percolate_bodies[-1]
+    assert body["size"] == tripwire.PERCOLATE_MAX_HITS
+
+
+def test_local_matches_equal_fixed_es_hits(engine):
+    documents = [
+        build_percolate_document("new sanctions"),
+        build_percolate_document("U.S. sanctions"),
+        build_percolate_document("Mining output in Kazakhstan",
+                                 extracted_themes=["mining_metals"], primary_jurisdiction="KZ"),
+        build_percolate_document("Mining output in Russia", extracted_themes=["mining_metals"]),
+    ]
+    expected = [["active"], ["active"], ["ru-mining"], []]
+    assert [[m.tripwire_id for m in engine.percolate(doc)] for doc in documents] == expected
+    assert engine.mismatches == 0
+
+
+def test_local_scores_count_satisfied_clauses(engine):
+    doc = build_percolate_document("", extracted_themes=["mining_metals"], primary_jurisdiction="RU")
+    assert [(m.tripwire_id, m.score) for m in engine._matcher.match(doc)] == [("ru-mining", 2.0)]
+
+
+def test_verification_agrees_without_forcing_reloads(engine):
+    checks = engine.es.fingerprint_checks
+    for _ in range(5):
+        assert [m.tripwire_id for m in engine.percolate(build_percolate_document("U.S. sanctions"))] == ["active"]
+    assert engine.mismatches == 0
+    assert engine.es.fingerprint_checks == checks
+
+
+def test_mismatch_reloads_only_when_tripwires_changed(engine, monkeypatch):
+    reloads = []
+    monkeypatch.setattr(engine, "reload", lambda: reloads.append(1) or True)
+    engine._matcher = TripwireMatcher([])
+    engine.percolate(build_percolate_document("sanctions"))
+    assert engine.mismatches == 1 and reloads == []
+
+    engine.es.tripwires.append(_tripwire("new", keywords=["sanctions"]))
+    engine.es.hits["sanctions"] = ["active", "new"]
+    engine.percolate(build_percolate_document("sanctions"))
+    assert engine.mismatches == 2 and reloads == [1]
+
+
+# =============================================================================
+# MATCH COUNTS
+# =============================================================================
+
+def _increments(engine):
+    return {op["update"]["_id"]: engine.es.bulk_bodies[-1][i + 1]["script"]["params"]["n"]
+            for i, op in enumerate(engine.es.bulk_bodies[-1]) if "update" in op}
+
+
+def test_match_counts_flush_after_interval(engine, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(tripwire.time, "monotonic", lambda: clock[0])
+    engine._flushed_at = clock[0]
+
+    engine.percolate_document("sanctions")
+    assert engine.es.bulk_bodies == []
+
+    clock[0] += tripwire.MATCH_COUNT_FLUSH_INTERVAL
+    engine.percolate_document("sanctions")
+    assert _increments(engine) == {"active": 2}
+
+
+def test_match_counts_flush_after_count(engine, monkeypatch):
+    monkeypatch.setattr(tripwire, "MATCH_COUNT_FLUSH", 3)
+    for _ in range(3):
+        engine.percolate_document("sanctions")
+    assert _increments(engine) == {"active": 3}
+
+
+def test_shared_engine_is_closed_at_exit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(tripwire, "_engine", None)
+    monkeypatch.setattr(tripwire, "TripwireEngine", lambda: object.__new__(TripwireEngine))
+    monkeypatch.setattr(tripwire.atexit, "register", registered.append)
+
+    engine = tripwire.get_tripwire_engine()
+    assert tripwire.get_tripwire_engine() is engine
+    assert registered == [engine.close]
@@ -32,20 +32,81 @@ The percolator query would be:
             ]
         }
     }
+
+Local evaluation:
+    Tripwires are stored as percolator queries, but documents are matched
+    in-process by a TripwireMatcher compiled from the enabled tripwires'
+    conditions (recompiled when tripwires change). Percolation in
+    Elasticsearch is only a fallback when no matcher could be loaded, and
+    a spot check of local results (verify_every).
+
+    Local match scores are the number of satisfied condition clauses (1.0
+    for a tripwire without conditions), not Elasticsearch relevance scores.
+    They order a document's matches by specificity but are not comparable
+    with the _score of ES percolation, which is only used as a fallback.
+
+    engine = TripwireEngine(verify_every=1000)
+    for matches in engine.percolate_batch(documents):
+        ...
+    engine.close()                  # flush buffered match counts
+
+    Match counts are buffered and written every MATCH_COUNT_FLUSH matches
+    or MATCH_COUNT_FLUSH_INTERVAL seconds; the shared engine from
+    get_tripwire_engine() is closed at interpreter exit.
 """
 
+import atexit
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple
 from datetime import datetime
-from elasticsearch import Elasticsearch
 from dataclasses import dataclass, field
 
+try:
+    from elasticsearch import Elasticsearch
+    from elasticsearch.helpers import scan
+    ES_AVAILABLE = True
+except ImportError:
+    Elasticsearch = None
+    scan = None
+    ES_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 ES_HOST = "http://localhost:9200"
 TRIPWIRE_INDEX = "tripwires"
 
+PERCOLATE_TEXT_LIMIT = 5000   # Text sent to ES percolation (local matching reads all of it)
+RELOAD_INTERVAL = 30.0        # Seconds between checks for tripwire changes in ES
+MATCH_COUNT_FLUSH = 200       # Buffered match-count increments before writing them to ES
+MATCH_COUNT_FLUSH_INTERVAL = 60.0  # Seconds before buffered match counts are written anyway
+BATCH_SIZE = 256              # Documents per percolate_batch() step
+PERCOLATE_MAX_HITS = 10000    # Hits requested from ES percolation (index.max_result_window)
+
+# Condition -> (document section, field) it must match, as in create_tripwire's query
+CONDITION_FIELDS = {
+    "themes": ("extracted", "themes"),
+    "phenomena": ("extracted", "phenomena"),
+    "red_flag_themes": ("extracted", "red_flag_themes"),
+    "methodologies": ("extracted", "methodologies"),
+    "entities": ("extracted", "entities"),
+    "jurisdictions": ("spatial", "primary_jurisdiction"),
+    "years": ("temporal", "content_years"),
+}
+
+# Word tokens, lowercased, split like the standard analyzer behind `match`
+# (UAX #29 word boundaries): letters stay joined across . ' ’ : ("u.s",
+# "o'neil"), digits across . , ; ' ’ ("1.5", "1,000"), and a trailing
+# period is dropped
+_TOKEN = re.compile(
+    r"\w+(?:(?<=[^\W\d_])[.'’:](?=[^\W\d_])\w+|(?<=\d)[.,;'’](?=\d)\w+)*"
+)
+
 # Index mapping for tripwires (percolator queries)
 # MUST include both the percolator field AND the document fields being percolated
 TRIPWIRE_MAPPING = {
@@ -104,7 +165,8 @@ TRIPWIRE_MAPPING = {
                     "phenomena": {"type": "keyword"},
                     "jurisdictions": {"type": "keyword"},
                     "entities": {"type": "keyword"},
-                    "keywords": {"type": "keyword"}
+                    "keywords": {"type": "keyword"},
+                    "years": {"type": "integer"}
                 }
             },
 
@@ -162,7 +224,12 @@ DOCUMENT_PERCOLATE_MAPPING = {
 
 @dataclass
 class TripwireMatch:
-    """Result of a tripwire match."""
+    """
+    Result of a tripwire match.
+
+    score is the number of satisfied condition clauses for local matches
+    and the ES _score only when percolation fell back to Elasticsearch.
+    """
     tripwire_id: str
     tripwire_name: str
     priority: str
@@ -172,20 +239,302 @@ class TripwireMatch:
     score: float
 
 
-class TripwireEngine:
+def tokenize(text: str) -> Set[str]:
+    """Distinct lowercased word tokens of a text."""
+    return {m.group().lower() for m in _TOKEN.finditer(text or "")}
+
+
+def _term(condition: str, value: Any) -> Any:
+    """Normalize a condition/document value for comparison (years are integers)."""
+    if condition == "years":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return value
+    return value
+
+
+def build_percolate_document(
+    text: str,
+    extracted_themes: List[str] = None,
+    extracted_phenomena: List[str] = None,
+    extracted_red_flag_themes: List[str] = None,
+    extracted_methodologies: List[str] = None,
+    extracted_entities: List[str] = None,
+    extracted_locations: List[str] = None,
+    primary_jurisdiction: str = None,
+    content_years: List[int] = None
+) -> Dict[str, Any]:
+    """Document in the shape tripwires are matched against (DOCUMENT_PERCOLATE_MAPPING)."""
+    return {
+        "text": text or "",
+        "extracted": {
+            "themes": extracted_themes or [],
+            "phenomena": extracted_phenomena or [],
+            "red_flag_themes": extracted_red_flag_themes or [],
+            "methodologies": extracted_methodologies or [],
+            "entities": extracted_entities or [],
+            "locations": extracted_locations or []
+        },
+        "temporal": {
+            "content_years": content_years or []
+        },
+        "spatial": {
+            "primary_jurisdiction": primary_jurisdiction,
+            "locations": extracted_locations or []
+        }
+    }
+
+
+def document_from_extraction(extraction_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Percolate document from UniversalExtractor.extract_all() output."""
+    extracted = extraction_result.get("extracted", {})
+    temporal = extraction_result.get("temporal", {})
+    spatial = extraction_result.get("spatial", {})
+
+    return build_percolate_document(
+        text="",  # Text not needed if we have extracted fields
+        extracted_themes=[t.get("id") for t in extracted.get("themes", [])],
+        extracted_phenomena=[p.get("id") for p in extracted.get("phenomena", [])],
+        extracted_red_flag_themes=[rf.get("id") for rf in extracted.get("red_flag_themes", [])],
+        extracted_methodologies=[m.get("id") for m in extracted.get("methodologies", [])],
+        extracted_entities=[e.get("value") for e in extracted.get("entities", [])],
+        extracted_locations=[loc.get("name") for loc in extracted.get("locations", [])],
+        primary_jurisdiction=spatial.get("primary_jurisdiction"),
+        content_years=temporal.get("content_years", [])
+    )
+
+
+class TripwireMatcher:
     """
-    Percolator-based tripwire engine for real-time document alerting.
+    Enabled tripwires compiled for in-process matching.
+
+    Mirrors the percolator query create_tripwire builds: every condition
+    list is an OR over its values and the conditions are ANDed; a tripwire
+    without conditions matches everything. Keywords follow `match`
+    semantics - a keyword hits when any of its tokens occurs in the text.
+
+    Compilation builds postings from each condition value (and keyword
+    token) to the tripwires it satisfies. Matching a document is one pass
+    over its values and text tokens, counting satisfied clauses per
+    tripwire; nothing is truncated.
+    """
+
+    def __init__(self, tripwires: Iterable[Dict[str, Any]] = ()):
+        self.tripwires: Dict[str, Dict[str, Any]] = {}
+        self._clauses: Dict[str, int] = {}
+        self._always: List[str] = []
+        # condition -> value/token -> tripwire ids
+        self._postings: Dict[str, Dict[Any, List[str]]] = defaultdict(lambda: defaultdict(list))
+        for tripwire in tripwires:
+            self._compile(tripwire)
+
+    def __len__(self) -> int:
+        return len(self.tripwires)
+
+    def _compile(self, tripwire: Dict[str, Any]):
+        if not tripwire.get("enabled", True):
+            return
+        tripwire_id = tripwire["id"]
+        conditions = tripwire.get("conditions") or {}
+        clauses = 0
+
+        for condition in CONDITION_FIELDS:
+            values = conditions.get(condition) or []
+            if values:
+                clauses += 1
+                for value in {_term(condition, v) for v in values}:
+                    self._postings[condition][value].append(tripwire_id)
+
+        keywords = conditions.get("keywords") or []
+        if keywords:
+            clauses += 1
+            for token in set().union(*(tokenize(kw) for kw in keywords)):
+                self._postings["keywords"][token].append(tripwire_id)
+
+        self.tripwires[tripwire_id] = tripwire
+        self._clauses[tripwire_id] = clauses
+        if not clauses:
+            self._always.append(tripwire_id)
+
+    def match_ids(self, document: Dict[str, Any]) -> List[Tuple[str, float]]:
+        """
+        (tripwire_id, score) of matching tripwires, highest score first.
+
+        score is the number of satisfied condition clauses (1.0 without
+        conditions) - a specificity count, not an ES relevance score.
+        """
+        satisfied: Dict[str, int] = defaultdict(int)
+
+        for condition, (section, name) in CONDITION_FIELDS.items():
+            postings = self._postings.get(condition)
+            if not postings:
+                continue
+            values = (document.get(section) or {}).get(name)
+            if values is None:
+                continue
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            hit = set()
+            for value in values:
+                hit.update(postings.get(_term(condition, value), ()))
+            for tripwire_id in hit:
+                satisfied[tripwire_id] += 1
+
+        keyword_postings = self._postings.get("keywords")
+        if keyword_postings:
+            hit = set()
+            for token in tokenize(document.get("text", "")) & keyword_postings.keys():
+                hit.update(keyword_postings[token])
+            for tripwire_id in hit:
+                satisfied[tripwire_id] += 1
+
+        matched = [(tripwire_id, 1.0) for tripwire_id in self._always]
+        matched.extend(
+            (tripwire_id, float(count)) for tripwire_id, count in satisfied.items()
+            if count == self._clauses[tripwire_id]
+        )
+        matched.sort(key=lambda m: -m[1])
+        return matched
+
+    def match(self, document: Dict[str, Any]) -> List[TripwireMatch]:
+        return [_to_match(tripwire_id, self.tripwires[tripwire_id], score)
+                for tripwire_id, score in self.match_ids(document)]
+
+
+def _to_match(tripwire_id: str, source: Dict[str, Any], score: float) -> TripwireMatch:
+    return TripwireMatch(
+        tripwire_id=tripwire_id,
+        tripwire_name=source.get("name", "Unknown"),
+        priority=source.get("priority", "medium"),
+        category=source.get("category", "topic"),
+        conditions=source.get("conditions", {}),
+        actions=source.get("actions", {}),
+        score=score
+    )
+
+
+class TripwireEngine:
     """
+    Tripwire engine for real-time document alerting.
+
+    Tripwires live in the percolator index; documents are matched locally by
+    a TripwireMatcher compiled from them. Local changes recompile it at once,
+    changes made elsewhere are picked up within reload_interval seconds.
 
-    def __init__(self):
-        self.es = Elasticsearch([ES_HOST])
-        self._ensure_index()
+    Args:
+        es: Elasticsearch client (default: one for ES_HOST, if installed)
+        verify_every: Percolate every Nth document in ES too and log
+            differences from the local result (0 = never)
+        reload_interval: Seconds between checks for tripwire changes in ES
+    """
 
-    def _ensure_index(self):
+    def __init__(self, es: Any = None, verify_every: int = 0, reload_interval: float = RELOAD_INTERVAL):
+        if es is None and ES_AVAILABLE:
+            es = Elasticsearch([ES_HOST])
+        self.es = es
+        self.verify_every = verify_every
+        self.reload_interval = reload_interval
+
+        self._lock = threading.RLock()
+        self._tripwires: Dict[str, Dict[str, Any]] = {}
+        self._matcher: Optional[TripwireMatcher] = None
+        self._fingerprint: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._documents = 0
+        self.mismatches = 0
+
+        # Match counts buffered until MATCH_COUNT_FLUSH increments or
+        # MATCH_COUNT_FLUSH_INTERVAL seconds since the last write
+        self._pending_counts: Dict[str, int] = defaultdict(int)
+        self._pending_total = 0
+        self._flushed_at = time.monotonic()
+        self._last_match: Optional[str] = None
+
+        self._index_ready = self._ensure_index()
+        self.reload()
+
+    def _ensure_index(self) -> bool:
         """Create tripwire index if it doesn't exist."""
-        if not self.es.indices.exists(index=TRIPWIRE_INDEX):
-            logger.info(f"Creating tripwire index: {TRIPWIRE_INDEX}")
-            self.es.indices.create(index=TRIPWIRE_INDEX, body=TRIPWIRE_MAPPING)
+        if self.es is None:
+            return False
+        try:
+            if not self.es.indices.exists(index=TRIPWIRE_INDEX):
+                logger.info(f"Creating tripwire index: {TRIPWIRE_INDEX}")
+                self.es.indices.create(index=TRIPWIRE_INDEX, body=TRIPWIRE_MAPPING)
+            return True
+        except Exception as e:
+            logger.warning(f"Tripwire index unavailable, matching locally only: {e}")
+            return False
+
+    # ─────────────────────────────────────────────────────────────
+    # Local matcher
+    # ─────────────────────────────────────────────────────────────
+
+    def _compile(self):
+        with self._lock:
+            self._matcher = TripwireMatcher(self._tripwires.values())
+
+    def _remote_fingerprint(self) -> Optional[Tuple]:
+        """(count, latest updated_at) of the tripwire index - changes when tripwires do."""
+        result = self.es.search(
+            index=TRIPWIRE_INDEX,
+            body={"size": 0, "track_total_hits": True,
+                  "aggs": {"updated": {"max": {"field": "updated_at"}}}}
+        )
+        total = result["hits"]["total"]
+        count = total["value"] if isinstance(total, dict) else total
+        return count, result.get("aggregations", {}).get("updated", {}).get("value")
+
+    def reload(self) -> bool:
+        """Recompile the matcher from all tripwires in ES. False if ES could not be read."""
+        if self.es is None:
+            if self._matcher is None:
+                self._compile()
+            return False
+        try:
+            if not self._index_ready:
+                self._index_ready = self._ensure_index()
+            fingerprint = self._remote_fingerprint()
+            tripwires = {
+                hit["_id"]: {"id": hit["_id"], **hit["_source"]}
+                for hit in scan(self.es, index=TRIPWIRE_INDEX, query={"query": {"match_all": {}}})
+            }
+        except Exception as e:
+            logger.warning(f"Could not load tripwires from ES: {e}")
+            if self._matcher is None and self._tripwires:
+                self._compile()
+            return False
+
+        with self._lock:
+            self._tripwires = tripwires
+            self._fingerprint = fingerprint
+            self._checked_at = time.monotonic()
+            self._compile()
+        logger.info(f"Compiled {len(self._matcher)} enabled tripwires")
+        return True
+
+    def _maybe_reload(self):
+        """Reload if tripwires changed in ES since the last check (at most every reload_interval)."""
+        if self.es is None or time.monotonic() - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = time.monotonic()
+        try:
+            fingerprint = self._remote_fingerprint()
+        except Exception as e:
+            logger.debug(f"Tripwire change check failed: {e}")
+            return
+        if fingerprint != self._fingerprint:
+            self.reload()
+
+    def _store_local(self, tripwire_id: str, doc: Optional[Dict[str, Any]]):
+        """Apply a change made through this engine to the local matcher."""
+        with self._lock:
+            if doc is None:
+                self._tripwires.pop(tripwire_id, None)
+            else:
+                self._tripwires[tripwire_id] = {"id": tripwire_id, **doc}
+            self._compile()
 
     def create_tripwire(
         self,
@@ -197,6 +546,7 @@ class TripwireEngine:
         jurisdictions: List[str] = None,
         entities: List[str] = None,
         keywords: List[str] = None,
+        years: List[int] = None,
         priority: str = "medium",
         category: str = "topic",
         owner: str = None,
@@ -213,6 +563,7 @@ class TripwireEngine:
             jurisdictions: Country codes to match (e.g., ["RU", "CN"])
             entities: Entity names/IDs to match
             keywords: Raw keywords to match in text
+            years: Content years to match (any of)
             priority: Alert priority (critical, high, medium, low)
             category: Tripwire category (red_flag, topic, entity, ownership)
             owner: Owner/creator of the tripwire
@@ -255,6 +606,11 @@ class TripwireEngine:
                 "terms": {"extracted.entities": entities}
             })
 
+        if years:
+            must_clauses.append({
+                "terms": {"temporal.content_years": years}
+            })
+
         if keywords:
             must_clauses.append({
                 "bool": {
@@ -285,7 +641,8 @@ class TripwireEngine:
                 "methodologies": methodologies or [],
                 "jurisdictions": jurisdictions or [],
                 "entities": entities or [],
-                "keywords": keywords or []
+                "keywords": keywords or [],
+                "years": years or []
             },
             "actions": actions or {},
             "enabled": True,
@@ -295,9 +652,15 @@ class TripwireEngine:
             "last_match": None
         }
 
-        result = self.es.index(index=TRIPWIRE_INDEX, body=doc, refresh=True)
-        logger.info(f"Created tripwire '{name}' with ID: {result['_id']}")
-        return result["_id"]
+        if self._index_ready:
+            result = self.es.index(index=TRIPWIRE_INDEX, body=doc, refresh=True)
+            tripwire_id = result["_id"]
+        else:
+            # No cluster: the tripwire exists in this engine only
+            tripwire_id = uuid.uuid4().hex
+        self._store_local(tripwire_id, doc)
+        logger.info(f"Created tripwire '{name}' with ID: {tripwire_id}")
+        return tripwire_id
 
     def percolate_document(
         self,
@@ -331,66 +694,166 @@ class TripwireEngine:
         Returns:
             List of matching tripwires
         """
-        # Build the document to percolate
-        doc = {
-            "text": text[:5000],  # Truncate for percolation
-            "extracted": {
-                "themes": extracted_themes or [],
-                "phenomena": extracted_phenomena or [],
-                "red_flag_themes": extracted_red_flag_themes or [],
-                "methodologies": extracted_methodologies or [],
-                "entities": extracted_entities or [],
-                "locations": extracted_locations or []
-            },
-            "temporal": {
-                "content_years": content_years or []
-            },
-            "spatial": {
-                "primary_jurisdiction": primary_jurisdiction,
-                "locations": extracted_locations or []
-            }
-        }
+        doc = build_percolate_document(
+            text,
+            extracted_themes=extracted_themes,
+            extracted_phenomena=extracted_phenomena,
+            extracted_red_flag_themes=extracted_red_flag_themes,
+            extracted_methodologies=extracted_methodologies,
+            extracted_entities=extracted_entities,
+            extracted_locations=extracted_locations,
+            primary_jurisdiction=primary_jurisdiction,
+            content_years=content_years
+        )
+        matches = self.percolate(doc)
+        self.flush_match_counts(force=False)
+        return matches
 
-        # Run percolation
+    def percolate(self, document: Dict[str, Any]) -> List[TripwireMatch]:
+        """Match one percolate document (see build_percolate_document)."""
+        self._maybe_reload()
+        matcher = self._matcher
+        if matcher is None:
+            matches = self._percolate_es(document)
+        else:
+            matches = matcher.match(document)
+            self._documents += 1
+            if self.verify_every and self._documents % self.verify_every == 0:
+                self._verify(matcher, document)
+        self._record_matches(matches)
+        return matches
+
+    def percolate_batch(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        batch_size: int = BATCH_SIZE
+    ) -> Iterator[List[TripwireMatch]]:
+        """
+        Match a stream of percolate documents, yielding each one's matches in order.
+
+        Tripwire changes are checked once per batch of `batch_size`
+        documents, and buffered match counts are flushed after each batch.
+        """
+        batch: List[Dict[str, Any]] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= batch_size:
+                yield from self._percolate_chunk(batch)
+                batch = []
+        if batch:
+            yield from self._percolate_chunk(batch)
+
+    def _percolate_chunk(self, batch: List[Dict[str, Any]]) -> Iterator[List[TripwireMatch]]:
+        self._maybe_reload()
+        for document in batch:
+            yield self.percolate(document)
+        self.flush_match_counts()
+
+    # ─────────────────────────────────────────────────────────────
+    # ES percolation (fallback and consistency check)
+    # ─────────────────────────────────────────────────────────────
+
+    def _percolate_es(self, document: Dict[str, Any]) -> List[TripwireMatch]:
+        """Percolate in ES against enabled tripwires (text truncated to PERCOLATE_TEXT_LIMIT)."""
+        if not self._index_ready:
+            return []
+        doc = dict(document, text=(document.get("text") or "")[:PERCOLATE_TEXT_LIMIT])
         result = self.es.search(
             index=TRIPWIRE_INDEX,
             body={
+                "size": PERCOLATE_MAX_HITS,
                 "query": {
-                    "percolate": {
-                        "field": "query",
-                        "document": doc
+                    "bool": {
+                        "must": {
+                            "percolate": {
+                                "field": "query",
+                                "document": doc
+                            }
+                        },
+                        # Disabled tripwires keep their query; the matcher skips them
+                        "filter": {"term": {"enabled": True}}
                     }
                 }
             }
         )
+        return [_to_match(hit["_id"], hit["_source"], hit["_score"]) for hit in result["hits"]["hits"]]
 
-        matches = []
-        for hit in result["hits"]["hits"]:
-            source = hit["_source"]
-            matches.append(TripwireMatch(
-                tripwire_id=hit["_id"],
-                tripwire_name=source.get("name", "Unknown"),
-                priority=source.get("priority", "medium"),
-                category=source.get("category", "topic"),
-                conditions=source.get("conditions", {}),
-                actions=source.get("actions", {}),
-                score=hit["_score"]
-            ))
-
-            # Update match count
-            self.es.update(
-                index=TRIPWIRE_INDEX,
-                id=hit["_id"],
-                body={
-                    "script": {
-                        "source": "ctx._source.match_count += 1; ctx._source.last_match = params.now",
-                        "params": {"now": datetime.utcnow().isoformat()}
-                    }
+    def _verify(self, matcher: TripwireMatcher, document: Dict[str, Any]):
+        """Compare local and ES results on the same (truncated) document."""
+        doc = dict(document, text=(document.get("text") or "")[:PERCOLATE_TEXT_LIMIT])
+        try:
+            remote = {m.tripwire_id for m in self._percolate_es(doc)}
+        except Exception as e:
+            logger.debug(f"Tripwire consistency check skipped: {e}")
+            return
+        local = {tripwire_id for tripwire_id, _ in matcher.match_ids(doc)}
+        if remote == local:
+            return
+        self.mismatches += 1
+        logger.warning(
+            f"Tripwire matcher disagrees with ES percolation: "
+            f"local only {sorted(local - remote)}, ES only {sorted(remote - local)}"
+        )
+        # Reload only if the tripwires actually changed since the last load
+        try:
+            stale = self._remote_fingerprint() != self._fingerprint
+        except Exception as e:
+            logger.debug(f"Tripwire change check failed: {e}")
+            return
+        if stale:
+            self.reload()
+
+    # ─────────────────────────────────────────────────────────────
+    # Match counts
+    # ─────────────────────────────────────────────────────────────
+
+    def _record_matches(self, matches: List[TripwireMatch]):
+        if not matches:
+            return
+        with self._lock:
+            for match in matches:
+                self._pending_counts[match.tripwire_id] += 1
+            self._pending_total += len(matches)
+            self._last_match = datetime.utcnow().isoformat()
+
+    def flush_match_counts(self, force: bool = True):
+        """
+        Write buffered match counts to ES.
+
+        Unless forced, only once MATCH_COUNT_FLUSH increments are pending or
+        MATCH_COUNT_FLUSH_INTERVAL seconds have passed since the last write.
+        """
+        with self._lock:
+            if not self._pending_counts:
+                return
+            due = (self._pending_total >= MATCH_COUNT_FLUSH
+                   or time.monotonic() - self._flushed_at >= MATCH_COUNT_FLUSH_INTERVAL)
+            if not force and not due:
+                return
+            counts, self._pending_counts = self._pending_counts, defaultdict(int)
+            self._pending_total = 0
+            self._flushed_at = time.monotonic()
+            now = self._last_match
+        if not self._index_ready:
+            return
+
+        operations = []
+        for tripwire_id, count in counts.items():
+            operations.append({"update": {"_index": TRIPWIRE_INDEX, "_id": tripwire_id}})
+            operations.append({
+                "script": {
+                    "source": "ctx._source.match_count += params.n; ctx._source.last_match = params.now",
+                    "params": {"n": count, "now": now}
                 }
-            )
+            })
+        try:
+            self.es.bulk(body=operations)
+        except Exception as e:
+            logger.warning(f"Failed to update tripwire match counts: {e}")
 
-        logger.info(f"Percolation found {len(matches)} tripwire matches")
-        return matches
+    def close(self):
+        """Write any buffered match counts."""
+        self.flush_match_counts()
 
     def percolate_extracted(self, extraction_result: Dict[str, Any]) -> List[TripwireMatch]:
         """
@@ -402,38 +865,28 @@ class TripwireEngine:
         Returns:
             List of matching tripwires
         """
-        extracted = extraction_result.get("extracted", {})
-        temporal = extraction_result.get("temporal", {})
-        spatial = extraction_result.get("spatial", {})
-
-        return self.percolate_document(
-            text="",  # Text not needed if we have extracted fields
-            extracted_themes=[t.get("id") for t in extracted.get("themes", [])],
-            extracted_phenomena=[p.get("id") for p in extracted.get("phenomena", [])],
-            extracted_red_flag_themes=[rf.get("id") for rf in extracted.get("red_flag_themes", [])],
-            extracted_methodologies=[m.get("id") for m in extracted.get("methodologies", [])],
-            extracted_entities=[e.get("value") for e in extracted.get("entities", [])],
-            extracted_locations=[loc.get("name") for loc in extracted.get("locations", [])],
-            primary_jurisdiction=spatial.get("primary_jurisdiction"),
-            content_years=temporal.get("content_years", [])
-        )
+        matches = self.percolate(document_from_extraction(extraction_result))
+        self.flush_match_counts(force=False)
+        return matches
 
     def list_tripwires(self, enabled_only: bool = True) -> List[Dict[str, Any]]:
         """List all tripwires."""
+        if not self._index_ready:
+            return [dict(t) for t in self._tripwires.values() if t.get("enabled", True) or not enabled_only]
         query = {"term": {"enabled": True}} if enabled_only else {"match_all": {}}
-        result = self.es.search(
-            index=TRIPWIRE_INDEX,
-            body={"query": query, "size": 1000}
-        )
         return [
             {"id": hit["_id"], **hit["_source"]}
-            for hit in result["hits"]["hits"]
+            for hit in scan(self.es, index=TRIPWIRE_INDEX, query={"query": query})
         ]
 
     def delete_tripwire(self, tripwire_id: str) -> bool:
         """Delete a tripwire."""
         try:
-            self.es.delete(index=TRIPWIRE_INDEX, id=tripwire_id, refresh=True)
+            if self._index_ready:
+                self.es.delete(index=TRIPWIRE_INDEX, id=tripwire_id, refresh=True)
+            elif tripwire_id not in self._tripwires:
+                return False
+            self._store_local(tripwire_id, None)
             return True
         except Exception as e:
             logger.error(f"Failed to delete tripwire {tripwire_id}: {e}")
@@ -441,13 +894,20 @@ class TripwireEngine:
 
     def disable_tripwire(self, tripwire_id: str) -> bool:
         """Disable a tripwire without deleting it."""
+        change = {"enabled": False, "updated_at": datetime.utcnow().isoformat()}
         try:
-            self.es.update(
-                index=TRIPWIRE_INDEX,
-                id=tripwire_id,
-                body={"doc": {"enabled": False, "updated_at": datetime.utcnow().isoformat()}},
-                refresh=True
-            )
+            if self._index_ready:
+                self.es.update(
+                    index=TRIPWIRE_INDEX,
+                    id=tripwire_id,
+                    body={"doc": change},
+                    refresh=True
+                )
+            elif tripwire_id not in self._tripwires:
+                return False
+            current = self._tripwires.get(tripwire_id)
+            if current is not None:
+                self._store_local(tripwire_id, {**current, **change})
             return True
         except Exception as e:
             logger.error(f"Failed to disable tripwire {tripwire_id}: {e}")
@@ -456,11 +916,15 @@ class TripwireEngine:
 
 # Singleton
 _engine = None
+_engine_lock = threading.Lock()
 
 def get_tripwire_engine() -> TripwireEngine:
+    """Shared engine, closed at interpreter exit so buffered match counts are written."""
     global _engine
-    if _engine is None:
-        _engine = TripwireEngine()
+    with _engine_lock:
+        if _engine is None:
+            _engine = TripwireEngine()
+            atexit.register(_engine.close)
     return _engine
 
 
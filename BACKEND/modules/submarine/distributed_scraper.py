@@ -37,14 +37,25 @@ Usage:
 Optional enrichment:
     --include-io            # Attach IO Matrix metadata (category, search template) from io-matrix
     --io-index io-matrix    # Override IO index name (default: io-matrix)
+
+Resumable runs (homepage mode):
+    --ledger run.db         # Record finished domains; rerunning skips them
+    --retry-failed          # ...except those that failed
+    --per-host 2            # Max concurrent requests per host
 """
 
 import asyncio
 import argparse
 import json
+import multiprocessing
+import os
+import sqlite3
 import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 import aiohttp
 import logging
@@ -74,16 +85,27 @@ DEFAULT_ES_HOST = "176.9.2.153"
 DEFAULT_ES_PORT = 9200
 ES_INDEX = "submarine-scrapes"
 DEFAULT_IO_INDEX = "io-matrix"
+DEFAULT_PER_HOST = 2          # Concurrent scrapes of one host
+LEDGER_BATCH = 500            # Finished domains per ledger write
+EXTRACT_RECYCLE_AFTER = 500   # Pages an extraction worker handles before it is replaced (leak guard)
+SLOW_EXTRACTION = 5.0         # CPU seconds after which a page's extraction is logged
 
 
 class SastreStreamer:
-    """Stream scraped data to sastre Elasticsearch."""
+    """
+    Stream scraped data to sastre Elasticsearch.
+
+    Docs streamed with a `key` are acknowledged individually: once the bulk
+    request carrying them returns, take_acks() reports for each key whether
+    ES indexed its doc, whichever flush (buffer-full or explicit) sent it.
+    """
 
     def __init__(self, es_host: str = DEFAULT_ES_HOST, es_port: int = DEFAULT_ES_PORT):
         self.es_url = f"http://{es_host}:{es_port}"
         self._session: Optional[aiohttp.ClientSession] = None
-        self._buffer: List[Dict] = []
+        self._buffer: List[Tuple[Optional[str], Dict]] = []
         self._buffer_size = 100  # Bulk index every 100 docs
+        self._acks: Dict[str, bool] = {}
 
     async def _ensure_session(self):
         if self._session is None:
@@ -179,26 +201,29 @@ class SastreStreamer:
         except Exception as e:
             logger.warning(f"Index check failed: {e}")
 
-    async def stream(self, doc: Dict[str, Any]):
-        """Add doc to buffer, flush when full."""
-        self._buffer.append(doc)
+    async def stream(self, doc: Dict[str, Any], key: Optional[str] = None):
+        """Add doc to buffer, flush when full. `key` makes its delivery show up in take_acks()."""
+        self._buffer.append((key, doc))
         if len(self._buffer) >= self._buffer_size:
             await self.flush()
 
-    async def flush(self):
-        """Bulk index buffered documents to sastre."""
+    async def flush(self) -> int:
+        """Bulk index buffered documents to sastre; returns how many ES indexed."""
         if not self._buffer:
-            return
+            return 0
 
+        # Take the buffer before awaiting, so docs streamed meanwhile are kept
+        entries, self._buffer = self._buffer, []
         await self._ensure_session()
 
         # Build bulk request body
         bulk_body = ""
-        for doc in self._buffer:
+        for _, doc in entries:
             action = {"index": {"_index": ES_INDEX}}
             bulk_body += json.dumps(action) + "\n"
             bulk_body += json.dumps(doc) + "\n"
 
+        indexed = [False] * len(entries)
         try:
             async with self._session.post(
                 f"{self.es_url}/_bulk",
@@ -208,17 +233,28 @@ class SastreStreamer:
             ) as resp:
                 if resp.status == 200:
                     result = await resp.json()
-                    errors = result.get("errors", False)
-                    if errors:
-                        logger.warning(f"Bulk index had errors")
+                    items = result.get("items", [])
+                    for i, item in enumerate(items[:len(entries)]):
+                        outcome = item.get("index", {})
+                        indexed[i] = "error" not in outcome and 200 <= outcome.get("status", 0) < 300
+                    if result.get("errors", False):
+                        logger.warning(f"Bulk index had errors: {indexed.count(False)}/{len(entries)} docs rejected")
                     else:
-                        logger.info(f"Streamed {len(self._buffer)} docs to sastre")
+                        logger.info(f"Streamed {len(entries)} docs to sastre")
                 else:
                     logger.error(f"Bulk index failed: {resp.status}")
         except Exception as e:
             logger.error(f"Stream to sastre failed: {e}")
 
-        self._buffer = []
+        for (key, _), ok in zip(entries, indexed):
+            if key is not None:
+                self._acks[key] = self._acks.get(key, False) or ok
+        return sum(indexed)
+
+    def take_acks(self) -> Dict[str, bool]:
+        """key -> indexed? for keyed docs whose bulk request has returned since the last call."""
+        acks, self._acks = self._acks, {}
+        return acks
 
     async def close(self):
         await self.flush()
@@ -226,6 +262,368 @@ class SastreStreamer:
             await self._session.close()
 
 
+# ─────────────────────────────────────────────────────────────
+# Extraction stage (runs inside extraction worker processes)
+# ─────────────────────────────────────────────────────────────
+
+_page_extractor = None  # UniversalExtractor, or False when unavailable
+
+
+def _get_page_extractor():
+    """The process's UniversalExtractor, built once (ImportError if unavailable)."""
+    global _page_extractor
+    if _page_extractor is None:
+        try:
+            from PACMAN.universal_extractor import UniversalExtractor
+            _page_extractor = UniversalExtractor()
+        except ImportError:
+            _page_extractor = False
+    if _page_extractor is False:
+        raise ImportError("PACMAN.universal_extractor not available")
+    return _page_extractor
+
+
+def _init_extraction_worker():
+    """Warm the extractor once per worker process."""
+    try:
+        _get_page_extractor()
+    except Exception as e:
+        logger.debug(f"UniversalExtractor not loaded: {e}")
+
+
+def _empty_extraction() -> Dict[str, Any]:
+    return {
+        "entities": {},
+        "themes": [],
+        "phenomena": [],
+        "persons": [],
+        "companies": [],
+        "locations": [],
+        "industry": None,
+        "red_flags": [],
+        "professions": [],  # NEW: from SUBJECT
+        "titles": [],       # NEW: from SUBJECT
+        "industries": [],   # NEW: from SUBJECT (more granular)
+        "outlinks": [],
+        "outlinks_external": [],
+    }
+
+
+def extract_page(html: str, text: str, url: str = "") -> Dict[str, Any]:
+    """
+    Run FULL extraction: entities + themes + phenomena + persons + companies + SUBJECT (profession/title/industry).
+
+    Priority:
+    1. UniversalExtractor (sastre, full embeddings)
+    2. SUBJECT Detector (professions, titles, industries from synonyms.json)
+    3. PACMAN regex (basic entity extraction)
+
+    CPU-bound and synchronous - runs in an ExtractionPool worker, never on
+    the event loop.
+    """
+    result = _empty_extraction()
+
+    if not html or len(html) < 100:
+        return result
+
+    content = text or html
+
+    # 1. Try UniversalExtractor (full extraction with embeddings)
+    try:
+        try:
+            full_result = _get_page_extractor().extract(content)
+            result.update({
+                "entities": full_result.get("identifiers", {}),
+                "themes": full_result.get("themes", []),
+                "phenomena": full_result.get("phenomena", []),
+                "persons": full_result.get("persons", []),
+                "companies": full_result.get("companies", []),
+                "locations": full_result.get("locations", []),
+                "industry": full_result.get("industry"),
+                "red_flags": full_result.get("red_flags", []),
+            })
+        except ImportError:
+            pass
+    except Exception as e:
+        logger.debug(f"UniversalExtractor failed: {e}")
+
+    # 2. SUBJECT Detector - professions, titles, industries (multilingual)
+    try:
+        # Try sastre path first
+        try:
+            import sys
+            if '/data/CLASSES' not in sys.path:
+                sys.path.insert(0, '/data/CLASSES')
+            from SUBJECT.detector import classify_text
+
+            subject_result = classify_text(content[:100000])  # Limit scan size
+
+            # Merge detected professions
+            if subject_result.get('professions'):
+                for p in subject_result['professions']:
+                    if p['name'] not in [x.get('name') for x in result['professions']]:
+                        result['professions'].append({
+                            'name': p['name'],
+                            'confidence': p['confidence'],
+                            'language': p['language'],
+                            'matched_term': p['matched_term'],
+                        })
+
+            # Merge detected titles
+            if subject_result.get('titles'):
+                for t in subject_result['titles']:
+                    if t['name'] not in [x.get('name') for x in result['titles']]:
+                        result['titles'].append({
+                            'name': t['name'],
+                            'confidence': t['confidence'],
+                            'language': t['language'],
+                            'matched_term': t['matched_term'],
+                        })
+
+            # Merge detected industries
+            if subject_result.get('industries'):
+                for i in subject_result['industries']:
+                    if i['name'] not in [x.get('name') for x in result['industries']]:
+                        result['industries'].append({
+                            'name': i['name'],
+                            'confidence': i['confidence'],
+                            'language': i['language'],
+                            'matched_term': i['matched_term'],
+                        })
+
+            # Set primary industry if not already set
+            if not result['industry'] and subject_result.get('primary_industry'):
+                result['industry'] = subject_result['primary_industry']
+
+        except ImportError:
+            logger.debug("SUBJECT detector not available")
+    except Exception as e:
+        logger.debug(f"SUBJECT detection failed: {e}")
+
+    # 3. PACMAN regex fallback (basic entities)
+    if not result['entities']:
+        try:
+            from modules.JESTER.pacman import extract_async
+            entities = asyncio.run(extract_async(html))
+            result["entities"] = entities
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.debug(f"PACMAN extraction failed: {e}")
+
+    # 4. Identifier extraction (emails, phones, LEI, IBAN, crypto, etc.)
+    try:
+        import sys
+        if "/data/PACMAN" not in sys.path:
+            sys.path.insert(0, "/data/PACMAN")
+        from patterns import ALL_PATTERNS
+        
+        identifiers = {}
+        for name, pattern in ALL_PATTERNS.items():
+            matches = pattern.findall(content[:100000])
+            if matches:
+                # Handle tuple results from groups
+                if matches and isinstance(matches[0], tuple):
+                    matches = [" ".join(filter(None, m)).strip() for m in matches]
+                # Deduplicate and limit
+                unique = list(set(m for m in matches if m))[:50]
+                if unique:
+                    identifiers[name] = unique
+        
+        if identifiers:
+            result["entities"] = identifiers
+    except Exception as e:
+        logger.debug(f"Identifier extraction failed: {e}")
+
+    # 5. Outlinks extraction (extract all links from HTML)
+    if html and url:
+        try:
+            import sys
+            if "/data/SUBMARINE" not in sys.path:
+                sys.path.insert(0, "/data/SUBMARINE")
+            from outlink_extractor import extract_outlinks
+            all_links = extract_outlinks(html, url, max_links=100)
+            result["outlinks"] = all_links
+            result["outlinks_external"] = [l for l in all_links if l.get("is_external")]
+        except Exception as e:
+            logger.debug(f"Outlinks extraction failed: {e}")
+
+    return result
+
+
+def _extract_timed(html: str, text: str, url: str) -> Tuple[Dict[str, Any], float]:
+    """extract_page plus the CPU time it took in this worker."""
+    started = time.process_time()
+    result = extract_page(html, text, url)
+    return result, time.process_time() - started
+
+
+@dataclass
+class ExtractionStats:
+    """Counters for the extraction stage."""
+    pages: int = 0
+    cpu_seconds: float = 0.0
+    max_cpu_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0
+    slow_pages: int = 0
+    errors: int = 0
+    pool_restarts: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class ExtractionPool:
+    """
+    Page extraction off the event loop.
+
+    `workers` long-lived processes (default: cores - 1, at most 4) each hold
+    one warmed UniversalExtractor and are replaced after `recycle_after`
+    pages, so leaks in the extractors cannot grow without bound. At most `queue_size` pages are queued or in
+    flight; further callers wait for a slot, which throttles fetching
+    instead of buffering pages. Each page's CPU time is measured in the
+    worker and accumulated in `stats`.
+
+    workers=0 runs extraction in one thread of this process instead.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        recycle_after: int = EXTRACT_RECYCLE_AFTER,
+    ):
+        self.workers = max(1, min(4, (os.cpu_count() or 2) - 1)) if workers is None else workers
+        self.queue_size = queue_size or max(1, self.workers) * 2
+        self.recycle_after = recycle_after
+        self.stats = ExtractionStats()
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 0:
+                # Worker recycling requires spawned (not forked) workers
+                recycle = {"max_tasks_per_child": self.recycle_after} if self.recycle_after and sys.version_info >= (3, 11) else {}
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_extraction_worker,
+                    **recycle,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="extract")
+        return self._executor
+
+    async def extract(self, html: str, text: str, url: str = "") -> Dict[str, Any]:
+        """extract_page() in a worker; an empty result if extraction fails."""
+        if not html or len(html) < 100:
+            return _empty_extraction()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.queue_size)
+
+        queued = time.monotonic()
+        async with self._slots:
+            self.stats.queue_wait_seconds += time.monotonic() - queued
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                result, cpu = await loop.run_in_executor(executor, _extract_timed, html, text, url)
+            except BrokenProcessPool as e:
+                # A worker died (OOM, segfault) - start a fresh pool for later pages
+                logger.warning(f"Extraction worker died on {url}: {e}")
+                self.stats.errors += 1
+                self._discard(executor)
+                return _empty_extraction()
+            except Exception as e:
+                logger.debug(f"Extraction failed for {url}: {e}")
+                self.stats.errors += 1
+                return _empty_extraction()
+
+        self.stats.pages += 1
+        self.stats.cpu_seconds += cpu
+        self.stats.max_cpu_seconds = max(self.stats.max_cpu_seconds, cpu)
+        if cpu >= SLOW_EXTRACTION:
+            self.stats.slow_pages += 1
+            logger.info(f"Slow extraction: {url} took {cpu:.1f}s CPU")
+        return result
+
+    def _discard(self, executor: Executor):
+        """Drop a broken pool; only the first caller failing on it replaces it."""
+        if self._executor is executor:
+            self._executor = None
+            self.stats.pool_restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class ScrapeLedger:
+    """
+    Durable record of finished domains, so an interrupted batch can resume.
+
+    SQLite (WAL) with one row per domain. Domains are checked against it in
+    chunks as they are read, and finished domains are written in batches
+    by the caller once sastre has confirmed indexing their docs.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS domains (
+                domain TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                source TEXT,
+                content_length INTEGER,
+                finished_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    def pending(self, domains: Iterable[str], retry_failed: bool = False, chunk: int = 500) -> Iterator[str]:
+        """Domains not finished in an earlier run (failed ones too if retry_failed)."""
+        status_filter = " AND status = 'success'" if retry_failed else ""
+        batch: List[str] = []
+
+        def unfinished(batch: List[str]) -> Iterator[str]:
+            marks = ",".join("?" * len(batch))
+            done = {row[0] for row in self._conn.execute(
+                f"SELECT domain FROM domains WHERE domain IN ({marks}){status_filter}", batch
+            )}
+            return (d for d in batch if d not in done)
+
+        for domain in domains:
+            batch.append(domain)
+            if len(batch) >= chunk:
+                yield from unfinished(batch)
+                batch = []
+        if batch:
+            yield from unfinished(batch)
+
+    def write(self, rows: List[Tuple[str, str, Optional[str], int, float]]):
+        """Store (domain, status, source, content_length, finished_at) rows."""
+        if not rows:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO domains (domain, status, source, content_length, finished_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM domains GROUP BY status").fetchall())
+
+    def close(self):
+        self._conn.close()
+
+
 class DistributedScraper:
     """
     Distributed scraper that runs locally or on sastre.
@@ -243,8 +641,10 @@ class DistributedScraper:
         io_index: str = DEFAULT_IO_INDEX,
         io_es_host: Optional[str] = None,
         io_es_port: Optional[int] = None,
+        extract_workers: Optional[int] = None,
     ):
         self.streamer = SastreStreamer(es_host, es_port)
+        self.extraction = ExtractionPool(workers=extract_workers)
         self.use_jester = use_jester
         self.use_backdrill = use_backdrill
         self.concurrent = concurrent
@@ -693,194 +1093,117 @@ class DistributedScraper:
 
     async def _extract_full(self, html: str, text: str, url: str = "") -> Dict[str, Any]:
         """
-        Run FULL extraction: entities + themes + phenomena + persons + companies + SUBJECT (profession/title/industry).
-
-        Priority:
-        1. UniversalExtractor (sastre, full embeddings)
-        2. SUBJECT Detector (professions, titles, industries from synonyms.json)
-        3. PACMAN regex (basic entity extraction)
+        Run FULL extraction (see extract_page) in the extraction pool, off the event loop.
         """
-        result = {
-            "entities": {},
-            "themes": [],
-            "phenomena": [],
-            "persons": [],
-            "companies": [],
-            "locations": [],
-            "industry": None,
-            "red_flags": [],
-            "professions": [],  # NEW: from SUBJECT
-            "titles": [],       # NEW: from SUBJECT
-            "industries": [],   # NEW: from SUBJECT (more granular)
-            "outlinks": [],
-            "outlinks_external": [],
-        }
-
-        if not html or len(html) < 100:
-            return result
-
-        content = text or html
-
-        # 1. Try UniversalExtractor (full extraction with embeddings)
-        try:
-            try:
-                from PACMAN.universal_extractor import UniversalExtractor
-                extractor = UniversalExtractor()
-                full_result = extractor.extract(content)
-                result.update({
-                    "entities": full_result.get("identifiers", {}),
-                    "themes": full_result.get("themes", []),
-                    "phenomena": full_result.get("phenomena", []),
-                    "persons": full_result.get("persons", []),
-                    "companies": full_result.get("companies", []),
-                    "locations": full_result.get("locations", []),
-                    "industry": full_result.get("industry"),
-                    "red_flags": full_result.get("red_flags", []),
-                })
-            except ImportError:
-                pass
-        except Exception as e:
-            logger.debug(f"UniversalExtractor failed: {e}")
-
-        # 2. SUBJECT Detector - professions, titles, industries (multilingual)
-        try:
-            # Try sastre path first
-            try:
-                import sys
-                if '/data/CLASSES' not in sys.path:
-                    sys.path.insert(0, '/data/CLASSES')
-                from SUBJECT.detector import classify_text
-
-                subject_result = classify_text(content[:100000])  # Limit scan size
-
-                # Merge detected professions
-                if subject_result.get('professions'):
-                    for p in subject_result['professions']:
-                        if p['name'] not in [x.get('name') for x in result['professions']]:
-                            result['professions'].append({
-                                'name': p['name'],
-                                'confidence': p['confidence'],
-                                'language': p['language'],
-                                'matched_term': p['matched_term'],
-                            })
-
-                # Merge detected titles
-                if subject_result.get('titles'):
-                    for t in subject_result['titles']:
-                        if t['name'] not in [x.get('name') for x in result['titles']]:
-                            result['titles'].append({
-                                'name': t['name'],
-                                'confidence': t['confidence'],
-                                'language': t['language'],
-                                'matched_term': t['matched_term'],
-                            })
-
-                # Merge detected industries
-                if subject_result.get('industries'):
-                    for i in subject_result['industries']:
-                        if i['name'] not in [x.get('name') for x in result['industries']]:
-                            result['industries'].append({
-                                'name': i['name'],
-                                'confidence': i['confidence'],
-                                'language': i['language'],
-                                'matched_term': i['matched_term'],
-                            })
-
-                # Set primary industry if not already set
-                if not result['industry'] and subject_result.get('primary_industry'):
-                    result['industry'] = subject_result['primary_industry']
-
-            except ImportError:
-                logger.debug("SUBJECT detector not available")
-        except Exception as e:
-            logger.debug(f"SUBJECT detection failed: {e}")
-
-        # 3. PACMAN regex fallback (basic entities)
-        if not result['entities']:
-            try:
-                from modules.JESTER.pacman import extract_async
-                entities = await extract_async(html)
-                result["entities"] = entities
-            except ImportError:
-                pass
-            except Exception as e:
-                logger.debug(f"PACMAN extraction failed: {e}")
-
-        # 4. Identifier extraction (emails, phones, LEI, IBAN, crypto, etc.)
-        try:
-            import sys
-            if "/data/PACMAN" not in sys.path:
-                sys.path.insert(0, "/data/PACMAN")
-            from patterns import ALL_PATTERNS
-            
-            identifiers = {}
-            for name, pattern in ALL_PATTERNS.items():
-                matches = pattern.findall(content[:100000])
-                if matches:
-                    # Handle tuple results from groups
-                    if matches and isinstance(matches[0], tuple):
-                        matches = [" ".join(filter(None, m)).strip() for m in matches]
-                    # Deduplicate and limit
-                    unique = list(set(m for m in matches if m))[:50]
-                    if unique:
-                        identifiers[name] = unique
-            
-            if identifiers:
-                result["entities"] = identifiers
-        except Exception as e:
-            logger.debug(f"Identifier extraction failed: {e}")
-
-        # 5. Outlinks extraction (extract all links from HTML)
-        if html and url:
-            try:
-                import sys
-                if "/data/SUBMARINE" not in sys.path:
-                    sys.path.insert(0, "/data/SUBMARINE")
-                from outlink_extractor import extract_outlinks
-                all_links = extract_outlinks(html, url, max_links=100)
-                result["outlinks"] = all_links
-                result["outlinks_external"] = [l for l in all_links if l.get("is_external")]
-            except Exception as e:
-                logger.debug(f"Outlinks extraction failed: {e}")
-
-        return result
+        return await self.extraction.extract(html, text, url)
 
     async def scrape_batch(
         self,
-        domains: List[str],
+        domains: Iterable[str],
         progress_callback: Optional[callable] = None,
+        ledger: Optional[ScrapeLedger] = None,
+        retry_failed: bool = False,
+        per_host: int = DEFAULT_PER_HOST,
+        total: Optional[int] = None,
     ) -> Dict[str, int]:
         """
         Scrape domains (homepage only) and stream to sastre.
 
+        Domains are pulled from `domains` (any iterable, e.g. a file
+        generator) through a bounded queue by `self.concurrent` workers, at
+        most `per_host` at a time per host. Each doc is streamed as soon as
+        its domain finishes, so memory stays flat whatever the batch size.
+
+        With a ledger, domains finished in earlier runs are skipped and
+        finished domains are recorded once ES has confirmed indexing their
+        docs; domains whose docs were rejected are retried by the next run
+        (counted as "undelivered").
+
         Returns stats dict.
         """
         await self.streamer._ensure_index()
 
-        sem = asyncio.Semaphore(self.concurrent)
-        stats = {"total": len(domains), "success": 0, "failed": 0, "streamed": 0}
-
-        async def process_one(domain: str, idx: int):
-            async with sem:
-                doc = await self.scrape_domain(domain)
-
-                if doc.get("content_length", 0) > 0:
-                    stats["success"] += 1
-                else:
-                    stats["failed"] += 1
-
-                # Stream to sastre immediately
-                await self.streamer.stream(doc)
-                stats["streamed"] += 1
-
-                if progress_callback and idx % 100 == 0:
-                    progress_callback(idx, len(domains), stats)
-
-        tasks = [process_one(d, i) for i, d in enumerate(domains)]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        if total is None and hasattr(domains, "__len__"):
+            total = len(domains)
+        stats = {"total": total, "success": 0, "failed": 0, "streamed": 0}
+        if ledger is not None:
+            stats["undelivered"] = 0
+            domains = ledger.pending(domains, retry_failed=retry_failed)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrent * 2)
+        hosts: Dict[str, list] = {}     # host -> [semaphore, workers using it]
+        finished: Dict[str, Tuple] = {}  # ledger rows waiting for ES to confirm their docs
+        checkpoint_lock = asyncio.Lock()
+
+        async def checkpoint():
+            # Only rows whose doc ES confirmed are recorded; rejected ones are
+            # dropped (retried next run), unconfirmed ones wait for their flush
+            async with checkpoint_lock:
+                await self.streamer.flush()
+                acks = self.streamer.take_acks()
+                rows = [finished.pop(domain) for domain, ok in acks.items() if domain in finished and ok]
+                for domain, ok in acks.items():
+                    if not ok and finished.pop(domain, None) is not None:
+                        stats["undelivered"] += 1
+                ledger.write(rows)
+
+        async def process_one(domain: str):
+            host = self._normalize_domain(domain)
+            slot = hosts.setdefault(host, [asyncio.Semaphore(per_host), 0])
+            slot[1] += 1
+            try:
+                async with slot[0]:
+                    doc = await self.scrape_domain(domain)
+            finally:
+                slot[1] -= 1
+                if not slot[1]:
+                    del hosts[host]
+
+            success = doc.get("content_length", 0) > 0
+            stats["success" if success else "failed"] += 1
+
+            if ledger is not None:
+                finished[domain] = (domain, "success" if success else "failed",
+                                    doc.get("source"), doc.get("content_length", 0), time.time())
+
+            # Stream to sastre immediately
+            await self.streamer.stream(doc, key=domain if ledger is not None else None)
+            stats["streamed"] += 1
+
+            if ledger is not None and len(finished) >= LEDGER_BATCH and not checkpoint_lock.locked():
+                await checkpoint()
+
+            done = stats["success"] + stats["failed"]
+            if progress_callback and done % 100 == 0:
+                progress_callback(done, total or done, stats)
+
+        async def worker():
+            while True:
+                domain = await queue.get()
+                try:
+                    if domain is None:
+                        return
+                    await process_one(domain)
+                except Exception as e:
+                    logger.error(f"Scrape failed for {domain}: {e}")
+                finally:
+                    queue.task_done()
 
-        # Final flush
-        await self.streamer.flush()
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrent)]
+        try:
+            for domain in domains:
+                await queue.put(domain)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            # Final flush (and ledger rows for everything streamed)
+            if ledger is not None:
+                await checkpoint()
+            else:
+                await self.streamer.flush()
 
         return stats
 
@@ -1028,6 +1351,7 @@ class DistributedScraper:
 
     async def close(self):
         await self.streamer.close()
+        await self.extraction.close()
         if self._jester:
             await self._jester.close()
         if self._backdrill:
@@ -1043,13 +1367,10 @@ class DistributedScraper:
 SubmarineScraper = DistributedScraper
 
 
-def load_domains(path: str, chunk: int = 0, total_chunks: int = 1) -> List[str]:
-    """Load domains from file (txt or CSV with 'domain' column), return only this chunk."""
+def _read_domains(path: Path) -> Iterator[str]:
+    """Domains from a txt file (one per line) or a CSV with a 'domain' column."""
     import csv
 
-    domains = []
-    path = Path(path)
-
     if path.suffix.lower() == '.csv':
         # CSV file - look for 'domain' column
         with open(path, 'r', encoding='utf-8') as f:
@@ -1059,23 +1380,38 @@ def load_domains(path: str, chunk: int = 0, total_chunks: int = 1) -> List[str]:
                 if domain:
                     domain = domain.strip()
                     if domain and not domain.startswith('#'):
-                        domains.append(domain)
+                        yield domain
     else:
         # Plain text file - one domain per line
         with open(path, 'r', encoding='utf-8') as f:
             for line in f:
                 line = line.strip()
                 if line and not line.startswith('#'):
-                    domains.append(line)
+                    yield line
 
-    # Split into chunks
+
+def chunk_bounds(path: str, chunk: int = 0, total_chunks: int = 1) -> Tuple[int, int]:
+    """[start, end) positions of this chunk among the domains in the file."""
+    count = sum(1 for _ in _read_domains(Path(path)))
     if total_chunks > 1:
-        chunk_size = len(domains) // total_chunks
+        chunk_size = count // total_chunks
         start = chunk * chunk_size
-        end = start + chunk_size if chunk < total_chunks - 1 else len(domains)
-        return domains[start:end]
+        end = start + chunk_size if chunk < total_chunks - 1 else count
+        return start, end
+    return 0, count
+
+
+def iter_domains(path: str, chunk: int = 0, total_chunks: int = 1) -> Iterator[str]:
+    """Stream this chunk's domains from file without loading the whole file."""
+    from itertools import islice
 
-    return domains
+    start, end = chunk_bounds(path, chunk, total_chunks)
+    return islice(_read_domains(Path(path)), start, end)
+
+
+def load_domains(path: str, chunk: int = 0, total_chunks: int = 1) -> List[str]:
+    """Load domains from file (txt or CSV with 'domain' column), return only this chunk."""
+    return list(iter_domains(path, chunk, total_chunks))
 
 
 async def main():
@@ -1098,12 +1434,19 @@ async def main():
     parser.add_argument("--max-pages", type=int, default=50, help="Max pages per domain (full-crawl mode)")
     parser.add_argument("--max-depth", type=int, default=3, help="Max crawl depth (full-crawl mode)")
     parser.add_argument("--concurrent-domains", type=int, default=10, help="Concurrent domains (full-crawl mode)")
+    parser.add_argument("--extract-workers", type=int, help="Extraction processes (default: CPU count - 1, at most 4; 0 = in-process thread)")
+
+    # Resumable homepage runs
+    parser.add_argument("--ledger", help="SQLite progress ledger; domains already in it are skipped (homepage mode)")
+    parser.add_argument("--retry-failed", action="store_true", help="Retry domains the ledger records as failed")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="Concurrent requests per host (homepage mode)")
 
     args = parser.parse_args()
 
-    # Load domains for this chunk
-    domains = load_domains(args.domains, args.chunk, args.total_chunks)
-    logger.info(f"Loaded {len(domains)} domains (chunk {args.chunk}/{args.total_chunks})")
+    if args.full_crawl:
+        # Load domains for this chunk
+        domains = load_domains(args.domains, args.chunk, args.total_chunks)
+        logger.info(f"Loaded {len(domains)} domains (chunk {args.chunk}/{args.total_chunks})")
 
     # Create scraper
     scraper = DistributedScraper(
@@ -1116,6 +1459,7 @@ async def main():
         io_index=args.io_index,
         io_es_host=args.io_es_host,
         io_es_port=args.io_es_port,
+        extract_workers=args.extract_workers,
     )
 
     start = time.time()
@@ -1154,14 +1498,40 @@ async def main():
             pct = idx / total * 100
             logger.info(f"Progress: {idx}/{total} ({pct:.1f}%) - Success: {stats['success']}, Failed: {stats['failed']}")
 
-        stats = await scraper.scrape_batch(domains, progress_callback=progress_homepage)
+        # Stream this chunk's domains from file
+        start_pos, end_pos = chunk_bounds(args.domains, args.chunk, args.total_chunks)
+        logger.info(f"Streaming {end_pos - start_pos} domains (chunk {args.chunk}/{args.total_chunks})")
+        domains = iter_domains(args.domains, args.chunk, args.total_chunks)
+        ledger = ScrapeLedger(Path(args.ledger)) if args.ledger else None
+
+        try:
+            stats = await scraper.scrape_batch(
+                domains,
+                progress_callback=progress_homepage,
+                ledger=ledger,
+                retry_failed=args.retry_failed,
+                per_host=args.per_host,
+                total=end_pos - start_pos,
+            )
+        finally:
+            if ledger is not None:
+                ledger.close()
 
         elapsed = time.time() - start
+        scraped = stats['success'] + stats['failed']
         logger.info(f"Done in {elapsed:.1f}s")
-        logger.info(f"Total: {stats['total']}, Success: {stats['success']}, Failed: {stats['failed']}")
-        logger.info(f"Speed: {stats['total']/elapsed:.1f} domains/sec")
+        logger.info(f"Total: {stats['total']}, Scraped: {scraped}, Success: {stats['success']}, Failed: {stats['failed']}")
+        logger.info(f"Speed: {scraped/elapsed:.1f} domains/sec")
         logger.info(f"Streamed {stats['streamed']} docs to sastre")
 
+    extraction = scraper.extraction.stats
+    if extraction.pages:
+        logger.info(
+            f"Extraction: {extraction.pages} pages, {extraction.cpu_seconds:.1f}s CPU "
+            f"({extraction.cpu_seconds / extraction.pages * 1000:.0f}ms/page, max {extraction.max_cpu_seconds:.1f}s), "
+            f"{extraction.errors} errors"
+        )
+
     await scraper.close()
 
 
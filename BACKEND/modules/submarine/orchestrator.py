@@ -19,9 +19,11 @@ import asyncio
 import json
 import logging
 import os
+import re
 import signal
 import sys
 import time
+import zlib
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -71,6 +73,10 @@ CONCURRENT_WAT_PROCESS = 10     # WAT files (large)
 CONCURRENT_JESTER = 100         # Domain-level concurrency (A→B→C cascade per domain)
 CONCURRENT_ES_BULK = 500        # ES bulk size
 
+# WARC range planning
+WARC_RANGE_GAP = 64 * 1024      # Merge records less than this many bytes apart into one read
+WARC_MAX_RANGE = 16 * 1024 * 1024  # Never merge a single read beyond this span
+
 # Checkpointing
 CHECKPOINT_INTERVAL = 10000     # Save every N domains
 
@@ -361,17 +367,151 @@ class CCIndexLookup:
 # PHASE 2a: CC CONTENT FETCHER (WARC + WAT)
 # ============================================================================
 
+@dataclass
+class WarcRange:
+    """One HTTP Range read covering one or more nearby WARC records."""
+    filename: str
+    start: int
+    end: int                                   # exclusive
+    records: List[Tuple[str, int, int]] = field(default_factory=list)  # (key, offset, length)
+
+    @property
+    def header(self) -> str:
+        return f"bytes={self.start}-{self.end - 1}"
+
+
+def plan_warc_ranges(
+    records: Dict[str, Dict],
+    gap: int = WARC_RANGE_GAP,
+    max_span: int = WARC_MAX_RANGE,
+) -> List[WarcRange]:
+    """
+    Group CC index records into as few Range reads as the gap budget allows.
+
+    Records are sorted by (filename, offset); a record joins the current read
+    when it starts at most `gap` bytes after the read's end and the read stays
+    within `max_span` bytes. Records without filename/length are skipped.
+    """
+    located = []
+    for key, record in records.items():
+        filename = record.get("filename")
+        offset = int(record.get("offset", 0) or 0)
+        length = int(record.get("length", 0) or 0)
+        if filename and length:
+            located.append((filename, offset, length, key))
+    located.sort()
+
+    ranges: List[WarcRange] = []
+    current: Optional[WarcRange] = None
+    for filename, offset, length, key in located:
+        end = offset + length
+        if (
+            current is not None
+            and current.filename == filename
+            and offset - current.end <= gap
+            and max(end, current.end) - current.start <= max_span
+        ):
+            current.end = max(current.end, end)
+        else:
+            current = WarcRange(filename, offset, end)
+            ranges.append(current)
+        current.records.append((key, offset, length))
+    return ranges
+
+
+async def split_warc_range(chunks: AsyncIterator[bytes], warc_range: WarcRange, base: int) -> AsyncIterator[Tuple[str, bytes]]:
+    """
+    Cut a streamed Range response back into its records' gzip members.
+
+    `base` is the file offset of the first byte of `chunks` (the range start
+    for a 206, 0 when the server ignored the Range header). Each record is
+    yielded as soon as its last byte arrives; bytes between records are
+    dropped as they stream past.
+    """
+    pending = sorted(warc_range.records, key=lambda r: r[1])
+    buffer = bytearray()
+    buffer_start = base  # file offset of buffer[0]
+    i = 0
+    async for chunk in chunks:
+        buffer += chunk
+        while i < len(pending):
+            key, offset, length = pending[i]
+            if offset + length > buffer_start + len(buffer):
+                break
+            yield key, bytes(buffer[offset - buffer_start:offset - buffer_start + length])
+            i += 1
+        # Keep only bytes a pending record (possibly overlapping) still needs
+        keep_from = pending[i][1] if i < len(pending) else buffer_start + len(buffer)
+        if keep_from > buffer_start:
+            drop = min(keep_from - buffer_start, len(buffer))
+            del buffer[:drop]
+            buffer_start += drop
+
+
+_CHARSET = re.compile(rb"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+
+
+def _decode_payload(body: bytes, content_type: bytes) -> str:
+    """Decode an HTTP body with its declared charset (header, then <meta>, then UTF-8)."""
+    match = _CHARSET.search(content_type) or _CHARSET.search(body[:4096])
+    charset = match.group(1).decode("ascii", "ignore") if match else "utf-8"
+    try:
+        return body.decode(charset, errors="ignore")
+    except LookupError:
+        return body.decode("utf-8", errors="ignore")
+
+
+def parse_warc_record(member: bytes) -> Optional[str]:
+    """
+    HTML payload of one WARC record (a gzip member, or raw bytes).
+
+    WARC headers and HTTP headers are split off as bytes; only the HTTP body
+    is decoded to text. Returns None if the payload does not look like HTML.
+    """
+    try:
+        # One gzip member per record; a decompressobj stops at the member end
+        data = zlib.decompressobj(zlib.MAX_WBITS | 16).decompress(member)
+    except zlib.error:
+        # Sometimes records aren't gzipped
+        data = member
+
+    # WARC format: WARC headers, blank line, HTTP headers, blank line, body
+    parts = data.split(b"\r\n\r\n", 2)
+    content_type = b""
+    if len(parts) >= 3:
+        http_headers, body = parts[1], parts[2]
+        for line in http_headers.split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-type":
+                content_type = value.strip()
+                break
+    elif len(parts) == 2:
+        body = parts[1]
+    else:
+        body = data
+
+    # Basic validation - should look like HTML
+    if b"<" not in body or b">" not in body:
+        return None
+    return _decode_payload(body, content_type)
+
+
 class CCContentFetcher:
     """
     Fetch content from Common Crawl WARC files with proper parallelization.
 
-    Uses Range requests to fetch only the needed bytes from each WARC.
-    Processes multiple domains concurrently.
+    Requested records are planned into Range reads (plan_warc_ranges): records
+    close together in the same WARC file share one request, whose response is
+    split back into records as it streams in. Reads run concurrently.
     """
 
-    def __init__(self):
+    def __init__(self, data_base: str = CC_DATA_BASE, gap: int = WARC_RANGE_GAP, max_span: int = WARC_MAX_RANGE):
+        self.data_base = data_base
+        self.gap = gap
+        self.max_span = max_span
         self._session: Optional[aiohttp.ClientSession] = None
         self._fetch_count = 0
+        self._record_count = 0
         self._success_count = 0
 
     async def __aenter__(self):
@@ -393,80 +533,68 @@ class CCContentFetcher:
 
     async def fetch_warc_content(self, cc_record: Dict) -> Tuple[str, Optional[str]]:
         """
-        Fetch actual content from WARC file using Range request.
+        Fetch actual content for one CC record.
 
         Returns: (domain, content or None)
         """
         domain = cc_record.get("domain", "unknown")
-        filename = cc_record.get("filename")
-        offset = int(cc_record.get("offset", 0) or 0)
-        length = int(cc_record.get("length", 0) or 0)
-
-        if not filename or not length:
-            return domain, None
-
-        url = f"{CC_DATA_BASE}/{filename}"
-        headers = {"Range": f"bytes={offset}-{offset + length - 1}"}
+        content = None
+        async for _, content, _ in self.fetch_records({domain: cc_record}):
+            pass
+        return domain, content
 
+    async def fetch_range(self, warc_range: WarcRange) -> AsyncIterator[Tuple[str, Optional[str], int]]:
+        """(key, content or None, latency_ms) for every record in one planned Range read."""
+        url = f"{self.data_base}/{warc_range.filename}"
+        start = time.time()
         self._fetch_count += 1
+        self._record_count += len(warc_range.records)
+        done = set()
 
         try:
-            async with self._session.get(url, headers=headers) as resp:
+            async with self._session.get(url, headers={"Range": warc_range.header}) as resp:
                 if resp.status not in (200, 206):
-                    logger.debug(f"WARC fetch {domain}: HTTP {resp.status}")
-                    return domain, None
-
-                import gzip
-                compressed = await resp.read()
-
-                # Decompress WARC record
-                try:
-                    decompressed = gzip.decompress(compressed)
-                    content = self._extract_html_from_warc(decompressed)
-                    if content:
-                        self._success_count += 1
-                    return domain, content
-                except gzip.BadGzipFile:
-                    # Sometimes records aren't gzipped
-                    content = self._extract_html_from_warc(compressed)
-                    if content:
-                        self._success_count += 1
-                    return domain, content
-                except Exception as e:
-                    logger.debug(f"WARC decompress {domain}: {e}")
-                    return domain, None
-
+                    logger.debug(f"WARC fetch {warc_range.filename}: HTTP {resp.status}")
+                else:
+                    base = warc_range.start if resp.status == 206 else 0
+                    async for key, member in split_warc_range(resp.content.iter_any(), warc_range, base):
+                        done.add(key)
+                        content = parse_warc_record(member)
+                        if content:
+                            self._success_count += 1
+                        yield key, content, int((time.time() - start) * 1000)
         except asyncio.TimeoutError:
-            logger.debug(f"WARC timeout: {domain}")
-            return domain, None
+            logger.debug(f"WARC timeout: {warc_range.filename} {warc_range.header}")
         except Exception as e:
-            logger.debug(f"WARC fetch {domain}: {e}")
-            return domain, None
+            logger.debug(f"WARC fetch {warc_range.filename}: {e}")
 
-    def _extract_html_from_warc(self, warc_data: bytes) -> Optional[str]:
-        """Extract HTML content from WARC record."""
-        try:
-            text = warc_data.decode('utf-8', errors='ignore')
+        for key, _, _ in warc_range.records:
+            if key not in done:
+                yield key, None, int((time.time() - start) * 1000)
 
-            # WARC format: WARC headers, blank line, HTTP headers, blank line, body
-            # Find the double CRLF separating sections
-            parts = text.split('\r\n\r\n', 2)
+    async def fetch_records(self, cc_records: Dict[str, Dict]) -> AsyncIterator[Tuple[str, Optional[str], int]]:
+        """(key, content or None, latency_ms) for each of `cc_records`, as their reads complete."""
+        ranges = plan_warc_ranges(cc_records, self.gap, self.max_span)
+        planned = {key for r in ranges for key, _, _ in r.records}
+        for key in cc_records:
+            if key not in planned:
+                yield key, None, 0
 
-            if len(parts) >= 3:
-                # parts[0] = WARC headers, parts[1] = HTTP headers, parts[2] = body
-                body = parts[2]
-            elif len(parts) == 2:
-                body = parts[1]
-            else:
-                body = text
+        queue: asyncio.Queue = asyncio.Queue()
+        sem = asyncio.Semaphore(CONCURRENT_WARC_FETCH)
 
-            # Basic validation - should look like HTML
-            if '<' in body and '>' in body:
-                return body
+        async def read(warc_range: WarcRange):
+            async with sem:
+                async for item in self.fetch_range(warc_range):
+                    await queue.put(item)
 
-            return None
-        except Exception:
-            return None
+        tasks = [asyncio.create_task(read(r)) for r in ranges]
+        try:
+            for _ in range(len(planned)):
+                yield await queue.get()
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def batch_fetch(
         self,
@@ -486,8 +614,6 @@ class CCContentFetcher:
             List of DomainResult objects
         """
         results = []
-        sem = asyncio.Semaphore(CONCURRENT_WARC_FETCH)
-        lock = asyncio.Lock()
 
         # Open content output file if needed (APPEND mode to preserve across batches)
         content_fh = None
@@ -495,11 +621,9 @@ class CCContentFetcher:
             output_dir.mkdir(parents=True, exist_ok=True)
             content_fh = open(output_dir / "cc_content.ndjson", 'a')
 
-        async def fetch_one(domain: str, cc_record: Dict):
-            async with sem:
-                start = time.time()
-                _, content = await self.fetch_warc_content(cc_record)
-                latency = int((time.time() - start) * 1000)
+        try:
+            async for domain, content, latency in self.fetch_records(cc_records):
+                cc_record = cc_records[domain]
 
                 result = DomainResult(
                     domain=domain,
@@ -514,28 +638,26 @@ class CCContentFetcher:
                     cc_length=int(cc_record.get("length", 0) or 0),
                 )
 
-                async with lock:
-                    results.append(result)
-                    if content_fh and content:
-                        # Stream full content to file for downstream processing
-                        content_fh.write(json.dumps({
-                            "domain": domain,
-                            "url": cc_record.get("url", ""),
-                            "content_length": len(content),
-                            "content": content,  # Full content, not preview
-                        }) + '\n')
+                results.append(result)
+                if content_fh and content:
+                    # Stream full content to file for downstream processing
+                    content_fh.write(json.dumps({
+                        "domain": domain,
+                        "url": cc_record.get("url", ""),
+                        "content_length": len(content),
+                        "content": content,  # Full content, not preview
+                    }) + '\n')
 
                 if progress_callback:
                     progress_callback(result)
+        finally:
+            if content_fh:
+                content_fh.close()
 
-        # Process all records in parallel with semaphore
-        tasks = [fetch_one(domain, record) for domain, record in cc_records.items()]
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-        if content_fh:
-            content_fh.close()
-
-        logger.info(f"WARC fetch: {self._fetch_count} attempts, {self._success_count} success")
+        logger.info(
+            f"WARC fetch: {self._record_count} records in {self._fetch_count} range requests, "
+            f"{self._success_count} success"
+        )
         return results
 
 
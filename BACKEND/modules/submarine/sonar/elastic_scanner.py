@@ -24,19 +24,33 @@ before touching raw WARC data. Uses all available "submerging points":
    - cc_web_graph_host_edges (421M) - Web graph
    - entity_links (4.7M) - Entity relationships
    - entity-mentions (3.9M) - Entity mentions
+
+Scanning runs every per-index search concurrently, caches index existence and
+mappings (clauses on unmapped fields are dropped before querying), and pages
+large result sets with point-in-time + search_after instead of one deep
+`size`. Hits can be consumed as they arrive via `Sonar.scan_stream()`.
 """
 
 import asyncio
 import logging
 import os
 import re
-from typing import List, Dict, Any, Optional, Set
-from dataclasses import dataclass, field
+import time
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Set, Tuple
+from dataclasses import dataclass, field, replace
 from elasticsearch import AsyncElasticsearch
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+PAGE_SIZE = 500                # Hits per request; larger scans page with PIT
+MAX_CONCURRENT_SEARCHES = 16   # Per-index searches in flight at once
+INDEX_CACHE_TTL = 300          # Seconds index existence/mappings are trusted
+PIT_KEEP_ALIVE = "1m"
+
+# Single-field clauses that can be dropped when the index lacks the field
+PRUNABLE_CLAUSES = {"term", "match", "match_phrase", "wildcard"}
+
 
 @dataclass
 class SonarHit:
@@ -48,6 +62,8 @@ class SonarHit:
     score: float = 0.0
     source: Dict[str, Any] = field(default_factory=dict)
     match_type: str = "unknown"  # domain, url, email, phone, entity, graph
+    domains: List[str] = field(default_factory=list)  # All domains extracted from the hit
+    urls: List[str] = field(default_factory=list)     # All URLs extracted from the hit
 
 
 @dataclass
@@ -78,6 +94,26 @@ class SonarResult:
             except:
                 pass
 
+    def add_hit(self, hit: SonarHit):
+        """Add a hit along with the domains/URLs extracted from it."""
+        for domain in hit.domains:
+            self.add_domain(domain)
+        for url in hit.urls:
+            self.add_url(url)
+        self.hits.append(hit)
+        self.total_hits += 1
+
+
+@dataclass
+class ScanTask:
+    """One search against one index, plus how to read its hits."""
+    index: str
+    query: Dict[str, Any]
+    size: int
+    match_type: str
+    extract: Optional[Callable[[Dict[str, Any], SonarHit], None]] = None
+    search_kwargs: Dict[str, Any] = field(default_factory=dict)
+
 
 class Sonar:
     """
@@ -90,11 +126,9 @@ class Sonar:
         result = await sonar.scan_all("John Smith")  # Name
         result = await sonar.scan_all("example.com")  # Domain
 
-        # Specific scans
-        result = await sonar.scan_domains("example.com")
-        result = await sonar.scan_entities("John Smith")
-        result = await sonar.scan_contacts("+1-234-567-8900")
-        result = await sonar.scan_graph("example.com")
+        # Progressive results
+        async for hit in sonar.scan_stream("example.com"):
+            print(hit.index, hit.domains, hit.urls)
     """
 
     # Index groups
@@ -141,9 +175,18 @@ class Sonar:
         "linklater_corpus",
     ]
 
-    def __init__(self, es_host: str = "http://localhost:9200"):
+    def __init__(
+        self,
+        es_host: str = "http://localhost:9200",
+        max_concurrent: int = MAX_CONCURRENT_SEARCHES,
+        page_size: int = PAGE_SIZE,
+    ):
         self.es_host = es_host
         self.es: Optional[AsyncElasticsearch] = None
+        self.max_concurrent = max_concurrent
+        self.page_size = page_size
+        # index -> (checked_at, exists, mapped field names or None if unknown)
+        self._index_cache: Dict[str, Tuple[float, bool, Optional[Set[str]]]] = {}
 
     async def _get_client(self) -> AsyncElasticsearch:
         if not self.es:
@@ -186,401 +229,331 @@ class Sonar:
         This is the main entry point for smart pre-filtering.
         """
         result = SonarResult(query=query)
-        query_type = self._detect_query_type(query)
+        async for _ in self.scan_stream(query, limit=limit, result=result):
+            pass
+        logger.info(f"SONAR: Found {len(result.domains)} domains, {len(result.urls)} URLs, {result.total_hits} total hits")
+        return result
+
+    async def scan_stream(
+        self,
+        query: str,
+        limit: int = 10000,
+        result: Optional[SonarResult] = None,
+    ) -> AsyncIterator[SonarHit]:
+        """
+        Yield hits from every relevant index as they arrive.
 
+        All per-index searches run concurrently (bounded by max_concurrent);
+        large result sets are paged with point-in-time + search_after. If
+        `result` is given, hits/domains/URLs are accumulated into it as well.
+        """
+        query_type = self._detect_query_type(query)
         logger.info(f"SONAR: Scanning for '{query}' (detected type: {query_type})")
 
-        # Route to appropriate scanners based on type
+        async for hit in self._run_tasks(self._plan(query, query_type, limit), result):
+            yield hit
+
+    def _plan(self, query: str, query_type: str, limit: int) -> List[ScanTask]:
+        """All index searches for a query, routed by query type."""
+        tasks: List[ScanTask] = []
+
         if query_type == "phone":
-            await self._scan_contacts_phone(query, result, limit)
-            await self._scan_breaches_phone(query, result, limit)
-            await self._scan_corpus_indices(query, query_type, result, limit)
+            tasks += self._phone_contact_tasks(query, limit)
+            tasks += self._phone_breach_tasks(query, limit)
 
         elif query_type == "email":
-            await self._scan_contacts_email(query, result, limit)
-            await self._scan_breaches_email(query, result, limit)
+            tasks += self._email_contact_tasks(query, limit)
+            tasks += self._email_breach_tasks(query, limit)
             # Also scan domain from email
-            domain = query.split("@")[-1]
-            await self._scan_domain_indices(domain, result, limit)
-            await self._scan_corpus_indices(query, query_type, result, limit)
+            tasks += self._domain_index_tasks(query.split("@")[-1], limit)
 
         elif query_type == "url":
             parsed = urlparse(query)
             if parsed.netloc:
-                await self._scan_domain_indices(parsed.netloc, result, limit)
-                await self._scan_graph_backlinks(parsed.netloc, result, limit)
-            await self._scan_corpus_indices(query, query_type, result, limit)
+                tasks += self._domain_index_tasks(parsed.netloc, limit)
+                tasks += self._graph_backlink_tasks(parsed.netloc, limit)
 
         elif query_type == "domain":
-            await self._scan_domain_indices(query, result, limit)
-            await self._scan_graph_backlinks(query, result, limit)
-            await self._scan_entity_domain(query, result, limit)
-            await self._scan_corpus_indices(query, query_type, result, limit)
+            tasks += self._domain_index_tasks(query, limit)
+            tasks += self._graph_backlink_tasks(query, limit)
+            tasks += self._entity_domain_tasks(query, limit)
 
         else:  # entity name
-            await self._scan_entity_indices(query, result, limit)
-            await self._scan_ownership(query, result, limit)
-            await self._scan_uk_companies(query, result, limit)
-            await self._scan_corpus_indices(query, query_type, result, limit)
-
-        logger.info(f"SONAR: Found {len(result.domains)} domains, {len(result.urls)} URLs, {result.total_hits} total hits")
-        return result
-
-    async def _scan_domain_indices(self, domain: str, result: SonarResult, limit: int):
-        """Scan domain-focused indices."""
-        es = await self._get_client()
-
-        for index in self.DOMAIN_INDICES:
-            try:
-                # Check if index exists
-                if not await es.indices.exists(index=index):
-                    continue
-
-                result.indices_scanned.append(index)
-
-                # Build query based on known field patterns
-                query = {
-                    "bool": {
-                        "should": [
-                            {"match": {"domain": domain}},
-                            {"match": {"url": f"*{domain}*"}},
-                            {"wildcard": {"domain": f"*{domain}*"}},
-                            {"wildcard": {"url.keyword": f"*{domain}*"}},
-                        ],
-                        "minimum_should_match": 1
-                    }
-                }
-
-                resp = await es.search(
-                    index=index,
-                    query=query,
-                    size=min(limit, 1000),
-                    _source=True
-                )
-
-                for hit in resp["hits"]["hits"]:
-                    src = hit["_source"]
-                    sonar_hit = SonarHit(
-                        index=index,
-                        doc_id=hit["_id"],
-                        score=hit["_score"] or 0,
-                        source=src,
-                        match_type="domain"
-                    )
-
-                    # Extract domain/URL from various field patterns
-                    for fld in ["domain", "url", "host", "source_url"]:
-                        if fld in src:
-                            val = src[fld]
-                            if isinstance(val, str):
-                                if "/" in val or "://" in val:
-                                    result.add_url(val)
-                                    sonar_hit.url = val
-                                else:
-                                    result.add_domain(val)
-                                    sonar_hit.domain = val
-
-                    result.hits.append(sonar_hit)
-                    result.total_hits += 1
-
-            except Exception as e:
-                logger.warning(f"Error scanning {index}: {e}")
+            tasks += self._entity_index_tasks(query, limit)
+            tasks += self._ownership_tasks(query, limit)
+            tasks += self._uk_company_tasks(query, limit)
+
+        tasks += self._corpus_tasks(query, query_type, limit)
+        return tasks
+
+    # ─────────────────────────────────────────────────────────────
+    # Execution: index metadata cache, concurrent fan-out, PIT paging
+    # ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _mapping_fields(properties: Dict[str, Any], prefix: str = "") -> Set[str]:
+        """Flatten a mapping's properties (incl. multi-fields) to dotted field names."""
+        names: Set[str] = set()
+        for name, spec in (properties or {}).items():
+            path = f"{prefix}{name}"
+            names.add(path)
+            if isinstance(spec, dict):
+                names |= Sonar._mapping_fields(spec.get("properties", {}), f"{path}.")
+                names |= Sonar._mapping_fields(spec.get("fields", {}), f"{path}.")
+        return names
+
+    async def _resolve_indices(self, names: Set[str]) -> Dict[str, Optional[Set[str]]]:
+        """
+        Existing indices among `names` -> their mapped fields (None if unknown).
 
-    async def _scan_entity_indices(self, name: str, result: SonarResult, limit: int):
-        """Scan entity indices for person/company names."""
+        One get_mapping call covers all concrete indices; aliases (or clients
+        without get_mapping) fall back to concurrent indices.exists calls.
+        Answers are cached for INDEX_CACHE_TTL seconds.
+        """
         es = await self._get_client()
-
-        for index in self.ENTITY_INDICES:
+        now = time.monotonic()
+        stale = sorted(
+            n for n in names
+            if n not in self._index_cache or now - self._index_cache[n][0] > INDEX_CACHE_TTL
+        )
+
+        if stale:
+            unresolved = set(stale)
             try:
-                if not await es.indices.exists(index=index):
-                    continue
-
-                result.indices_scanned.append(index)
-
-                query = {
-                    "bool": {
-                        "should": [
-                            {"match_phrase": {"name": name}},
-                            {"match_phrase": {"full_name": name}},
-                            {"match_phrase": {"company_name": name}},
-                            {"match": {"name": {"query": name, "fuzziness": "AUTO"}}},
-                        ],
-                        "minimum_should_match": 1
-                    }
-                }
-
-                resp = await es.search(
-                    index=index,
-                    query=query,
-                    size=min(limit, 1000),
-                    _source=True
+                resp = await es.indices.get_mapping(
+                    index=",".join(stale), ignore_unavailable=True, allow_no_indices=True
                 )
-
-                for hit in resp["hits"]["hits"]:
-                    src = hit["_source"]
-                    sonar_hit = SonarHit(
-                        index=index,
-                        doc_id=hit["_id"],
-                        score=hit["_score"] or 0,
-                        source=src,
-                        match_type="entity"
-                    )
-
-                    # Extract domains from entity records
-                    for fld in ["url", "source_url", "website", "domain", "page_url"]:
-                        if fld in src:
-                            val = src[fld]
-                            if isinstance(val, str):
-                                result.add_url(val)
-                                sonar_hit.url = val
-
-                    result.hits.append(sonar_hit)
-                    result.total_hits += 1
-
+                body = getattr(resp, "body", resp) or {}
+                for index, mapping in body.items():
+                    if index in unresolved:
+                        props = (mapping or {}).get("mappings", {}).get("properties", {})
+                        self._index_cache[index] = (now, True, self._mapping_fields(props))
+                        unresolved.discard(index)
             except Exception as e:
-                logger.warning(f"Error scanning {index}: {e}")
-
-    async def _scan_contacts_phone(self, phone: str, result: SonarResult, limit: int):
-        """Scan for phone number matches."""
-        es = await self._get_client()
-
-        # Normalize phone for search
-        phone_normalized = re.sub(r'[\s\-\(\)]', '', phone)
-
-        try:
-            if not await es.indices.exists(index="phones_unified"):
-                return
-
-            result.indices_scanned.append("phones_unified")
-
-            query = {
-                "bool": {
-                    "should": [
-                        {"match": {"phone": phone}},
-                        {"match": {"phone_normalized": phone_normalized}},
-                        {"wildcard": {"phone": f"*{phone_normalized[-10:]}*"}}  # Last 10 digits
-                    ],
-                    "minimum_should_match": 1
-                }
-            }
-
-            resp = await es.search(
-                index="phones_unified",
-                query=query,
-                size=min(limit, 1000),
-                _source=True
-            )
+                logger.debug(f"SONAR: get_mapping unavailable ({e}); checking indices one by one")
 
-            for hit in resp["hits"]["hits"]:
-                src = hit["_source"]
-                sonar_hit = SonarHit(
-                    index="phones_unified",
-                    doc_id=hit["_id"],
-                    score=hit["_score"] or 0,
-                    source=src,
-                    match_type="phone"
+            if unresolved:
+                ordered = sorted(unresolved)
+                checks = await asyncio.gather(
+                    *(es.indices.exists(index=n) for n in ordered), return_exceptions=True
                 )
-
-                for fld in ["domain", "source_url", "url"]:
-                    if fld in src:
-                        result.add_url(src[fld])
-                        sonar_hit.url = src[fld]
-
-                result.hits.append(sonar_hit)
-                result.total_hits += 1
-
-        except Exception as e:
-            logger.warning(f"Error scanning phones_unified: {e}")
-
-    async def _scan_contacts_email(self, email: str, result: SonarResult, limit: int):
-        """Scan for email matches."""
-        es = await self._get_client()
-
-        try:
-            if not await es.indices.exists(index="emails_unified"):
-                return
-
-            result.indices_scanned.append("emails_unified")
-
-            query = {
-                "bool": {
-                    "should": [
-                        {"term": {"email.keyword": email.lower()}},
-                        {"match": {"email": email}},
-                    ],
-                    "minimum_should_match": 1
-                }
-            }
-
-            resp = await es.search(
-                index="emails_unified",
-                query=query,
-                size=min(limit, 1000),
-                _source=True
-            )
-
-            for hit in resp["hits"]["hits"]:
-                src = hit["_source"]
-                sonar_hit = SonarHit(
-                    index="emails_unified",
-                    doc_id=hit["_id"],
-                    score=hit["_score"] or 0,
-                    source=src,
-                    match_type="email"
-                )
-
-                for fld in ["domain", "source_url", "url", "source_domain"]:
-                    if fld in src:
-                        result.add_url(src[fld])
-                        sonar_hit.url = src[fld]
-
-                result.hits.append(sonar_hit)
-                result.total_hits += 1
-
-        except Exception as e:
-            logger.warning(f"Error scanning emails_unified: {e}")
-
-    async def _scan_breaches_phone(self, phone: str, result: SonarResult, limit: int):
-        """Scan breach records for phone number."""
-        es = await self._get_client()
-        phone_normalized = re.sub(r'[\s\-\(\)]', '', phone)
+                for index, exists in zip(ordered, checks):
+                    if isinstance(exists, Exception):
+                        logger.warning(f"Error checking {index}: {exists}")
+                        continue
+                    self._index_cache[index] = (now, bool(exists), None)
+
+        return {
+            n: self._index_cache[n][2]
+            for n in names
+            if n in self._index_cache and self._index_cache[n][1]
+        }
+
+    @staticmethod
+    def _prune_query(query: Dict[str, Any], fields: Optional[Set[str]]) -> Optional[Dict[str, Any]]:
+        """
+        Drop field clauses on fields the index does not map (they can never
+        match). Returns None when nothing can match, so the search is skipped.
+        """
+        if fields is None:
+            return query
+
+        def usable(clause: Dict[str, Any]) -> bool:
+            if len(clause) != 1:
+                return True
+            kind, body = next(iter(clause.items()))
+            if kind not in PRUNABLE_CLAUSES or not isinstance(body, dict) or len(body) != 1:
+                return True
+            return next(iter(body)) in fields
+
+        should = query.get("bool", {}).get("should") if "bool" in query else None
+        if should is None:
+            return query if usable(query) else None
+
+        kept = [c for c in should if usable(c)]
+        if not kept:
+            return None
+        if len(kept) == len(should):
+            return query
+        return {"bool": {**query["bool"], "should": kept}}
+
+    @staticmethod
+    def _hits_of(resp: Any) -> List[Dict[str, Any]]:
+        return (resp.get("hits", {}) or {}).get("hits", []) or []
+
+    async def _search_pages(self, es: AsyncElasticsearch, task: ScanTask) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of raw hits for one task (PIT + search_after beyond one page)."""
+        if task.size <= self.page_size:
+            resp = await es.search(index=task.index, query=task.query, size=task.size, _source=True, **task.search_kwargs)
+            yield self._hits_of(resp)
+            return
 
         try:
-            if not await es.indices.exists(index="breach_records"):
-                return
-
-            result.indices_scanned.append("breach_records")
-
-            resp = await es.search(
-                index="breach_records",
-                query={"match": {"phone": phone_normalized}},
-                size=min(limit, 1000),
-                _source=True
-            )
-
-            for hit in resp["hits"]["hits"]:
-                src = hit["_source"]
-                sonar_hit = SonarHit(
-                    index="breach_records",
-                    doc_id=hit["_id"],
-                    score=hit["_score"] or 0,
-                    source=src,
-                    match_type="breach"
-                )
-
-                # Breach records often have source/database field
-                if "source" in src:
-                    result.add_domain(src["source"])
-
-                result.hits.append(sonar_hit)
-                result.total_hits += 1
-
+            pit = await es.open_point_in_time(index=task.index, keep_alive=PIT_KEEP_ALIVE)
+            pit_id = pit["id"]
         except Exception as e:
-            logger.warning(f"Error scanning breach_records: {e}")
-
-    async def _scan_breaches_email(self, email: str, result: SonarResult, limit: int):
-        """Scan breach records for email."""
-        es = await self._get_client()
+            # No PIT support (old cluster / stub client): one bounded request
+            logger.debug(f"SONAR: no point-in-time for {task.index} ({e})")
+            resp = await es.search(index=task.index, query=task.query, size=task.size, _source=True, **task.search_kwargs)
+            yield self._hits_of(resp)
+            return
 
+        remaining = task.size
+        search_after = None
         try:
-            if not await es.indices.exists(index="breach_records"):
-                return
-
-            result.indices_scanned.append("breach_records")
-
-            resp = await es.search(
-                index="breach_records",
-                query={"term": {"email.keyword": email.lower()}},
-                size=min(limit, 1000),
-                _source=True
-            )
-
-            for hit in resp["hits"]["hits"]:
-                src = hit["_source"]
-                sonar_hit = SonarHit(
-                    index="breach_records",
-                    doc_id=hit["_id"],
-                    score=hit["_score"] or 0,
-                    source=src,
-                    match_type="breach"
+            while remaining > 0:
+                size = min(self.page_size, remaining)
+                kwargs = dict(task.search_kwargs)
+                if search_after is not None:
+                    kwargs["search_after"] = search_after
+                resp = await es.search(
+                    pit={"id": pit_id, "keep_alive": PIT_KEEP_ALIVE},
+                    query=task.query,
+                    size=size,
+                    sort=["_score", "_shard_doc"],
+                    track_scores=True,
+                    _source=True,
+                    **kwargs,
                 )
-
-                if "source" in src:
-                    result.add_domain(src["source"])
-
-                result.hits.append(sonar_hit)
-                result.total_hits += 1
-
-        except Exception as e:
-            logger.warning(f"Error scanning breach_records: {e}")
-
-    async def _scan_graph_backlinks(self, domain: str, result: SonarResult, limit: int):
-        """Scan web graph for backlinks to/from domain."""
+                pit_id = resp.get("pit_id") or pit_id
+                hits = self._hits_of(resp)
+                if not hits:
+                    break
+                yield hits
+                remaining -= len(hits)
+                search_after = hits[-1].get("sort")
+                if len(hits) < size or not search_after:
+                    break
+        finally:
+            try:
+                await es.close_point_in_time(id=pit_id)
+            except Exception as e:
+                logger.debug(f"SONAR: could not close PIT for {task.index}: {e}")
+
+    def _to_hit(self, task: ScanTask, raw: Dict[str, Any]) -> SonarHit:
+        src = raw.get("_source", {}) or {}
+        sonar_hit = SonarHit(
+            index=task.index,
+            doc_id=raw.get("_id", ""),
+            score=raw.get("_score") or 0,
+            source=src,
+            match_type=task.match_type,
+        )
+        if task.extract:
+            task.extract(src, sonar_hit)
+        return sonar_hit
+
+    async def _run_tasks(self, tasks: List[ScanTask], result: Optional[SonarResult] = None) -> AsyncIterator[SonarHit]:
+        """Run tasks concurrently and yield hits page by page as they arrive."""
+        if not tasks:
+            return
         es = await self._get_client()
+        indices = await self._resolve_indices({t.index for t in tasks})
+
+        runnable: List[ScanTask] = []
+        for task in tasks:
+            if task.index not in indices:
+                continue
+            if result is not None:
+                result.indices_scanned.append(task.index)
+            pruned = self._prune_query(task.query, indices[task.index])
+            if pruned is not None:
+                runnable.append(replace(task, query=pruned))
+
+        # Bounded page queue keeps memory flat while slow consumers catch up
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max(4, self.max_concurrent))
+        gate = asyncio.Semaphore(max(1, self.max_concurrent))
+
+        async def worker(task: ScanTask):
+            try:
+                async with gate:
+                    async for hits in self._search_pages(es, task):
+                        await pages.put((task, hits))
+            except Exception as e:
+                logger.warning(f"Error scanning {task.index}: {e}")
+            finally:
+                await pages.put((task, None))
 
+        workers = [asyncio.create_task(worker(t)) for t in runnable]
+        remaining = len(workers)
         try:
-            if not await es.indices.exists(index="cc_web_graph_host_edges"):
-                return
-
-            result.indices_scanned.append("cc_web_graph_host_edges")
-
-            # Look for domain as target (who links TO it) and source (who it links TO)
-            query = {
-                "bool": {
-                    "should": [
-                        {"term": {"target": domain}},
-                        {"term": {"source": domain}},
-                        {"wildcard": {"target": f"*.{domain}"}},
-                        {"wildcard": {"source": f"*.{domain}"}},
-                    ],
-                    "minimum_should_match": 1
-                }
-            }
-
-            resp = await es.search(
-                index="cc_web_graph_host_edges",
-                query=query,
-                size=min(limit, 5000),  # Graph can have many edges
-                _source=True
-            )
-
-            for hit in resp["hits"]["hits"]:
-                src = hit["_source"]
-                sonar_hit = SonarHit(
-                    index="cc_web_graph_host_edges",
-                    doc_id=hit["_id"],
-                    score=hit["_score"] or 0,
-                    source=src,
-                    match_type="graph"
-                )
-
-                # Add both source and target domains
-                if "source" in src:
-                    result.add_domain(src["source"])
-                if "target" in src:
-                    result.add_domain(src["target"])
-
-                result.hits.append(sonar_hit)
-                result.total_hits += 1
-
-        except Exception as e:
-            logger.warning(f"Error scanning cc_web_graph_host_edges: {e}")
-
-    def _get_corpus_indices(self) -> List[str]:
-        env = os.getenv("SUBMARINE_CORPUS_INDICES", "").strip()
-        if env:
-            return [p.strip() for p in env.split(",") if p.strip()]
-        return list(self.CORPUS_INDICES_DEFAULT)
-
-    def _extract_domains_urls_from_corpus_source(self, src: Dict[str, Any], result: SonarResult, sonar_hit: SonarHit):
+            while remaining:
+                task, hits = await pages.get()
+                if hits is None:
+                    remaining -= 1
+                    continue
+                for raw in hits:
+                    sonar_hit = self._to_hit(task, raw)
+                    if result is not None:
+                        result.add_hit(sonar_hit)
+                    yield sonar_hit
+        finally:
+            for w in workers:
+                w.cancel()
+
+    async def _collect(self, tasks: List[ScanTask], result: SonarResult):
+        async for _ in self._run_tasks(tasks, result):
+            pass
+
+    # ─────────────────────────────────────────────────────────────
+    # Field extractors (source document -> hit domains/URLs)
+    # ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _extract_domain_record(src: Dict[str, Any], sonar_hit: SonarHit):
+        # Extract domain/URL from various field patterns
+        for fld in ["domain", "url", "host", "source_url"]:
+            if fld in src:
+                val = src[fld]
+                if isinstance(val, str):
+                    if "/" in val or "://" in val:
+                        sonar_hit.urls.append(val)
+                        sonar_hit.url = val
+                    else:
+                        sonar_hit.domains.append(val)
+                        sonar_hit.domain = val
+
+    @staticmethod
+    def _url_fields_extractor(fields: Tuple[str, ...]) -> Callable[[Dict[str, Any], SonarHit], None]:
+        def extract(src: Dict[str, Any], sonar_hit: SonarHit):
+            for fld in fields:
+                val = src.get(fld)
+                if isinstance(val, str):
+                    sonar_hit.urls.append(val)
+                    sonar_hit.url = val
+        return extract
+
+    @staticmethod
+    def _extract_breach_source(src: Dict[str, Any], sonar_hit: SonarHit):
+        # Breach records often have source/database field
+        if isinstance(src.get("source"), str):
+            sonar_hit.domains.append(src["source"])
+
+    @staticmethod
+    def _extract_graph_edge(src: Dict[str, Any], sonar_hit: SonarHit):
+        # Add both source and target domains
+        for fld in ("source", "target"):
+            if isinstance(src.get(fld), str):
+                sonar_hit.domains.append(src[fld])
+
+    @staticmethod
+    def _extract_uk_company(src: Dict[str, Any], sonar_hit: SonarHit):
+        # UK company numbers can lead to Companies House URLs
+        if "company_number" in src:
+            ch_url = f"https://find-and-update.company-information.service.gov.uk/company/{src['company_number']}"
+            sonar_hit.urls.append(ch_url)
+            sonar_hit.url = ch_url
+
+    @staticmethod
+    def _extract_domains_urls_from_corpus_source(src: Dict[str, Any], sonar_hit: SonarHit):
         def _add_domain(val: Any):
             if isinstance(val, str) and val:
-                result.add_domain(val)
+                sonar_hit.domains.append(val)
                 sonar_hit.domain = sonar_hit.domain or val
 
         def _add_url(val: Any):
             if isinstance(val, str) and val:
-                result.add_url(val)
+                sonar_hit.urls.append(val)
                 sonar_hit.url = sonar_hit.url or val
 
         for fld in ("source_domain", "domain"):
@@ -606,13 +579,153 @@ class Sonar:
             else:
                 _add_url(urls)
 
-    async def _scan_corpus_indices(self, query: str, query_type: str, result: SonarResult, limit: int):
-        """Scan the CYMONIDES corpus indices (cymonides-3/home, cymonides-2/raw) for relevant docs."""
-        es = await self._get_client()
+    # ─────────────────────────────────────────────────────────────
+    # Scan plans per index group
+    # ─────────────────────────────────────────────────────────────
+
+    def _domain_index_tasks(self, domain: str, limit: int) -> List[ScanTask]:
+        """Domain-focused indices."""
+        # Build query based on known field patterns
+        query = {
+            "bool": {
+                "should": [
+                    {"match": {"domain": domain}},
+                    {"match": {"url": f"*{domain}*"}},
+                    {"wildcard": {"domain": f"*{domain}*"}},
+                    {"wildcard": {"url.keyword": f"*{domain}*"}},
+                ],
+                "minimum_should_match": 1
+            }
+        }
+        return [
+            ScanTask(index, query, min(limit, 1000), "domain", self._extract_domain_record)
+            for index in self.DOMAIN_INDICES
+        ]
+
+    def _entity_index_tasks(self, name: str, limit: int) -> List[ScanTask]:
+        """Entity indices for person/company names."""
+        query = {
+            "bool": {
+                "should": [
+                    {"match_phrase": {"name": name}},
+                    {"match_phrase": {"full_name": name}},
+                    {"match_phrase": {"company_name": name}},
+                    {"match": {"name": {"query": name, "fuzziness": "AUTO"}}},
+                ],
+                "minimum_should_match": 1
+            }
+        }
+        # Extract domains from entity records
+        extract = self._url_fields_extractor(("url", "source_url", "website", "domain", "page_url"))
+        return [
+            ScanTask(index, query, min(limit, 1000), "entity", extract)
+            for index in self.ENTITY_INDICES
+        ]
+
+    def _phone_contact_tasks(self, phone: str, limit: int) -> List[ScanTask]:
+        # Normalize phone for search
+        phone_normalized = re.sub(r'[\s\-\(\)]', '', phone)
+        query = {
+            "bool": {
+                "should": [
+                    {"match": {"phone": phone}},
+                    {"match": {"phone_normalized": phone_normalized}},
+                    {"wildcard": {"phone": f"*{phone_normalized[-10:]}*"}}  # Last 10 digits
+                ],
+                "minimum_should_match": 1
+            }
+        }
+        extract = self._url_fields_extractor(("domain", "source_url", "url"))
+        return [ScanTask("phones_unified", query, min(limit, 1000), "phone", extract)]
+
+    def _email_contact_tasks(self, email: str, limit: int) -> List[ScanTask]:
+        query = {
+            "bool": {
+                "should": [
+                    {"term": {"email.keyword": email.lower()}},
+                    {"match": {"email": email}},
+                ],
+                "minimum_should_match": 1
+            }
+        }
+        extract = self._url_fields_extractor(("domain", "source_url", "url", "source_domain"))
+        return [ScanTask("emails_unified", query, min(limit, 1000), "email", extract)]
 
+    def _phone_breach_tasks(self, phone: str, limit: int) -> List[ScanTask]:
+        phone_normalized = re.sub(r'[\s\-\(\)]', '', phone)
+        return [ScanTask(
+            "breach_records", {"match": {"phone": phone_normalized}},
+            min(limit, 1000), "breach", self._extract_breach_source,
+        )]
+
+    def _email_breach_tasks(self, email: str, limit: int) -> List[ScanTask]:
+        return [ScanTask(
+            "breach_records", {"term": {"email.keyword": email.lower()}},
+            min(limit, 1000), "breach", self._extract_breach_source,
+        )]
+
+    def _graph_backlink_tasks(self, domain: str, limit: int) -> List[ScanTask]:
+        """Web graph backlinks to/from domain."""
+        # Look for domain as target (who links TO it) and source (who it links TO)
+        query = {
+            "bool": {
+                "should": [
+                    {"term": {"target": domain}},
+                    {"term": {"source": domain}},
+                    {"wildcard": {"target": f"*.{domain}"}},
+                    {"wildcard": {"source": f"*.{domain}"}},
+                ],
+                "minimum_should_match": 1
+            }
+        }
+        # Graph can have many edges
+        return [ScanTask("cc_web_graph_host_edges", query, min(limit, 5000), "graph", self._extract_graph_edge)]
+
+    def _entity_domain_tasks(self, domain: str, limit: int) -> List[ScanTask]:
+        """Entity mentions index for domain references."""
+        return [ScanTask(
+            "entity-mentions", {"match": {"source_domain": domain}},
+            min(limit, 1000), "mention", self._url_fields_extractor(("url",)),
+        )]
+
+    def _ownership_tasks(self, name: str, limit: int) -> List[ScanTask]:
+        """OpenOwnership beneficial ownership records."""
+        query = {
+            "bool": {
+                "should": [
+                    {"match_phrase": {"interested_party.name": name}},
+                    {"match_phrase": {"subject.name": name}},
+                    {"match": {"interested_party.name": {"query": name, "fuzziness": "AUTO"}}},
+                ],
+                "minimum_should_match": 1
+            }
+        }
+        return [ScanTask("openownership", query, min(limit, 1000), "ownership")]
+
+    def _uk_company_tasks(self, name: str, limit: int) -> List[ScanTask]:
+        """UK Companies House indices."""
+        query = {
+            "bool": {
+                "should": [
+                    {"match_phrase": {"company_name": name}},
+                    {"match": {"company_name": {"query": name, "fuzziness": "AUTO"}}},
+                ],
+                "minimum_should_match": 1
+            }
+        }
+        return [ScanTask("uk_ccod", query, min(limit, 500), "uk_company", self._extract_uk_company)]
+
+    def _get_corpus_indices(self) -> List[str]:
+        env = os.getenv("SUBMARINE_CORPUS_INDICES", "").strip()
+        if env:
+            return [p.strip() for p in env.split(",") if p.strip()]
+        return list(self.CORPUS_INDICES_DEFAULT)
+
+    def _corpus_tasks(self, query: str, query_type: str, limit: int) -> List[ScanTask]:
+        """CYMONIDES corpus indices (cymonides-3/home, cymonides-2/raw)."""
         corpus_indices = self._get_corpus_indices()
         if not corpus_indices:
-            return
+            return []
 
         email = query.lower().strip() if query_type == "email" else None
         phone_digits = re.sub(r"\D", "", query) if query_type == "phone" else None
@@ -624,241 +737,137 @@ class Sonar:
         elif query_type in {"email", "phone"}:
             size_cap = 500
 
-        for index in corpus_indices:
-            try:
-                if not await es.indices.exists(index=index):
-                    continue
-
-                result.indices_scanned.append(index)
-
-                if query_type == "email" and email:
-                    q = {
-                        "bool": {
-                            "should": [
-                                {"term": {"extracted_entities.emails.keyword": email}},
-                                {"term": {"email.keyword": email}},
-                                {
-                                    "simple_query_string": {
-                                        "query": email,
-                                        "fields": ["content", "title", "snippet", "source_url", "url"],
-                                        "default_operator": "and",
-                                        "lenient": True,
-                                    }
-                                },
-                            ],
-                            "minimum_should_match": 1,
-                        }
-                    }
-                elif query_type == "phone" and phone_digits:
-                    should = [
-                        {"term": {"extracted_entities.phones.keyword": query}},
-                        {"term": {"extracted_entities.phones.keyword": phone_digits}},
-                        {"term": {"phone.keyword": query}},
-                        {"term": {"phone.keyword": phone_digits}},
-                    ]
-                    if len(phone_digits) >= 7:
-                        should.append({"wildcard": {"content": f"*{phone_digits[-7:]}*"}})
-                    q = {"bool": {"should": should, "minimum_should_match": 1}}
-                elif query_type == "domain":
-                    dom = query.lower().strip()
-                    q = {
-                        "bool": {
-                            "should": [
-                                {"term": {"source_domain.keyword": dom}},
-                                {"term": {"domain.keyword": dom}},
-                                {"term": {"extracted_entities.domains.keyword": dom}},
-                                {"wildcard": {"source_url.keyword": f"*{dom}*"}},
-                                {"wildcard": {"url.keyword": f"*{dom}*"}},
-                            ],
-                            "minimum_should_match": 1,
-                        }
-                    }
-                elif query_type == "url":
-                    url = query.strip()
-                    q = {
-                        "bool": {
-                            "should": [
-                                {"term": {"source_url.keyword": url}},
-                                {"term": {"url.keyword": url}},
-                                {"wildcard": {"source_url.keyword": f"*{url}*"}},
-                                {"wildcard": {"url.keyword": f"*{url}*"}},
-                            ],
-                            "minimum_should_match": 1,
-                        }
-                    }
-                else:
-                    q = {
-                        "simple_query_string": {
-                            "query": query,
-                            "fields": [
-                                "title",
-                                "content",
-                                "snippet",
-                                "keywords",
-                                "source_url",
-                                "source_domain",
-                                "url",
-                                "domain",
-                                "wdc_entity_name",
-                            ],
-                            "default_operator": "and",
-                            "lenient": True,
-                        }
-                    }
-
-                resp = await es.search(
-                    index=index,
-                    query=q,
-                    size=min(limit, size_cap),
-                    track_total_hits=False,
-                    _source=True,
-                )
-
-                for hit in resp.get("hits", {}).get("hits", []):
-                    src = hit.get("_source", {}) or {}
-                    sonar_hit = SonarHit(
-                        index=index,
-                        doc_id=hit.get("_id", ""),
-                        score=hit.get("_score") or 0,
-                        source=src,
-                        match_type="corpus",
-                    )
-                    self._extract_domains_urls_from_corpus_source(src, result, sonar_hit)
-                    result.hits.append(sonar_hit)
-                    result.total_hits += 1
-
-            except Exception as e:
-                logger.warning(f"Error scanning {index}: {e}")
-
-    async def _scan_entity_domain(self, domain: str, result: SonarResult, limit: int):
-        """Scan entity mentions index for domain references."""
-        es = await self._get_client()
-
-        try:
-            if not await es.indices.exists(index="entity-mentions"):
-                return
-
-            result.indices_scanned.append("entity-mentions")
-
-            resp = await es.search(
-                index="entity-mentions",
-                query={"match": {"source_domain": domain}},
-                size=min(limit, 1000),
-                _source=True
-            )
-
-            for hit in resp["hits"]["hits"]:
-                src = hit["_source"]
-                sonar_hit = SonarHit(
-                    index="entity-mentions",
-                    doc_id=hit["_id"],
-                    score=hit["_score"] or 0,
-                    source=src,
-                    match_type="mention"
-                )
-
-                if "url" in src:
-                    result.add_url(src["url"])
-                    sonar_hit.url = src["url"]
-
-                result.hits.append(sonar_hit)
-                result.total_hits += 1
-
-        except Exception as e:
-            logger.warning(f"Error scanning entity-mentions: {e}")
-
-    async def _scan_ownership(self, name: str, result: SonarResult, limit: int):
-        """Scan OpenOwnership for beneficial ownership records."""
-        es = await self._get_client()
-
-        try:
-            if not await es.indices.exists(index="openownership"):
-                return
-
-            result.indices_scanned.append("openownership")
-
-            query = {
+        if query_type == "email" and email:
+            q = {
+                "bool": {
+                    "should": [
+                        {"term": {"extracted_entities.emails.keyword": email}},
+                        {"term": {"email.keyword": email}},
+                        {
+                            "simple_query_string": {
+                                "query": email,
+                                "fields": ["content", "title", "snippet", "source_url", "url"],
+                                "default_operator": "and",
+                                "lenient": True,
+                            }
+                        },
+                    ],
+                    "minimum_should_match": 1,
+                }
+            }
+        elif query_type == "phone" and phone_digits:
+            should = [
+                {"term": {"extracted_entities.phones.keyword": query}},
+                {"term": {"extracted_entities.phones.keyword": phone_digits}},
+                {"term": {"phone.keyword": query}},
+                {"term": {"phone.keyword": phone_digits}},
+            ]
+            if len(phone_digits) >= 7:
+                should.append({"wildcard": {"content": f"*{phone_digits[-7:]}*"}})
+            q = {"bool": {"should": should, "minimum_should_match": 1}}
+        elif query_type == "domain":
+            dom = query.lower().strip()
+            q = {
+                "bool": {
+                    "should": [
+                        {"term": {"source_domain.keyword": dom}},
+                        {"term": {"domain.keyword": dom}},
+                        {"term": {"extracted_entities.domains.keyword": dom}},
+                        {"wildcard": {"source_url.keyword": f"*{dom}*"}},
+                        {"wildcard": {"url.keyword": f"*{dom}*"}},
+                    ],
+                    "minimum_should_match": 1,
+                }
+            }
+        elif query_type == "url":
+            url = query.strip()
+            q = {
                 "bool": {
                     "should": [
-                        {"match_phrase": {"interested_party.name": name}},
-                        {"match_phrase": {"subject.name": name}},
-                        {"match": {"interested_party.name": {"query": name, "fuzziness": "AUTO"}}},
+                        {"term": {"source_url.keyword": url}},
+                        {"term": {"url.keyword": url}},
+                        {"wildcard": {"source_url.keyword": f"*{url}*"}},
+                        {"wildcard": {"url.keyword": f"*{url}*"}},
+                    ],
+                    "minimum_should_match": 1,
+                }
+            }
+        else:
+            q = {
+                "simple_query_string": {
+                    "query": query,
+                    "fields": [
+                        "title",
+                        "content",
+                        "snippet",
+                        "keywords",
+                        "source_url",
+                        "source_domain",
+                        "url",
+                        "domain",
+                        "wdc_entity_name",
                     ],
-                    "minimum_should_match": 1
+                    "default_operator": "and",
+                    "lenient": True,
                 }
             }
 
-            resp = await es.search(
-                index="openownership",
-                query=query,
-                size=min(limit, 1000),
-                _source=True
+        return [
+            ScanTask(
+                index, q, min(limit, size_cap), "corpus",
+                self._extract_domains_urls_from_corpus_source,
+                search_kwargs={"track_total_hits": False},
             )
+            for index in corpus_indices
+        ]
 
-            for hit in resp["hits"]["hits"]:
-                src = hit["_source"]
-                sonar_hit = SonarHit(
-                    index="openownership",
-                    doc_id=hit["_id"],
-                    score=hit["_score"] or 0,
-                    source=src,
-                    match_type="ownership"
-                )
+    # ─────────────────────────────────────────────────────────────
+    # Per-group scans (accumulate into a SonarResult)
+    # ─────────────────────────────────────────────────────────────
 
-                result.hits.append(sonar_hit)
-                result.total_hits += 1
+    async def _scan_domain_indices(self, domain: str, result: SonarResult, limit: int):
+        """Scan domain-focused indices."""
+        await self._collect(self._domain_index_tasks(domain, limit), result)
 
-        except Exception as e:
-            logger.warning(f"Error scanning openownership: {e}")
+    async def _scan_entity_indices(self, name: str, result: SonarResult, limit: int):
+        """Scan entity indices for person/company names."""
+        await self._collect(self._entity_index_tasks(name, limit), result)
 
-    async def _scan_uk_companies(self, name: str, result: SonarResult, limit: int):
-        """Scan UK Companies House indices."""
-        es = await self._get_client()
+    async def _scan_contacts_phone(self, phone: str, result: SonarResult, limit: int):
+        """Scan for phone number matches."""
+        await self._collect(self._phone_contact_tasks(phone, limit), result)
 
-        try:
-            if not await es.indices.exists(index="uk_ccod"):
-                return
+    async def _scan_contacts_email(self, email: str, result: SonarResult, limit: int):
+        """Scan for email matches."""
+        await self._collect(self._email_contact_tasks(email, limit), result)
 
-            result.indices_scanned.append("uk_ccod")
+    async def _scan_breaches_phone(self, phone: str, result: SonarResult, limit: int):
+        """Scan breach records for phone number."""
+        await self._collect(self._phone_breach_tasks(phone, limit), result)
 
-            query = {
-                "bool": {
-                    "should": [
-                        {"match_phrase": {"company_name": name}},
-                        {"match": {"company_name": {"query": name, "fuzziness": "AUTO"}}},
-                    ],
-                    "minimum_should_match": 1
-                }
-            }
+    async def _scan_breaches_email(self, email: str, result: SonarResult, limit: int):
+        """Scan breach records for email."""
+        await self._collect(self._email_breach_tasks(email, limit), result)
 
-            resp = await es.search(
-                index="uk_ccod",
-                query=query,
-                size=min(limit, 500),
-                _source=True
-            )
+    async def _scan_graph_backlinks(self, domain: str, result: SonarResult, limit: int):
+        """Scan web graph for backlinks to/from domain."""
+        await self._collect(self._graph_backlink_tasks(domain, limit), result)
 
-            for hit in resp["hits"]["hits"]:
-                src = hit["_source"]
-                sonar_hit = SonarHit(
-                    index="uk_ccod",
-                    doc_id=hit["_id"],
-                    score=hit["_score"] or 0,
-                    source=src,
-                    match_type="uk_company"
-                )
+    async def _scan_corpus_indices(self, query: str, query_type: str, result: SonarResult, limit: int):
+        """Scan the CYMONIDES corpus indices (cymonides-3/home, cymonides-2/raw) for relevant docs."""
+        await self._collect(self._corpus_tasks(query, query_type, limit), result)
 
-                # UK company numbers can lead to Companies House URLs
-                if "company_number" in src:
-                    ch_url = f"https://find-and-update.company-information.service.gov.uk/company/{src['company_number']}"
-                    result.add_url(ch_url)
-                    sonar_hit.url = ch_url
+    async def _scan_entity_domain(self, domain: str, result: SonarResult, limit: int):
+        """Scan entity mentions index for domain references."""
+        await self._collect(self._entity_domain_tasks(domain, limit), result)
 
-                result.hits.append(sonar_hit)
-                result.total_hits += 1
+    async def _scan_ownership(self, name: str, result: SonarResult, limit: int):
+        """Scan OpenOwnership for beneficial ownership records."""
+        await self._collect(self._ownership_tasks(name, limit), result)
 
-        except Exception as e:
-            logger.warning(f"Error scanning uk_ccod: {e}")
+    async def _scan_uk_companies(self, name: str, result: SonarResult, limit: int):
+        """Scan UK Companies House indices."""
+        await self._collect(self._uk_company_tasks(name, limit), result)
 
 
 # Quick test
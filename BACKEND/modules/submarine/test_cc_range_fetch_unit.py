@@ -0,0 +1,107 @@
+import gzip
+
+import pytest
+from aiohttp import web
+
+
+def _warc_member(body: bytes, content_type: str = "text/html; charset=utf-8") -> bytes:
+    http = (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: " + content_type.encode() + b"\r\n"
+        b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n"
+    )
+    record = (
+        b"WARC/1.0\r\n"
+        b"WARC-Type: response\r\n"
+        b"Content-Length: " + str(len(http) + len(body)).encode() + b"\r\n\r\n"
+        + http + body + b"\r\n\r\n"
+    )
+    return gzip.compress(record)
+
+
+def _build_warc(bodies):
+    """Concatenated gzip members, with unrelated members in between; returns (data, records)."""
+    data = b""
+    records = {}
+    for i, (body, content_type) in enumerate(bodies):
+        data += _warc_member(b"<html>filler</html>" * 50)
+        member = _warc_member(body, content_type)
+        records[f"d{i}.example"] = {
+            "filename": "crawl/seg/warc/file-0.warc.gz",
+            "offset": str(len(data)),
+            "length": str(len(member)),
+            "domain": f"d{i}.example",
+        }
+        data += member
+    return data, records
+
+
+async def _serve_ranges(data: bytes, requests: list):
+    """Stub WARC host answering Range requests from `data`; returns (runner, base_url)."""
+    async def handler(request):
+        requests.append(request.headers.get("Range"))
+        start, end = request.headers["Range"].split("=")[1].split("-")
+        return web.Response(status=206, body=data[int(start):int(end) + 1])
+
+    app = web.Application()
+    app.router.add_get("/{path:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_plan_merges_nearby_records_within_gap():
+    from SUBMARINE.orchestrator import plan_warc_ranges
+
+    records = {
+        "a": {"filename": "f1", "offset": "0", "length": "100"},
+        "b": {"filename": "f1", "offset": "150", "length": "100"},
+        "c": {"filename": "f1", "offset": "10000", "length": "100"},
+        "d": {"filename": "f2", "offset": "120", "length": "10"},
+        "e": {"filename": "f1", "offset": "5", "length": "0"},
+    }
+
+    ranges = plan_warc_ranges(records, gap=100)
+
+    assert [(r.filename, r.start, r.end) for r in ranges] == [("f1", 0, 250), ("f1", 10000, 10100), ("f2", 120, 130)]
+    assert [k for k, _, _ in ranges[0].records] == ["a", "b"]
+    assert ranges[0].header == "bytes=0-249"
+
+
+def test_parse_decodes_payload_with_declared_charset():
+    from SUBMARINE.orchestrator import parse_warc_record
+
+    body = "<html><p>Ürün fiyatı</p></html>".encode("iso-8859-9")
+    assert parse_warc_record(_warc_member(body, "text/html; charset=iso-8859-9")).startswith("<html><p>Ürün fiyatı")
+    assert parse_warc_record(_warc_member(b"not markup", "text/plain")) is None
+
+
+@pytest.mark.asyncio
+async def test_batch_fetch_coalesces_ranges():
+    from SUBMARINE.orchestrator import CCContentFetcher
+
+    bodies = [(f"<html><title>page {i}</title></html>".encode(), "text/html") for i in range(5)]
+    data, records = _build_warc(bodies)
+    requests = []
+    runner, base_url = await _serve_ranges(data, requests)
+
+    try:
+        async with CCContentFetcher(data_base=base_url, gap=64 * 1024) as fetcher:
+            results = await fetcher.batch_fetch(records)
+
+        requests_merged = len(requests)
+        requests.clear()
+        async with CCContentFetcher(data_base=base_url, gap=0) as fetcher:
+            separate = await fetcher.batch_fetch(records)
+    finally:
+        await runner.cleanup()
+
+    assert requests_merged == 1
+    assert {r.domain: r.content.rstrip() for r in results} == {
+        f"d{i}.example": f"<html><title>page {i}</title></html>" for i in range(5)
+    }
+    assert len(requests) == 5
+    assert all(r.source == "cc" for r in separate)
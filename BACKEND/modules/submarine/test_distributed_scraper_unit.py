@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+
+async def _serve_es(rejected: set, delay: float = 0.0):
+    """Stub ES: HEAD/PUT index, _bulk rejecting docs whose domain is in `rejected`."""
+    bulks = []
+
+    async def bulk(request):
+        lines = [json.loads(line) for line in (await request.text()).splitlines() if line]
+        docs = lines[1::2]
+        bulks.append([d["domain"] for d in docs])
+        await asyncio.sleep(delay)
+        items = [
+            {"index": {"status": 400, "error": {"type": "mapper_parsing_exception"}}}
+            if d["domain"] in rejected else {"index": {"status": 201}}
+            for d in docs
+        ]
+        return web.json_response({"errors": any(d["domain"] in rejected for d in docs), "items": items})
+
+    async def index_exists(request):
+        return web.Response(status=200)
+
+    app = web.Application()
+    app.router.add_post("/_bulk", bulk)
+    app.router.add_route("HEAD", "/{index}", index_exists)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port, bulks
+
+
+def _scraper(port):
+    from SUBMARINE.distributed_scraper import DistributedScraper
+
+    scraper = DistributedScraper(es_host="127.0.0.1", es_port=port, concurrent=4, extract_workers=0)
+    scraper.streamer._buffer_size = 3
+
+    async def scrape_domain(domain):
+        await asyncio.sleep(0.001)
+        return {"domain": domain, "content_length": 10, "source": "stub"}
+
+    scraper.scrape_domain = scrape_domain
+    return scraper
+
+
+@pytest.mark.asyncio
+async def test_streamer_reports_per_document_success():
+    from SUBMARINE.distributed_scraper import SastreStreamer
+
+    runner, port, _ = await _serve_es(rejected={"bad.example"})
+    streamer = SastreStreamer("127.0.0.1", port)
+    try:
+        for domain in ("a.example", "bad.example", "b.example"):
+            await streamer.stream({"domain": domain}, key=domain)
+        await streamer.stream({"domain": "unkeyed.example"})
+        assert await streamer.flush() == 3
+        assert streamer.take_acks() == {"a.example": True, "bad.example": False, "b.example": True}
+        assert streamer.take_acks() == {}
+    finally:
+        await streamer.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_ledger_resume_retries_undelivered_domains(tmp_path):
+    from SUBMARINE.distributed_scraper import ScrapeLedger
+
+    domains = [f"d{i}.example" for i in range(20)]
+    rejected = {"d3.example", "d11.example"}
+
+    runner, port, _ = await _serve_es(rejected=rejected, delay=0.01)
+    scraper = _scraper(port)
+    ledger = ScrapeLedger(tmp_path / "run.db")
+    try:
+        stats = await scraper.scrape_batch(domains, ledger=ledger)
+    finally:
+        await scraper.close()
+        await runner.cleanup()
+    assert stats["undelivered"] == 2
+    assert ledger.counts() == {"success": 18}
+
+    # Rerun: only the domains ES never indexed are scraped again
+    runner, port, bulks = await _serve_es(rejected=set())
+    scraper = _scraper(port)
+    try:
+        await scraper.scrape_batch(domains, ledger=ledger)
+    finally:
+        await scraper.close()
+        await runner.cleanup()
+        ledger.close()
+    assert sorted(d for bulk in bulks for d in bulk) == sorted(rejected)
+
+
+def test_extraction_pool_default_workers(monkeypatch):
+    from SUBMARINE.distributed_scraper import ExtractionPool
+
+    monkeypatch.setattr("os.cpu_count", lambda: 32)
+    assert ExtractionPool().workers == 4
+    monkeypatch.setattr("os.cpu_count", lambda: 2)
+    assert ExtractionPool().workers == 1
+
+
+class _PendingExecutor:
+    """Executor whose submitted calls stay pending until failed by the test."""
+
+    def __init__(self):
+        from concurrent.futures import Future
+        self._future_type = Future
+        self.futures = []
+        self.shutdowns = 0
+
+    def submit(self, fn, *args):
+        future = self._future_type()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdowns += 1
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_is_shut_down_and_replaced_once():
+    from concurrent.futures.process import BrokenProcessPool
+    from SUBMARINE.distributed_scraper import ExtractionPool
+
+    pool = ExtractionPool(workers=2)
+    broken = pool._executor = _PendingExecutor()
+    html = "<html>" + "x" * 200 + "</html>"
+    first = asyncio.create_task(pool.extract(html, "", "https://a.example/"))
+    second = asyncio.create_task(pool.extract(html, "", "https://b.example/"))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(broken.futures) == 2
+
+    broken.futures[0].set_exception(BrokenProcessPool("worker died"))
+    await first
+    assert pool._executor is None
+    replacement = pool._executor = _PendingExecutor()
+
+    # The second caller fails on the old pool; the replacement must survive
+    broken.futures[1].set_exception(BrokenProcessPool("worker died"))
+    await second
+    assert pool._executor is replacement
+    assert broken.shutdowns == 2
+    assert pool.stats.pool_restarts == 1 and pool.stats.errors == 2
@@ -100,3 +100,89 @@ async def test_corpus_scan_prefers_home_then_raw_and_extracts_domains_urls(monke
     assert "https://example.com/page" in result.urls
     assert "https://sub.example.com/a" in result.urls
 
+
+
+class _PagingIndices(_DummyIndices):
+    def __init__(self, exists_map, mappings):
+        super().__init__(exists_map)
+        self._mappings = mappings
+        self.mapping_calls = 0
+
+    async def get_mapping(self, index: str, **kwargs):
+        self.mapping_calls += 1
+        names = index.split(",")
+        return {n: {"mappings": {"properties": self._mappings[n]}} for n in names if n in self._mappings}
+
+
+class _PagingAsyncES:
+    """Search stub with point-in-time + search_after over a fixed doc list."""
+
+    def __init__(self, docs, mappings):
+        self.indices = _PagingIndices({}, mappings)
+        self._docs = docs
+        self.calls = []
+        self.open_pits = set()
+
+    async def open_point_in_time(self, index: str, keep_alive: str):
+        pit_id = f"pit-{index}"
+        self.open_pits.add(pit_id)
+        return {"id": pit_id}
+
+    async def close_point_in_time(self, id: str):
+        self.open_pits.discard(id)
+
+    async def search(self, query: dict, size: int, index: str = None, pit=None, search_after=None, _source=True, **kwargs):
+        index = index or pit["id"].split("-", 1)[1]
+        self.calls.append({"index": index, "query": query, "size": size, "search_after": search_after})
+        docs = self._docs.get(index, [])
+        start = search_after[1] + 1 if search_after else 0
+        page = [
+            {"_id": str(i), "_score": 1.0, "_source": docs[i], "sort": [1.0, i]}
+            for i in range(start, min(start + size, len(docs)))
+        ]
+        return {"hits": {"hits": page}, "pit_id": pit["id"] if pit else None}
+
+
+@pytest.mark.asyncio
+async def test_large_scan_pages_with_pit_and_caches_mappings():
+    from SUBMARINE.sonar.elastic_scanner import Sonar, SonarResult
+
+    edges = [{"source": f"s{i}.example", "target": "b.example"} for i in range(1200)]
+    es = _PagingAsyncES(
+        docs={"cc_web_graph_host_edges": edges},
+        mappings={"cc_web_graph_host_edges": {"source": {"type": "keyword"}, "target": {"type": "keyword"}}},
+    )
+
+    sonar = Sonar(page_size=500)
+    sonar.es = es
+    result = SonarResult(query="b.example")
+
+    hits = [h async for h in sonar._run_tasks(sonar._graph_backlink_tasks("b.example", 5000), result)]
+
+    assert len(hits) == 1200
+    assert result.total_hits == 1200
+    assert "s1199.example" in result.domains
+    # 500 + 500 + 200, each page resumed from the previous page's sort values
+    assert [c["size"] for c in es.calls] == [500, 500, 500]
+    assert es.calls[1]["search_after"] == [1.0, 499]
+    assert not es.open_pits
+
+    # Mapping is cached; a second scan does not ask again
+    await sonar._scan_graph_backlinks("b.example", SonarResult(query="b.example"), limit=10)
+    assert es.indices.mapping_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_unmapped_index_is_skipped_without_search():
+    from SUBMARINE.sonar.elastic_scanner import Sonar, SonarResult
+
+    es = _PagingAsyncES(docs={}, mappings={"emails_unified": {"address": {"type": "keyword"}}})
+
+    sonar = Sonar()
+    sonar.es = es
+    result = SonarResult(query="a@example.com")
+
+    await sonar._scan_contacts_email("a@example.com", result, limit=10)
+
+    assert result.indices_scanned == ["emails_unified"]
+    assert es.calls == []
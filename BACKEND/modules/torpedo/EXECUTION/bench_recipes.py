@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Recipe extraction benchmark - BeautifulSoup html.parser vs compiled lxml recipes.
+
+Runs both extraction paths over saved results pages and reports per-page
+latency plus whether the two paths produced identical articles.
+
+Fixture layout (one pair per saved page; a synthetic set ships in
+EXECUTION/fixtures/ and is used when --fixtures is not given):
+    fixtures/
+        bbc.co.uk.html      # raw search results page
+        bbc.co.uk.json      # {"recipe": {...}, "base_url": "https://bbc.co.uk"}
+
+If a page has no .json sidecar, its recipe is looked up by file stem (domain)
+in the news sources file (`--sources`, default: IO matrix news.json).
+
+Usage:
+    python -m TORPEDO.EXECUTION.bench_recipes
+    python -m TORPEDO.EXECUTION.bench_recipes --fixtures ./fixtures
+    python -m TORPEDO.EXECUTION.bench_recipes --fixtures ./fixtures --repeat 50
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..paths import news_sources_path
+from .news_searcher import NewsSearcher
+from .recipe_extractor import compile_recipe
+
+DEFAULT_FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _recipes_by_domain(sources_path: Path) -> Dict[str, Dict[str, str]]:
+    if not sources_path.exists():
+        return {}
+    with open(sources_path) as f:
+        data = json.load(f)
+    recipes = {}
+    for sources in data.values():
+        if not isinstance(sources, list):
+            continue
+        for source in sources:
+            if source.get("domain") and source.get("search_recipe"):
+                recipes[source["domain"]] = source["search_recipe"]
+    return recipes
+
+
+def load_fixtures(fixtures_dir: Path, sources_path: Path) -> List[Tuple[str, str, Dict[str, str], str]]:
+    """Return (name, html, recipe, base_url) for every usable fixture."""
+    by_domain: Optional[Dict[str, Dict[str, str]]] = None
+    fixtures = []
+    for html_path in sorted(fixtures_dir.glob("*.html")):
+        sidecar = html_path.with_suffix(".json")
+        if sidecar.exists():
+            with open(sidecar) as f:
+                meta = json.load(f)
+            recipe = meta.get("recipe")
+            base_url = meta.get("base_url", "")
+        else:
+            if by_domain is None:
+                by_domain = _recipes_by_domain(sources_path)
+            recipe = by_domain.get(html_path.stem)
+            base_url = f"https://{html_path.stem}"
+        if not recipe:
+            print(f"  skip {html_path.name}: no recipe")
+            continue
+        html = html_path.read_text(encoding="utf-8", errors="replace")
+        fixtures.append((html_path.stem, html, recipe, base_url))
+    return fixtures
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(fixtures_dir: Path, sources_path: Path, repeat: int) -> Dict[str, Any]:
+    searcher = NewsSearcher()
+    fixtures = load_fixtures(fixtures_dir, sources_path)
+
+    rows = []
+    for name, html, recipe, base_url in fixtures:
+        compiled = compile_recipe(recipe)
+        legacy = searcher._extract_with_recipe_bs4(html, recipe, base_url=base_url)
+        bs4_ms = _time_ms(lambda: searcher._extract_with_recipe_bs4(html, recipe, base_url=base_url), repeat)
+
+        if compiled is None:
+            rows.append({"fixture": name, "articles": len(legacy), "bs4_ms": bs4_ms,
+                         "compiled_ms": None, "speedup": None, "match": None})
+            continue
+
+        fast = compiled.extract(html, base_url=base_url)
+        compiled_ms = _time_ms(lambda: compiled.extract(html, base_url=base_url), repeat)
+        rows.append({
+            "fixture": name,
+            "articles": len(legacy),
+            "bs4_ms": bs4_ms,
+            "compiled_ms": compiled_ms,
+            "speedup": bs4_ms / compiled_ms if compiled_ms else None,
+            "match": fast == legacy,
+        })
+
+    timed = [r for r in rows if r["compiled_ms"] is not None]
+    return {
+        "fixtures": len(rows),
+        "fallback": len(rows) - len(timed),
+        "mismatches": [r["fixture"] for r in timed if not r["match"]],
+        "bs4_total_ms": sum(r["bs4_ms"] for r in timed),
+        "compiled_total_ms": sum(r["compiled_ms"] for r in timed),
+        "rows": rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark news recipe extraction paths")
+    parser.add_argument("--fixtures", "-f", default=str(DEFAULT_FIXTURES),
+                        help="Directory of saved .html pages (+ optional .json sidecars)")
+    parser.add_argument("--sources", "-s", help="news.json to resolve recipes by domain")
+    parser.add_argument("--repeat", "-r", type=int, default=20, help="Timed runs per fixture (median reported)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON report")
+    args = parser.parse_args()
+
+    sources_path = Path(args.sources) if args.sources else news_sources_path()
+    report = run(Path(args.fixtures), sources_path, max(1, args.repeat))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n{'fixture':<40} {'arts':>5} {'bs4 ms':>9} {'lxml ms':>9} {'x':>6}  match")
+    for r in report["rows"]:
+        compiled_ms = f"{r['compiled_ms']:.2f}" if r["compiled_ms"] is not None else "-"
+        speedup = f"{r['speedup']:.1f}" if r["speedup"] else "-"
+        match = {True: "yes", False: "NO", None: "fallback"}[r["match"]]
+        print(f"{r['fixture'][:40]:<40} {r['articles']:>5} {r['bs4_ms']:>9.2f} {compiled_ms:>9} {speedup:>6}  {match}")
+
+    if report["compiled_total_ms"]:
+        print(f"\nTotal: bs4 {report['bs4_total_ms']:.1f} ms, compiled {report['compiled_total_ms']:.1f} ms "
+              f"({report['bs4_total_ms'] / report['compiled_total_ms']:.1f}x)")
+    if report["mismatches"]:
+        print(f"Output mismatches: {', '.join(report['mismatches'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,7 @@ from typing import Dict, List, Any, Optional
 from urllib.parse import quote_plus
 
 from .base_searcher import BaseSearcher
+from .recipe_extractor import compile_recipe
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from datetime import datetime, date
@@ -125,7 +126,24 @@ class NewsSearcher(BaseSearcher):
         recipe: Dict[str, str],
         base_url: str = ""
     ) -> List[Dict[str, Any]]:
-        """Extract search results from HTML using a recipe."""
+        """
+        Extract search results from HTML using a recipe.
+
+        Uses the recipe's precompiled selectors on lxml when possible,
+        otherwise the BeautifulSoup path.
+        """
+        compiled = compile_recipe(recipe)
+        if compiled is not None:
+            return compiled.extract(html, base_url=base_url)
+        return self._extract_with_recipe_bs4(html, recipe, base_url=base_url)
+
+    def _extract_with_recipe_bs4(
+        self,
+        html: str,
+        recipe: Dict[str, str],
+        base_url: str = ""
+    ) -> List[Dict[str, Any]]:
+        """Extract search results from HTML using a recipe (BeautifulSoup html.parser)."""
         soup = BeautifulSoup(html, 'html.parser')
         results = []
 
@@ -0,0 +1,182 @@
+"""
+RecipeExtractor - Compiled search-result recipes
+
+A news source's `search_recipe` is a handful of CSS selectors
+(container/title/url/snippet/date). The old path parsed every results page
+with BeautifulSoup's pure-Python `html.parser` and re-interpreted each
+selector for every container.
+
+Here each recipe is compiled ONCE into XPath objects (via cssselect) and run
+against lxml's C parser: one parse, one container query, then a fixed set of
+precompiled relative lookups per container.
+
+Selectors cssselect cannot translate (soupsieve-only pseudo-classes such as
+`:-soup-contains`) make `compile_recipe()` return None so callers can fall back
+to the BeautifulSoup path.
+
+Usage:
+    from TORPEDO.EXECUTION.recipe_extractor import compile_recipe
+
+    compiled = compile_recipe(recipe)
+    for hit in compiled.iter_hits(html, base_url="https://example.com"):
+        print(hit.title, hit.url, hit.date, hit.snippet)
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+logger = logging.getLogger("Torpedo.RecipeExtractor")
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    from cssselect import HTMLTranslator, SelectorError
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+    etree = None
+    lxml_html = None
+    HTMLTranslator = None
+    SelectorError = Exception
+
+# Recipe defaults - must match NewsSearcher._extract_with_recipe
+DEFAULT_CONTAINER = "article"
+DEFAULT_TITLE = "a"
+DEFAULT_URL = "a[href]"
+DEFAULT_SNIPPET = "p"
+
+
+class RecipeHit(NamedTuple):
+    """One search result extracted by a recipe."""
+    title: Optional[str]
+    url: Optional[str]
+    date: Optional[str]
+    snippet: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as the legacy BeautifulSoup extractor (absent fields omitted)."""
+        result: Dict[str, Any] = {}
+        if self.title is not None:
+            result["title"] = self.title
+        if self.url is not None:
+            result["url"] = self.url
+        if self.snippet is not None:
+            result["snippet"] = self.snippet
+        if self.date is not None:
+            result["date"] = self.date
+        return result
+
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = frozenset({"script", "style"})
+
+
+def _strings(el) -> Iterator[str]:
+    """Text nodes below `el` in document order, skipping script/style bodies and comments."""
+    if el.text:
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(el, separator: str = " ") -> str:
+    """Equivalent of BeautifulSoup get_text(separator=separator, strip=True)."""
+    return separator.join(t.strip() for t in _strings(el) if t.strip())
+
+
+class CompiledRecipe:
+    """A search_recipe with every selector precompiled to an XPath object."""
+
+    def __init__(self, container: str, title: str, url: str, snippet: str, date: Optional[str] = None):
+        # HTML rules: element and attribute names match case-insensitively, as in soupsieve
+        translator = HTMLTranslator()
+        # Containers are searched below the document root, fields only below
+        # their container (soupsieve's select_one never matches the element itself).
+        self._container = etree.XPath(translator.css_to_xpath(container, prefix="descendant::"))
+        self._title = etree.XPath(translator.css_to_xpath(title, prefix="descendant::"))
+        self._url = etree.XPath(translator.css_to_xpath(url, prefix="descendant::"))
+        self._snippet = etree.XPath(translator.css_to_xpath(snippet, prefix="descendant::"))
+        self._date = etree.XPath(translator.css_to_xpath(date, prefix="descendant::")) if date else None
+
+    @staticmethod
+    def _first(xpath, container):
+        found = xpath(container)
+        return found[0] if found else None
+
+    def iter_hits(self, html: str, base_url: str = "") -> Iterator[RecipeHit]:
+        """Parse once and yield a RecipeHit per container that has a url and title."""
+        if not html:
+            return
+        try:
+            # Always a full document: fromstring() would wrap several top-level
+            # elements in a synthetic <div> that container selectors could match
+            try:
+                root = lxml_html.document_fromstring(html)
+            except ValueError:
+                # str input with an XML encoding declaration - let lxml decode bytes
+                root = lxml_html.document_fromstring(html.encode("utf-8"))
+        except etree.ParserError as e:
+            logger.debug(f"lxml could not parse page: {e}")
+            return
+
+        for container in self._container(root):
+            title = url = snippet = date = None
+
+            title_el = self._first(self._title, container)
+            if title_el is not None:
+                title = _text(title_el)
+
+            url_el = self._first(self._url, container)
+            if url_el is not None:
+                url = url_el.get("href", "")
+                if url and not url.startswith("http") and base_url:
+                    url = urljoin(base_url, url)
+
+            snippet_el = self._first(self._snippet, container)
+            if snippet_el is not None:
+                snippet = _text(snippet_el)
+
+            if self._date is not None:
+                date_el = self._first(self._date, container)
+                if date_el is not None:
+                    date = date_el.get("datetime") or _text(date_el, separator="")
+
+            # Only yield if we have meaningful data (URL required, title must exist)
+            if url and title:
+                yield RecipeHit(title, url, date, snippet)
+
+    def extract(self, html: str, base_url: str = "") -> List[Dict[str, Any]]:
+        """List-of-dicts output identical to NewsSearcher._extract_with_recipe."""
+        return [hit.to_dict() for hit in self.iter_hits(html, base_url)]
+
+
+@lru_cache(maxsize=4096)
+def _compile(container: str, title: str, url: str, snippet: str, date: Optional[str]) -> Optional[CompiledRecipe]:
+    try:
+        return CompiledRecipe(container, title, url, snippet, date)
+    except (SelectorError, etree.XPathError) as e:
+        logger.debug(f"Recipe not compilable ({e}); using BeautifulSoup fallback")
+        return None
+
+
+def compile_recipe(recipe: Dict[str, str]) -> Optional[CompiledRecipe]:
+    """
+    Compile (and memoize) a search_recipe.
+
+    Returns None if lxml/cssselect are unavailable or a selector is not
+    supported - callers should then use the BeautifulSoup extractor.
+    """
+    if not LXML_AVAILABLE or not recipe:
+        return None
+    return _compile(
+        recipe.get("container", DEFAULT_CONTAINER),
+        recipe.get("title", DEFAULT_TITLE),
+        recipe.get("url", DEFAULT_URL),
+        recipe.get("snippet", DEFAULT_SNIPPET),
+        recipe.get("date") or None,
+    )
@@ -17,10 +17,12 @@ import asyncio
 import json
 import logging
 import re
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field, asdict
+from functools import lru_cache
 
 from dotenv import load_dotenv
 
@@ -34,6 +36,7 @@ if _env:
 # Relative imports within TORPEDO package
 from ..EXECUTION.news_searcher import NewsSearcher
 from .designators import DESIGNATORS, EU27_UK, get_designators, get_unique_designators
+from .ner_batcher import NERBatcher
 
 # Import GLiNER - use absolute import from modules path
 try:
@@ -60,6 +63,34 @@ OUTPUT_DIR = io_matrix_dir()
 OUTPUT_BASENAME = "news_entities"
 
 
+@lru_cache(maxsize=1024)
+def _designator_pattern(designator: str) -> "re.Pattern[str]":
+    """Compiled local-context pattern for a designator (compiled once per designator)."""
+    escaped = re.escape(designator)
+    if not designator.endswith("."):
+        escaped = f"{escaped}\\.?"
+    return re.compile(escaped, re.IGNORECASE)
+
+
+def _compile_has_designator(designators) -> "re.Pattern[str]":
+    """
+    Single alternation matching " <DESIGNATOR>" or "(<DESIGNATOR>)" in an
+    upper-cased name - replaces a per-designator loop of substring checks.
+    """
+    alternation = "|".join(
+        re.escape(d.upper()) for d in sorted(designators, key=len, reverse=True) if d
+    )
+    if not alternation:
+        return re.compile(r"(?!)")  # no designators: never matches
+    return re.compile(f" (?:{alternation})|\\((?:{alternation})\\)")
+
+
+def _regex_first_snippets(backend, text: str) -> List[str]:
+    """GLiNERBackend.extract() input selection: regex-signal snippets, else head/tail of the text."""
+    text = backend._strip_html(text)
+    return backend._extract_candidate_snippets(text, include_dates=False) or backend._fallback_snippets(text)
+
+
 def _timestamp() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -126,8 +157,15 @@ class HarvestStats:
     unique_companies: int = 0
     unique_persons: int = 0
     errors: int = 0
+    elapsed_seconds: float = 0.0
+    ner_batches: int = 0
+    ner_cache_hits: int = 0
     jurisdictions_processed: List[str] = field(default_factory=list)
 
+    @property
+    def articles_per_second(self) -> float:
+        return self.total_articles / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
     def to_dict(self) -> Dict:
         return asdict(self)
 
@@ -149,6 +187,8 @@ class EntityHarvester:
         dry_run: bool = False,
         require_recipe: bool = True,  # Only use sources with extraction recipes
         checkpoint_every: int = 1,  # Save progress every N keywords
+        ner_batch_size: int = 16,  # Chunks per GLiNER forward pass
+        ner_in_process: bool = True,  # Run GLiNER in a dedicated worker process
     ):
         self.news_searcher = NewsSearcher()
         self.max_sources = max_sources
@@ -158,7 +198,10 @@ class EntityHarvester:
         self.require_recipe = require_recipe
         self.checkpoint_every = checkpoint_every
         self._current_jurisdiction: Optional[str] = None
-        self._gliner = None
+        self._ner: Optional[NERBatcher] = None
+        self.ner_batch_size = ner_batch_size
+        self.ner_in_process = ner_in_process
+        self._started_at: Optional[float] = None
         self._save_lock = asyncio.Lock()
         self._keywords_completed = 0
         self.companies: Dict[str, HarvestedEntity] = {}
@@ -166,12 +209,42 @@ class EntityHarvester:
         self.stats = HarvestStats()
         # Build set of all designators for validation
         self._all_designators = get_unique_designators()
+        self._has_designator_re = _compile_has_designator(self._all_designators)
+
+    def _get_ner(self) -> Optional[NERBatcher]:
+        """Lazy create the batched GLiNER extractor."""
+        if self._ner is None and GLINER_AVAILABLE and GLiNERBackend:
+            # Loop-side backend is only used for snippet selection; the model loads in the batcher
+            backend = GLiNERBackend(threshold=self.confidence_threshold)
+            self._ner = NERBatcher(
+                batch_size=self.ner_batch_size,
+                threshold=self.confidence_threshold,
+                labels=GLiNERBackend.GLINER_LABELS,
+                model_name=backend.model_name,
+                use_process=self.ner_in_process,
+                snippet_fn=lambda text: _regex_first_snippets(backend, text),
+            )
+        return self._ner
+
+    async def close(self):
+        """Flush pending NER batches and stop the worker process."""
+        if self._ner is not None:
+            await self._ner.close()
+            self._sync_ner_stats()
+            self._ner = None
+
+    async def __aenter__(self) -> "EntityHarvester":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
-    def _get_gliner(self) -> Optional[GLiNERBackend]:
-        """Lazy load GLiNER backend."""
-        if self._gliner is None and GLINER_AVAILABLE and GLiNERBackend:
-            self._gliner = GLiNERBackend(threshold=self.confidence_threshold)
-        return self._gliner
+    def _sync_ner_stats(self):
+        if self._started_at is not None:
+            self.stats.elapsed_seconds = round(time.monotonic() - self._started_at, 2)
+        if self._ner is not None:
+            self.stats.ner_batches = self._ner.stats.batches_run
+            self.stats.ner_cache_hits = self._ner.stats.cache_hits
 
     def _normalize_name(self, name: str) -> str:
         """Normalize entity name for deduplication."""
@@ -187,11 +260,7 @@ class EntityHarvester:
         if not text or not designator:
             return []
 
-        escaped = re.escape(designator)
-        if not designator.endswith("."):
-            escaped = f"{escaped}\\.?"
-
-        pattern = re.compile(escaped, re.IGNORECASE)
+        pattern = _designator_pattern(designator)
         candidates = []
         seen = set()
         boundaries = ".?!;:\n"
@@ -237,31 +306,7 @@ class EntityHarvester:
         With it, we only keep real companies like "Barclays PLC",
         "Siemens AG", "Podravka d.d."
         """
-        name_upper = name.upper()
-        name_lower = name.lower()
-
-        for designator in self._all_designators:
-            # Check various forms
-            d_upper = designator.upper()
-            d_lower = designator.lower()
-
-            # Exact suffix match (most common): "Barclays PLC"
-            if name_upper.endswith(f" {d_upper}"):
-                return True
-            if name_upper.endswith(f" {d_upper}."):
-                return True
-
-            # With period variations: "S.p.A." vs "SpA"
-            if f" {d_upper}" in name_upper:
-                return True
-            if f" {d_lower}" in name_lower:
-                return True
-
-            # Parenthetical: "Barclays (PLC)"
-            if f"({d_upper})" in name_upper:
-                return True
-
-        return False
+        return self._has_designator_re.search(name.upper()) is not None
 
     def _add_company(
         self,
@@ -353,9 +398,9 @@ class EntityHarvester:
         keyword: str,
         source_domain: str
     ):
-        """Extract entities from a single article."""
-        gliner = self._get_gliner()
-        if not gliner:
+        """Extract entities from a single article (GLiNER call is batched with concurrent articles)."""
+        ner = self._get_ner()
+        if not ner:
             logger.warning("GLiNER not available - skipping extraction")
             return
 
@@ -376,13 +421,7 @@ class EntityHarvester:
         }
 
         try:
-            result = gliner.extract(
-                text,
-                url=article.get("url", ""),
-                include_emails=False,
-                include_phones=False,
-                include_dates=False
-            )
+            result = await ner.extract(text)
 
             for company in result.get("companies", []):
                 name = company.get("value", "").strip()
@@ -414,6 +453,8 @@ class EntityHarvester:
         logger.info(f"  Searching {jurisdiction} news for '{keyword}'...")
 
         articles_count = 0
+        if self._started_at is None:
+            self._started_at = time.monotonic()
         try:
             results = await self.news_searcher.search(
                 query=keyword,
@@ -432,9 +473,12 @@ class EntityHarvester:
                 source_domain = source_result.get("domain", "")
                 articles = source_result.get("articles", [])
 
-                for article in articles:
-                    await self._process_article(article, jurisdiction, keyword, source_domain)
-                    articles_count += 1
+                # Submit together so the batcher can fill a forward pass
+                await asyncio.gather(*(
+                    self._process_article(article, jurisdiction, keyword, source_domain)
+                    for article in articles
+                ))
+                articles_count += len(articles)
 
             self.stats.total_articles += articles_count
             logger.info(f"    Found {articles_count} articles")
@@ -444,6 +488,7 @@ class EntityHarvester:
             self.stats.errors += 1
         finally:
             self._keywords_completed += 1
+            self._sync_ner_stats()
             if self.checkpoint_every and (self._keywords_completed % self.checkpoint_every == 0):
                 await self._checkpoint(f"{jurisdiction}:{keyword}")
 
@@ -568,6 +613,8 @@ class EntityHarvester:
         print(f"  Companies: {self.stats.unique_companies}")
         print(f"  Persons: {self.stats.unique_persons}")
         print(f"  Errors: {self.stats.errors}")
+        print(f"  NER batches: {self.stats.ner_batches} (cache hits: {self.stats.ner_cache_hits})")
+        print(f"  Throughput: {self.stats.articles_per_second:.1f} articles/s")
 
         if self.companies:
             print(f"\nTop 10 Companies:")
@@ -607,6 +654,8 @@ async def main():
         help="Output file path or directory (country-labeled, timestamped, never overwrites existing files)",
     )
     parser.add_argument("--checkpoint-every", type=int, default=1, help="Save progress every N keywords (0=off)")
+    parser.add_argument("--ner-batch-size", type=int, default=16, help="Text chunks per GLiNER forward pass")
+    parser.add_argument("--ner-in-thread", action="store_true", help="Run GLiNER in a thread instead of a worker process")
     parser.add_argument("--list-jurisdictions", action="store_true", help="List jurisdictions")
     args = parser.parse_args()
 
@@ -621,29 +670,30 @@ async def main():
         print("ERROR: GLiNER not available. Install with: pip install gliner")
         return
 
-    harvester = EntityHarvester(
-        max_sources=args.max_sources,
-        max_pages=args.max_pages,
-        confidence_threshold=args.threshold,
-        dry_run=args.dry_run,
-        checkpoint_every=args.checkpoint_every
-    )
-
     designators = None
     if args.designators:
         designators = [d.strip() for d in args.designators.split(",")]
 
-    if args.jurisdiction:
-        await harvester.harvest_jurisdiction(
-            args.jurisdiction,
-            designators=designators,
-            concurrent=args.concurrent
-        )
-    elif args.all:
-        await harvester.harvest_all_eu(concurrent_keywords=args.concurrent)
-    else:
-        print("Specify --jurisdiction XX or --all")
-        return
+    async with EntityHarvester(
+        max_sources=args.max_sources,
+        max_pages=args.max_pages,
+        confidence_threshold=args.threshold,
+        dry_run=args.dry_run,
+        checkpoint_every=args.checkpoint_every,
+        ner_batch_size=args.ner_batch_size,
+        ner_in_process=not args.ner_in_thread,
+    ) as harvester:
+        if args.jurisdiction:
+            await harvester.harvest_jurisdiction(
+                args.jurisdiction,
+                designators=designators,
+                concurrent=args.concurrent
+            )
+        elif args.all:
+            await harvester.harvest_all_eu(concurrent_keywords=args.concurrent)
+        else:
+            print("Specify --jurisdiction XX or --all")
+            return
 
     output_path = Path(args.output) if args.output else None
     harvester.save_results(output_path)
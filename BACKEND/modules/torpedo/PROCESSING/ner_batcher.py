@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+TORPEDO NER BATCHER - Batched GLiNER inference off the event loop
+
+The harvester used to call GLiNER once per article, synchronously, on the
+asyncio loop. This module turns that into:
+
+1. Snippets: article text is cut into the inputs GLiNER sees - by default
+   chunks of at most `chunk_chars`, or the caller's `snippet_fn` (the
+   harvester passes GLiNERBackend's regex-first snippet selection)
+2. Batching: chunks from all in-flight articles are accumulated until
+   `batch_size` is reached (or `max_wait` elapses) and sent as ONE forward pass
+3. Worker process: the model lives in a dedicated process (CPU-only), so
+   the harvesting I/O loop never stalls on inference
+4. Cache: predictions are memoized by chunk hash (SHA1 of chunk + labels)
+
+Usage:
+    async with NERBatcher(batch_size=16) as batcher:
+        entities = await batcher.extract(text)   # {"persons": [...], "companies": [...]}
+"""
+
+import asyncio
+import atexit
+import hashlib
+import logging
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("TORPEDO.NERBatcher")
+
+DEFAULT_MODEL = "urchade/gliner_medium-v2.1"
+
+# Same label set as GLiNERBackend.GLINER_LABELS - GLiNER scores every span
+# against all labels, so dropping the unused ones changes person/company output
+DEFAULT_LABELS = ("person name", "organization", "company", "address", "location", "phone number", "date")
+
+PERSON_LABELS = {"person", "person name"}
+COMPANY_LABELS = {"organization", "company"}
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+")
+
+
+# ─────────────────────────────────────────────────────────────
+# Worker-side (runs inside the NER process)
+# ─────────────────────────────────────────────────────────────
+
+_worker_model = None
+
+
+def _init_worker(model_name: str, torch_threads: int):
+    """Load the GLiNER model once per worker process."""
+    global _worker_model
+    try:
+        import torch
+        if torch_threads > 0:
+            torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+
+    from gliner import GLiNER
+    _worker_model = GLiNER.from_pretrained(model_name)
+    _worker_model.to("cpu")
+
+
+def _predict_batch(
+    texts: Sequence[str],
+    labels: Sequence[str],
+    threshold: float,
+    model_name: str = DEFAULT_MODEL,
+) -> List[List[Dict[str, Any]]]:
+    """Run a single batched forward pass. Returns one entity list per text."""
+    global _worker_model
+    if _worker_model is None:
+        _init_worker(model_name, 0)
+
+    model = _worker_model
+    labels = list(labels)
+    texts = list(texts)
+
+    if hasattr(model, "batch_predict_entities"):
+        return model.batch_predict_entities(texts, labels, threshold=threshold)
+    if hasattr(model, "inference"):
+        return model.inference(texts, labels, threshold=threshold, batch_size=len(texts))
+    return [model.predict_entities(t, labels, threshold=threshold) for t in texts]
+
+
+# ─────────────────────────────────────────────────────────────
+# Loop-side batcher
+# ─────────────────────────────────────────────────────────────
+
+@dataclass
+class NERBatchStats:
+    """Counters for batched inference."""
+    chunks_submitted: int = 0
+    cache_hits: int = 0
+    batches_run: int = 0
+    chunks_inferred: int = 0
+    batch_errors: int = 0
+    restarts: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class NERBatcher:
+    """
+    Accumulates text chunks from concurrent callers into fixed-size batches
+    and runs them through GLiNER in a worker process.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 16,
+        max_wait: float = 0.05,
+        chunk_chars: int = 1500,
+        threshold: float = 0.5,
+        labels: Sequence[str] = DEFAULT_LABELS,
+        model_name: str = DEFAULT_MODEL,
+        use_process: bool = True,
+        torch_threads: int = 0,
+        cache_size: int = 50000,
+        snippet_fn: Optional[Callable[[str], List[str]]] = None,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.chunk_chars = chunk_chars
+        self.threshold = threshold
+        self.labels = tuple(labels)
+        self.model_name = model_name
+        self.use_process = use_process
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 2) - 1)
+        self.cache_size = cache_size
+        self.snippet_fn = snippet_fn
+        self.stats = NERBatchStats()
+
+        self._executor: Optional[Executor] = None
+        self._cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    # ── executor ──
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # Safety net for callers that never reach close()
+            atexit.register(self._shutdown_executor)
+            if self.use_process:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1,
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.torch_threads),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gliner")
+        return self._executor
+
+    def _discard(self, executor: Executor):
+        """Drop a broken pool; only the first batch failing on it replaces it."""
+        if self._executor is executor:
+            self._executor = None
+            self.stats.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def close(self):
+        """Flush outstanding chunks and shut the worker down."""
+        if self._pending:
+            self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        atexit.unregister(self._shutdown_executor)
+
+    async def __aenter__(self) -> "NERBatcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # ── chunking / cache ──
+
+    def chunk_text(self, text: str) -> List[str]:
+        """Split text into chunks of at most `chunk_chars`, on sentence boundaries where possible."""
+        text = " ".join(text.split())
+        if not text:
+            return []
+        if len(text) <= self.chunk_chars:
+            return [text]
+
+        chunks: List[str] = []
+        current = ""
+        for sentence in _SENTENCE_BREAK.split(text):
+            while len(sentence) > self.chunk_chars:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(sentence[:self.chunk_chars])
+                sentence = sentence[self.chunk_chars:]
+            if current and len(current) + 1 + len(sentence) > self.chunk_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _chunk_key(self, chunk: str) -> str:
+        material = f"{self.threshold}|{'|'.join(self.labels)}|{chunk}"
+        return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+    def _cache_put(self, key: str, entities: List[Dict[str, Any]]):
+        self._cache[key] = entities
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # ── batching ──
+
+    async def predict(self, chunk: str) -> List[Dict[str, Any]]:
+        """Raw GLiNER entities for one chunk (batched with concurrent callers)."""
+        self.stats.chunks_submitted += 1
+        key = self._chunk_key(chunk)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats.cache_hits += 1
+            return cached
+
+        # Identical chunk already queued or running - share its result
+        existing = self._inflight.get(key)
+        if existing is not None:
+            self.stats.cache_hits += 1
+            return await asyncio.shield(existing)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        self._pending.append((key, chunk, future))
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            self._pending = self._pending[self.batch_size:]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, str, asyncio.Future]]):
+        loop = asyncio.get_running_loop()
+        texts = [chunk for _, chunk, _ in batch]
+        executor = self._get_executor()
+        try:
+            results = await loop.run_in_executor(
+                executor,
+                _predict_batch,
+                texts,
+                self.labels,
+                self.threshold,
+                self.model_name,
+            )
+            self.stats.batches_run += 1
+            self.stats.chunks_inferred += len(texts)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # The worker died (e.g. OOM) - later batches get a fresh one
+                logger.warning(f"GLiNER worker died: {e}")
+                self._discard(executor)
+            else:
+                logger.debug(f"GLiNER batch of {len(texts)} failed: {e}")
+            self.stats.batch_errors += 1
+            for key, _, future in batch:
+                self._inflight.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (key, _, future), entities in zip(batch, results):
+            entities = list(entities or [])
+            self._cache_put(key, entities)
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(entities)
+
+    # ── public extraction API ──
+
+    async def extract(self, text: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract persons and companies from text.
+
+        Returns the same shape as GLiNERBackend.extract():
+            {"persons": [{"value", "confidence", "method"}], "companies": [...]}
+        """
+        chunks = self.snippet_fn(text) if self.snippet_fn else self.chunk_text(text)
+        if not chunks:
+            return {"persons": [], "companies": []}
+
+        # A failed batch drops only its own snippets, as a per-snippet
+        # predict_entities() failure did in GLiNERBackend
+        predictions = await asyncio.gather(*(self.predict(c) for c in chunks), return_exceptions=True)
+
+        persons: List[Dict[str, Any]] = []
+        companies: List[Dict[str, Any]] = []
+        seen_persons = set()
+        seen_companies = set()
+
+        for entities in predictions:
+            if isinstance(entities, BaseException):
+                continue
+            for entity in entities:
+                entity_text = (entity.get("text") or "").strip()
+                label = (entity.get("label") or "").lower()
+                confidence = entity.get("score", 0.5)
+                if len(entity_text) < 2:
+                    continue
+
+                if label in PERSON_LABELS:
+                    # Validate: should have space (first + last name)
+                    if " " in entity_text and entity_text not in seen_persons:
+                        seen_persons.add(entity_text)
+                        persons.append({"value": entity_text, "confidence": confidence, "method": "gliner"})
+                elif label in COMPANY_LABELS:
+                    if entity_text not in seen_companies:
+                        seen_companies.add(entity_text)
+                        companies.append({"value": entity_text, "confidence": confidence, "method": "gliner"})
+
+        return {"persons": persons, "companies": companies}
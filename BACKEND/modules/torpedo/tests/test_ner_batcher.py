@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched GLiNER extractor
+Covers label set, caller-supplied snippets, batch failure isolation, worker
+restarts and shutdown
+"""
+
+import asyncio
+import sys
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PROCESSING"))
+
+import ner_batcher
+from ner_batcher import DEFAULT_LABELS, NERBatcher
+
+
+def _fake_predict(calls):
+    def predict(texts, labels, threshold, model_name):
+        calls.append((list(texts), tuple(labels)))
+        results = []
+        for text in texts:
+            if "boom" in text:
+                raise RuntimeError("model failure")
+            results.append([
+                {"text": word, "label": "company", "score": 0.9}
+                for word in text.split() if word.endswith("Ltd")
+            ])
+        return results
+    return predict
+
+
+def test_default_labels_match_backend():
+    assert DEFAULT_LABELS == (
+        "person name", "organization", "company", "address", "location", "phone number", "date",
+    )
+
+
+def test_snippet_fn_selects_model_inputs(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ner_batcher, "_predict_batch", _fake_predict(calls))
+
+    async def run():
+        async with NERBatcher(use_process=False, snippet_fn=lambda text: [text[:8], text[-8:]]) as batcher:
+            return await batcher.extract("AcmeLtd filler filler filler ZetaLtd")
+
+    result = asyncio.run(run())
+    assert calls == [(["AcmeLtd ", " ZetaLtd"], DEFAULT_LABELS)]
+    assert [c["value"] for c in result["companies"]] == ["AcmeLtd", "ZetaLtd"]
+
+
+def test_failed_batch_only_drops_its_snippets(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ner_batcher, "_predict_batch", _fake_predict(calls))
+
+    async def run():
+        async with NERBatcher(batch_size=1, use_process=False, snippet_fn=lambda text: text.split("|")) as batcher:
+            return await batcher.extract("boom BadLtd|GoodLtd")
+
+    result = asyncio.run(run())
+    assert len(calls) == 2
+    assert [c["value"] for c in result["companies"]] == ["GoodLtd"]
+
+
+def test_broken_worker_is_replaced_once(monkeypatch):
+    calls = []
+    predict = _fake_predict(calls)
+
+    def dies_first(texts, *args):
+        if not calls:
+            calls.append(None)
+            raise BrokenProcessPool("worker died")
+        return predict(texts, *args)
+
+    monkeypatch.setattr(ner_batcher, "_predict_batch", dies_first)
+
+    async def run():
+        async with NERBatcher(use_process=False) as batcher:
+            first = await batcher.extract("AcmeLtd")
+            assert batcher._executor is None
+            second = await batcher.extract("ZetaLtd")
+            # A late failure from an already-replaced pool keeps the new one
+            current = batcher._executor
+            batcher._discard(ner_batcher.ThreadPoolExecutor(max_workers=1))
+            assert batcher._executor is current
+            return batcher, first, second
+
+    batcher, first, second = asyncio.run(run())
+    assert first["companies"] == []
+    assert [c["value"] for c in second["companies"]] == ["ZetaLtd"]
+    assert batcher.stats.restarts == 1
+    assert batcher.stats.batch_errors == 1
+
+
+def test_context_manager_shuts_executor_down(monkeypatch):
+    monkeypatch.setattr(ner_batcher, "_predict_batch", _fake_predict([]))
+
+    async def run():
+        async with NERBatcher(use_process=False) as batcher:
+            await batcher.extract("AcmeLtd")
+            assert batcher._executor is not None
+        return batcher
+
+    batcher = asyncio.run(run())
+    assert batcher._executor is None
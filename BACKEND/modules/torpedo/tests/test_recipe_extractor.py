@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled news search recipes
+Each fixture is run through the lxml path and the BeautifulSoup path; outputs must match
+"""
+
+import pytest
+
+from TORPEDO.EXECUTION.bench_recipes import DEFAULT_FIXTURES, run
+from TORPEDO.EXECUTION.news_searcher import NewsSearcher
+from TORPEDO.EXECUTION.recipe_extractor import compile_recipe
+
+BASE_URL = "https://news.example.com/search"
+
+FIXTURES = [
+    (
+        "inline markup, script, style and comments",
+        """<article><h2><a href="/x">Hello <!-- c --> <b>World</b></a></h2>
+        <p>Snip &amp; <script>var a = 1;</script><style>p {}</style> more</p>
+        <time datetime="2024-01-02">2 Jan</time></article>""",
+        {"container": "article", "title": "h2 a", "date": "time"},
+    ),
+    (
+        "nested containers",
+        """<div class="res"><div class="res"><a href="http://a.example">A</a></div><a href="/b">B</a></div>""",
+        {"container": ".res"},
+    ),
+    (
+        "upper-case element and attribute names",
+        """<div class="Res"><a HREF="/b">B</a></div>""",
+        {"container": "DIV.Res", "url": "a[HREF]"},
+    ),
+    (
+        "missing snippet",
+        """<ul><li><a href="/a">A</a><p>s1</p></li><li><a href="/b">B</a></li></ul>""",
+        {"container": "ul > li", "snippet": "p"},
+    ),
+    (
+        "structural date selector",
+        """<div class="r"><a href="/a">A</a><span>d1</span><span>d 2</span></div>""",
+        {"container": "div.r", "date": "span:nth-of-type(2)"},
+    ),
+    (
+        "line break inside snippet",
+        """<div class="r"><a href="/a">A</a><p>x<br>y</p></div>""",
+        {"container": "div.r"},
+    ),
+    (
+        "container without title",
+        """<div class="r"><a href="/a"></a></div><div class="r"><a href="/b">B</a></div>""",
+        {"container": "div.r"},
+    ),
+    (
+        "several top-level div containers",
+        """<div><a href="/a">A</a></div><div><a href="/b">B</a></div>""",
+        {"container": "div"},
+    ),
+    (
+        "single top-level container",
+        """<div class="r"><a href="/a">A</a></div>""",
+        {"container": "div.r"},
+    ),
+    (
+        "full document",
+        """<!DOCTYPE html><html><head><title>Results</title></head>
+        <body><div class="r"><a href="/a">A</a></div></body></html>""",
+        {"container": "div.r"},
+    ),
+]
+
+
+@pytest.mark.parametrize("html,recipe", [f[1:] for f in FIXTURES], ids=[f[0] for f in FIXTURES])
+def test_compiled_recipe_matches_beautifulsoup(html, recipe):
+    compiled = compile_recipe(recipe)
+    assert compiled is not None
+
+    expected = NewsSearcher._extract_with_recipe_bs4(None, html, recipe, base_url=BASE_URL)
+    assert expected
+    assert compiled.extract(html, base_url=BASE_URL) == expected
+
+
+def test_soupsieve_only_selector_falls_back():
+    assert compile_recipe({"container": "div:-soup-contains('x')"}) is None
+
+
+def test_shipped_benchmark_fixtures_match(tmp_path):
+    report = run(DEFAULT_FIXTURES, tmp_path / "news.json", repeat=1)
+    assert report["fixtures"] >= 3
+    assert report["fallback"] == 0
+    assert report["mismatches"] == []
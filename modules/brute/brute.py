@@ -183,6 +183,17 @@ except ImportError:
     except ImportError:
         ANALYTICS_AVAILABLE = False
 
+# Import engine feedback so completed runs train QueryRouter's engine selection
+try:
+    from brute.routing.engine_feedback import record_search_feedback
+    ENGINE_FEEDBACK_AVAILABLE = True
+except ImportError:
+    try:
+        from routing.engine_feedback import record_search_feedback
+        ENGINE_FEEDBACK_AVAILABLE = True
+    except ImportError:
+        ENGINE_FEEDBACK_AVAILABLE = False
+
 # Import EngineHealthMonitor for circuit breaker pattern
 try:
     from brute.infrastructure.engine_health_monitor import EngineHealthMonitor, EngineStatus
@@ -3309,6 +3320,11 @@ class BruteSearchEngine:
                 print("\n")  # Extra spacing before analytics
                 self.analytics_collector.print_summary()
                 self.analytics_collector.save_to_db()
+                if ENGINE_FEEDBACK_AVAILABLE and os.getenv('ENABLE_ENGINE_FEEDBACK', 'false').lower() == 'true':
+                    try:
+                        record_search_feedback(self.keyword, self.analytics_collector)
+                    except Exception as e:
+                        logger.warning(f"Could not record engine feedback: {e}")
 
                 # Store analytics in stats for JSON export
                 self.stats['engine_analytics'] = self.analytics_collector.to_dict()
@@ -41,6 +41,7 @@ sys.path.insert(0, str(CYMONIDES_ROOT))
 try:
     from brute.routing.query_router import QueryRouter, EngineRecommendation
     from brute.routing.axis_analyzer import SubjectType
+    from brute.routing.engine_feedback import EngineFeedbackStore, outcomes_from_execution
     from brute.execution.cascade_executor import (
         CascadeExecutor, WavePhase, ExecutionResult, WaveResult
     )
@@ -48,6 +49,7 @@ try:
 except ImportError:
     from ..routing.query_router import QueryRouter, EngineRecommendation
     from ..routing.axis_analyzer import SubjectType
+    from ..routing.engine_feedback import EngineFeedbackStore, outcomes_from_execution
     from ..execution.cascade_executor import (
         CascadeExecutor, WavePhase, ExecutionResult, WaveResult
     )
@@ -111,7 +113,10 @@ class BruteSearchOptimal:
         max_results_per_engine: int = 100,
         max_engines: int = 15,
         deduplicate: bool = True,
-        progress_callback: Optional[ProgressCallback] = None
+        progress_callback: Optional[ProgressCallback] = None,
+        feedback_store: Optional[EngineFeedbackStore] = None,
+        learn_engines: bool = False,
+        latency_budget_ms: Optional[int] = None
     ):
         """
         Initialize optimal brute search.
@@ -123,6 +128,9 @@ class BruteSearchOptimal:
             max_engines: Max engines to use per query (default 15)
             deduplicate: Whether to deduplicate by URL (default True)
             progress_callback: Optional callback for progress updates
+            feedback_store: Engine outcome store (default: shared on-disk store)
+            learn_engines: Route from, and record, engine outcomes (default False)
+            latency_budget_ms: Leave out engines expected to take longer
         """
         self.performance_mode = performance_mode
         self.max_results_per_engine = max_results_per_engine
@@ -130,9 +138,13 @@ class BruteSearchOptimal:
         self.progress_callback = progress_callback
 
         # Initialize components
+        if learn_engines and feedback_store is None:
+            feedback_store = EngineFeedbackStore()
         self.router = QueryRouter(
             max_engines=max_engines,
-            performance_mode=performance_mode
+            performance_mode=performance_mode,
+            feedback=feedback_store if learn_engines else None,
+            latency_budget_ms=latency_budget_ms
         )
         self.ranker = ResultRanker()
 
@@ -279,6 +291,17 @@ class BruteSearchOptimal:
 
         execution_time = (time.time() - exec_start) * 1000
 
+        # Feed per-engine yield/latency/errors back into routing
+        if self.router.feedback is not None:
+            qclass = (
+                recommendation.query_analysis.query_class
+                if recommendation else self.router.classify(query)
+            )
+            try:
+                self.router.record_outcomes(outcomes_from_execution(execution_result, qclass))
+            except Exception as exc:
+                logger.warning("Could not record engine feedback: %s", exc)
+
         # Phase 3: Result Ranking
         rank_start = time.time()
         ranked_results = self.ranker.rank(
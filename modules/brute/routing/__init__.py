@@ -11,6 +11,7 @@ Three routing systems available:
    - OBJECT axis: Query operators (site:, filetype:, etc.)
    - TEMPORAL axis: Time-based constraints
    - Reduces engine count from 65 to 10-15 per query
+   - Optional learned selection from recorded engine outcomes (engine_feedback)
 
 2. **MatrixQueryRouter** (full): Complete NSOL routing with UNIFIED_MATRIX
    - L1/L2/L3 tiers for all search types
@@ -28,6 +29,7 @@ Additional Components:
 - **search_routing_system**: JSON configs for engine assignments and availability
 """
 from .query_router import QueryRouter, QueryAnalysis, EngineRecommendation
+from .engine_feedback import EngineFeedbackStore, EngineOutcome, EngineSelectionPolicy
 from .axis_analyzer import AxisAnalyzer, SubjectType, LocationContext, ObjectOperator
 
 # Full matrix routing
@@ -63,6 +65,9 @@ __all__ = [
     "QueryRouter",
     "QueryAnalysis",
     "EngineRecommendation",
+    "EngineFeedbackStore",
+    "EngineOutcome",
+    "EngineSelectionPolicy",
     "AxisAnalyzer",
     "SubjectType",
     "LocationContext",
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Engine Feedback - learned engine selection for QueryRouter.
+
+QueryRouter scores engines from static ENGINE_TAGS reliability constants and
+tier penalties, so an engine that keeps returning nothing new (or keeps
+timing out) for a kind of query is selected forever. This module closes the
+loop:
+
+1. Outcomes: after a search, each engine's unique-URL yield, latency and
+   error are recorded per *query class* (coarse axis signature, e.g.
+   "person:uk" or "topic:recent:ops")
+2. Store: decayed per (query class, engine) statistics in SQLite, so old
+   evidence fades and engines that recover are noticed
+3. Policy: budget-aware explore/exploit selection. Most slots go to engines
+   with the best expected unique yield (static router score as prior, data
+   takes over as it accumulates); a few slots explore under-sampled engines.
+   Engines expected to blow the latency budget are left out.
+
+Replaying recorded outcomes (JSONL, or the engine_stats table written by
+EngineAnalyticsCollector) into a fresh store reproduces the selection
+offline.
+
+Learned routing is opt-in: BruteSearchOptimal(learn_engines=True), and
+ENABLE_ENGINE_FEEDBACK=true for BruteSearchEngine to record its runs. The
+router still applies its performance-mode tier limits to what the policy
+picks.
+
+Usage:
+    from brute.routing.engine_feedback import EngineFeedbackStore, EngineOutcome
+
+    store = EngineFeedbackStore()
+    router = QueryRouter(feedback=store, latency_budget_ms=60000)
+    rec = router.route("John Smith London")
+    ...
+    router.record_outcomes([
+        EngineOutcome(rec.query_analysis.query_class, "GO", unique_results=42, latency_ms=1800),
+        EngineOutcome(rec.query_analysis.query_class, "YE", error="timeout", latency_ms=120000),
+    ])
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import random
+import sqlite3
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .axis_analyzer import AxisAnalysis, AxisAnalyzer, LocationContext, TemporalContext
+except ImportError:
+    from axis_analyzer import AxisAnalysis, AxisAnalyzer, LocationContext, TemporalContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEEDBACK_DB = os.getenv(
+    "BRUTE_ENGINE_FEEDBACK_DB",
+    str(Path(__file__).resolve().parent.parent / "data" / "engine_feedback.db"),
+)
+
+LATENCY_SAMPLES = 20  # Recent latencies kept per (query class, engine)
+
+
+def query_class(analysis: AxisAnalysis) -> str:
+    """Coarse, stable signature of a query used to key engine statistics."""
+    parts = [analysis.subject_types[0].name.lower() if analysis.subject_types else "topic"]
+    if analysis.location_context != LocationContext.GLOBAL:
+        parts.append(analysis.location_context.name.lower())
+    if analysis.temporal_context != TemporalContext.ANY_TIME:
+        parts.append(analysis.temporal_context.name.lower())
+    if analysis.operators:
+        parts.append("ops")
+    return ":".join(parts)
+
+
+@dataclass
+class EngineOutcome:
+    """One engine's contribution to one completed search."""
+    query_class: str
+    engine: str
+    unique_results: int = 0
+    raw_results: int = 0
+    latency_ms: float = 0.0
+    error: Optional[str] = None  # None = success; 'timeout', 'rate_limit', ...
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class EngineStats:
+    """Decayed statistics for one engine on one query class."""
+    runs: float = 0.0
+    errors: float = 0.0
+    unique_sum: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    updated_at: float = 0.0
+
+    def decayed(self, now: float, half_life: float) -> Tuple[float, float, float]:
+        """(runs, errors, unique_sum) decayed to `now`."""
+        if not self.updated_at or half_life <= 0:
+            return self.runs, self.errors, self.unique_sum
+        factor = 0.5 ** (max(0.0, now - self.updated_at) / half_life)
+        return self.runs * factor, self.errors * factor, self.unique_sum * factor
+
+    def median_latency(self) -> Optional[float]:
+        return statistics.median(self.latencies) if self.latencies else None
+
+
+class EngineFeedbackStore:
+    """
+    Persistent per-query-class engine statistics (SQLite, WAL, batched writes).
+
+    Args:
+        db_path: SQLite file (default BRUTE_ENGINE_FEEDBACK_DB or data/engine_feedback.db)
+        half_life: Seconds for recorded evidence to lose half its weight
+        flush_every: Dirty records buffered before writing
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        half_life: float = 14 * 24 * 3600,
+        flush_every: int = 50,
+    ):
+        self.db_path = db_path or DEFAULT_FEEDBACK_DB
+        self.half_life = half_life
+        self.flush_every = flush_every
+
+        self._stats: Dict[str, Dict[str, EngineStats]] = {}
+        self._loaded: set = set()
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS engine_feedback (
+                    query_class TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    runs REAL NOT NULL,
+                    errors REAL NOT NULL,
+                    unique_sum REAL NOT NULL,
+                    latencies TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (query_class, engine)
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def _load(self, qclass: str):
+        """Pull a query class into memory (once); caller holds the lock."""
+        if qclass in self._loaded:
+            return
+        self._loaded.add(qclass)
+        try:
+            rows = self._connect().execute(
+                "SELECT engine, runs, errors, unique_sum, latencies, updated_at "
+                "FROM engine_feedback WHERE query_class = ?", (qclass,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Engine feedback unavailable (%s); continuing in memory", e)
+            return
+        per_engine = self._stats.setdefault(qclass, {})
+        for engine, runs, errors, unique_sum, latencies, updated_at in rows:
+            per_engine.setdefault(engine, EngineStats(
+                runs=runs,
+                errors=errors,
+                unique_sum=unique_sum,
+                latencies=json.loads(latencies),
+                updated_at=updated_at,
+            ))
+
+    def record(self, outcome: EngineOutcome):
+        """Fold one outcome into the decayed statistics."""
+        now = outcome.timestamp or time.time()
+        with self._lock:
+            self._load(outcome.query_class)
+            s = self._stats.setdefault(outcome.query_class, {}).setdefault(outcome.engine, EngineStats())
+            s.runs, s.errors, s.unique_sum = s.decayed(now, self.half_life)
+            s.runs += 1.0
+            if outcome.error:
+                s.errors += 1.0
+            else:
+                s.unique_sum += max(0, outcome.unique_results)
+            if outcome.latency_ms:
+                s.latencies.append(float(outcome.latency_ms))
+                del s.latencies[:-LATENCY_SAMPLES]
+            s.updated_at = max(s.updated_at, now)
+            self._dirty.add((outcome.query_class, outcome.engine))
+            if len(self._dirty) >= self.flush_every:
+                self._flush_locked()
+
+    def record_many(self, outcomes: Iterable[EngineOutcome]) -> int:
+        count = 0
+        for outcome in outcomes:
+            self.record(outcome)
+            count += 1
+        return count
+
+    def stats(self, qclass: str) -> Dict[str, EngineStats]:
+        """Statistics for every engine seen on a query class."""
+        with self._lock:
+            self._load(qclass)
+            return dict(self._stats.get(qclass, {}))
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        rows = []
+        for qclass, engine in dirty:
+            s = self._stats[qclass][engine]
+            rows.append((qclass, engine, s.runs, s.errors, s.unique_sum, json.dumps(s.latencies), s.updated_at))
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany("""
+                    INSERT INTO engine_feedback (query_class, engine, runs, errors, unique_sum, latencies, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(query_class, engine) DO UPDATE SET
+                        runs = excluded.runs,
+                        errors = excluded.errors,
+                        unique_sum = excluded.unique_sum,
+                        latencies = excluded.latencies,
+                        updated_at = excluded.updated_at
+                """, rows)
+        except sqlite3.Error as e:
+            logger.warning("Could not persist engine feedback: %s", e)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+@dataclass
+class EngineChoice:
+    """Why the policy picked (or scored) an engine."""
+    engine: str
+    expected_unique: float
+    expected_latency_ms: Optional[float]
+    error_rate: float
+    runs: float
+    explored: bool = False
+
+
+class EngineSelectionPolicy:
+    """
+    Budget-aware explore/exploit engine selection.
+
+    Each candidate's value is its expected unique yield discounted by its
+    error rate. Engines without data start from the router's static score
+    (scaled to the best observed yield); `prior_weight` pseudo-runs of that
+    prior are blended with the observed mean, so data takes over gradually.
+
+    Slots: `max_engines` is the concurrency budget. All but the exploration
+    slots go to the highest-value engines; the rest go to the candidates with
+    the largest UCB bonus (least evidence relative to the class), ties broken
+    randomly. Engines whose median latency exceeds `latency_budget_ms` are
+    never picked; engines that fail more than `max_error_rate` of the time or
+    have repeatedly yielded under `min_yield` unique results are only retried
+    through exploration, so fewer than `max_engines` may be returned.
+
+    Args:
+        exploration: Fraction of slots reserved for exploration
+        prior_weight: Pseudo-runs given to the static prior
+        latency_budget_ms: Skip engines expected to be slower than this
+        max_error_rate: Skip engines failing more often than this
+        min_yield: Engines with evidence expected to add fewer unique results
+            than this are not exploited (their slot is simply not spent)
+        rng: Random source (seed it for reproducible replays)
+    """
+
+    def __init__(
+        self,
+        exploration: float = 0.15,
+        prior_weight: float = 3.0,
+        latency_budget_ms: Optional[float] = None,
+        max_error_rate: float = 0.6,
+        min_yield: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.exploration = exploration
+        self.prior_weight = prior_weight
+        self.latency_budget_ms = latency_budget_ms
+        self.max_error_rate = max_error_rate
+        self.min_yield = min_yield
+        self.rng = rng or random.Random()
+
+    def evaluate(
+        self,
+        priors: Dict[str, float],
+        stats: Dict[str, EngineStats],
+        now: float,
+        half_life: float,
+    ) -> Dict[str, EngineChoice]:
+        """Expected yield / latency / error rate for each candidate with a positive prior."""
+        decayed = {code: s.decayed(now, half_life) for code, s in stats.items()}
+        observed = [
+            unique_sum / (runs - errors)
+            for runs, errors, unique_sum in decayed.values()
+            if runs - errors > 0
+        ]
+        # Static scores become a yield prior on the scale of what engines actually return
+        yield_scale = statistics.mean(observed) if observed else 1.0
+        top_prior = max(priors.values()) if priors else 0.0
+
+        choices: Dict[str, EngineChoice] = {}
+        for code, prior in priors.items():
+            if prior <= 0:
+                continue
+            prior_yield = (prior / top_prior) * yield_scale if top_prior else 0.0
+            runs, errors, unique_sum = decayed.get(code, (0.0, 0.0, 0.0))
+            successes = runs - errors
+            # Beta(1, 1)-smoothed error rate, prior-blended mean yield per successful run
+            error_rate = (errors + 0.5) / (runs + 1.0) if runs else 0.0
+            mean_yield = (unique_sum + self.prior_weight * prior_yield) / (successes + self.prior_weight)
+            s = stats.get(code)
+            choices[code] = EngineChoice(
+                engine=code,
+                expected_unique=mean_yield * (1.0 - error_rate),
+                expected_latency_ms=s.median_latency() if s else None,
+                error_rate=error_rate,
+                runs=runs,
+            )
+        return choices
+
+    def select(
+        self,
+        priors: Dict[str, float],
+        stats: Dict[str, EngineStats],
+        max_engines: int,
+        now: Optional[float] = None,
+        half_life: float = 14 * 24 * 3600,
+        default_latency_ms: Optional[Dict[str, float]] = None,
+    ) -> List[EngineChoice]:
+        """Pick up to `max_engines` engines, exploit first, then exploration slots."""
+        now = now or time.time()
+        choices = self.evaluate(priors, stats, now, half_life)
+        if not choices or max_engines <= 0:
+            return []
+
+        def within_budget(choice: EngineChoice) -> bool:
+            latency = choice.expected_latency_ms
+            if latency is None and default_latency_ms:
+                latency = default_latency_ms.get(choice.engine)
+            return self.latency_budget_ms is None or latency is None or latency <= self.latency_budget_ms
+
+        explore_slots = 0
+        if self.exploration > 0 and max_engines > 1:
+            explore_slots = max(1, int(round(max_engines * self.exploration)))
+
+        def worth_exploiting(choice: EngineChoice) -> bool:
+            if choice.error_rate > self.max_error_rate:
+                return False
+            return choice.runs < self.prior_weight or choice.expected_unique >= self.min_yield
+
+        exploitable = sorted(
+            (c for c in choices.values() if within_budget(c) and worth_exploiting(c)),
+            key=lambda c: (-c.expected_unique, c.engine),
+        )
+        selected = exploitable[:max_engines - explore_slots]
+        taken = {c.engine for c in selected}
+
+        # UCB-style bonus: engines with little evidence in this class get tried
+        total_runs = sum(c.runs for c in choices.values()) + 1.0
+        rest = [c for c in choices.values() if c.engine not in taken and within_budget(c)]
+        self.rng.shuffle(rest)
+        rest.sort(key=lambda c: -math.sqrt(math.log(total_runs + 1.0) / (c.runs + 1.0)))
+        for choice in rest[:explore_slots]:
+            choice.explored = True
+            selected.append(choice)
+        return selected
+
+
+# ─────────────────────────────────────────────────────────────
+# Outcome sources and offline replay
+# ─────────────────────────────────────────────────────────────
+
+def classify_error(error: Optional[str]) -> Optional[str]:
+    """Map an error message to the coarse types used by EngineAnalyticsCollector."""
+    if not error:
+        return None
+    text = str(error).lower()
+    if "timeout" in text or "timed out" in text:
+        return "timeout"
+    if "rate" in text or "429" in text:
+        return "rate_limit"
+    if "connection" in text or "network" in text:
+        return "network"
+    if "parse" in text or "json" in text:
+        return "parse"
+    return "other"
+
+
+def outcomes_from_analytics(collector: Any, qclass: str) -> List[EngineOutcome]:
+    """Outcomes from a finalized EngineAnalyticsCollector (BruteSearchEngine runs)."""
+    analytics = collector.finalize()
+    now = time.time()
+    return [
+        EngineOutcome(
+            query_class=qclass,
+            engine=code,
+            unique_results=m.unique_results,
+            raw_results=m.raw_results,
+            latency_ms=m.response_time_ms,
+            error=None if m.success else (m.error_type or "other"),
+            timestamp=now,
+        )
+        for code, m in analytics.engine_metrics.items()
+    ]
+
+
+def outcomes_from_execution(execution_result: Any, qclass: str) -> List[EngineOutcome]:
+    """
+    Outcomes from a CascadeExecutor ExecutionResult.
+
+    The executor deduplicates as results arrive, so an engine's result_count
+    is the number of URLs it contributed that no earlier engine had.
+    """
+    now = time.time()
+    outcomes = []
+    for wave in execution_result.wave_results:
+        for er in wave.engine_results:
+            outcomes.append(EngineOutcome(
+                query_class=qclass,
+                engine=er.engine_code,
+                unique_results=er.result_count if er.success else 0,
+                raw_results=er.result_count,
+                latency_ms=er.execution_time_ms,
+                error=None if er.success else classify_error(er.error) or "other",
+                timestamp=now,
+            ))
+    return outcomes
+
+
+def load_outcomes(path: str) -> Iterator[EngineOutcome]:
+    """Read outcomes from a JSONL file (one EngineOutcome dict per line)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield EngineOutcome(**json.loads(line))
+
+
+def save_outcomes(path: str, outcomes: Iterable[EngineOutcome]):
+    """Append outcomes to a JSONL file for later replay."""
+    with open(path, "a", encoding="utf-8") as f:
+        for outcome in outcomes:
+            f.write(json.dumps(asdict(outcome)) + "\n")
+
+
+def outcomes_from_analytics_db(db_path: str, analyzer: Optional[AxisAnalyzer] = None) -> Iterator[EngineOutcome]:
+    """Replay the engine_stats history written by EngineAnalyticsCollector.save_to_db()."""
+    from datetime import datetime
+
+    analyzer = analyzer or AxisAnalyzer()
+    classes: Dict[str, str] = {}
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT timestamp, query, engine_code, response_time_ms, raw_results, unique_results, "
+            "success, error_type FROM engine_stats ORDER BY timestamp"
+        ).fetchall()
+    for ts, query, engine, latency, raw, unique, success, error_type in rows:
+        if query not in classes:
+            classes[query] = query_class(analyzer.analyze(query or ""))
+        try:
+            when = datetime.fromisoformat(ts).timestamp()
+        except (TypeError, ValueError):
+            when = time.time()
+        yield EngineOutcome(
+            query_class=classes[query],
+            engine=engine,
+            unique_results=unique or 0,
+            raw_results=raw or 0,
+            latency_ms=latency or 0.0,
+            error=None if success else (error_type or "other"),
+            timestamp=when,
+        )
+
+
+def replay(outcomes: Iterable[EngineOutcome], store: Optional[EngineFeedbackStore] = None) -> EngineFeedbackStore:
+    """Feed recorded outcomes into a store (in-memory by default)."""
+    store = store or EngineFeedbackStore(db_path=":memory:")
+    store.record_many(sorted(outcomes, key=lambda o: o.timestamp))
+    return store
+
+
+def record_search_feedback(query: str, collector: Any, store: Optional[EngineFeedbackStore] = None) -> int:
+    """Record a finished BruteSearchEngine run's analytics; returns outcomes written."""
+    qclass = query_class(AxisAnalyzer().analyze(query))
+    own_store = store is None
+    store = store or EngineFeedbackStore()
+    try:
+        return store.record_many(outcomes_from_analytics(collector, qclass))
+    finally:
+        if own_store:
+            store.close()
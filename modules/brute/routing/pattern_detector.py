@@ -9,16 +9,81 @@ Pattern Categories:
 1. Pre-processors (handled before search): translation, handshake, variations
 2. Search type patterns: scraper, archive, domain, filetype, etc.
 3. Operator patterns: NOT, OR, proximity, language, etc.
+
+Detection is dispatched on literal triggers: every pattern is indexed by the
+literal text it requires, one pass over the query picks the pattern types
+that can possibly match, and only those get a real regex check, in priority
+order. Recent query -> pattern decisions are kept in a bounded LRU, so
+repeated queries from the API or bulk query files skip matching entirely.
 """
 
 import re
+import threading
+from collections import OrderedDict
 from typing import Tuple, List, Dict, Optional, Any
 
+try:
+    import re._parser as _sre_parse
+    import re._constants as _sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+    import sre_constants as _sre_constants
+
+DECISION_CACHE_SIZE = 4096  # Recent query -> (pattern_type, params) decisions
+
+# Direct forum operators, then contextual patterns (see _has_forum_pattern)
+FORUM_PATTERNS = [
+    r'forum:|discussion:|discussions:',
+    r'\breddit\b.*\b(discussion|post|comment|thread)\b',
+    r'\b(discussion|thread|post)\b.*\b(forum|reddit|board)\b',
+    r'\b(forum|community)\b.*\b(discussion|thread|post)\b',
+    r'\bforum\b',
+    r'\breddit\b',
+]
+
+
+def _required_literals(pattern: str) -> List[str]:
+    """
+    Lowercased ASCII literal runs that every match of ``pattern`` contains.
+
+    Conservative: alternations, optional parts, classes and lookarounds
+    contribute nothing, so a pattern may pass the check without matching,
+    but never the other way round. Unparseable patterns require nothing.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, re.IGNORECASE)
+    except Exception:
+        return []
+
+    repeats = {_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT}
+    if hasattr(_sre_constants, 'POSSESSIVE_REPEAT'):
+        repeats.add(_sre_constants.POSSESSIVE_REPEAT)
+
+    def walk(items) -> List[str]:
+        runs: List[str] = []
+        current: List[str] = []
+        for op, av in items:
+            if op is _sre_constants.LITERAL and av < 128:
+                current.append(chr(av).lower())
+                continue
+            if current:
+                runs.append(''.join(current))
+                current = []
+            if op is _sre_constants.SUBPATTERN:
+                runs.extend(walk(av[-1]))
+            elif op in repeats and av[0] >= 1:
+                runs.extend(walk(av[2]))
+        if current:
+            runs.append(''.join(current))
+        return runs
+
+    return walk(parsed)
+
 
 class PatternDetector:
     """Centralized pattern detection for all search operators and types."""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = DECISION_CACHE_SIZE):
         """Initialize all pattern definitions and priority order."""
         
         # All pattern definitions organized by category
@@ -512,6 +577,12 @@ class PatternDetector:
         # Compile regex patterns for efficiency
         self._compiled_patterns = {}
         self._compile_patterns()
+
+        # Literal-trigger dispatcher + decision cache
+        self.cache_size = cache_size
+        self._decisions: "OrderedDict[str, Tuple[str, Tuple[str, ...]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._build_dispatcher()
     
     def _compile_patterns(self):
         """Pre-compile all regex patterns for better performance."""
@@ -526,6 +597,74 @@ class PatternDetector:
             elif isinstance(patterns, str):
                 self._compiled_patterns[pattern_type] = re.compile(patterns, re.IGNORECASE)
     
+    def _build_dispatcher(self):
+        """
+        Index every pattern by the literal text it cannot match without.
+
+        Each pattern's required literal runs (e.g. ``site`` and ``:`` for
+        ``site\\s*:``) are read from the parsed regex and the pattern is keyed
+        by its longest run; patterns that need none (month names, IPs) are
+        always considered. At query time the keys are substring-tested once,
+        and only the surviving pattern types get a real regex check.
+        """
+        entries: List[Tuple[str, List[str]]] = []
+        for pattern in self.preprocessor_patterns.values():
+            entries.append(('@preprocessor', _required_literals(pattern)))
+
+        for pattern_type in self.priority_order:
+            if pattern_type == 'scraper':
+                sources = [r'^\?\?']
+            elif pattern_type == 'or_search':
+                sources = [r' / ', r' OR ']
+            elif pattern_type == 'forum':
+                sources = FORUM_PATTERNS
+            else:
+                patterns = self.patterns.get(pattern_type, [])
+                if isinstance(patterns, dict):
+                    sources = list(patterns.values())
+                elif isinstance(patterns, str):
+                    sources = [patterns]
+                else:
+                    sources = list(patterns)
+            for pattern in sources:
+                entries.append((pattern_type, _required_literals(pattern)))
+
+        # longest required run -> [(owner, other runs)]; owners with no run always pass
+        index: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+        always = set()
+        for owner, runs in entries:
+            if not runs:
+                always.add(owner)
+                continue
+            runs = sorted(set(runs), key=len, reverse=True)
+            index.setdefault(runs[0], []).append((owner, tuple(runs[1:])))
+        self._literal_index = list(index.items())
+        self._always = frozenset(always)
+
+    def _candidates(self, query: str) -> Optional[set]:
+        """Pattern types (plus '@preprocessor') that can possibly match; None = check all."""
+        if not query.isascii():
+            # Unicode case folding can match ASCII literals; skip the prefilter
+            return None
+        query_lower = query.lower()
+        found = set(self._always)
+        for key, owners in self._literal_index:
+            if key in query_lower:
+                for owner, rest in owners:
+                    if owner in found:
+                        continue
+                    for run in rest:
+                        if run not in query_lower:
+                            break
+                    else:
+                        found.add(owner)
+        return found
+
+    def clear_cache(self):
+        """Forget cached decisions (call after changing patterns)."""
+        with self._cache_lock:
+            self._decisions.clear()
+
     def detect_pattern(self, query: str) -> Tuple[str, List[str]]:
         """
         Detect the search pattern type and extract parameters.
@@ -536,29 +675,54 @@ class PatternDetector:
         Returns:
             Tuple of (pattern_type, parameters)
         """
+        with self._cache_lock:
+            cached = self._decisions.get(query)
+            if cached is not None:
+                self._decisions.move_to_end(query)
+                return cached[0], list(cached[1])
+
+        pattern_type, params = self._detect_pattern_sequential(query, self._candidates(query))
+
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._decisions[query] = (pattern_type, tuple(params))
+                if len(self._decisions) > self.cache_size:
+                    self._decisions.popitem(last=False)
+        return pattern_type, params
+
+    def _detect_pattern_sequential(self, query: str, candidates: Optional[set] = None) -> Tuple[str, List[str]]:
+        """
+        Walk the pattern types in priority order.
+
+        ``candidates`` (from _candidates) limits the regex checks to pattern
+        types that can possibly match; None checks every type.
+        """
+        def possible(pattern_type: str) -> bool:
+            return candidates is None or pattern_type in candidates
+
         # First check for preprocessors (they should not be main patterns)
-        preprocessor = self.check_preprocessor(query)
+        preprocessor = self.check_preprocessor(query) if possible('@preprocessor') else None
         if preprocessor and preprocessor[0] in ['translation', 'handshake', 'variations']:
             # These are handled by preprocessors, not main search
             # Return as exact_phrase for now
             return 'exact_phrase', [query]
         
         # Check NOT patterns before news detection
-        if self._check_pattern(query, 'not_search'):
+        if possible('not_search') and self._check_pattern(query, 'not_search'):
             return 'not_search', [query]
         
         # Check for news keywords early (before other patterns)
         if any(word in query.lower() for word in ['news', 'latest', 'breaking']):
             # But still check for higher priority patterns first
             for pattern_type in self.priority_order[:10]:  # Check first 10 high-priority patterns
-                result = self._check_pattern(query, pattern_type)
+                result = possible(pattern_type) and self._check_pattern(query, pattern_type)
                 if result:
                     return result
             return 'news', [query]
         
         # Check patterns in priority order
         for pattern_type in self.priority_order:
-            result = self._check_pattern(query, pattern_type)
+            result = possible(pattern_type) and self._check_pattern(query, pattern_type)
             if result:
                 return result
         
@@ -651,20 +815,8 @@ class PatternDetector:
         """Check for forum-related patterns."""
         query_lower = query.lower()
         
-        # Direct operators
-        if any(op in query_lower for op in ['forum:', 'discussion:', 'discussions:']):
-            return True
-        
-        # Contextual patterns
-        forum_patterns = [
-            r'\breddit\b.*\b(discussion|post|comment|thread)\b',
-            r'\b(discussion|thread|post)\b.*\b(forum|reddit|board)\b',
-            r'\b(forum|community)\b.*\b(discussion|thread|post)\b',
-            r'\bforum\b',
-            r'\breddit\b',
-        ]
-        
-        for pattern in forum_patterns:
+        # Direct operators, then contextual patterns
+        for pattern in FORUM_PATTERNS:
             if re.search(pattern, query_lower):
                 return True
         
@@ -11,6 +11,11 @@ Engine Selection Strategy:
 3. Apply interaction rules for axis combinations
 4. Score and rank engines by relevance
 5. Return optimal subset (10-15 engines)
+
+With an EngineFeedbackStore attached, step 5 is learned: recorded per-engine
+unique yield, latency and errors for the query's class drive a budget-aware
+explore/exploit selection (see engine_feedback.py), with the static scores
+as the prior.
 """
 from __future__ import annotations
 
@@ -27,6 +32,12 @@ try:
         ObjectOperator,
         TemporalContext,
     )
+    from .engine_feedback import (
+        EngineFeedbackStore,
+        EngineOutcome,
+        EngineSelectionPolicy,
+        query_class,
+    )
 except ImportError:
     from axis_analyzer import (
         AxisAnalyzer,
@@ -36,6 +47,12 @@ except ImportError:
         ObjectOperator,
         TemporalContext,
     )
+    from engine_feedback import (
+        EngineFeedbackStore,
+        EngineOutcome,
+        EngineSelectionPolicy,
+        query_class,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +76,7 @@ class QueryAnalysis:
     axis_analysis: AxisAnalysis
     detected_intent: str  # 'discovery', 'lookup', 'verification', 'research'
     complexity_score: float  # 0-1, how complex is this query
+    query_class: str = ""  # Key for learned engine statistics
 
 
 @dataclass
@@ -202,11 +220,21 @@ class QueryRouter:
         'very_slow': 180000,  # 180s
     }
 
+    # Max engines per tier, by performance mode
+    TIER_LIMITS: Dict[str, Dict[str, int]] = {
+        'speed': {'lightning': 6, 'fast': 4, 'standard': 2, 'slow': 0, 'very_slow': 0},
+        'balanced': {'lightning': 5, 'fast': 5, 'standard': 3, 'slow': 1, 'very_slow': 1},
+        'comprehensive': {'lightning': 4, 'fast': 5, 'standard': 4, 'slow': 2, 'very_slow': 2},
+    }
+
     def __init__(
         self,
         max_engines: int = 15,
         min_engines: int = 5,
-        performance_mode: str = 'balanced'
+        performance_mode: str = 'balanced',
+        feedback: Optional[EngineFeedbackStore] = None,
+        policy: Optional[EngineSelectionPolicy] = None,
+        latency_budget_ms: Optional[int] = None
     ):
         """
         Initialize query router.
@@ -215,11 +243,18 @@ class QueryRouter:
             max_engines: Maximum engines to recommend (default 15)
             min_engines: Minimum engines to recommend (default 5)
             performance_mode: 'speed', 'balanced', or 'comprehensive'
+            feedback: Optional outcome store; enables learned selection
+            policy: Explore/exploit policy (default EngineSelectionPolicy)
+            latency_budget_ms: Leave out engines expected to take longer
         """
         self.max_engines = max_engines
         self.min_engines = min_engines
         self.performance_mode = performance_mode
         self.axis_analyzer = AxisAnalyzer()
+        self.feedback = feedback
+        self.policy = policy or EngineSelectionPolicy(latency_budget_ms=latency_budget_ms)
+        if latency_budget_ms is not None:
+            self.policy.latency_budget_ms = latency_budget_ms
 
     def route(self, query: str) -> EngineRecommendation:
         """
@@ -243,14 +278,18 @@ class QueryRouter:
             cleaned_query=axis_analysis.cleaned_query,
             axis_analysis=axis_analysis,
             detected_intent=intent,
-            complexity_score=complexity
+            complexity_score=complexity,
+            query_class=query_class(axis_analysis)
         )
 
         # Score engines
         engine_scores = self._score_engines(axis_analysis)
 
-        # Select engines
-        selected = self._select_engines(engine_scores, axis_analysis)
+        # Select engines (learned when outcome feedback is available)
+        if self.feedback is not None:
+            selected = self._select_with_feedback(engine_scores, query_analysis.query_class)
+        else:
+            selected = self._select_engines(engine_scores, axis_analysis)
 
         # Build recommendation
         recommendation = self._build_recommendation(
@@ -371,13 +410,7 @@ class QueryRouter:
             'lightning': 0, 'fast': 0, 'standard': 0, 'slow': 0, 'very_slow': 0
         }
 
-        # Tier limits based on performance mode
-        tier_limits = {
-            'speed': {'lightning': 6, 'fast': 4, 'standard': 2, 'slow': 0, 'very_slow': 0},
-            'balanced': {'lightning': 5, 'fast': 5, 'standard': 3, 'slow': 1, 'very_slow': 1},
-            'comprehensive': {'lightning': 4, 'fast': 5, 'standard': 4, 'slow': 2, 'very_slow': 2},
-        }
-        limits = tier_limits.get(self.performance_mode, tier_limits['balanced'])
+        limits = self._tier_limits()
 
         for code, score in sorted_engines:
             if len(selected) >= self.max_engines:
@@ -407,6 +440,83 @@ class QueryRouter:
 
         return selected
 
+    def _tier_limits(self) -> Dict[str, int]:
+        return self.TIER_LIMITS.get(self.performance_mode, self.TIER_LIMITS['balanced'])
+
+    def _select_with_feedback(self, scores: Dict[str, float], qclass: str) -> List[str]:
+        """
+        Select engines from recorded outcomes for this query class.
+
+        The policy only ranks; the performance mode's tier limits and the
+        latency budget still apply to what it picks and to the min_engines
+        fallback.
+        """
+        limits = self._tier_limits()
+        priors = {
+            code: score for code, score in scores.items()
+            if score > 0 and not self.ENGINE_TAGS[code].disabled
+            and limits[self.ENGINE_TAGS[code].tier] > 0
+        }
+        stats = self.feedback.stats(qclass)
+        # Before an engine has latency data, assume its tier timeout
+        default_latency = {code: self.TIER_TIMEOUTS.get(self.ENGINE_TAGS[code].tier) for code in priors}
+        choices = self.policy.select(
+            priors,
+            stats,
+            self.max_engines,
+            half_life=self.feedback.half_life,
+            default_latency_ms=default_latency,
+        )
+
+        selected: List[str] = []
+        selected_tiers = {tier: 0 for tier in limits}
+
+        def admit(code: str) -> bool:
+            engine = self.ENGINE_TAGS.get(code)
+            if not engine or engine.disabled or code in selected:
+                return False
+            if len(selected) >= self.max_engines or selected_tiers[engine.tier] >= limits[engine.tier]:
+                return False
+            budget = self.policy.latency_budget_ms
+            if budget is not None:
+                s = stats.get(code)
+                latency = s.median_latency() if s else None
+                if latency is None:
+                    latency = self.TIER_TIMEOUTS.get(engine.tier)
+                if latency is not None and latency > budget:
+                    return False
+            selected.append(code)
+            selected_tiers[engine.tier] += 1
+            return True
+
+        for choice in choices:
+            admit(choice.engine)
+
+        if len(selected) < self.min_engines:
+            general_fallback = ['GO', 'BI', 'DD', 'BR', 'YA', 'EX']
+            for code in general_fallback:
+                if len(selected) >= self.min_engines:
+                    break
+                admit(code)
+
+        logger.debug(
+            "Feedback selection for %s: %s",
+            qclass, ', '.join(f"{c.engine}{'*' if c.explored else ''}={c.expected_unique:.1f}" for c in choices)
+        )
+        return selected
+
+    def classify(self, query: str) -> str:
+        """Query class used to key engine feedback."""
+        return query_class(self.axis_analyzer.analyze(query))
+
+    def record_outcomes(self, outcomes: List[EngineOutcome]) -> int:
+        """Feed completed-search outcomes back into the router's store."""
+        if self.feedback is None:
+            return 0
+        count = self.feedback.record_many(outcomes)
+        self.feedback.flush()
+        return count
+
     def _build_recommendation(
         self,
         query_analysis: QueryAnalysis,
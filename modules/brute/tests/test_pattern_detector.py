@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Tests for PatternDetector's literal-trigger dispatch and decision cache."""
+
+import random
+
+import pytest
+
+from modules.brute.routing.pattern_detector import PatternDetector
+
+QUERIES = [
+    "John Smith London",
+    "site:example.com fraud",
+    "?? https://example.com",
+    "filetype:pdf annual report",
+    "latest news on climate policy",
+    "breaking news site:bbc.co.uk",
+    "john@example.com",
+    "+44 20 7946 0958",
+    "192.168.1.1",
+    "Acme Ltd NOT Acme Inc",
+    "tesla / spacex",
+    "tesla OR spacex",
+    "reddit discussion about vpn",
+    "forum: crypto scams",
+    "linkedin.com/in/janedoe",
+    "\"exact phrase\" 2019",
+    "Müller GmbH Zürich",
+    "",
+    # One per operator syntax the random mix rarely hits
+    "crgb?",
+    "john@example.com?",
+    "+447700900123?",
+    "https://www.linkedin.com/in/jane-doe?",
+    "whois!:example.com",
+    "2019! :example.com",
+    "bl!:?example.com",
+    "ol! :<- 2019?",
+    "p! :<- 2019?",
+    "alldom:example.com",
+    "crypto:bc1qxy2kgdygjrsqtzq2n0yrf2493p83kkfjhx0wlh",
+    "[beneficial owner]",
+    "related:example.com",
+    "similar:https://example.com",
+    "reverse!:https://example.com/a.jpg",
+    "\"acme\"",
+    "\"acme ltd\" :example.com",
+    "\"acme ltd\" :example.com?",
+]
+FILLER = ["john", "smith", "acme", "ltd", "report", "2021", "march", "the", "and", "http://", ".com", "@", ":", "/", "!", "?"]
+
+
+def _random_queries(detector, n, seed):
+    """Queries mixing the dispatcher's literal triggers with filler, punctuation and case."""
+    rng = random.Random(seed)
+    vocab = [key for key, _ in detector._literal_index] + FILLER
+    for _ in range(n):
+        words = [rng.choice(vocab) for _ in range(rng.randint(1, 5))]
+        sep = rng.choice([" ", "", ": ", " / "])
+        query = sep.join(words)
+        yield query.upper() if rng.random() < 0.2 else query
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_dispatch_matches_the_sequential_walk(seed):
+    detector = PatternDetector(cache_size=0)
+    for query in QUERIES + list(_random_queries(detector, 3000, seed)):
+        assert detector.detect_pattern(query) == detector._detect_pattern_sequential(query), query
+
+
+def test_decisions_are_cached_and_bounded(monkeypatch):
+    detector = PatternDetector(cache_size=2)
+    walks = []
+    real_walk = detector._detect_pattern_sequential
+
+    def counting_walk(query, candidates=None):
+        walks.append(query)
+        return real_walk(query, candidates)
+
+    monkeypatch.setattr(detector, "_detect_pattern_sequential", counting_walk)
+    first = detector.detect_pattern("site:example.com fraud")
+    first[1].append("mutated")
+    assert detector.detect_pattern("site:example.com fraud") == ("site", ["site:example.com fraud"])
+    assert walks == ["site:example.com fraud"]
+
+    detector.detect_pattern("John Smith London")
+    detector.detect_pattern("filetype:pdf annual report")
+    detector.detect_pattern("site:example.com fraud")
+    assert walks.count("site:example.com fraud") == 2
+
+    detector.clear_cache()
+    detector.detect_pattern("filetype:pdf annual report")
+    assert walks.count("filetype:pdf annual report") == 2
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Tests for QueryRouter's learned (feedback) engine selection."""
+
+import random
+
+import pytest
+
+from modules.brute.routing.engine_feedback import (
+    EngineFeedbackStore,
+    EngineOutcome,
+    EngineSelectionPolicy,
+)
+from modules.brute.routing.query_router import EngineTag, QueryRouter
+
+QUERIES = [
+    "John Smith London",
+    "machine learning research papers 2024",
+    "Acme Ltd annual report filetype:pdf",
+    "latest news on climate policy",
+]
+
+
+def _router(mode="balanced", budget=None, seed=0, **kwargs):
+    store = EngineFeedbackStore(db_path=":memory:")
+    policy = EngineSelectionPolicy(rng=random.Random(seed), latency_budget_ms=budget)
+    return QueryRouter(performance_mode=mode, feedback=store, policy=policy, **kwargs)
+
+
+@pytest.mark.parametrize("mode", ["speed", "balanced", "comprehensive"])
+def test_feedback_selection_respects_tier_limits(mode):
+    limits = QueryRouter.TIER_LIMITS[mode]
+    for seed in range(20):
+        router = _router(mode, seed=seed)
+        for query in QUERIES:
+            rec = router.route(query)
+            for tier, codes in rec.tier_breakdown.items():
+                assert len(codes) <= limits[tier], (query, tier, codes)
+            if mode == "speed":
+                assert rec.estimated_time_ms <= QueryRouter.TIER_TIMEOUTS["standard"]
+
+
+def test_learned_yield_cannot_bring_in_slow_engines_in_speed_mode():
+    router = _router("speed")
+    qclass = router.classify("John Smith London")
+    router.record_outcomes([
+        EngineOutcome(qclass, code, unique_results=500, latency_ms=2000)
+        for code in ("YE", "LG", "HF")
+        for _ in range(5)
+    ])
+    rec = router.route("John Smith London")
+    assert not {"YE", "LG", "HF"} & set(rec.recommended_engines)
+
+
+def test_fallback_skips_disabled_and_over_budget_engines(monkeypatch):
+    monkeypatch.setitem(
+        QueryRouter.ENGINE_TAGS, "BI",
+        EngineTag("BI", "Bing", {"general", "web"}, "lightning", 0.97, disabled=True),
+    )
+    # Only lightning engines (30s tier timeout) fit a 45s budget
+    router = _router("balanced", budget=45000, min_engines=40)
+    qclass = router.classify("John Smith London")
+    router.record_outcomes([EngineOutcome(qclass, "DD", unique_results=10, latency_ms=60000)])
+
+    selected = router.route("John Smith London").recommended_engines
+    assert selected
+    assert "BI" not in selected and "DD" not in selected
+    assert all(QueryRouter.ENGINE_TAGS[code].tier == "lightning" for code in selected)
+
+
+def test_learned_routing_is_opt_in():
+    from modules.brute.brute_optimal import BruteSearchOptimal
+    assert BruteSearchOptimal().router.feedback is None
@@ -179,3 +179,35 @@ DEDUP_DB_PATH = PROJECT_ROOT / "BACKEND" / "modules" / "JESTER" / "MAPPER" / "da
 
 # In-memory dedup threshold (switch to SQLite above this)
 DEDUP_MEMORY_THRESHOLD = 10000
+
+
+# =============================================================================
+# ARCHIVE VERIFICATION
+# =============================================================================
+
+# Concurrent HEAD checks for archive-discovered URLs (total / per host)
+VERIFY_CONCURRENCY = 50
+VERIFY_PER_HOST = 4
+
+# How long a verified status (url -> exists/status) is trusted across runs
+VERIFY_CACHE_TTL = 7 * 24 * 3600
+
+# Yield order with verification on:
+#   "priority"  - strict source-priority/arrival order (verification waits in line)
+#   "completed" - first-verified-first-out
+VERIFY_ORDER = "priority"
+
+
+# =============================================================================
+# DISCOVERY STORE
+# =============================================================================
+
+# A domain is served from disk (no source queried) if every active source
+# completed a run within this window. Older runs trigger an incremental
+# remap (sources accepting `since`) or a full re-query (everything else).
+DISCOVERY_CACHE_TTL = 24 * 3600
+
+# Incremental remaps only see what a source dates after the last run, and
+# providers cap result counts, so pages missed once would stay missed. After
+# this long since a source's last full run it is re-queried in full again.
+DISCOVERY_FULL_REFRESH = 7 * 24 * 3600
@@ -0,0 +1,335 @@
+"""
+JESTER MAPPER - Persistent Discovery Store
+===========================================
+
+Everything a mapping run discovers, kept on disk per domain:
+
+    urls         - one row per (domain, url) with first/last seen and the
+                   DiscoveredURL metadata (JSON)
+    url_sources  - which discovery sources produced each URL, and when
+    source_runs  - when each source last completed a run for a domain, and
+                   when it last completed a full (non-incremental) one
+
+This replaces the in-memory ResultCache / seen-set / collected list:
+
+    - Dedup is an indexed lookup plus a small write buffer, so memory stays
+      constant regardless of domain size
+    - Cache hits (every source ran recently) stream rows back from disk in
+      keyset-paginated batches
+    - Sources that accept a `since` argument are re-queried only for what is
+      new since their last completed run; their older URLs are replayed from
+      the store
+    - Thread-safe; Mapper makes every call on a worker thread (record_many
+      once per drained queue batch, aiter_urls one page per call), so
+      SQLite I/O never runs on the event loop
+
+Usage:
+    store = DiscoveryStore(cache_dir / "discovery.db")
+    run_id = store.begin_run()
+    is_new = store.record("example.com", item, via="sitemap", run_id=run_id)
+    new = store.record_many("example.com", [(item, "sitemap"), ...], run_id)
+    store.complete_source("example.com", "sitemap", started_at, count)
+    for item in store.iter_urls("example.com", sources=["sitemap"]):
+        ...
+    async for item in store.aiter_urls("example.com", sources=["sitemap"]):
+        ...
+    store.close()
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import fields
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .models import DiscoveredURL
+
+logger = logging.getLogger(__name__)
+
+# Per-run verification results are not discovery data
+_TRANSIENT_FIELDS = {"current_exists", "current_status", "current_checked_at"}
+_URL_FIELDS = {f.name for f in fields(DiscoveredURL)}
+_LOOKUP_CHUNK = 500  # URLs per seen_run lookup (below SQLite's variable limit)
+
+
+def _dump(item: DiscoveredURL) -> str:
+    data = {k: getattr(item, k) for k in _URL_FIELDS - _TRANSIENT_FIELDS}
+    return json.dumps(data, default=str)
+
+
+def _load(data: str) -> DiscoveredURL:
+    values = json.loads(data)
+    return DiscoveredURL(**{k: v for k, v in values.items() if k in _URL_FIELDS})
+
+
+class DiscoveryStore:
+    """SQLite-backed per-domain URL discovery history (WAL, batched writes, thread-safe)."""
+
+    def __init__(self, db_path: Path, batch_size: int = 500):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        # (domain, url) -> (item, run_id, {via sources}) waiting to be written
+        self._pending: Dict[Tuple[str, str], Tuple[DiscoveredURL, str, set]] = {}
+        # Concurrent mapping runs share the file; wait on their write locks
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                id INTEGER PRIMARY KEY,
+                domain TEXT NOT NULL,
+                url TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                seen_run TEXT,
+                data TEXT NOT NULL,
+                UNIQUE (domain, url)
+            );
+            CREATE TABLE IF NOT EXISTS url_sources (
+                url_id INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (url_id, source)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_url_sources_source ON url_sources(source, url_id);
+            CREATE TABLE IF NOT EXISTS source_runs (
+                domain TEXT NOT NULL,
+                source TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                completed_at REAL NOT NULL,
+                url_count INTEGER NOT NULL,
+                full_at REAL,
+                PRIMARY KEY (domain, source)
+            );
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(source_runs)")}
+        if "full_at" not in columns:
+            self._conn.execute("ALTER TABLE source_runs ADD COLUMN full_at REAL")
+        self._conn.commit()
+
+    @staticmethod
+    def begin_run() -> str:
+        """Token marking URLs already emitted by the current mapping run."""
+        return uuid.uuid4().hex
+
+    # ─────────────────────────────────────────────────────────────
+    # Source runs
+    # ─────────────────────────────────────────────────────────────
+
+    def last_runs(self, domain: str) -> Dict[str, Tuple[float, float, Optional[float]]]:
+        """
+        source -> (started_at, completed_at, full_at) of its last complete run.
+
+        full_at is the start of the last full run (None if the source has
+        only ever run incrementally, e.g. in a store created before it was
+        tracked).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, started_at, completed_at, full_at FROM source_runs WHERE domain = ?", (domain,)
+            ).fetchall()
+        return {source: (started, completed, full_at) for source, started, completed, full_at in rows}
+
+    def complete_source(
+        self, domain: str, source: str, started_at: float, url_count: int, full: bool = True
+    ):
+        """Record that `source` finished a full (or, with full=False, incremental) run for `domain`."""
+        with self._lock:
+            self._flush()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO source_runs (domain, source, started_at, completed_at, url_count, full_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(domain, source) DO UPDATE SET "
+                    "started_at = excluded.started_at, completed_at = excluded.completed_at, "
+                    "url_count = excluded.url_count, full_at = COALESCE(excluded.full_at, source_runs.full_at)",
+                    (domain, source, started_at, time.time(), url_count, started_at if full else None),
+                )
+
+    # ─────────────────────────────────────────────────────────────
+    # URLs
+    # ─────────────────────────────────────────────────────────────
+
+    def record(self, domain: str, item: DiscoveredURL, via: Optional[str], run_id: str) -> bool:
+        """
+        Store a discovered URL (and the source `via` that produced it).
+
+        Returns True the first time the URL is seen in run `run_id`, i.e.
+        when the caller should emit it. `via=None` replays a stored row
+        without attributing it to a source again.
+        """
+        return self.record_many(domain, [(item, via)], run_id)[0]
+
+    def record_many(
+        self, domain: str, entries: List[Tuple[DiscoveredURL, Optional[str]]], run_id: str
+    ) -> List[bool]:
+        """
+        record() for several (item, via) pairs, in order.
+
+        URLs not already buffered are looked up with one query per
+        _LOOKUP_CHUNK URLs instead of one per URL.
+        """
+        with self._lock:
+            missing = list({item.url for item, _ in entries if (domain, item.url) not in self._pending})
+            seen_runs: Dict[str, Optional[str]] = {}
+            for offset in range(0, len(missing), _LOOKUP_CHUNK):
+                chunk = missing[offset:offset + _LOOKUP_CHUNK]
+                seen_runs.update(self._conn.execute(
+                    f"SELECT url, seen_run FROM urls WHERE domain = ? AND url IN ({','.join('?' * len(chunk))})",
+                    (domain, *chunk),
+                ).fetchall())
+
+            results = []
+            for item, via in entries:
+                key = (domain, item.url)
+                pending = self._pending.get(key)
+                if pending is not None:
+                    if via:
+                        pending[2].add(via)
+                    results.append(pending[1] != run_id)
+                    self._pending[key] = (pending[0], run_id, pending[2])
+                    continue
+                results.append(seen_runs.get(item.url) != run_id)
+                self._pending[key] = (item, run_id, {via} if via else set())
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            return results
+
+    def flush(self):
+        """Write buffered URL records."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        now = time.time()
+        url_rows = []
+        source_rows = []
+        for (domain, url), (item, run_id, sources) in pending.items():
+            url_rows.append((domain, url, now, now, run_id, _dump(item)))
+            for source in sources:
+                source_rows.append((source, now, now, domain, url))
+        with self._conn:
+            # Metadata of the first sighting is kept; later runs refresh last_seen
+            self._conn.executemany("""
+                INSERT INTO urls (domain, url, first_seen, last_seen, seen_run, data)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(domain, url) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    seen_run = excluded.seen_run
+            """, url_rows)
+            self._conn.executemany("""
+                INSERT INTO url_sources (url_id, source, first_seen, last_seen)
+                SELECT id, ?, ?, ? FROM urls WHERE domain = ? AND url = ?
+                ON CONFLICT(url_id, source) DO UPDATE SET last_seen = excluded.last_seen
+            """, source_rows)
+
+    def iter_urls(
+        self,
+        domain: str,
+        sources: Optional[Iterable[str]] = None,
+        batch: int = 1000,
+    ) -> Iterator[Tuple[DiscoveredURL, List[str]]]:
+        """
+        Stream stored (DiscoveredURL, sources) for a domain from disk.
+
+        Keyset-paginated on rowid and bounded by the max id at call time, so
+        rows added while iterating (by the same run) are not replayed.
+        """
+        source_list = list(sources) if sources is not None else None
+        if source_list is not None and not source_list:
+            return
+        max_id = self._max_id(domain)
+        last_id = 0
+        while True:
+            page, last_id = self._page(domain, source_list, last_id, max_id, batch)
+            if not page:
+                return
+            yield from page
+
+    async def aiter_urls(
+        self,
+        domain: str,
+        sources: Optional[Iterable[str]] = None,
+        batch: int = 1000,
+    ) -> AsyncIterator[Tuple[DiscoveredURL, List[str]]]:
+        """iter_urls() for the event loop: each page is read on a worker thread."""
+        source_list = list(sources) if sources is not None else None
+        if source_list is not None and not source_list:
+            return
+        max_id = await asyncio.to_thread(self._max_id, domain)
+        last_id = 0
+        while True:
+            page, last_id = await asyncio.to_thread(self._page, domain, source_list, last_id, max_id, batch)
+            if not page:
+                return
+            for entry in page:
+                yield entry
+
+    def _max_id(self, domain: str) -> int:
+        """Flush, then the highest row id of a domain (the end of an iteration)."""
+        with self._lock:
+            self._flush()
+            (max_id,) = self._conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM urls WHERE domain = ?", (domain,)
+            ).fetchone()
+        return max_id
+
+    def _page(
+        self,
+        domain: str,
+        source_list: Optional[List[str]],
+        last_id: int,
+        max_id: int,
+        batch: int,
+    ) -> Tuple[List[Tuple[DiscoveredURL, List[str]]], int]:
+        """One keyset page after `last_id`: ([(item, sources)], id to continue from)."""
+        source_filter = ""
+        params_tail: Tuple = ()
+        if source_list is not None:
+            marks = ",".join("?" * len(source_list))
+            source_filter = f" AND id IN (SELECT url_id FROM url_sources WHERE source IN ({marks}))"
+            params_tail = tuple(source_list)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, data, (SELECT group_concat(source) FROM url_sources WHERE url_id = urls.id) "
+                f"FROM urls WHERE domain = ? AND id > ? AND id <= ?{source_filter} "
+                f"ORDER BY id LIMIT ?",
+                (domain, last_id, max_id) + params_tail + (batch,),
+            ).fetchall()
+        page = [(_load(data), url_sources.split(",") if url_sources else []) for _, data, url_sources in rows]
+        return page, rows[-1][0] if rows else last_id
+
+    def count(self, domain: str) -> int:
+        with self._lock:
+            self._flush()
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM urls WHERE domain = ?", (domain,)).fetchone()
+        return n
+
+    def forget(self, domain: str):
+        """Drop everything stored for a domain."""
+        with self._lock, self._conn:
+            self._pending = {k: v for k, v in self._pending.items() if k[0] != domain}
+            self._conn.execute(
+                "DELETE FROM url_sources WHERE url_id IN (SELECT id FROM urls WHERE domain = ?)", (domain,)
+            )
+            self._conn.execute("DELETE FROM urls WHERE domain = ?", (domain,))
+            self._conn.execute("DELETE FROM source_runs WHERE domain = ?", (domain,))
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                self._conn.close()
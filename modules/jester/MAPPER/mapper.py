@@ -8,10 +8,12 @@ Consolidates 17+ discovery methods with high-performance async execution.
 Performance Optimizations:
     - Shared httpx client with HTTP/2 multiplexing
     - Connection pooling (100 concurrent, 10 per host)
-    - In-memory dedup for small jobs, batch SQLite for large
+    - Persistent per-domain discovery store (SQLite): constant-memory dedup,
+      cache hits streamed from disk, incremental remaps via `since`
     - Bounded priority queue (fast sources first)
     - Adaptive rate limiting per API
     - DNS pre-caching
+    - Concurrent archive verification (per-host limits, persistent status cache)
 
 Two Modes:
     THOROUGH (default) - All sources, fast ones stream first
@@ -43,11 +45,13 @@ Source Categories:
 
 import asyncio
 import heapq
+import inspect
 import logging
+import time
 import sqlite3
 import tempfile
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import AsyncGenerator, Set, List, Optional, Dict, Any, Tuple
 
@@ -69,7 +73,14 @@ from .config import (
     THOROUGH_SOURCES,
     FREE_SOURCES,
     TIMEOUTS,
+    VERIFY_CONCURRENCY,
+    VERIFY_PER_HOST,
+    VERIFY_ORDER,
+    DISCOVERY_CACHE_TTL,
+    DISCOVERY_FULL_REFRESH,
 )
+from .discovery_store import DiscoveryStore
+from .verifier import ArchiveVerifier, VerificationCache
 
 # Source modules
 from .sources.subdomains import SubdomainDiscovery
@@ -92,32 +103,7 @@ class PriorityItem:
     """Wrapper for priority queue - fast sources (priority=1) processed first."""
     priority: int
     url: DiscoveredURL = field(compare=False)
-
-
-# =============================================================================
-# RESULT CACHE
-# =============================================================================
-
-class ResultCache:
-    """Cache domain results for 5 minutes to avoid duplicate work."""
-
-    def __init__(self, ttl_seconds: int = 300):
-        self._cache: Dict[str, Tuple[datetime, List[DiscoveredURL]]] = {}
-        self._ttl = timedelta(seconds=ttl_seconds)
-
-    def get(self, domain: str, fast: bool) -> Optional[List[DiscoveredURL]]:
-        key = f"{domain}:{'fast' if fast else 'thorough'}"
-        if key in self._cache:
-            timestamp, results = self._cache[key]
-            if datetime.now() - timestamp < self._ttl:
-                logger.info(f"[MAPPER] Cache hit for {domain}")
-                return results
-            del self._cache[key]
-        return None
-
-    def set(self, domain: str, fast: bool, results: List[DiscoveredURL]):
-        key = f"{domain}:{'fast' if fast else 'thorough'}"
-        self._cache[key] = (datetime.now(), results)
+    source: Optional[str] = field(default=None, compare=False)  # Producing source (None = replayed from store)
 
 
 # =============================================================================
@@ -155,11 +141,10 @@ class Mapper:
     - Shared HTTP client with connection pooling
     - Priority queue for fast-first streaming
     - Adaptive rate limiting
-    - In-memory or batch SQLite deduplication
+    - Persistent discovery store (dedup, cache hits, incremental remaps)
     """
 
-    # Class-level cache shared across instances
-    _result_cache = ResultCache()
+    # Class-level rate limiter shared across instances
     _rate_limiter = AdaptiveRateLimiter()
 
     def __init__(self, cache_dir: Optional[Path] = None):
@@ -167,7 +152,8 @@ class Mapper:
         Initialize the Mapper.
 
         Args:
-            cache_dir: Optional directory for SQLite deduplication cache
+            cache_dir: Optional directory for the discovery store
+                (discovery.db) and verification cache (url_status.db)
         """
         self.cache_dir = cache_dir or Path(tempfile.gettempdir()) / "jester_mapper"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -321,6 +307,7 @@ class Mapper:
         client: Any,
         archive_mode: str,
         verify_archives: bool,
+        verifier: Optional[ArchiveVerifier] = None,
     ) -> Optional[DiscoveredURL]:
         """
         Verify URL existence and apply archive_mode filtering.
@@ -339,7 +326,12 @@ class Mapper:
             return item
 
         # Archived URL - needs verification if enabled
-        if verify_archives:
+        if verify_archives and verifier is not None:
+            exists, status, checked_at = await verifier.verify(item.url)
+            item.current_exists = exists
+            item.current_status = status
+            item.current_checked_at = checked_at
+        elif verify_archives:
             exists, status = await self._verify_url_exists(item.url, client)
             item.current_exists = exists
             item.current_status = status
@@ -378,6 +370,10 @@ class Mapper:
         archive_mode: str = "both",
         verify_archives: bool = True,
         search_query: Optional[str] = None,
+        verify_order: str = VERIFY_ORDER,
+        verify_concurrency: int = VERIFY_CONCURRENCY,
+        verify_per_host: int = VERIFY_PER_HOST,
+        refresh: bool = False,
     ) -> AsyncGenerator[DiscoveredURL, None]:
         """
         Discover all URLs for a domain.
@@ -400,6 +396,24 @@ class Mapper:
                 Even with archive_mode="current_only", archives are used for discovery,
                 then verification confirms which URLs still exist.
             search_query: Optional text to filter links (Firecrawl only)
+            verify_order: Yield order while archive URLs are being verified
+                - priority (default): strict source-priority/arrival order
+                - completed: first-verified-first-out (live sources never wait)
+            verify_concurrency: Max concurrent verification requests
+            verify_per_host: Max concurrent verification requests per host
+            refresh: Ignore the discovery store's source runs and re-query
+                every source in full (stored URLs are still deduplicated)
+
+        Results are persisted per domain. If every active source completed a
+        run within DISCOVERY_CACHE_TTL, URLs are streamed from disk. Otherwise
+        sources that accept `since` are only asked for what is new since
+        their last run (their older URLs are replayed from the store), and
+        the rest are re-queried in full. Every source is re-queried in full
+        at least once per DISCOVERY_FULL_REFRESH. Store I/O runs on worker
+        threads, never on the event loop.
+
+        Only Brave currently accepts `since`; the archive sources (Wayback,
+        Common Crawl) are still re-queried in full on every remap.
 
         Yields:
             DiscoveredURL objects as they're discovered (fast sources first)
@@ -420,14 +434,6 @@ class Mapper:
         domain = self._normalize_domain(domain)
         logger.info(f"[MAPPER] Starting discovery for: {domain}")
 
-        # Check result cache (5-minute TTL)
-        cached = self._result_cache.get(domain, fast)
-        if cached:
-            logger.info(f"[MAPPER] Returning {len(cached)} cached results")
-            for url in cached:
-                yield url
-            return
-
         # Determine which sources to use
         if sources:
             active_sources = sources
@@ -444,44 +450,66 @@ class Mapper:
 
         logger.info(f"[MAPPER] Using {len(active_sources)} sources: {active_sources}")
 
-        # Pre-cache DNS for all API hosts
-        await self._precache_dns()
-
-        # Ensure we have a client
-        client = await self._get_client()
-
-        # In-memory dedup set (fast for typical jobs <50K URLs)
-        seen: Set[str] = set()
-
-        # For large jobs, batch SQLite writes
-        BATCH_SIZE = 100
-        pending_batch: List[str] = []
-        db_conn: Optional[sqlite3.Connection] = None
+        # Persistent discovery store: dedup + what each source found last time
+        store = await asyncio.to_thread(DiscoveryStore, self.cache_dir / "discovery.db")
+        run_id = store.begin_run()
+        now = time.time()
+        last_runs = {} if refresh else await asyncio.to_thread(store.last_runs, domain)
+        known_sources = [s for s in active_sources if s in self._source_map]
+        cache_hit = bool(known_sources) and all(
+            s in last_runs and now - last_runs[s][1] < DISCOVERY_CACHE_TTL
+            for s in known_sources
+        )
+        if cache_hit:
+            logger.info(f"[MAPPER] Cache hit for {domain}: streaming stored URLs")
 
         url_count = 0
-        collected_urls: List[DiscoveredURL] = []  # For caching
 
         try:
+            # Pre-cache DNS for all API hosts (only if something will be fetched)
+            if not cache_hit:
+                await self._precache_dns()
+
+            # Ensure we have a client
+            client = await self._get_client()
+
             # Create generators for each active source
             generators = []
-            for source_name in active_sources:
+            replay_sources: List[str] = list(known_sources) if cache_hit else []
+            incremental: Set[str] = set()
+            for source_name in ([] if cache_hit else active_sources):
                 if source_name in self._source_map:
                     gen_func = self._source_map[source_name]
                     priority = SOURCE_PRIORITY.get(source_name, 10)
-                    
+
+                    # Incremental: sources with a date filter only fetch what's new
+                    extra: Dict[str, Any] = {}
+                    last_full = last_runs.get(source_name, (0, 0, None))[2]
+                    if (
+                        last_full is not None
+                        and now - last_full < DISCOVERY_FULL_REFRESH
+                        and "since" in inspect.signature(gen_func).parameters
+                    ):
+                        extra["since"] = last_runs[source_name][0]
+                        replay_sources.append(source_name)
+                        incremental.add(source_name)
+
+
                     # Special handling for Firecrawl to pass advanced params
                     if source_name == "firecrawl_map":
                         gen = gen_func(
                             domain, 
                             include_subdomains=include_subdomains, 
                             limit=max_urls if max_urls else 100000,
-                            search=search_query
+                            search=search_query,
+                            **extra
                         )
                     elif source_name == "firecrawl_crawl":
                         gen = gen_func(
                             domain,
                             include_subdomains=include_subdomains,
-                            limit=max_urls if max_urls else 50000
+                            limit=max_urls if max_urls else 50000,
+                            **extra
                         )
                     elif source_name == "firecrawl":
                         # If the group alias is used directly
@@ -489,13 +517,21 @@ class Mapper:
                         # or update it. Since discover_all just calls map then crawl, 
                         # we'd need to update it to pass args. 
                         # For now, standard call.
-                        gen = gen_func(domain)
+                        gen = gen_func(domain, **extra)
                     else:
                         # Standard interface for other sources
-                        gen = gen_func(domain)
+                        gen = gen_func(domain, **extra)
                         
                     generators.append((source_name, priority, gen))
 
+            if replay_sources:
+                async def replay():
+                    async for item, _ in store.aiter_urls(domain, sources=replay_sources):
+                        yield item
+
+                # Stored URLs are known-good - stream them ahead of live sources
+                generators.append((None, 0, replay()))
+
             if not generators:
                 logger.warning("[MAPPER] No valid sources configured")
                 return
@@ -504,25 +540,30 @@ class Mapper:
             queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=1000)
             sentinel = object()
             sentinel_priority = 999
+            finished: Dict[str, Tuple[float, int]] = {}  # source -> (started_at, count) on clean finish
 
-            async def consume(name: str, priority: int, gen):
+            async def consume(name: Optional[str], priority: int, gen):
                 """Consume a generator and push items to the priority queue."""
                 source_count = 0
+                started_at = time.time()
                 try:
                     async for item in gen:
                         if item is not None:
                             # Wrap in PriorityItem for fast-first streaming
-                            await queue.put(PriorityItem(priority=priority, url=item))
+                            await queue.put(PriorityItem(priority=priority, url=item, source=name))
                             source_count += 1
                             # Adaptive rate limiting
-                            self._rate_limiter.success(name)
+                            if name:
+                                self._rate_limiter.success(name)
+                    if name:
+                        finished[name] = (started_at, source_count)
                 except Exception as e:
                     if "429" in str(e) or "rate" in str(e).lower():
                         self._rate_limiter.rate_limited(name)
                     logger.error(f"[MAPPER] Source '{name}' failed: {e}")
                 finally:
-                    logger.info(f"[MAPPER] Source '{name}' complete: {source_count} URLs")
-                    await queue.put(PriorityItem(priority=sentinel_priority, url=sentinel))
+                    logger.info(f"[MAPPER] Source '{name or 'store'}' complete: {source_count} URLs")
+                    await queue.put(PriorityItem(priority=sentinel_priority, url=sentinel, source=name))
 
             # Start all consumers in parallel
             tasks = [
@@ -530,56 +571,120 @@ class Mapper:
                 for name, priority, gen in generators
             ]
 
+            # Archive verification runs as its own concurrent stage; checked
+            # statuses persist across runs (url_status.db, VERIFY_CACHE_TTL)
+            verifier: Optional[ArchiveVerifier] = None
+            if verify_archives:
+                try:
+                    status_cache = await asyncio.to_thread(VerificationCache, self.cache_dir / "url_status.db")
+                except sqlite3.Error as e:
+                    logger.warning(f"[MAPPER] Verification cache unavailable: {e}")
+                    status_cache = None
+                verifier = ArchiveVerifier(
+                    lambda u: self._verify_url_exists(u, client),
+                    status_cache,
+                    concurrency=verify_concurrency,
+                    per_host=verify_per_host,
+                )
+
+            # Output stage: futures in arrival order ("priority") or finished
+            # results ("completed"). Bounded so verification can't run away.
+            window = max(100, verify_concurrency * 4)
+            output: asyncio.Queue = asyncio.Queue(maxsize=window)
+            slots = asyncio.Semaphore(window)
+            done_marker = object()
+            strict_order = verify_order != "completed"
+
+            async def verify_in_background(item: DiscoveredURL) -> Optional[DiscoveredURL]:
+                try:
+                    return await self._verify_and_filter_url(
+                        item, client, archive_mode, verify_archives, verifier
+                    )
+                except Exception as e:
+                    # One failed check must not take down the other verifications;
+                    # the item is filtered as if its existence were unknown
+                    logger.debug(f"[MAPPER] Verification failed for {item.url}: {e}")
+                    return await self._verify_and_filter_url(item, client, archive_mode, False)
+
+            async def verify_then_emit(item: DiscoveredURL):
+                try:
+                    await output.put(await verify_in_background(item))
+                finally:
+                    slots.release()
+
+            async def dispatch():
+                """Dedup source items and route them through verification."""
+                completed = 0
+                in_flight: Set[asyncio.Task] = set()
+                try:
+                    while completed < len(tasks):
+                        # Drain what is queued so the store is hit once per batch
+                        drained = [await queue.get()]
+                        while not queue.empty() and len(drained) < store.batch_size:
+                            drained.append(queue.get_nowait())
+
+                        # Dedup against the store (records the producing source too)
+                        entries = [(p.url, p.source) for p in drained if p.url is not sentinel]
+                        is_new = iter(())
+                        if entries:
+                            is_new = iter(await asyncio.to_thread(store.record_many, domain, entries, run_id))
+
+                        for priority_item in drained:
+                            if priority_item.url is sentinel:
+                                completed += 1
+                                # All of this source's items are recorded by now
+                                if priority_item.source in finished:
+                                    started_at, count = finished[priority_item.source]
+                                    await asyncio.to_thread(
+                                        store.complete_source,
+                                        domain, priority_item.source, started_at, count,
+                                        full=priority_item.source not in incremental,
+                                    )
+                                continue
+                            if not next(is_new):
+                                continue
+                            item = priority_item.url
+
+                            if not (verifier is not None and item.is_archived):
+                                # Nothing to verify - filter inline, no network
+                                await output.put(await self._verify_and_filter_url(
+                                    item, client, archive_mode, verify_archives
+                                ))
+                            elif strict_order:
+                                # Queue slot holds the future, so output order == arrival order
+                                await output.put(asyncio.ensure_future(verify_in_background(item)))
+                            else:
+                                await slots.acquire()
+                                task = asyncio.create_task(verify_then_emit(item))
+                                in_flight.add(task)
+                                task.add_done_callback(in_flight.discard)
+
+                    if in_flight:
+                        await asyncio.gather(*in_flight)
+                    await output.put(done_marker)
+                except asyncio.CancelledError:
+                    for task in in_flight:
+                        task.cancel()
+                    raise
+                except Exception as e:
+                    logger.error(f"[MAPPER] Dispatch failed: {e}")
+                    for task in in_flight:
+                        task.cancel()
+                    await output.put(done_marker)
+
+            dispatcher = asyncio.create_task(dispatch())
+
             # Yield items as they arrive (fast sources first due to priority)
-            completed = 0
             try:
-                while completed < len(tasks):
-                    priority_item = await queue.get()
-
-                    if priority_item.url is sentinel:
-                        completed += 1
-                        continue
-
-                    item = priority_item.url
-
-                    # Fast in-memory dedup
-                    if item.url in seen:
-                        continue
-                    seen.add(item.url)
-
-                    # Switch to SQLite for large jobs
-                    if len(seen) > 10000 and db_conn is None:
-                        db_path = self.cache_dir / f"mapper_{domain.replace('.', '_')}.db"
-                        db_conn = sqlite3.connect(str(db_path))
-                        db_conn.execute("CREATE TABLE IF NOT EXISTS seen_urls (url TEXT PRIMARY KEY)")
-                        # Bulk insert existing seen URLs
-                        db_conn.executemany(
-                            "INSERT OR IGNORE INTO seen_urls (url) VALUES (?)",
-                            [(u,) for u in seen]
-                        )
-                        db_conn.commit()
-                        logger.info(f"[MAPPER] Switched to SQLite dedup at {len(seen)} URLs")
-
-                    # Batch SQLite writes (if active)
-                    if db_conn is not None:
-                        pending_batch.append(item.url)
-                        if len(pending_batch) >= BATCH_SIZE:
-                            db_conn.executemany(
-                                "INSERT OR IGNORE INTO seen_urls (url) VALUES (?)",
-                                [(u,) for u in pending_batch]
-                            )
-                            db_conn.commit()
-                            pending_batch.clear()
-
-                    # Verify and filter based on archive_mode
-                    filtered_item = await self._verify_and_filter_url(
-                        item, client, archive_mode, verify_archives
-                    )
+                while True:
+                    entry = await output.get()
+                    if entry is done_marker:
+                        break
+                    filtered_item = await entry if isinstance(entry, asyncio.Future) else entry
                     if filtered_item is None:
                         continue  # Filtered out by archive_mode
 
                     url_count += 1
-                    collected_urls.append(filtered_item)
                     yield filtered_item
 
                     # Check max_urls limit
@@ -589,23 +694,25 @@ class Mapper:
 
             finally:
                 # Cancel remaining tasks
+                dispatcher.cancel()
                 for task in tasks:
                     task.cancel()
-
-                # Flush any pending batch
-                if db_conn is not None and pending_batch:
-                    db_conn.executemany(
-                        "INSERT OR IGNORE INTO seen_urls (url) VALUES (?)",
-                        [(u,) for u in pending_batch]
-                    )
-                    db_conn.commit()
+                while not output.empty():
+                    entry = output.get_nowait()
+                    if isinstance(entry, asyncio.Future):
+                        entry.cancel()
+
+                if verifier is not None:
+                    if verifier.checked or verifier.cache_hits:
+                        logger.info(
+                            f"[MAPPER] Verified {verifier.checked} archive URLs "
+                            f"({verifier.cache_hits} from cache)"
+                        )
+                    await verifier.aclose()
 
         finally:
-            if db_conn is not None:
-                db_conn.close()
+            await asyncio.to_thread(store.close)
 
-        # Cache results for 5 minutes
-        self._result_cache.set(domain, fast, collected_urls)
         logger.info(f"[MAPPER] Discovery complete: {url_count} unique URLs")
 
     async def map_domain_with_stats(
@@ -24,6 +24,7 @@ Usage:
 
 import asyncio
 import logging
+from datetime import datetime, timezone
 from typing import AsyncGenerator, Set, Optional, Any, List
 from urllib.parse import unquote
 import re
@@ -191,6 +192,10 @@ class SearchEngineDiscovery:
 
         FREE tier: 100 queries/day, 10 results/query.
         PAID: $5 per 1000 queries.
+
+        No `since`: dateRestrict filters on the page's own date, not on when
+        Google indexed it, so an incremental query would never return older
+        pages that were indexed late or cut off by max_results.
         """
         if not self.google_key or not self.google_cse:
             logger.debug("[google] No API key or CSE ID - skipping")
@@ -363,12 +368,15 @@ class SearchEngineDiscovery:
         domain: str,
         max_results: int = 200,
         client: Optional[Any] = None,
+        since: Optional[float] = None,
     ) -> AsyncGenerator[DiscoveredURL, None]:
         """
         Query Brave Search API.
 
         FREE tier: 2000 queries/month.
         PAID: $3 per 1000 queries.
+
+        since: Unix timestamp - only pages discovered after it (freshness range)
         """
         if not self.brave_key:
             logger.debug("[brave] No API key - skipping")
@@ -393,6 +401,10 @@ class SearchEngineDiscovery:
                     "count": 20,
                     "offset": offset,
                 }
+                if since:
+                    start_day = datetime.fromtimestamp(since, tz=timezone.utc).strftime("%Y-%m-%d")
+                    end_day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+                    params["freshness"] = f"{start_day}to{end_day}"
 
                 try:
                     status, data = await self._http_get(http_client, url, params=params, headers=headers)
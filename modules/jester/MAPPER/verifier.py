@@ -0,0 +1,169 @@
+"""
+JESTER MAPPER - Archive URL Verification
+=========================================
+
+Checks whether archive-discovered URLs (Wayback / Common Crawl) still exist,
+outside the Mapper's consumer loop:
+
+    - Bounded concurrency (VERIFY_CONCURRENCY total, VERIFY_PER_HOST per host)
+    - Persistent url -> (exists, status, checked_at) cache with a TTL, so
+      remapping a domain only re-checks URLs whose answer has gone stale
+    - Cache writes are buffered and flushed in batches; every SQLite call
+      made by ArchiveVerifier runs on a worker thread, off the event loop
+
+Usage:
+    cache = VerificationCache(cache_dir / "url_status.db")
+    verifier = ArchiveVerifier(check_fn, cache)
+    exists, status, checked_at = await verifier.verify(url)
+    await verifier.aclose()
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .config import VERIFY_CACHE_TTL, VERIFY_CONCURRENCY, VERIFY_PER_HOST
+
+logger = logging.getLogger(__name__)
+
+# (exists, status_code) - exists is None when the check itself failed
+CheckFn = Callable[[str], Awaitable[Tuple[Optional[bool], Optional[int]]]]
+
+
+class VerificationCache:
+    """SQLite cache of URL existence checks (WAL, batched writes, thread-safe)."""
+
+    def __init__(self, db_path: Path, ttl_seconds: int = VERIFY_CACHE_TTL, batch_size: int = 200):
+        self.db_path = Path(db_path)
+        self.ttl = ttl_seconds
+        self.batch_size = batch_size
+        self._pending: List[Tuple[str, Optional[int], Optional[int], float]] = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS url_status (
+                url TEXT PRIMARY KEY,
+                exists_now INTEGER,
+                status INTEGER,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Tuple[bool, Optional[int], float]]:
+        """Fresh cached (exists, status, checked_at), or None if missing/expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT exists_now, status, checked_at FROM url_status WHERE url = ? AND checked_at >= ?",
+                (url, time.time() - self.ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        return bool(row[0]), row[1], row[2]
+
+    def put(self, url: str, exists: bool, status: Optional[int], checked_at: float):
+        """Buffer a result in memory; call flush() once `flush_due`."""
+        with self._lock:
+            self._pending.append((url, int(exists), status, checked_at))
+
+    @property
+    def flush_due(self) -> bool:
+        return len(self._pending) >= self.batch_size
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO url_status (url, exists_now, status, checked_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL; returns rows removed."""
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM url_status WHERE checked_at < ?", (time.time() - self.ttl,))
+        return cur.rowcount
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._conn.close()
+
+
+class ArchiveVerifier:
+    """
+    Concurrent existence checks with per-host limits and a persistent cache.
+
+    Args:
+        check: Coroutine doing the actual request (Mapper._verify_url_exists)
+        cache: Optional VerificationCache (None = no cross-run memory)
+        concurrency: Max checks in flight overall
+        per_host: Max checks in flight against one host
+    """
+
+    def __init__(
+        self,
+        check: CheckFn,
+        cache: Optional[VerificationCache] = None,
+        concurrency: int = VERIFY_CONCURRENCY,
+        per_host: int = VERIFY_PER_HOST,
+    ):
+        self._check = check
+        self.cache = cache
+        self._global = asyncio.Semaphore(max(1, concurrency))
+        self._hosts: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(max(1, per_host)))
+        self.checked = 0
+        self.cache_hits = 0
+
+    async def verify(self, url: str) -> Tuple[Optional[bool], Optional[int], float]:
+        """Return (exists, status, checked_at) from cache or a fresh check."""
+        if self.cache is not None:
+            try:
+                cached = await asyncio.to_thread(self.cache.get, url)
+            except sqlite3.Error as e:
+                logger.debug(f"[MAPPER] Verification cache read failed: {e}")
+                cached = None
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+        host = urlparse(url).netloc.lower()
+        async with self._global:
+            async with self._hosts[host]:
+                exists, status = await self._check(url)
+        checked_at = time.time()
+        self.checked += 1
+
+        # Failed checks (timeouts etc.) are not cached - retry next run
+        if exists is not None and self.cache is not None:
+            self.cache.put(url, exists, status, checked_at)
+            if self.cache.flush_due:
+                try:
+                    await asyncio.to_thread(self.cache.flush)
+                except sqlite3.Error as e:
+                    logger.debug(f"[MAPPER] Verification cache write failed: {e}")
+        return exists, status, checked_at
+
+    def close(self):
+        if self.cache is not None:
+            try:
+                self.cache.close()
+            except sqlite3.Error as e:
+                logger.debug(f"[MAPPER] Verification cache close failed: {e}")
+
+    async def aclose(self):
+        """close() on a worker thread."""
+        await asyncio.to_thread(self.close)
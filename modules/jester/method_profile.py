@@ -0,0 +1,327 @@
+"""
+JESTER Method Profile - per-domain memory of which scraping tier works
+
+Every scrape used to start at JESTER_A and walk down the hierarchy, so a
+Cloudflare-fronted domain paid for a failed httpx request and a failed Colly
+run on every single URL, every run. This module remembers, per domain and per
+tier:
+
+- success / attempt counts (exponentially decayed, so old evidence fades)
+- recent latencies (median reported)
+- the last method that succeeded
+
+`start_method()` uses it to skip tiers that have recently and repeatedly
+failed for a domain. With probability `exploration` (and whenever the decayed
+evidence gets thin) it starts from the top again, so a domain that becomes
+unblocked is rediscovered.
+
+Profiles persist in SQLite (WAL). Routing and recording only touch memory;
+SQLite reads (`preload`) and writes (`aflush`) run on a worker thread so
+async callers never block the event loop on disk I/O.
+
+Usage:
+    from modules.jester.method_profile import MethodProfileStore
+
+    store = MethodProfileStore()
+    await store.preload(urls)
+    start = store.start_method(url, config.enabled_methods)
+    store.record(url, JesterMethod.JESTER_A, success=False, latency_ms=420)
+    if store.flush_due:
+        await store.aflush()
+    print(store.profile("example.com"))
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger("JESTER.profile")
+
+DEFAULT_PROFILE_DB = os.getenv(
+    "JESTER_METHOD_PROFILE_DB",
+    str(Path.home() / ".jester" / "method_profile.db"),
+)
+
+LATENCY_SAMPLES = 20  # Recent latencies kept per (domain, method)
+
+
+def domain_of(url: str) -> str:
+    """Profile key for a URL (lowercased host without leading www.)."""
+    host = urlparse(url).netloc.lower() if "//" in url else url.lower()
+    host = host.split("@")[-1].split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+@dataclass
+class MethodStats:
+    """Decayed outcome counts for one tier on one domain."""
+    successes: float = 0.0
+    attempts: float = 0.0
+    latencies: List[int] = field(default_factory=list)
+    last_success: float = 0.0
+    updated_at: float = 0.0
+
+    def decayed(self, now: float, half_life: float) -> Tuple[float, float]:
+        """(successes, attempts) decayed to `now`."""
+        if not self.updated_at or half_life <= 0:
+            return self.successes, self.attempts
+        factor = 0.5 ** (max(0.0, now - self.updated_at) / half_life)
+        return self.successes * factor, self.attempts * factor
+
+    def success_rate(self, now: float, half_life: float) -> float:
+        """Laplace-smoothed success rate (0.5 with no evidence)."""
+        successes, attempts = self.decayed(now, half_life)
+        return (successes + 1.0) / (attempts + 2.0)
+
+    def median_latency(self) -> Optional[float]:
+        return statistics.median(self.latencies) if self.latencies else None
+
+
+class MethodProfileStore:
+    """
+    Persistent per-domain scraping method profile.
+
+    Args:
+        db_path: SQLite file (default JESTER_METHOD_PROFILE_DB or ~/.jester/method_profile.db)
+        half_life: Seconds for recorded evidence to lose half its weight
+        min_attempts: Decayed attempts needed before a tier may be skipped
+        skip_below: Tiers whose smoothed success rate is below this are skipped
+        exploration: Probability of ignoring the profile and starting at the top
+        flush_every: Dirty records buffered before `flush_due` is set
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        half_life: float = 7 * 24 * 3600,
+        min_attempts: float = 2.0,
+        skip_below: float = 0.25,
+        exploration: float = 0.05,
+        flush_every: int = 50,
+    ):
+        self.db_path = db_path or DEFAULT_PROFILE_DB
+        self.half_life = half_life
+        self.min_attempts = min_attempts
+        self.skip_below = skip_below
+        self.exploration = exploration
+        self.flush_every = flush_every
+
+        self._stats: Dict[str, Dict[str, MethodStats]] = {}
+        self._last_method: Dict[str, str] = {}
+        self._loaded: set = set()
+        self._dirty: set = set()
+        # _lock guards the in-memory state and is never held across SQLite
+        # calls; _io_lock serializes use of the connection
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ─────────────────────────────────────────────────────────────
+    # Storage
+    # ─────────────────────────────────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS method_stats (
+                    domain TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    successes REAL NOT NULL,
+                    attempts REAL NOT NULL,
+                    latencies TEXT NOT NULL,
+                    last_success REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (domain, method)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS last_method (
+                    domain TEXT PRIMARY KEY,
+                    method TEXT NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def load(self, urls_or_domains: Iterable[str]):
+        """Read profiles for domains not yet in memory (blocking SQLite I/O)."""
+        with self._lock:
+            domains = {domain_of(u) for u in urls_or_domains} - self._loaded
+        domains.discard("")
+        if not domains:
+            return
+        loaded = {}
+        try:
+            with self._io_lock:
+                conn = self._connect()
+                for domain in domains:
+                    rows = conn.execute(
+                        "SELECT method, successes, attempts, latencies, last_success, updated_at "
+                        "FROM method_stats WHERE domain = ?", (domain,)
+                    ).fetchall()
+                    last = conn.execute("SELECT method FROM last_method WHERE domain = ?", (domain,)).fetchone()
+                    loaded[domain] = (rows, last)
+        except sqlite3.Error as e:
+            logger.warning(f"Method profile unavailable ({e}); continuing in memory")
+        with self._lock:
+            self._loaded.update(domains)
+            for domain, (rows, last) in loaded.items():
+                # Outcomes recorded meanwhile are newer than the stored rows
+                per_method = self._stats.setdefault(domain, {})
+                for method, successes, attempts, latencies, last_success, updated_at in rows:
+                    per_method.setdefault(method, MethodStats(
+                        successes=successes,
+                        attempts=attempts,
+                        latencies=json.loads(latencies),
+                        last_success=last_success,
+                        updated_at=updated_at,
+                    ))
+                if last and domain not in self._last_method:
+                    self._last_method[domain] = last[0]
+
+    async def preload(self, urls_or_domains: Iterable[str]):
+        """load() on a worker thread."""
+        await asyncio.to_thread(self.load, list(urls_or_domains))
+
+    def _ensure_loaded(self, domain: str):
+        if domain not in self._loaded:
+            self.load([domain])
+
+    @property
+    def flush_due(self) -> bool:
+        """True once `flush_every` updates are waiting to be written."""
+        return len(self._dirty) >= self.flush_every
+
+    def flush(self):
+        """Write buffered updates to SQLite (blocking)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+            stat_rows = []
+            for domain, method in dirty:
+                s = self._stats[domain][method]
+                stat_rows.append((domain, method, s.successes, s.attempts, json.dumps(s.latencies),
+                                  s.last_success, s.updated_at))
+            last_rows = [(d, self._last_method[d]) for d in {d for d, _ in dirty} if d in self._last_method]
+        try:
+            with self._io_lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO method_stats (domain, method, successes, attempts, latencies, last_success, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(domain, method) DO UPDATE SET
+                            successes = excluded.successes,
+                            attempts = excluded.attempts,
+                            latencies = excluded.latencies,
+                            last_success = excluded.last_success,
+                            updated_at = excluded.updated_at
+                    """, stat_rows)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO last_method (domain, method) VALUES (?, ?)", last_rows
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not persist method profile: {e}")
+
+    async def aflush(self):
+        """flush() on a worker thread."""
+        await asyncio.to_thread(self.flush)
+
+    def close(self):
+        self.flush()
+        with self._io_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ─────────────────────────────────────────────────────────────
+    # Recording and routing
+    # ─────────────────────────────────────────────────────────────
+
+    def record(self, url: str, method: Any, success: bool, latency_ms: Optional[int] = None):
+        """Record one attempt of `method` (JesterMethod or its value) against a URL's domain."""
+        domain = domain_of(url)
+        if not domain:
+            return
+        name = getattr(method, "value", method)
+        now = time.time()
+        self._ensure_loaded(domain)
+        with self._lock:
+            s = self._stats.setdefault(domain, {}).setdefault(name, MethodStats())
+            s.successes, s.attempts = s.decayed(now, self.half_life)
+            s.attempts += 1.0
+            if success:
+                s.successes += 1.0
+                s.last_success = now
+                self._last_method[domain] = name
+            if latency_ms:
+                s.latencies.append(int(latency_ms))
+                del s.latencies[:-LATENCY_SAMPLES]
+            s.updated_at = now
+            self._dirty.add((domain, name))
+
+    def start_method(self, url: str, methods: Sequence[Any]) -> Optional[Any]:
+        """
+        First method in `methods` (hierarchy order) that is likely to succeed.
+
+        A tier is skipped only if it has at least `min_attempts` of decayed
+        evidence and a success rate below `skip_below`. Returns None when the
+        whole hierarchy should be walked (no profile, exploration, or every
+        tier looks bad).
+        """
+        if not methods or (self.exploration and random.random() < self.exploration):
+            return None
+        domain = domain_of(url)
+        now = time.time()
+        self._ensure_loaded(domain)
+        with self._lock:
+            per_method = self._stats.get(domain)
+            if not per_method:
+                return None
+            for method in methods:
+                s = per_method.get(getattr(method, "value", method))
+                if s is None:
+                    break
+                _, attempts = s.decayed(now, self.half_life)
+                if attempts < self.min_attempts or s.success_rate(now, self.half_life) >= self.skip_below:
+                    break
+            else:
+                return None
+        return None if method is methods[0] else method
+
+    def profile(self, domain_or_url: str) -> Dict[str, Any]:
+        """Current (decayed) view of a domain's profile."""
+        domain = domain_of(domain_or_url)
+        now = time.time()
+        self._ensure_loaded(domain)
+        with self._lock:
+            methods = {}
+            for name, s in self._stats.get(domain, {}).items():
+                successes, attempts = s.decayed(now, self.half_life)
+                methods[name] = {
+                    "success_rate": round(s.success_rate(now, self.half_life), 3),
+                    "successes": round(successes, 2),
+                    "attempts": round(attempts, 2),
+                    "median_latency_ms": s.median_latency(),
+                    "last_success": s.last_success or None,
+                }
+            return {
+                "domain": domain,
+                "last_success_method": self._last_method.get(domain),
+                "methods": methods,
+            }
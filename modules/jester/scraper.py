@@ -36,6 +36,7 @@ from modules.jester.jester_a import JesterA, JesterAResult, scrape_a, scrape_a_b
 from modules.jester.jester_b import JesterB, JesterBResult, scrape_b, scrape_b_batch, colly_available
 from modules.jester.jester_c import JesterC, JesterCResult, scrape_c, scrape_c_batch, rod_available, ScreenshotRule, ScreenshotResult
 from modules.jester.jester_d import JesterD, JesterDResult, scrape_d, scrape_d_batch, jester_d_available
+from modules.jester.method_profile import MethodProfileStore
 
 __all__ = [
     # Unified
@@ -48,6 +49,8 @@ __all__ = [
     "JesterC", "JesterCResult", "scrape_c", "scrape_c_batch", "rod_available", "ScreenshotRule", "ScreenshotResult",
     # Tier D
     "JesterD", "JesterDResult", "scrape_d", "scrape_d_batch", "jester_d_available",
+    # Method profile
+    "MethodProfileStore",
     # Convenience
     "scrape", "scrape_batch", "scrape_batch_optimized", "get_jester",
     # Crawl mode
@@ -130,6 +133,12 @@ class JesterConfig:
     max_concurrent_c: int = 100
     max_concurrent_d: int = 50
 
+    # Streaming batch pipeline (scrape_batch_optimized): how long the Go
+    # tiers wait to fill a micro-batch, and how many Go calls run at once
+    batch_window_b: float = 0.25
+    batch_window_c: float = 0.5
+    max_go_batches: int = 2
+
     # User agent
     user_agent: str = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
 
@@ -151,6 +160,11 @@ class JesterConfig:
     use_auth_sessions: bool = True
     auth_session_dir: Optional[str] = None
 
+    # Per-domain method profile: start at the cheapest tier likely to work (opt-in)
+    use_method_profile: bool = False
+    method_profile_path: Optional[str] = None  # Default: JESTER_METHOD_PROFILE_DB / ~/.jester/method_profile.db
+    profile_exploration: float = 0.05          # Chance of walking the full hierarchy anyway
+
 
 class Jester:
     """
@@ -196,6 +210,15 @@ class Jester:
             except Exception as e:
                 logger.debug(f"Apify init skipped: {e}")
 
+        # Per-domain method profile (which tier works for which site)
+        self._profile: Optional[MethodProfileStore] = None
+        self._profile_flush: Optional[asyncio.Task] = None
+        if self.config.use_method_profile:
+            self._profile = MethodProfileStore(
+                db_path=self.config.method_profile_path,
+                exploration=self.config.profile_exploration,
+            )
+
         self._initialized = False
         self._init_lock = asyncio.Lock()  # Prevent race condition in lazy init
 
@@ -257,6 +280,29 @@ class Jester:
         if self._go_bridge:
             # Go bridge cleanup if needed
             pass
+        if self._profile:
+            if self._profile_flush:
+                await self._profile_flush
+            await asyncio.to_thread(self._profile.close)
+
+    def _record_outcome(self, result: Optional[JesterResult]):
+        """Feed a tier's result into the per-domain method profile."""
+        if self._profile is None or result is None or result.method == JesterMethod.BLOCKED:
+            return
+        success = bool(result.html) and len(result.html) > MIN_VALID_HTML_LENGTH
+        self._record_attempt(result.url, result.method, success, result.latency_ms)
+
+    def _record_attempt(self, url: str, method: JesterMethod, success: bool, latency_ms: Optional[int] = None):
+        """Record in memory; buffered rows are written on a worker thread."""
+        self._profile.record(url, method, success, latency_ms)
+        if self._profile.flush_due and (self._profile_flush is None or self._profile_flush.done()):
+            self._profile_flush = asyncio.ensure_future(self._profile.aflush())
+
+    def method_profile(self, url_or_domain: str) -> Dict[str, Any]:
+        """Learned per-tier success rates / latencies for a domain."""
+        if self._profile is None:
+            return {}
+        return self._profile.profile(url_or_domain)
 
     # ─────────────────────────────────────────────────────────────
     # Main scrape method - tries all methods in order
@@ -275,6 +321,9 @@ class Jester:
         Tries methods in order until one succeeds:
         A -> B -> C -> D -> Firecrawl -> BrightData
 
+        Without a forced method, the domain's method profile may start the
+        walk further down (skipping tiers that keep failing for that domain).
+
         Args:
             url: URL to scrape
             force_method: Skip to specific method (for pre-classified sources)
@@ -289,6 +338,11 @@ class Jester:
         method = force_method or self.config.force_method
         methods = self.config.enabled_methods
 
+        # Otherwise start at the cheapest tier the domain profile expects to work
+        if not method and self._profile:
+            await self._profile.preload([url])
+            method = self._profile.start_method(url, methods)
+
         # If forcing a method, start from that method
         if method:
             try:
@@ -302,9 +356,12 @@ class Jester:
         for m in methods:
             try:
                 result = await self._try_method(url, m, country=country, languages=languages)
+                self._record_outcome(result)
                 if result and result.html and len(result.html) > MIN_VALID_HTML_LENGTH:
                     return result
             except Exception as e:
+                if self._profile:
+                    self._record_attempt(url, m, success=False)
                 last_error = str(e)
                 logger.debug(f"Method {m.value} failed for {url}: {e}")
                 continue
@@ -785,6 +842,9 @@ class Jester:
         """
         Scrape multiple URLs concurrently.
 
+        Each URL goes through scrape(), so the method profile picks its
+        starting tier unless force_method is given.
+
         Args:
             urls: List of URLs to scrape
             max_concurrent: Maximum concurrent requests (default 100 for Firecrawl)
@@ -816,23 +876,35 @@ class Jester:
         use_brightdata: bool = False,
     ) -> List[JesterResult]:
         """
-        Optimized batch scraping using tiered parallelization.
-
-        Instead of trying each tier per-URL (spawning 1000 Go processes),
-        this runs each tier ONCE with all URLs that need it:
-
-        Phase 1: JESTER_A (httpx) on ALL URLs → collect failures
-        Phase 2: BACKDRILL (archives: recent → 2y → 3y) on failures
-        Phase 3: JESTER_B (Colly) on failures (ONE Go call, 500 concurrent)
-        Phase 4: JESTER_C (Rod) on remaining (ONE Go call, 100 concurrent)
-        Phase 5: JESTER_D (headless browser) on remaining
-        Phase 6: Firecrawl (paid API, off by default)
-        Phase 7: BrightData (expensive, off by default)
+        Optimized batch scraping using a streaming tier pipeline.
+
+        Each tier is a bounded worker stage fed by its own queue. A URL that
+        fails a tier is pushed into the next tier's queue immediately, so a
+        fast JESTER_A failure reaches Colly without waiting for the slowest
+        httpx request in the batch:
+
+        JESTER_A (httpx, per-domain limited)
+          -> JESTER_B (Colly, micro-batched Go calls, max_concurrent_b in total)
+          -> JESTER_C (Rod, micro-batched Go calls, max_concurrent_c in total)
+          -> JESTER_D (headless browser)
+          -> Firecrawl (paid API)
+          -> BrightData (expensive, off by default)
+
+        The Go tiers still run as few processes as possible: a stage collects
+        URLs for up to `batch_window_b` / `batch_window_c` seconds (or until a
+        full batch) and sends them to ONE Go call, with at most
+        `max_go_batches` calls in flight per tier. The tier's concurrency is
+        split between those calls, so Colly never runs more than
+        `max_concurrent_b` fetches (Rod `max_concurrent_c`) at once.
+
+        URLs whose domain profile shows the early tiers failing enter the
+        pipeline at the first tier expected to work.
 
         Args:
             urls: List of URLs to scrape
             domain_limit: Max concurrent requests per domain (rate limiting)
-            progress_callback: Optional callback(phase, completed, total)
+            progress_callback: Optional callback(phase, completed, total),
+                called once per tier when that tier has drained
             use_backdrill: Enable BACKDRILL archive fallback (default True)
             use_firecrawl: Enable Firecrawl paid API (default False for batch)
             use_brightdata: Enable BrightData as last resort (default False for batch)
@@ -840,80 +912,147 @@ class Jester:
         Returns:
             List of JesterResult objects in same order as input URLs
         """
+        from urllib.parse import urlparse
+        from collections import defaultdict
+
         await self._ensure_init()
 
         if not urls:
             return []
 
+        unique_urls = list(dict.fromkeys(urls))
+        total = len(unique_urls)
         results: Dict[str, JesterResult] = {}
-        pending = set(urls)
+        completed = 0
 
         def report(phase: str, done: int, total: int):
             if progress_callback:
                 progress_callback(phase, done, total)
             logger.info(f"[{phase}] {done}/{total} URLs processed")
 
-        # Phase 1: JESTER_A (httpx) - all URLs
-        logger.info(f"Phase 1: JESTER_A on {len(pending)} URLs")
-        a_results = await self._batch_jester_a(list(pending), domain_limit)
-        for r in a_results:
-            results[r.url] = r
-            if r.html and len(r.html) > MIN_VALID_HTML_LENGTH:
-                pending.discard(r.url)
-        report("JESTER_A", len(urls) - len(pending), len(urls))
-
-        # Phase 2: JESTER_B (Colly) - failed URLs, SINGLE Go call
-        if pending and self._colly_available:
-            logger.info(f"Phase 2: JESTER_B on {len(pending)} failed URLs")
-            b_results = await self._batch_jester_b(list(pending))
-            for r in b_results:
-                results[r.url] = r
-                if r.html and len(r.html) > MIN_VALID_HTML_LENGTH:
-                    pending.discard(r.url)
-            report("JESTER_B", len(urls) - len(pending), len(urls))
-
-        # Phase 3: JESTER_C (Rod) - still-failed URLs, SINGLE Go call
-        if pending and self._rod_available:
-            logger.info(f"Phase 3: JESTER_C on {len(pending)} failed URLs")
-            c_results = await self._batch_jester_c(list(pending))
-            for r in c_results:
-                results[r.url] = r
-                if r.html and len(r.html) > MIN_VALID_HTML_LENGTH:
-                    pending.discard(r.url)
-            report("JESTER_C", len(urls) - len(pending), len(urls))
-
-        # Phase 4: JESTER_D (headless) - remaining failures
-        if pending and self._jester_d_available:
-            logger.info(f"Phase 4: JESTER_D on {len(pending)} failed URLs")
-            d_results = await self._batch_jester_d(list(pending))
-            for r in d_results:
-                results[r.url] = r
-                if r.html and len(r.html) > MIN_VALID_HTML_LENGTH:
-                    pending.discard(r.url)
-            report("JESTER_D", len(urls) - len(pending), len(urls))
-
-        # Phase 5: Firecrawl - paid fallback
-        if pending and self._firecrawl_key:
-            logger.info(f"Phase 5: Firecrawl on {len(pending)} failed URLs")
-            f_results = await self._batch_firecrawl(list(pending))
-            for r in f_results:
-                results[r.url] = r
-                if r.html and len(r.html) > MIN_VALID_HTML_LENGTH:
-                    pending.discard(r.url)
-            report("FIRECRAWL", len(urls) - len(pending), len(urls))
-
-        # Phase 6: BrightData - off by default for batch (expensive)
-        if use_brightdata and pending and self._brightdata_key:
-            logger.info(f"Phase 6: BrightData on {len(pending)} failed URLs")
-            bd_results = await self._batch_brightdata(list(pending))
-            for r in bd_results:
-                results[r.url] = r
-                if r.html and len(r.html) > MIN_VALID_HTML_LENGTH:
-                    pending.discard(r.url)
-            report("BRIGHTDATA", len(urls) - len(pending), len(urls))
-
-        # Mark any remaining as blocked
-        for url in pending:
+        # Per-domain limiter shared by every JESTER_A fetch in this batch
+        domain_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(domain_limit)
+        )
+
+        async def run_a(batch: List[str]) -> List[JesterResult]:
+            async with domain_semaphores[urlparse(batch[0]).netloc]:
+                return [await self.scrape_a(batch[0])]
+
+        def one_at_a_time(scrape_one):
+            async def run(batch: List[str]) -> List[JesterResult]:
+                return [await scrape_one(batch[0])]
+            return run
+
+        def go_call(run_go, share: int):
+            async def run(batch: List[str]) -> List[JesterResult]:
+                return await run_go(batch, max_concurrent=share)
+            return run
+
+        # Each in-flight Go call gets an equal share of the tier's concurrency
+        go_batches = max(1, self.config.max_go_batches)
+        colly_share = max(1, self.config.max_concurrent_b // go_batches)
+        rod_share = max(1, self.config.max_concurrent_c // go_batches)
+
+        # (name, run(batch) -> results, max batch size, batch window s, max in flight)
+        tiers = [("JESTER_A", run_a, 1, 0.0, self.config.max_concurrent_a)]
+        if self._colly_available:
+            tiers.append(("JESTER_B", go_call(self._batch_jester_b, colly_share), colly_share,
+                          self.config.batch_window_b, go_batches))
+        if self._rod_available:
+            tiers.append(("JESTER_C", go_call(self._batch_jester_c, rod_share), rod_share,
+                          self.config.batch_window_c, go_batches))
+        if self._jester_d_available:
+            tiers.append(("JESTER_D", one_at_a_time(self.scrape_d), 1, 0.0, self.config.max_concurrent_d))
+        if self._firecrawl_key:
+            tiers.append(("FIRECRAWL", one_at_a_time(self.scrape_firecrawl), 1, 0.0, 10))
+        if use_brightdata and self._brightdata_key:
+            tiers.append(("BRIGHTDATA", one_at_a_time(self.scrape_brightdata), 1, 0.0, 5))
+
+        # None on a queue means "upstream tier has drained"
+        queues: List[asyncio.Queue] = [asyncio.Queue() for _ in tiers]
+
+        async def run_stage(index: int):
+            name, run_batch, batch_size, window, max_in_flight = tiers[index]
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            slots = asyncio.Semaphore(max_in_flight)
+            in_flight = set()
+            loop = asyncio.get_running_loop()
+
+            async def dispatch(batch: List[str]):
+                nonlocal completed
+                try:
+                    try:
+                        batch_results = await run_batch(batch)
+                    except Exception as e:
+                        logger.error(f"{name} failed for {len(batch)} URLs: {e}")
+                        batch_results = []
+                    by_url = {r.url: r for r in batch_results if r is not None}
+                    for r in by_url.values():
+                        self._record_outcome(r)
+                    for url in batch:
+                        r = by_url.get(url)
+                        if r is not None:
+                            results[url] = r
+                            if r.html and len(r.html) > MIN_VALID_HTML_LENGTH:
+                                completed += 1
+                                continue
+                        if outbox is not None:
+                            outbox.put_nowait(url)
+                finally:
+                    slots.release()
+
+            upstream_open = True
+            while upstream_open:
+                url = await inbox.get()
+                if url is None:
+                    break
+                batch = [url]
+                if batch_size > 1:
+                    # Micro-batch: gather more failures for one Go call
+                    deadline = loop.time() + window
+                    while len(batch) < batch_size:
+                        remaining = deadline - loop.time()
+                        try:
+                            if remaining <= 0:
+                                url = inbox.get_nowait()
+                            else:
+                                url = await asyncio.wait_for(inbox.get(), remaining)
+                        except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                            break
+                        if url is None:
+                            upstream_open = False
+                            break
+                        batch.append(url)
+
+                await slots.acquire()
+                task = asyncio.create_task(dispatch(batch))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+            report(name, completed, total)
+            if outbox is not None:
+                outbox.put_nowait(None)
+
+        logger.info(f"Streaming {total} URLs through {' -> '.join(t[0] for t in tiers)}")
+        tier_index = {JesterMethod[t[0]]: i for i, t in enumerate(tiers)}
+        hierarchy = [m for m in JesterMethod if m in tier_index]
+        if self._profile:
+            await self._profile.preload(unique_urls)
+        for url in unique_urls:
+            entry = 0
+            start = self._profile.start_method(url, hierarchy) if self._profile else None
+            if start is not None:
+                entry = tier_index[start]
+            queues[entry].put_nowait(url)
+        queues[0].put_nowait(None)
+        await asyncio.gather(*(run_stage(i) for i in range(len(tiers))))
+
+        # Mark any URL no tier produced a result for as blocked
+        for url in unique_urls:
             if url not in results:
                 results[url] = JesterResult(
                     url=url,
@@ -926,38 +1065,12 @@ class Jester:
                 )
 
         # Return in original order
-        return [results.get(url) for url in urls]
+        return [results[url] for url in urls]
 
-    async def _batch_jester_a(
-        self,
-        urls: List[str],
-        domain_limit: int = 10,
-    ) -> List[JesterResult]:
-        """
-        Batch JESTER_A (httpx) with per-domain rate limiting.
-        """
-        from urllib.parse import urlparse
-        from collections import defaultdict
-
-        # Group by domain for rate limiting
-        domain_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
-            lambda: asyncio.Semaphore(domain_limit)
-        )
-        global_semaphore = asyncio.Semaphore(self.config.max_concurrent_a)
-
-        async def fetch_one(url: str) -> JesterResult:
-            domain = urlparse(url).netloc
-            async with global_semaphore:
-                async with domain_semaphores[domain]:
-                    return await self.scrape_a(url)
-
-        tasks = [fetch_one(url) for url in urls]
-        return await asyncio.gather(*tasks, return_exceptions=False)
-
-    async def _batch_jester_b(self, urls: List[str]) -> List[JesterResult]:
+    async def _batch_jester_b(self, urls: List[str], max_concurrent: Optional[int] = None) -> List[JesterResult]:
         """
         Batch JESTER_B (Colly) - SINGLE Go call with all URLs.
-        This is the key optimization: 500 concurrent in ONE process.
+        This is the key optimization: up to max_concurrent_b fetches in ONE process.
         """
         if not self._go_bridge or not urls:
             return []
@@ -967,7 +1080,7 @@ class Jester:
             # Call Colly ONCE with ALL URLs
             crawl_results, _ = await self._go_bridge.crawl_static_html(
                 urls,
-                max_concurrent=self.config.max_concurrent_b,  # 500!
+                max_concurrent=max_concurrent or self.config.max_concurrent_b,
                 timeout=self.config.timeout_b
             )
             latency = int((time.time() - start) * 1000)
@@ -999,7 +1112,7 @@ class Jester:
                 error=str(e)
             ) for url in urls]
 
-    async def _batch_jester_c(self, urls: List[str]) -> List[JesterResult]:
+    async def _batch_jester_c(self, urls: List[str], max_concurrent: Optional[int] = None) -> List[JesterResult]:
         """
         Batch JESTER_C (Rod) - SINGLE Go call with all URLs.
         JS rendering at 100 concurrent browsers.
@@ -1012,7 +1125,7 @@ class Jester:
             # Call Rod ONCE with ALL URLs
             crawl_results = await self._go_bridge.crawl_with_rod(
                 urls,
-                max_concurrent=self.config.max_concurrent_c,  # 100
+                max_concurrent=max_concurrent or self.config.max_concurrent_c,
                 timeout=self.config.timeout_c,
                 include_html=True
             )
@@ -1044,48 +1157,6 @@ class Jester:
                 error=str(e)
             ) for url in urls]
 
-    async def _batch_jester_d(self, urls: List[str]) -> List[JesterResult]:
-        """
-        Batch JESTER_D (headless browser).
-        Limited concurrency due to resource usage.
-        """
-        semaphore = asyncio.Semaphore(self.config.max_concurrent_d)  # 50
-
-        async def scrape_one(url: str) -> JesterResult:
-            async with semaphore:
-                return await self.scrape_d(url)
-
-        tasks = [scrape_one(url) for url in urls]
-        return await asyncio.gather(*tasks, return_exceptions=False)
-
-    async def _batch_firecrawl(self, urls: List[str]) -> List[JesterResult]:
-        """
-        Batch Firecrawl API calls.
-        Rate limited to avoid API throttling.
-        """
-        semaphore = asyncio.Semaphore(10)  # Firecrawl rate limit
-
-        async def scrape_one(url: str) -> JesterResult:
-            async with semaphore:
-                return await self.scrape_firecrawl(url)
-
-        tasks = [scrape_one(url) for url in urls]
-        return await asyncio.gather(*tasks, return_exceptions=False)
-
-    async def _batch_brightdata(self, urls: List[str]) -> List[JesterResult]:
-        """
-        Batch BrightData API calls.
-        Most expensive, lowest concurrency.
-        """
-        semaphore = asyncio.Semaphore(5)  # Conservative rate limit
-
-        async def scrape_one(url: str) -> JesterResult:
-            async with semaphore:
-                return await self.scrape_brightdata(url)
-
-        tasks = [scrape_one(url) for url in urls]
-        return await asyncio.gather(*tasks, return_exceptions=False)
-
 
 # ─────────────────────────────────────────────────────────────────
 # Convenience functions
@@ -1141,7 +1212,9 @@ async def scrape_batch_optimized(
         results = await scrape_batch_optimized(urls, progress_callback=print)
     """
     jester = await get_jester()
-    return await jester.scrape_batch_optimized(urls, domain_limit, progress_callback, use_brightdata)
+    return await jester.scrape_batch_optimized(
+        urls, domain_limit, progress_callback, use_brightdata=use_brightdata
+    )
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Tests for the persistent discovery store and incremental remaps."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+from modules.jester.MAPPER import mapper as mapper_module
+from modules.jester.MAPPER.discovery_store import DiscoveryStore
+from modules.jester.MAPPER.mapper import Mapper
+from modules.jester.MAPPER.models import DiscoveredURL
+from modules.jester.MAPPER.sources.search_engines import SearchEngineDiscovery
+
+
+def test_concurrent_writers_wait_for_the_lock(tmp_path):
+    db = tmp_path / "discovery.db"
+    DiscoveryStore(db).close()
+    errors = []
+
+    def write(worker):
+        store = DiscoveryStore(db, batch_size=10)
+        try:
+            assert store._conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+            run_id = store.begin_run()
+            for i in range(300):
+                store.record("example.com", DiscoveredURL(url=f"https://example.com/{worker}/{i}", source="sitemap"), "sitemap", run_id)
+            store.complete_source("example.com", f"sitemap{worker}", time.time(), 300)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            store.close()
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    store = DiscoveryStore(db)
+    assert store.count("example.com") == 1200
+    store.close()
+
+
+def test_full_at_survives_incremental_runs_and_old_schema(tmp_path):
+    db = tmp_path / "discovery.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE source_runs (domain TEXT NOT NULL, source TEXT NOT NULL, started_at REAL NOT NULL, "
+        "completed_at REAL NOT NULL, url_count INTEGER NOT NULL, PRIMARY KEY (domain, source))"
+    )
+    conn.execute("INSERT INTO source_runs VALUES ('example.com', 'brave', 1.0, 2.0, 5)")
+    conn.commit()
+    conn.close()
+
+    store = DiscoveryStore(db)
+    assert store.last_runs("example.com")["brave"] == (1.0, 2.0, None)
+    store.complete_source("example.com", "brave", 10.0, 5)
+    store.complete_source("example.com", "brave", 20.0, 1, full=False)
+    started, _, full_at = store.last_runs("example.com")["brave"]
+    assert (started, full_at) == (20.0, 10.0)
+    store.close()
+
+
+def test_google_is_never_queried_incrementally():
+    import inspect
+    assert "since" not in inspect.signature(SearchEngineDiscovery.discover_google).parameters
+
+
+def test_incremental_remaps_fall_back_to_full_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(mapper_module, "DISCOVERY_CACHE_TTL", 0)
+    calls = []
+
+    async def dated_source(domain, since=None):
+        calls.append(since)
+        yield DiscoveredURL(url=f"https://{domain}/page{len(calls)}", source="brave")
+
+    async def no_dns():
+        pass
+
+    mapper = Mapper(cache_dir=tmp_path)
+    mapper._source_map = {"brave": dated_source}
+    mapper._precache_dns = no_dns
+    mapper._client = object()
+
+    async def run():
+        return [u.url async for u in mapper.map_domain("example.com", sources=["brave"])]
+
+    assert len(asyncio.run(run())) == 1
+    assert len(asyncio.run(run())) == 2
+    assert calls[0] is None and calls[1] is not None
+
+    # Last full run is older than DISCOVERY_FULL_REFRESH: query everything again
+    monkeypatch.setattr(mapper_module, "DISCOVERY_FULL_REFRESH", 0)
+    assert asyncio.run(run()) == ["https://example.com/page3"]
+    assert calls[2] is None
+
+
+def test_record_many_matches_record(tmp_path):
+    store = DiscoveryStore(tmp_path / "discovery.db", batch_size=3)
+    first, second = store.begin_run(), store.begin_run()
+    urls = [f"https://example.com/{i % 5}" for i in range(8)]
+    assert store.record_many("example.com", [(DiscoveredURL(url=u, source="a"), "a") for u in urls], first) == \
+        [True] * 5 + [False] * 3
+    assert store.record("example.com", DiscoveredURL(url=urls[0], source="b"), "b", first) is False
+    assert store.record_many("example.com", [(DiscoveredURL(url=u, source="b"), "b") for u in urls[:6]], second) == \
+        [True] * 5 + [False]
+    assert [sorted(s) for _, s in store.iter_urls("example.com")][0] == ["a", "b"]
+    store.close()
+
+
+def test_mapper_store_io_runs_off_the_loop(tmp_path, monkeypatch):
+    threads = []
+    real_store = mapper_module.DiscoveryStore
+
+    class TrackedStore(real_store):
+        def __init__(self, *args, **kwargs):
+            threads.append(threading.current_thread())
+            super().__init__(*args, **kwargs)
+
+    for name in ("last_runs", "record_many", "complete_source", "_max_id", "_page", "close"):
+        def tracked(self, *args, _original=getattr(real_store, name), **kwargs):
+            threads.append(threading.current_thread())
+            return _original(self, *args, **kwargs)
+        setattr(TrackedStore, name, tracked)
+    monkeypatch.setattr(mapper_module, "DiscoveryStore", TrackedStore)
+    monkeypatch.setattr(mapper_module, "DISCOVERY_CACHE_TTL", 0)
+
+    async def dated_source(domain, since=None):
+        for i in range(50):
+            yield DiscoveredURL(url=f"https://{domain}/{since is not None}/{i}", source="brave")
+
+    async def no_dns():
+        pass
+
+    mapper = Mapper(cache_dir=tmp_path)
+    mapper._source_map = {"brave": dated_source}
+    mapper._precache_dns = no_dns
+    mapper._client = object()
+
+    async def run():
+        return [u.url async for u in mapper.map_domain("example.com", sources=["brave"])]
+
+    assert len(asyncio.run(run())) == 50
+    assert len(asyncio.run(run())) == 100  # Second run replays the first from the store
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Tests for concurrent archive verification in Mapper.map_domain."""
+
+import asyncio
+import threading
+
+import pytest
+
+from modules.jester.MAPPER.mapper import Mapper
+from modules.jester.MAPPER.models import DiscoveredURL
+from modules.jester.MAPPER.verifier import ArchiveVerifier, VerificationCache
+
+
+async def _live(domain):
+    for i in range(5):
+        yield DiscoveredURL(url=f"https://{domain}/live{i}", source="sitemap")
+
+
+async def _archived(domain):
+    for i in range(20):
+        yield DiscoveredURL(url=f"https://{domain}/old{i}", source="wayback", is_archived=True)
+
+
+def _mapper(tmp_path, check):
+    mapper = Mapper(cache_dir=tmp_path)
+    mapper._source_map = {"sitemap": _live, "wayback": _archived}
+    mapper._verify_url_exists = check
+    mapper._client = object()
+
+    async def no_dns():
+        pass
+
+    mapper._precache_dns = no_dns
+    return mapper
+
+
+async def _collect(mapper, **kwargs):
+    return [u async for u in mapper.map_domain("example.com", sources=["sitemap", "wayback"], **kwargs)]
+
+
+@pytest.mark.parametrize("order", ["priority", "completed"])
+def test_failed_check_does_not_drop_other_urls(tmp_path, order):
+    async def check(url, client):
+        await asyncio.sleep(0.001)
+        if url.endswith("/old3"):
+            raise RuntimeError("connection reset")
+        return True, 200
+
+    found = asyncio.run(_collect(_mapper(tmp_path, check), verify_order=order))
+    urls = {u.url for u in found}
+
+    assert len(urls) == 25
+    failed = next(u for u in found if u.url.endswith("/old3"))
+    assert failed.current_exists is None
+    assert all(u.current_exists for u in found if u.is_archived and u is not failed)
+
+
+def test_failed_check_is_unknown_for_current_only(tmp_path):
+    async def check(url, client):
+        if url.endswith("/old3"):
+            raise RuntimeError("connection reset")
+        return True, 200
+
+    found = asyncio.run(_collect(_mapper(tmp_path, check), verify_order="completed", archive_mode="current_only"))
+    assert len(found) == 24
+    assert not any(u.url.endswith("/old3") for u in found)
+
+
+def test_verification_cache_io_runs_off_the_loop(tmp_path):
+    cache = VerificationCache(tmp_path / "url_status.db", batch_size=2)
+    threads = []
+    for name in ("get", "flush"):
+        original = getattr(cache, name)
+
+        def tracked(*args, _original=original):
+            threads.append(threading.current_thread())
+            return _original(*args)
+
+        setattr(cache, name, tracked)
+
+    async def check(url):
+        return True, 200
+
+    async def run():
+        verifier = ArchiveVerifier(check, cache)
+        await asyncio.gather(*(verifier.verify(f"https://example.com/{i}") for i in range(4)))
+        await verifier.aclose()
+
+    asyncio.run(run())
+    assert threads and threading.main_thread() not in threads
+
+    reopened = VerificationCache(tmp_path / "url_status.db")
+    assert reopened.get("https://example.com/3")[0] is True
+    reopened.close()
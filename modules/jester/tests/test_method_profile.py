@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for the per-domain JESTER method profile."""
+
+import asyncio
+import threading
+
+from modules.jester.method_profile import MethodProfileStore
+from modules.jester.scraper import Jester, JesterConfig, JesterMethod
+
+TIERS = [JesterMethod.JESTER_A, JesterMethod.JESTER_B, JesterMethod.JESTER_C]
+
+
+def _store(tmp_path, **kwargs):
+    kwargs.setdefault("exploration", 0.0)
+    return MethodProfileStore(db_path=str(tmp_path / "profile.db"), **kwargs)
+
+
+def test_repeatedly_failing_tiers_are_skipped(tmp_path):
+    store = _store(tmp_path)
+    for _ in range(4):
+        store.record("https://blocked.example/a", JesterMethod.JESTER_A, success=False)
+        store.record("https://blocked.example/b", JesterMethod.JESTER_B, success=True, latency_ms=300)
+
+    assert store.start_method("https://www.blocked.example/c", TIERS) == JesterMethod.JESTER_B
+    assert store.start_method("https://fresh.example/", TIERS) is None
+    assert store.profile("blocked.example")["last_success_method"] == "jester_b"
+
+
+def test_records_stay_in_memory_until_flushed(tmp_path):
+    store = _store(tmp_path, flush_every=3)
+    for _ in range(2):
+        store.record("https://a.example/", JesterMethod.JESTER_A, success=False)
+    store.record("https://b.example/", JesterMethod.JESTER_A, success=False)
+    store.record("https://c.example/", JesterMethod.JESTER_A, success=False)
+    assert store.flush_due
+
+    store.flush()
+    assert not store.flush_due
+    store.close()
+
+    reopened = _store(tmp_path)
+    assert reopened.profile("a.example")["methods"]["jester_a"]["attempts"] > 1.9
+
+
+def test_async_callers_do_sqlite_io_off_the_loop(tmp_path):
+    store = _store(tmp_path)
+    for _ in range(3):
+        store.record("https://blocked.example/", JesterMethod.JESTER_A, success=False)
+    store.close()
+
+    reopened = _store(tmp_path)
+    io_threads = []
+    connect = reopened._connect
+
+    def tracking_connect():
+        io_threads.append(threading.current_thread())
+        return connect()
+
+    reopened._connect = tracking_connect
+
+    async def run():
+        await reopened.preload(["https://blocked.example/x"])
+        start = reopened.start_method("https://blocked.example/x", TIERS)
+        reopened.record("https://blocked.example/x", JesterMethod.JESTER_B, success=True)
+        await reopened.aflush()
+        return start
+
+    assert asyncio.run(run()) == JesterMethod.JESTER_B
+    assert io_threads and threading.main_thread() not in io_threads
+
+
+def test_profile_is_opt_in():
+    assert Jester(JesterConfig())._profile is None
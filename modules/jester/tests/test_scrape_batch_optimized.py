@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Tests for the streaming tier pipeline in Jester.scrape_batch_optimized."""
+
+import asyncio
+
+from modules.jester.scraper import Jester, JesterConfig, JesterMethod, JesterResult
+
+
+def _result(url, method, ok):
+    return JesterResult(url=url, html="x" * 200 if ok else "", method=method,
+                        latency_ms=0, status_code=200, content_length=0)
+
+
+def _index(url):
+    return int(url.rsplit("/", 1)[-1])
+
+
+class FakeJester(Jester):
+    """Tiers succeed by URL number: A on multiples of 2, B of 3, C of 5."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.go_calls = []
+        self.colly_running = 0
+        self.colly_peak = 0
+
+    async def _ensure_init(self):
+        self._colly_available = self._rod_available = True
+        self._jester_d_available = False
+        self._firecrawl_key = None
+
+    async def scrape_a(self, url):
+        await asyncio.sleep(0.001)
+        return _result(url, JesterMethod.JESTER_A, _index(url) % 2 == 0)
+
+    async def _batch_jester_b(self, urls, max_concurrent=None):
+        self.go_calls.append(("B", len(urls), max_concurrent))
+        self.colly_running += max_concurrent
+        self.colly_peak = max(self.colly_peak, self.colly_running)
+        await asyncio.sleep(0.02)
+        self.colly_running -= max_concurrent
+        return [_result(u, JesterMethod.JESTER_B, _index(u) % 3 == 0) for u in urls]
+
+    async def _batch_jester_c(self, urls, max_concurrent=None):
+        self.go_calls.append(("C", len(urls), max_concurrent))
+        await asyncio.sleep(0.02)
+        return [_result(u, JesterMethod.JESTER_C, _index(u) % 5 == 0) for u in urls]
+
+
+def _run(config, urls):
+    jester = FakeJester(config)
+    results = asyncio.run(jester.scrape_batch_optimized(urls))
+    return jester, results
+
+
+def test_results_follow_input_order_and_fall_through_tiers():
+    urls = [f"https://h{i % 3}.example/{i}" for i in range(30)] + ["https://h0.example/4"]
+    _, results = _run(JesterConfig(use_method_profile=False), urls)
+
+    assert [r.url for r in results] == urls
+    assert results[4].method == JesterMethod.JESTER_A
+    assert results[3].method == JesterMethod.JESTER_B
+    assert results[5].method == JesterMethod.JESTER_C
+    assert results[7].method == JesterMethod.JESTER_C and not results[7].html
+
+
+def test_in_flight_go_calls_share_tier_concurrency():
+    config = JesterConfig(use_method_profile=False, max_concurrent_b=10, max_concurrent_c=4,
+                          max_go_batches=2, batch_window_b=0.0, batch_window_c=0.0)
+    urls = [f"https://h{i % 7}.example/{2 * i + 1}" for i in range(60)]
+    jester, _ = _run(config, urls)
+
+    colly_calls = [call for call in jester.go_calls if call[0] == "B"]
+    assert colly_calls
+    assert all(size <= 5 and share == 5 for _, size, share in colly_calls)
+    assert jester.colly_peak <= config.max_concurrent_b
+    assert all(share == 2 for tier, _, share in jester.go_calls if tier == "C")
@@ -73,7 +73,10 @@ import re
 import shlex
 import asyncio
 import logging
+import threading
 import aiohttp
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 from urllib.parse import urlparse
 from typing import Dict, Any, Optional, Tuple, List
@@ -157,6 +160,18 @@ except ImportError:
     CompareOperator = None
     SimilarityEngine = None
 
+# Pairwise similarity / clustering for the basic compare path
+from .node_similarity import (
+    NodeFeatures,
+    node_similarity,
+    nearest_neighbors,
+    cluster_pairs,
+    average_similarity,
+    CLUSTER_THRESHOLD,
+    HIGH_SIMILARITY,
+    DENSE_MAX_NODES,
+)
+
 # Import surprising AND detection
 try:
     from modules.sastre.narrative.surprising_and import SurprisingAndDetector, detect_surprising_ands
@@ -1367,6 +1382,198 @@ def parse_multi_domain_backlink(query: str) -> Tuple[str, List[str]]:
     return mode, domains
 
 
+# =============================================================================
+# OPERATOR DISPATCH (one scan → typed routing plan)
+# =============================================================================
+
+# Unanchored operator tokens, found in a single finditer pass. The alternatives
+# cannot overlap (exploration stops before its ':', historical tokens start
+# with ':', pipes are '=>'), so every token kind present in the query is seen.
+OPERATOR_SCANNER = re.compile(
+    r'(?P<pipe>=>)'
+    r'|(?P<historical>' + HISTORICAL_PATTERN.pattern + r')'
+    r'|(?P<exploration>\b(?:indom|inurl)\s*(?=:)|\bhop\(\d+\))',
+    re.IGNORECASE,
+)
+
+# Routes in the order UnifiedExecutor.execute has always tried them. Routes in
+# CONFIRMED_ROUTES are only candidates after the scan; their has_* check runs
+# to confirm (anchored regexes, social prefixes, tag syntax).
+ROUTE_ORDER = [
+    'submarine', 'submarine_explore', 'chain_pipe', 'chain', 'agent_direct',
+    'template', 'index', 'scrape', 'grid', 'historical', 'macro', 'entity',
+    'multi_domain_backlink', 'boolean_tag', 'watcher', 'tagging', 'dd', 'lit',
+    'reg', 'registry', 'io', 'query', 'auto_io', 'brute',
+]
+
+CONFIRMED_ROUTES = {
+    'multi_domain_backlink': has_multi_domain_backlink,
+    'boolean_tag': has_boolean_tag_query,
+    'watcher': has_watcher_operator,
+    'tagging': has_tagging_operator,
+    'dd': has_dd_operator,
+    'lit': has_lit_operator,
+    'reg': has_reg_operator,
+    'io': has_io_prefix,
+}
+
+AUTO_IO_PREFIXES = {
+    "email": "e:",
+    "phone": "t:",
+    "domain": "d:",
+    "linkedin_url": "li:",
+}
+
+PLAN_CACHE_SIZE = 1024
+
+
+@dataclass
+class RoutePlan:
+    """
+    Where a query goes, decided once.
+
+    route:  name from ROUTE_ORDER
+    query:  query to hand the route's executor (rewritten for submarine_explore / auto_io)
+    parsed: unified parser result when the plan got that far (read-only, may be shared)
+    tokens: (kind, position, text) for every operator token found
+    """
+    route: str
+    query: str
+    parsed: Optional[ParsedQuery] = None
+    tokens: List[Tuple[str, int, str]] = field(default_factory=list)
+
+
+class OperatorDispatcher:
+    """
+    Operator grammar compiled into one prefix table plus one token scanner.
+
+    Prefix operators (p:, chain:, csr:, bl?, ...) are looked up by slicing the
+    query start to each distinct prefix length, so the cost does not grow with
+    the number of operators. Everything else comes from OPERATOR_SCANNER.
+    Plans are kept in an LRU keyed by the stripped query.
+    """
+
+    def __init__(self, cache_size: int = PLAN_CACHE_SIZE):
+        families: Dict[str, List[str]] = {
+            'submarine': ['/submarine'],
+            'chain': ['chain:'],
+            'agent_direct': list(AGENT_DIRECT_PREFIXES),
+            'template': ['template:'],
+            'index': ['/index'],
+            'scrape': ['/scrape'],
+            'macro': list(MACRO_OPERATORS),
+            'entity': list(ENTITY_OPERATORS),
+            'registry': list(get_registry_operators()),
+            # Candidates only - confirmed by CONFIRMED_ROUTES
+            'multi_domain_backlink': ['bl?', '?bl'],
+            'boolean_tag': ['('],
+            'watcher': ['-#w', '~#w', '+#w', '/w'],
+            'dd': ['dd'],
+            'lit': ['lit'],
+            'reg': ['reg'],
+            'io': list(IO_PREFIXES) + [
+                'fb', 'facebook', 'tw', 'twitter', 'x', 'ig', 'instagram', 'threads', 'social', 'all',
+            ],
+        }
+        self._prefixes: Dict[str, List[str]] = {}
+        for route, prefixes in families.items():
+            for prefix in prefixes:
+                self._prefixes.setdefault(prefix, []).append(route)
+        self._prefix_lengths = sorted({len(p) for p in self._prefixes})
+
+        self.cache_size = cache_size
+        self._plans: "OrderedDict[str, RoutePlan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def scan(self, query: str) -> List[Tuple[str, int, str]]:
+        """All operator tokens as (kind, position, text), in query order."""
+        query_lower = query.lower()
+        tokens = []
+        for length in self._prefix_lengths:
+            if length > len(query_lower):
+                break
+            prefix = query_lower[:length]
+            for route in self._prefixes.get(prefix, ()):
+                tokens.append((route, 0, query[:length]))
+        tokens.extend((m.lastgroup, m.start(), m.group()) for m in OPERATOR_SCANNER.finditer(query))
+        return tokens
+
+    def plan(self, query: str) -> RoutePlan:
+        """Routing plan for a query (cached)."""
+        query = query.strip()
+        with self._lock:
+            plan = self._plans.get(query)
+            if plan is not None:
+                self._plans.move_to_end(query)
+                return plan
+
+        plan = self._build_plan(query)
+
+        if self.cache_size > 0:
+            with self._lock:
+                self._plans[query] = plan
+                if len(self._plans) > self.cache_size:
+                    self._plans.popitem(last=False)
+        return plan
+
+    def clear_cache(self):
+        with self._lock:
+            self._plans.clear()
+
+    def _build_plan(self, query: str) -> RoutePlan:
+        tokens = self.scan(query)
+        kinds = {kind for kind, _, _ in tokens}
+        if 'pipe' in kinds:
+            # Tagging and watcher chains (=> #tag, => +#w) hang off the pipe
+            kinds.update(('tagging', 'watcher'))
+            if CHAIN_PARSER_AVAILABLE:
+                kinds.add('chain_pipe')
+        if 'exploration' in kinds:
+            kinds.add('submarine_explore')
+
+        parsed = None
+        for route in ROUTE_ORDER:
+            if route == 'grid':
+                parsed = parse_unified_query(query)
+                if parsed and parsed.is_grid_query:
+                    return RoutePlan('grid', query, parsed, tokens)
+            elif route == 'query':
+                if parsed and parsed.operators and (
+                    parsed.wants_backlinks or parsed.wants_outlinks
+                    or parsed.wants_entities or parsed.wants_filetype
+                ):
+                    return RoutePlan('query', query, parsed, tokens)
+            elif route == 'auto_io':
+                prefix = AUTO_IO_PREFIXES.get(_detect_entity_type(query))
+                if prefix:
+                    return RoutePlan('auto_io', f"{prefix} {query}", parsed, tokens)
+            elif route == 'brute':
+                return RoutePlan('brute', query, parsed, tokens)
+            elif route in kinds:
+                confirm = CONFIRMED_ROUTES.get(route)
+                if confirm is None or confirm(query):
+                    if route == 'submarine_explore':
+                        return RoutePlan(route, f"/submarine explore {query}", parsed, tokens)
+                    return RoutePlan(route, query, parsed, tokens)
+        return RoutePlan('brute', query, parsed, tokens)
+
+
+_DISPATCHER: Optional[OperatorDispatcher] = None
+
+
+def get_operator_dispatcher() -> OperatorDispatcher:
+    """Shared dispatcher (built on first use, after registry operators load)."""
+    global _DISPATCHER
+    if _DISPATCHER is None:
+        _DISPATCHER = OperatorDispatcher()
+    return _DISPATCHER
+
+
+def plan_query(query: str) -> RoutePlan:
+    """Decide where UnifiedExecutor.execute would send a query, without running it."""
+    return get_operator_dispatcher().plan(query)
+
+
 # =============================================================================
 # UNIFIED EXECUTOR
 # =============================================================================
@@ -1498,117 +1705,48 @@ class UnifiedExecutor:
         4. IO Prefixes (p:, c:, e:, d:, t:) → IOExecutor
         5. Query Operators (bl?, ent?, pdf!, etc.) → QueryExecutor (web targets)
         6. Exact Phrases → BRUTE (40+ engines)
+
+        The full order lives in ROUTE_ORDER; plan_query() decides the route in
+        one operator scan and caches the plan per query.
         """
         self._lazy_load()
-        query = query.strip()
-
-        # Submarine discovery command
-        if query.lower().startswith("/submarine"):
-            return await self._execute_submarine(query, project_id)
-
-        # SUBMARINE exploration shortcuts (indom:/inurl:/hop(n)) without requiring "/submarine explore"
-        if looks_like_submarine_exploration(query):
-            return await self._execute_submarine(f"/submarine explore {query}", project_id)
-
-        # Chain pipes (=> syntax) → execute each step, pass results forward
-        if has_chain_pipe(query):
-            return await self._execute_chain_pipe(query, project_id)
-
-        # Chain operators → IOPlanner (multi-step investigations)
-        if has_chain_operator(query):
-            return await self._execute_chain(query, project_id)
-
-        # Direct agent addressing (edith:, wikiman:, cymonides:, etc.)
-        if has_agent_direct_operator(query):
-            return await self._execute_agent_direct(query, project_id)
-
-        # Template operators → ThinOrchestrator (full investigation flow)
-        if has_template_operator(query):
-            return await self._execute_template(query, project_id)
-
-        # Index command (stub)
-        if query.lower().startswith("/index"):
-            return await self._execute_index_command(query, project_id)
-
-        # Scrape command (single URL or depth-based crawl)
-        if query.lower().startswith("/scrape"):
-            return await self._execute_scrape_command(query, project_id)
-
-        # First, try unified parser to detect grid queries and operators
-        parsed = parse_unified_query(query)
-        if parsed and parsed.is_grid_query:
-            return await self._execute_grid(parsed, project_id)
-
-        # Historical operators (:2022!, :<-) → Archive search via Linklater
-        if has_historical_operator(query):
-            return await self._execute_historical(query, project_id)
-
-        # Macro operators (alldom:, cdom:, crel:, age:, rep:, dns:) → LINKLATER/specialized
-        if has_macro_operator(query):
-            return await self._execute_macro(query, project_id)
-
-        # Entity extraction operators (ent?, p?, c?, e?, t?, a?, u?) → LINKLATER
-        if has_entity_operator(query):
-            return await self._execute_entity_extraction(query, project_id)
-
-        # Multi-domain batch backlink queries (bl? :!domain1 :!domain2 ...) → Batch LINKLATER
-        if has_multi_domain_backlink(query):
-            return await self._execute_multi_domain_backlinks(query, project_id)
-
-        # Boolean tag queries (#a AND #b), (#a OR #b) → GraphProvider
-        if has_boolean_tag_query(query):
-            return await self._execute_boolean_tag_query(query, project_id)
-
-        # Watcher operators (+#w:, -#w:, #w?, +#watcher:) → WatcherBridge
-        if has_watcher_operator(query):
-            return await self._execute_watcher(query, project_id)
-
-        # Tagging operators (=> +#tag, => -#tag, => #tag) → GraphProvider
-        if has_tagging_operator(query):
-            return await self._execute_tagging(query, project_id)
-
-# DD operators → Template-driven DD investigation
-        if has_dd_operator(query):
-            return await self._execute_dd(query, project_id)
-
-        # Litigation operators → Jurisdictional litigation module
-        if has_lit_operator(query):
-            return await self._execute_lit(query, project_id)
-
-        # Regulatory operators → Jurisdictional regulatory module
-        if has_reg_operator(query):
-            return await self._execute_reg(query, project_id)
-
-        # Registry operators → Torpedo
-        if has_registry_operator(query):
-            return await self._execute_registry(query, project_id)
-
-        # IO prefixes → IOExecutor
-        if has_io_prefix(query):
-            return await self._execute_io(query, project_id)
-
-        # If we have parsed operators but not grid query, use appropriate executor
-        if parsed and parsed.operators:
-            # Query operators for web targets → Query executor (link analysis, entity extraction)
-            if parsed.wants_backlinks or parsed.wants_outlinks or parsed.wants_entities:
-                return await self._execute_query(parsed, project_id)
-            # Filetype search
-            if parsed.wants_filetype:
-                return await self._execute_query(parsed, project_id)
-
-        # Auto-route bare IO values (email/phone/domain/linkedin) into IOExecutor
-        auto_type = _detect_entity_type(query)
-        if auto_type in {"email", "phone", "domain", "linkedin_url"}:
-            prefix_map = {
-                "email": "e:",
-                "phone": "t:",
-                "domain": "d:",
-                "linkedin_url": "li:",
-            }
-            return await self._execute_io(f"{prefix_map[auto_type]} {query}", project_id)
+        plan = plan_query(query)
+
+        # Grid queries and web-target query operators run off the parsed query
+        if plan.route == 'grid':
+            return await self._execute_grid(plan.parsed, project_id)
+        if plan.route == 'query':
+            return await self._execute_query(plan.parsed, project_id)
+
+        handlers = {
+            'submarine': self._execute_submarine,          # /submarine ...
+            'submarine_explore': self._execute_submarine,  # indom:/inurl:/hop(n) shortcuts
+            'chain_pipe': self._execute_chain_pipe,        # => pipes, results passed forward
+            'chain': self._execute_chain,                  # chain: <type> → IOPlanner
+            'agent_direct': self._execute_agent_direct,    # edith:, wikiman:, cymonides:, ...
+            'template': self._execute_template,            # template:genre:jurisdiction
+            'index': self._execute_index_command,
+            'scrape': self._execute_scrape_command,
+            'historical': self._execute_historical,        # :2022!, :<- → archives
+            'macro': self._execute_macro,                  # alldom:, cdom:, crel:, age:, rep:, dns:
+            'entity': self._execute_entity_extraction,     # ent?, p?, c?, e?, t?, a?, u?
+            'multi_domain_backlink': self._execute_multi_domain_backlinks,
+            'boolean_tag': self._execute_boolean_tag_query,  # (#a AND #b)
+            'watcher': self._execute_watcher,              # +#w:, -#w:, /w{...}
+            'tagging': self._execute_tagging,              # => +#tag, => -#tag
+            'dd': self._execute_dd,
+            'lit': self._execute_lit,
+            'reg': self._execute_reg,
+            'registry': self._execute_registry,            # csr:, chr:, cde:, cuk: → Torpedo
+            'io': self._execute_io,                        # p:, c:, e:, t:, d: → IOExecutor
+            'auto_io': self._execute_io,                   # bare email/phone/domain/linkedin
+        }
+        handler = handlers.get(plan.route)
+        if handler is not None:
+            return await handler(plan.query, project_id)
 
         # Everything else → BRUTE (exact phrases, general search)
-        return await self._execute_brute(query, project_id)
+        return await self._execute_brute(plan.query, project_id)
 
     async def _execute_io(self, query: str, project_id: str) -> Dict[str, Any]:
         """Execute IO prefix query."""
@@ -4230,11 +4368,11 @@ class UnifiedExecutor:
         # Convert to our format
         matrix = []
         high_pairs = []
-        neighbors = {}
         verdicts = {}
 
         # Build similarity matrix from pairwise comparisons
         id_to_idx = {nid: i for i, nid in enumerate(node_ids)}
+        pairs = []
 
         # Initialize matrix
         for _ in nodes:
@@ -4248,10 +4386,11 @@ class UnifiedExecutor:
         for comp in result.comparisons:
             i = id_to_idx.get(comp.node_a_id)
             j = id_to_idx.get(comp.node_b_id)
-            if i is not None and j is not None:
+            if i is not None and j is not None and i != j:
                 score = comp.score.total
                 matrix[i][j] = score
                 matrix[j][i] = score
+                pairs.append((min(i, j), max(i, j), score))
 
                 # Track verdicts
                 verdicts[f"{comp.node_a_id}:{comp.node_b_id}"] = {
@@ -4273,20 +4412,10 @@ class UnifiedExecutor:
                     })
 
         # Build neighbors
-        for i, node in enumerate(nodes):
-            node_id = node["node_id"]
-            neighbors[node_id] = []
-            for j, other in enumerate(nodes):
-                if i != j:
-                    neighbors[node_id].append({
-                        "node_id": other["node_id"],
-                        "label": other.get("label"),
-                        "score": matrix[i][j]
-                    })
-            neighbors[node_id] = sorted(neighbors[node_id], key=lambda x: -x["score"])[:5]
+        neighbors = self._neighbors_from_pairs(nodes, pairs)
 
-        # Cluster using CompareOperator or fallback
-        clusters = self._cluster_similar_nodes(nodes, matrix, threshold=0.7)
+        # Cluster over compared pairs (single-linkage)
+        clusters = self._cluster_similar_nodes(nodes, pairs, threshold=CLUSTER_THRESHOLD)
 
         return {
             "similarity_matrix": matrix,
@@ -4309,60 +4438,55 @@ class UnifiedExecutor:
         }
 
     def _compute_similarity_basic(self, nodes: List[Dict]) -> Dict:
-        """Fallback basic similarity computation."""
-        # Compute pairwise similarities
-        matrix = []
-        high_pairs = []
-        neighbors = {}
-
-        for i, node_a in enumerate(nodes):
-            row = []
-            vec_a = node_a.get("_comparison_vectors", {})
-            neighbors[node_a["node_id"]] = []
-
-            for j, node_b in enumerate(nodes):
-                if i == j:
-                    row.append(1.0)
-                    continue
-
-                vec_b = node_b.get("_comparison_vectors", {})
-                score, breakdown = self._compute_node_similarity(vec_a, vec_b)
-                row.append(score)
+        """
+        Fallback basic similarity computation.
 
-                if score > 0.8:
-                    high_pairs.append({
-                        "node_a": node_a["node_id"],
-                        "node_b": node_b["node_id"],
-                        "score": score,
-                        "breakdown": breakdown,
-                        "suggested_action": "FUSE" if score > 0.95 else "INVESTIGATE"
-                    })
+        Each unordered pair is scored once (vectorized when numpy is
+        installed). Above DENSE_MAX_NODES only blocked candidate pairs are
+        scored and no full matrix is returned.
+        """
+        n = len(nodes)
+        node_ids = [node["node_id"] for node in nodes]
+        features = NodeFeatures([node.get("_comparison_vectors", {}) for node in nodes])
+        blocked = n > DENSE_MAX_NODES
+        pairs = features.score_pairs(features.candidate_pairs(blocking=blocked))
+        scores = {(i, j): score for i, j, score in pairs}
 
-                neighbors[node_a["node_id"]].append({
-                    "node_id": node_b["node_id"],
-                    "label": node_b.get("label"),
-                    "score": score
-                })
+        matrix = []
+        if not blocked:
+            matrix = [[0.0] * n for _ in range(n)]
+            for i in range(n):
+                matrix[i][i] = 1.0
+            for i, j, score in pairs:
+                matrix[i][j] = matrix[j][i] = score
 
-            matrix.append(row)
+        high_pairs = []
+        for i, j, score in sorted(p for p in pairs if p[2] > HIGH_SIMILARITY):
+            high_pairs.append({
+                "node_a": node_ids[i],
+                "node_b": node_ids[j],
+                "score": score,
+                "breakdown": features.breakdown(i, j),
+                "suggested_action": "FUSE" if score > 0.95 else "INVESTIGATE"
+            })
 
-        # Sort neighbors by score
-        for node_id in neighbors:
-            neighbors[node_id] = sorted(neighbors[node_id], key=lambda x: -x["score"])[:5]
+        neighbors = self._neighbors_from_pairs(nodes, pairs)
 
-        # Cluster similar nodes (simple single-linkage)
-        clusters = self._cluster_similar_nodes(nodes, matrix, threshold=0.7)
+        # Cluster similar nodes (single-linkage)
+        clusters = self._cluster_similar_nodes(nodes, pairs, CLUSTER_THRESHOLD, scores, features.score)
 
         return {
             "similarity_matrix": matrix,
-            "node_order": [n["node_id"] for n in nodes],
+            "node_order": node_ids,
             "high_similarity_pairs": high_pairs,
             "potential_duplicates": len([p for p in high_pairs if p["score"] > 0.95]),
             "nearest_neighbors": neighbors,
             "clusters": clusters,
             "engine": "basic",
             "summary": {
-                "total_nodes": len(nodes),
+                "total_nodes": n,
+                "pairs_scored": len(pairs),
+                "blocked": blocked,
                 "high_similarity_count": len(high_pairs),
                 "cluster_count": len(clusters)
             }
@@ -4370,140 +4494,37 @@ class UnifiedExecutor:
 
     def _compute_node_similarity(self, vec_a: Dict, vec_b: Dict) -> Tuple[float, Dict]:
         """Compute similarity between two node vectors."""
-        scores = {}
-
-        # Name similarity (Jaccard)
-        name_a = vec_a.get("name_tokens", set())
-        name_b = vec_b.get("name_tokens", set())
-        if name_a and name_b:
-            intersection = len(name_a & name_b)
-            union = len(name_a | name_b)
-            scores["name"] = intersection / union if union > 0 else 0
-        else:
-            scores["name"] = 0
-
-        # Type match (exact)
-        scores["type"] = 1.0 if vec_a.get("entity_type") == vec_b.get("entity_type") else 0
-
-        # Identifier match (any shared = high signal)
-        id_a = vec_a.get("identifiers", {})
-        id_b = vec_b.get("identifiers", {})
-        shared_ids = 0
-        for key in id_a:
-            if id_a.get(key) and id_b.get(key):
-                if id_a[key] == id_b[key]:
-                    shared_ids += 1
-                else:
-                    scores["identifier_conflict"] = True
-        scores["identifiers"] = min(1.0, shared_ids * 0.5)  # Each shared ID = 0.5
-
-        # Jurisdiction match
-        scores["jurisdiction"] = 1.0 if (vec_a.get("jurisdiction") and vec_a["jurisdiction"] == vec_b.get("jurisdiction")) else 0
-
-        # Country match
-        scores["country"] = 1.0 if (vec_a.get("country") and vec_a["country"] == vec_b.get("country")) else 0
-
-        # Address similarity
-        addr_a = vec_a.get("address", "")
-        addr_b = vec_b.get("address", "")
-        if addr_a and addr_b:
-            # Simple token overlap
-            tokens_a = set(addr_a.split())
-            tokens_b = set(addr_b.split())
-            intersection = len(tokens_a & tokens_b)
-            union = len(tokens_a | tokens_b)
-            scores["address"] = intersection / union if union > 0 else 0
-        else:
-            scores["address"] = 0
-
-        # Temporal overlap
-        years_a = vec_a.get("active_years", set())
-        years_b = vec_b.get("active_years", set())
-        if years_a and years_b:
-            intersection = len(years_a & years_b)
-            union = len(years_a | years_b)
-            scores["temporal"] = intersection / union if union > 0 else 0
-        else:
-            scores["temporal"] = 0
-
-        # Source overlap
-        sources_a = vec_a.get("sources", set())
-        sources_b = vec_b.get("sources", set())
-        if sources_a and sources_b:
-            intersection = len(sources_a & sources_b)
-            union = len(sources_a | sources_b)
-            scores["sources"] = intersection / union if union > 0 else 0
-        else:
-            scores["sources"] = 0
-
-        # Weighted average - only count dimensions with data
-        weights = {
-            "name": 0.25,
-            "type": 0.10,
-            "identifiers": 0.40,  # Unique IDs are strongest signal
-            "jurisdiction": 0.10,
-            "country": 0.05,
-            "address": 0.05,
-            "temporal": 0.03,
-            "sources": 0.02
-        }
-
-        # Only use dimensions that have data (non-zero scores)
-        active_weights = {}
-        for k, w in weights.items():
-            # Identifiers always count (0 means no match, which is meaningful)
-            if k == "identifiers" or scores.get(k, 0) > 0 or (k in ["type"] and scores.get(k) == 0):
-                active_weights[k] = w
-
-        # Normalize weights
-        total_weight = sum(active_weights.values())
-        if total_weight == 0:
-            total = 0
-        else:
-            total = sum(scores.get(k, 0) * (w / total_weight) for k, w in active_weights.items())
-
-        # Identifier match is a STRONG signal - boost if identifiers match
-        if scores.get("identifiers", 0) > 0:
-            total = max(total, 0.8 + (scores["identifiers"] * 0.2))  # Floor at 0.8 if any ID matches
+        return node_similarity(vec_a, vec_b)
 
-        # Identifier conflict = strong signal of difference
-        if scores.get("identifier_conflict"):
-            total *= 0.3  # Heavy penalty
-
-        return round(total, 3), {k: round(v, 3) for k, v in scores.items() if isinstance(v, (int, float))}
-
-    def _cluster_similar_nodes(self, nodes: List[Dict], matrix: List[List[float]], threshold: float) -> List[Dict]:
-        """Simple single-linkage clustering of similar nodes."""
-        n = len(nodes)
-        visited = set()
+    def _neighbors_from_pairs(self, nodes: List[Dict], pairs: List[Tuple[int, int, float]], k: int = 5) -> Dict:
+        """Top-k nearest neighbors per node from scored (i, j, score) pairs."""
+        neighbors = {}
+        for i, nearest in enumerate(nearest_neighbors(len(nodes), pairs, k)):
+            neighbors[nodes[i]["node_id"]] = [
+                {"node_id": nodes[j]["node_id"], "label": nodes[j].get("label"), "score": score}
+                for j, score in nearest
+            ]
+        return neighbors
+
+    def _cluster_similar_nodes(
+        self,
+        nodes: List[Dict],
+        pairs: List[Tuple[int, int, float]],
+        threshold: float,
+        scores: Optional[Dict[Tuple[int, int], float]] = None,
+        score_fn=None,
+    ) -> List[Dict]:
+        """Single-linkage clustering: connected components of pairs >= threshold."""
+        if scores is None:
+            scores = {(i, j): score for i, j, score in pairs}
         clusters = []
-
-        for i in range(n):
-            if i in visited:
-                continue
-
-            # Start new cluster
-            cluster_members = [i]
-            visited.add(i)
-
-            # Find all connected nodes above threshold
-            queue = [i]
-            while queue:
-                current = queue.pop(0)
-                for j in range(n):
-                    if j not in visited and matrix[current][j] >= threshold:
-                        cluster_members.append(j)
-                        visited.add(j)
-                        queue.append(j)
-
-            if len(cluster_members) > 1:
-                clusters.append({
-                    "members": [nodes[idx]["node_id"] for idx in cluster_members],
-                    "labels": [nodes[idx].get("label") for idx in cluster_members],
-                    "size": len(cluster_members),
-                    "avg_similarity": round(sum(matrix[i][j] for i in cluster_members for j in cluster_members if i != j) / max(1, len(cluster_members) * (len(cluster_members) - 1)), 3)
-                })
-
+        for members in cluster_pairs(len(nodes), pairs, threshold):
+            clusters.append({
+                "members": [nodes[idx]["node_id"] for idx in members],
+                "labels": [nodes[idx].get("label") for idx in members],
+                "size": len(members),
+                "avg_similarity": average_similarity(members, scores, score_fn),
+            })
         return clusters
 
     async def _create_comparison_narrative(
@@ -0,0 +1,413 @@
+"""
+Pairwise node similarity and clustering for grid compare (=?) results.
+
+UnifiedExecutor used to fill a full n x n matrix in Python loops (scoring both
+(i, j) and (j, i)) and then re-walk it to cluster. This module scores each
+unordered pair once:
+
+- NodeFeatures encodes every node's comparison vectors once (token sets as
+  sorted id arrays, categorical fields as integer codes)
+- candidate pairs are the upper triangle, or - for large result sets - only
+  pairs sharing a name token or an identifier (blocking). Pairs sharing
+  neither score at most 0.47 under the weights below. Identifier blocks are
+  always paired in full; a name token shared by more than MAX_POSTING nodes
+  is split into a sorted-neighbourhood window (each node paired with the
+  MAX_POSTING nodes whose names sort next to it)
+- scores are computed for whole pair batches with numpy when installed,
+  otherwise pair by pair with node_similarity()
+- clusters are the connected components of above-threshold pairs, members
+  listed in breadth-first order from the lowest index
+
+Usage:
+    features = NodeFeatures([n.get("_comparison_vectors", {}) for n in nodes])
+    pairs = features.score_pairs(features.candidate_pairs(blocking=len(nodes) > DENSE_MAX_NODES))
+    clusters = cluster_pairs(len(nodes), pairs, threshold=0.7)
+"""
+
+from collections import defaultdict
+from itertools import combinations
+from typing import Any, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Dimension weights; only dimensions with data count (identifiers and type always)
+WEIGHTS = {
+    "name": 0.25,
+    "type": 0.10,
+    "identifiers": 0.40,  # Unique IDs are strongest signal
+    "jurisdiction": 0.10,
+    "country": 0.05,
+    "address": 0.05,
+    "temporal": 0.03,
+    "sources": 0.02,
+}
+
+CLUSTER_THRESHOLD = 0.7
+HIGH_SIMILARITY = 0.8
+DENSE_MAX_NODES = 300   # Above this, score blocked candidates only (no full matrix)
+MAX_POSTING = 200       # Name-token blocks larger than this are paired within a sorted window
+PAIR_BATCH = 200_000    # Pairs scored per vectorized batch
+
+Pair = Tuple[int, int, float]
+
+
+def _jaccard(a: set, b: set) -> float:
+    if a and b:
+        union = len(a | b)
+        return len(a & b) / union if union > 0 else 0
+    return 0
+
+
+def node_similarity(vec_a: Dict, vec_b: Dict) -> Tuple[float, Dict]:
+    """Compute similarity between two node comparison vectors -> (score, breakdown)."""
+    scores = {}
+
+    # Name similarity (Jaccard)
+    scores["name"] = _jaccard(vec_a.get("name_tokens", set()), vec_b.get("name_tokens", set()))
+
+    # Type match (exact)
+    scores["type"] = 1.0 if vec_a.get("entity_type") == vec_b.get("entity_type") else 0
+
+    # Identifier match (any shared = high signal)
+    id_a = vec_a.get("identifiers", {})
+    id_b = vec_b.get("identifiers", {})
+    shared_ids = 0
+    for key in id_a:
+        if id_a.get(key) and id_b.get(key):
+            if id_a[key] == id_b[key]:
+                shared_ids += 1
+            else:
+                scores["identifier_conflict"] = True
+    scores["identifiers"] = min(1.0, shared_ids * 0.5)  # Each shared ID = 0.5
+
+    # Jurisdiction / country match
+    scores["jurisdiction"] = 1.0 if (vec_a.get("jurisdiction") and vec_a["jurisdiction"] == vec_b.get("jurisdiction")) else 0
+    scores["country"] = 1.0 if (vec_a.get("country") and vec_a["country"] == vec_b.get("country")) else 0
+
+    # Address similarity (simple token overlap)
+    addr_a = vec_a.get("address", "")
+    addr_b = vec_b.get("address", "")
+    scores["address"] = _jaccard(set(addr_a.split()), set(addr_b.split())) if addr_a and addr_b else 0
+
+    # Temporal and source overlap
+    scores["temporal"] = _jaccard(vec_a.get("active_years", set()), vec_b.get("active_years", set()))
+    scores["sources"] = _jaccard(vec_a.get("sources", set()), vec_b.get("sources", set()))
+
+    # Weighted average - only count dimensions with data (identifiers and type always)
+    active_weights = {}
+    for k, w in WEIGHTS.items():
+        if k in ("identifiers", "type") or scores.get(k, 0) > 0:
+            active_weights[k] = w
+
+    total_weight = sum(active_weights.values())
+    if total_weight == 0:
+        total = 0
+    else:
+        total = sum(scores.get(k, 0) * (w / total_weight) for k, w in active_weights.items())
+
+    # Identifier match is a STRONG signal - floor at 0.8 if any ID matches
+    if scores.get("identifiers", 0) > 0:
+        total = max(total, 0.8 + (scores["identifiers"] * 0.2))
+
+    # Identifier conflict = strong signal of difference
+    if scores.get("identifier_conflict"):
+        total *= 0.3  # Heavy penalty
+
+    return round(total, 3), {k: round(v, 3) for k, v in scores.items() if isinstance(v, (int, float))}
+
+
+class _Codes:
+    """Interns hashable values to small ints (0 reserved for 'no value')."""
+
+    def __init__(self):
+        self._ids: Dict[Hashable, int] = {}
+
+    def __call__(self, value: Any) -> int:
+        try:
+            return self._ids.setdefault(value, len(self._ids) + 1)
+        except TypeError:  # unhashable - compare by repr
+            return self._ids.setdefault(repr(value), len(self._ids) + 1)
+
+
+class NodeFeatures:
+    """Comparison vectors of n nodes, encoded once for batch scoring."""
+
+    SET_DIMENSIONS = ("name", "address", "temporal", "sources")
+
+    def __init__(self, vectors: Sequence[Dict]):
+        self.vectors = list(vectors)
+        self.n = len(self.vectors)
+        tokens = _Codes()
+        values = _Codes()
+
+        self.sets: Dict[str, List[List[int]]] = {dim: [] for dim in self.SET_DIMENSIONS}
+        self.types: List[int] = []
+        self.jurisdictions: List[int] = []
+        self.countries: List[int] = []
+        self.identifiers: Dict[Hashable, List[int]] = {}
+
+        for idx, vec in enumerate(self.vectors):
+            address = vec.get("address", "")
+            raw_sets = {
+                "name": vec.get("name_tokens", set()),
+                "address": set(address.split()) if address else set(),
+                "temporal": vec.get("active_years", set()),
+                "sources": vec.get("sources", set()),
+            }
+            for dim, items in raw_sets.items():
+                self.sets[dim].append(sorted({tokens((dim, t)) for t in items}))
+            # entity_type compares raw values (None != "")
+            self.types.append(values(("type", vec.get("entity_type"))))
+            self.jurisdictions.append(values(("jur", vec["jurisdiction"])) if vec.get("jurisdiction") else 0)
+            self.countries.append(values(("country", vec["country"])) if vec.get("country") else 0)
+            for key, value in (vec.get("identifiers") or {}).items():
+                column = self.identifiers.setdefault(key, [0] * self.n)
+                if value:
+                    column[idx] = values(("id", key, value))
+
+        self.vocabulary = len(tokens._ids) + 1
+        self._arrays = self._to_arrays() if NUMPY_AVAILABLE else None
+
+    def _to_arrays(self) -> Dict[str, Any]:
+        arrays: Dict[str, Any] = {
+            "type": np.asarray(self.types, dtype=np.int64),
+            "jurisdiction": np.asarray(self.jurisdictions, dtype=np.int64),
+            "country": np.asarray(self.countries, dtype=np.int64),
+            "identifiers": [np.asarray(col, dtype=np.int64) for col in self.identifiers.values()],
+        }
+        for dim, rows in self.sets.items():
+            lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=self.n)
+            flat = np.fromiter((t for r in rows for t in r), dtype=np.int64, count=int(lengths.sum()))
+            offsets = np.zeros(self.n + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            # (node, token) keys sorted, for membership tests
+            owners = np.repeat(np.arange(self.n, dtype=np.int64), lengths)
+            arrays[dim] = (offsets, lengths, flat, np.sort(owners * self.vocabulary + flat))
+        return arrays
+
+    # ─────────────────────────────────────────────────────────────
+    # Candidate pairs
+    # ─────────────────────────────────────────────────────────────
+
+    def candidate_pairs(self, blocking: bool = False, max_posting: int = MAX_POSTING) -> Iterable[Tuple[Any, Any]]:
+        """
+        Batches of (I, J) index arrays (lists without numpy) with I < J.
+
+        Without blocking this is the whole upper triangle. With blocking only
+        pairs sharing a name token or an identifier value are produced. A
+        name token shared by more than `max_posting` nodes pairs each node
+        only with its `max_posting` successors in name order; identifier
+        blocks are never capped.
+        """
+        if not blocking:
+            yield from self._upper_triangle()
+            return
+
+        names = self.sets["name"]
+        postings: Dict[Tuple, List[int]] = defaultdict(list)
+        for idx, name_tokens in enumerate(names):
+            for token in name_tokens:
+                postings[("t", token)].append(idx)
+        for key, column in self.identifiers.items():
+            for idx, code in enumerate(column):
+                if code:
+                    postings[("i", code)].append(idx)
+
+        def block_pairs(kind: str, members: List[int]) -> Iterable[Tuple[int, int]]:
+            if kind == "i" or len(members) <= max_posting:
+                return combinations(members, 2)
+            ordered = sorted(members, key=lambda idx: (names[idx], idx))
+            return (
+                (min(a, b), max(a, b))
+                for pos, a in enumerate(ordered)
+                for b in ordered[pos + 1:pos + 1 + max_posting]
+            )
+
+        seen = set()
+        batch_i: List[int] = []
+        batch_j: List[int] = []
+        for (kind, _), members in postings.items():
+            if len(members) < 2:
+                continue
+            for i, j in block_pairs(kind, members):
+                key = i * self.n + j
+                if key in seen:
+                    continue
+                seen.add(key)
+                batch_i.append(i)
+                batch_j.append(j)
+                if len(batch_i) >= PAIR_BATCH:
+                    yield self._batch(batch_i, batch_j)
+                    batch_i, batch_j = [], []
+        if batch_i:
+            yield self._batch(batch_i, batch_j)
+
+    def _batch(self, i: List[int], j: List[int]):
+        if NUMPY_AVAILABLE:
+            return np.asarray(i, dtype=np.int64), np.asarray(j, dtype=np.int64)
+        return i, j
+
+    def _upper_triangle(self):
+        n = self.n
+        if not NUMPY_AVAILABLE:
+            for i in range(n - 1):
+                yield [i] * (n - 1 - i), list(range(i + 1, n))
+            return
+        rows_per_batch = max(1, PAIR_BATCH // max(1, n))
+        for start in range(0, n - 1, rows_per_batch):
+            stop = min(n - 1, start + rows_per_batch)
+            i_parts, j_parts = [], []
+            for i in range(start, stop):
+                i_parts.append(np.full(n - 1 - i, i, dtype=np.int64))
+                j_parts.append(np.arange(i + 1, n, dtype=np.int64))
+            yield np.concatenate(i_parts), np.concatenate(j_parts)
+
+    # ─────────────────────────────────────────────────────────────
+    # Scoring
+    # ─────────────────────────────────────────────────────────────
+
+    def score_pairs(self, batches: Iterable[Tuple[Any, Any]], min_score: float = 0.0) -> List[Pair]:
+        """Score every candidate pair; returns (i, j, score) with score >= min_score."""
+        pairs: List[Pair] = []
+        for i_idx, j_idx in batches:
+            if NUMPY_AVAILABLE:
+                scores = self._score_batch(i_idx, j_idx)
+                keep = scores >= min_score
+                pairs.extend(zip(i_idx[keep].tolist(), j_idx[keep].tolist(), scores[keep].tolist()))
+            else:
+                for i, j in zip(i_idx, j_idx):
+                    score = self.score(i, j)
+                    if score >= min_score:
+                        pairs.append((i, j, score))
+        return pairs
+
+    def score(self, i: int, j: int) -> float:
+        return node_similarity(self.vectors[i], self.vectors[j])[0]
+
+    def breakdown(self, i: int, j: int) -> Dict:
+        return node_similarity(self.vectors[i], self.vectors[j])[1]
+
+    def _set_jaccard(self, dim: str, i_idx, j_idx):
+        offsets, lengths, flat, keys = self._arrays[dim]
+        len_i, len_j = lengths[i_idx], lengths[j_idx]
+        # Expand i's tokens per pair and test membership in j's token set
+        total = int(len_i.sum())
+        pair_of = np.repeat(np.arange(len(i_idx), dtype=np.int64), len_i)
+        starts = np.repeat(offsets[i_idx] - np.concatenate(([0], np.cumsum(len_i)[:-1])), len_i)
+        tokens = flat[np.arange(total, dtype=np.int64) + starts] if total else flat[:0]
+        probe = j_idx[pair_of] * self.vocabulary + tokens
+        pos = np.searchsorted(keys, probe)
+        hit = (pos < len(keys)) & (keys[np.minimum(pos, len(keys) - 1)] == probe) if len(keys) else np.zeros(total, bool)
+        inter = np.bincount(pair_of[hit], minlength=len(i_idx)).astype(np.float64)
+        union = (len_i + len_j).astype(np.float64) - inter
+        both = (len_i > 0) & (len_j > 0)
+        return np.where(both & (union > 0), inter / np.where(union > 0, union, 1.0), 0.0)
+
+    def _score_batch(self, i_idx, j_idx):
+        """Vectorized node_similarity score for pair arrays (same arithmetic order)."""
+        a = self._arrays
+        name = self._set_jaccard("name", i_idx, j_idx)
+        type_match = (a["type"][i_idx] == a["type"][j_idx]).astype(np.float64)
+
+        shared = np.zeros(len(i_idx), dtype=np.float64)
+        conflict = np.zeros(len(i_idx), dtype=bool)
+        for column in a["identifiers"]:
+            ci, cj = column[i_idx], column[j_idx]
+            both = (ci != 0) & (cj != 0)
+            shared += both & (ci == cj)
+            conflict |= both & (ci != cj)
+        identifiers = np.minimum(1.0, shared * 0.5)
+
+        jur_i = a["jurisdiction"][i_idx]
+        jurisdiction = ((jur_i != 0) & (jur_i == a["jurisdiction"][j_idx])).astype(np.float64)
+        cty_i = a["country"][i_idx]
+        country = ((cty_i != 0) & (cty_i == a["country"][j_idx])).astype(np.float64)
+
+        scores = {
+            "name": name,
+            "type": type_match,
+            "identifiers": identifiers,
+            "jurisdiction": jurisdiction,
+            "country": country,
+            "address": self._set_jaccard("address", i_idx, j_idx),
+            "temporal": self._set_jaccard("temporal", i_idx, j_idx),
+            "sources": self._set_jaccard("sources", i_idx, j_idx),
+        }
+
+        total_weight = np.zeros(len(i_idx), dtype=np.float64)
+        for k, w in WEIGHTS.items():
+            total_weight += w if k in ("identifiers", "type") else np.where(scores[k] > 0, w, 0.0)
+        total = np.zeros(len(i_idx), dtype=np.float64)
+        for k, w in WEIGHTS.items():
+            total += scores[k] * (w / total_weight)
+
+        total = np.where(identifiers > 0, np.maximum(total, 0.8 + identifiers * 0.2), total)
+        total = np.where(conflict, total * 0.3, total)
+        # Python's round() (correctly rounded), so scores match node_similarity exactly
+        return np.fromiter((round(x, 3) for x in total.tolist()), dtype=np.float64, count=len(total))
+
+
+# ─────────────────────────────────────────────────────────────
+# Neighbors and clusters from scored pairs
+# ─────────────────────────────────────────────────────────────
+
+def nearest_neighbors(n: int, pairs: Iterable[Pair], k: int = 5) -> List[List[Tuple[int, float]]]:
+    """Top-k (index, score) per node, best first (ties by index)."""
+    per_node: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+    for i, j, score in pairs:
+        per_node[i].append((j, score))
+        per_node[j].append((i, score))
+    return [sorted(items, key=lambda item: (-item[1], item[0]))[:k] for items in per_node]
+
+
+def cluster_pairs(
+    n: int,
+    pairs: Iterable[Pair],
+    threshold: float = CLUSTER_THRESHOLD,
+) -> List[List[int]]:
+    """
+    Single-linkage clusters: connected components of pairs scoring >= threshold.
+
+    Components are found in index order and their members listed breadth
+    first (neighbours by index), the order the matrix walk produced.
+    """
+    adjacency: Dict[int, List[int]] = defaultdict(list)
+    for i, j, score in pairs:
+        if score >= threshold:
+            adjacency[i].append(j)
+            adjacency[j].append(i)
+
+    visited = set()
+    clusters: List[List[int]] = []
+    for start in sorted(adjacency):
+        if start in visited:
+            continue
+        visited.add(start)
+        members = [start]
+        head = 0
+        while head < len(members):
+            for j in sorted(adjacency[members[head]]):
+                if j not in visited:
+                    visited.add(j)
+                    members.append(j)
+            head += 1
+        clusters.append(members)
+    return clusters
+
+
+def average_similarity(members: Sequence[int], scores: Dict[Tuple[int, int], float], score_fn=None) -> float:
+    """Mean pairwise score within a cluster; unscored pairs come from score_fn (or 0)."""
+    if len(members) < 2:
+        return 0.0
+    total = 0.0
+    for a, b in combinations(sorted(members), 2):
+        score = scores.get((a, b))
+        if score is None:
+            score = score_fn(a, b) if score_fn else 0.0
+        total += score
+    return round(total / (len(members) * (len(members) - 1) / 2), 3)
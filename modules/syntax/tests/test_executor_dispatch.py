@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Tests for UnifiedExecutor routing through the operator dispatcher."""
+
+import random
+
+import pytest
+
+from modules.syntax import executor as ex
+
+REGISTRY_OPERATORS = {
+    "csr:": {"jurisdiction": "CY", "name": "Cyprus Registrar"},
+    "cuk:": {"jurisdiction": "GB", "name": "Companies House"},
+}
+
+QUERIES = [
+    "/submarine explore acme.com",
+    "indom:acme",
+    "inurl: login hop(2)",
+    "p: John Smith => c?",
+    "chain: due_diligence c: Acme Ltd",
+    "edith: who owns Acme?",
+    "template:dd:uk Acme Ltd",
+    "/index acme.com",
+    "/scrape https://acme.com",
+    "acme.com :2022!",
+    "acme.com :<-",
+    "alldom: acme.com",
+    "bl? :!#acme",
+    "pdf! :#acme!",
+    "ent? :acme.com",
+    "bl? :!acme.com :!zeta.com",
+    "(#fraud AND #cyprus)",
+    "+#w: sanctions",
+    "/w{acme}",
+    "acme.com => +#suspicious",
+    "dd: Acme Ltd",
+    "litcy: Acme Ltd",
+    "reguk: Acme Ltd",
+    "csr: Acme Ltd",
+    "c: Acme Ltd",
+    "fb: janedoe",
+    "bl? acme.com",
+    "pdf! annual report",
+    "john@example.com",
+    "+44 20 7946 0958",
+    "acme.com",
+    "https://www.linkedin.com/in/jane-doe",
+    "\"Acme Holdings\" fraud",
+    "",
+]
+PREFIXES = [
+    "/submarine", "/index", "/scrape", "chain:", "template:", "edith:", "cy:", "alldom:", "rep:", "ent?", "p?",
+    "bl?", "?bl", "(", "-#w", "~#w", "+#w", "/w", "dd", "lit", "reg", "csr:", "cuk:", "p:", "c:", "e:", "d:",
+    "li:", "fb", "tw", "x", "ig", "social", "all", "#", "=>",
+]
+BODIES = [
+    "acme", "Acme Ltd", "acme.com", "john@example.com", "+447700900123", ":!acme.com", "#fraud AND #cy)",
+    "{acme}", ":!#acme", ":#acme!", ":2022!", ":<-", "indom:", "inurl:", "hop(3)", "=> c?", "=> #tag", "pdf!",
+    "bl?", "ent?", "cy:", "uk", "john smith", "?", ":", "!",
+]
+
+
+def _if_chain_route(query):
+    """The former has_* if-chain from UnifiedExecutor.execute: (route, query handed on)."""
+    query = query.strip()
+    if query.lower().startswith("/submarine"):
+        return "submarine", query
+    if ex.looks_like_submarine_exploration(query):
+        return "submarine_explore", f"/submarine explore {query}"
+    if ex.has_chain_pipe(query):
+        return "chain_pipe", query
+    if ex.has_chain_operator(query):
+        return "chain", query
+    if ex.has_agent_direct_operator(query):
+        return "agent_direct", query
+    if ex.has_template_operator(query):
+        return "template", query
+    if query.lower().startswith("/index"):
+        return "index", query
+    if query.lower().startswith("/scrape"):
+        return "scrape", query
+    parsed = ex.parse_unified_query(query)
+    if parsed and parsed.is_grid_query:
+        return "grid", query
+    checks = [
+        ("historical", ex.has_historical_operator),
+        ("macro", ex.has_macro_operator),
+        ("entity", ex.has_entity_operator),
+        ("multi_domain_backlink", ex.has_multi_domain_backlink),
+        ("boolean_tag", ex.has_boolean_tag_query),
+        ("watcher", ex.has_watcher_operator),
+        ("tagging", ex.has_tagging_operator),
+        ("dd", ex.has_dd_operator),
+        ("lit", ex.has_lit_operator),
+        ("reg", ex.has_reg_operator),
+        ("registry", ex.has_registry_operator),
+        ("io", ex.has_io_prefix),
+    ]
+    for route, check in checks:
+        if check(query):
+            return route, query
+    if parsed and parsed.operators:
+        if parsed.wants_backlinks or parsed.wants_outlinks or parsed.wants_entities or parsed.wants_filetype:
+            return "query", query
+    auto_type = ex._detect_entity_type(query)
+    if auto_type in ex.AUTO_IO_PREFIXES:
+        return "auto_io", f"{ex.AUTO_IO_PREFIXES[auto_type]} {query}"
+    return "brute", query
+
+
+def _random_queries(n, seed):
+    rng = random.Random(seed)
+    for _ in range(n):
+        parts = [rng.choice(PREFIXES)] if rng.random() < 0.8 else []
+        parts += [rng.choice(BODIES) for _ in range(rng.randint(1, 4))]
+        query = rng.choice([" ", ""]).join(parts)
+        yield query.upper() if rng.random() < 0.15 else query
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    monkeypatch.setattr(ex, "_REGISTRY_OPERATORS_CACHE", REGISTRY_OPERATORS)
+    return ex.OperatorDispatcher(cache_size=0)
+
+
+@pytest.mark.parametrize("chain_parser", [True, False])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_plans_match_the_former_if_chain(dispatcher, monkeypatch, seed, chain_parser):
+    # Without the chain parser, => pipes fall through to tagging and watchers
+    monkeypatch.setattr(ex, "CHAIN_PARSER_AVAILABLE", chain_parser)
+    for query in QUERIES + list(_random_queries(3000, seed)):
+        plan = dispatcher.plan(query)
+        assert (plan.route, plan.query) == _if_chain_route(query), query
+
+
+def test_plans_are_cached_by_stripped_query(monkeypatch):
+    dispatcher = ex.OperatorDispatcher(cache_size=2)
+    builds = []
+    real_build = dispatcher._build_plan
+
+    def counting_build(query):
+        builds.append(query)
+        return real_build(query)
+
+    monkeypatch.setattr(dispatcher, "_build_plan", counting_build)
+    plan = dispatcher.plan("alldom: acme.com")
+    assert dispatcher.plan("  alldom: acme.com ") is plan
+    assert builds == ["alldom: acme.com"]
+
+    dispatcher.plan("john@example.com")
+    dispatcher.plan("acme.com :2022!")
+    dispatcher.plan("alldom: acme.com")
+    assert builds.count("alldom: acme.com") == 2
+
+    dispatcher.clear_cache()
+    dispatcher.plan("acme.com :2022!")
+    assert builds.count("acme.com :2022!") == 2
+
+
+def test_scan_reports_operator_positions(dispatcher):
+    tokens = dispatcher.scan("p: John Smith => c? :2022!")
+    assert ("io", 0, "p:") in tokens
+    assert ("pipe", 14, "=>") in tokens
+    assert [kind for kind, _, _ in tokens if kind == "historical"] == ["historical"]
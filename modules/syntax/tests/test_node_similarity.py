@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for compare (=?) pair scoring, blocking and clustering."""
+
+import random
+
+from modules.syntax.node_similarity import (
+    MAX_POSTING,
+    NodeFeatures,
+    cluster_pairs,
+    nearest_neighbors,
+    node_similarity,
+)
+
+WORDS = ["acme", "holdings", "john", "smith", "global", "trading", "maria", "lopez", "ltd", "group"]
+
+
+def _vectors(n, seed=7):
+    rng = random.Random(seed)
+    vectors = []
+    for _ in range(n):
+        vec = {
+            "name_tokens": set(rng.sample(WORDS, rng.randint(1, 3))),
+            "entity_type": rng.choice(["person", "company"]),
+            "identifiers": {},
+            "country": rng.choice(["gb", "us", ""]),
+        }
+        if rng.random() < 0.3:
+            vec["identifiers"]["company_number"] = f"C{rng.randint(0, 40)}"
+        vectors.append(vec)
+    return vectors
+
+
+def _matrix_clusters(vectors, threshold=0.7):
+    """The former matrix walk: BFS from each unvisited node, neighbours by index."""
+    n = len(vectors)
+    matrix = [[node_similarity(a, b)[0] if i != j else 1.0 for j, b in enumerate(vectors)] for i, a in enumerate(vectors)]
+    visited, clusters = set(), []
+    for i in range(n):
+        if i in visited:
+            continue
+        members, queue = [i], [i]
+        visited.add(i)
+        while queue:
+            current = queue.pop(0)
+            for j in range(n):
+                if j not in visited and matrix[current][j] >= threshold:
+                    members.append(j)
+                    visited.add(j)
+                    queue.append(j)
+        if len(members) > 1:
+            clusters.append(members)
+    return clusters
+
+
+def _clusters(vectors, blocking):
+    features = NodeFeatures(vectors)
+    pairs = features.score_pairs(features.candidate_pairs(blocking=blocking))
+    return cluster_pairs(len(vectors), pairs)
+
+
+def test_clusters_keep_matrix_walk_member_order():
+    vectors = _vectors(120)
+    assert _clusters(vectors, blocking=False) == _matrix_clusters(vectors)
+    assert _clusters(vectors, blocking=True) == _matrix_clusters(vectors)
+
+
+def test_shared_identifier_blocks_are_not_capped():
+    rng = random.Random(1)
+    vectors = [
+        {"name_tokens": {f"name{i}"}, "entity_type": rng.choice(["person", "company"]),
+         "identifiers": {"lei": "529900T8BM49AURSDO55" if i % 2 else f"L{i}"}}
+        for i in range(2 * (MAX_POSTING + 50))
+    ]
+    clusters = _clusters(vectors, blocking=True)
+    assert clusters == [list(range(1, len(vectors), 2))]
+
+
+def test_common_name_blocks_are_split_not_skipped():
+    n = MAX_POSTING * 2
+    vectors = [{"name_tokens": {"john", "smith"}, "entity_type": "person", "identifiers": {}} for _ in range(n)]
+    features = NodeFeatures(vectors)
+    pairs = features.score_pairs(features.candidate_pairs(blocking=True))
+    assert len(pairs) < n * (n - 1) // 2
+
+    neighbors = nearest_neighbors(n, pairs, k=5)
+    assert all(len(nearest) == 5 for nearest in neighbors)
+
+
+def test_cluster_members_are_listed_breadth_first():
+    pairs = [(0, 5, 0.9), (2, 5, 0.9), (1, 3, 0.2), (4, 6, 0.75), (3, 6, 0.8)]
+    assert cluster_pairs(7, pairs) == [[0, 5, 2], [3, 6, 4]]